@@ -33,16 +33,20 @@ from .services.auth import (
     AuthLoginClient,
     ConfidentialAppAuthClient,
     DependentScopeSpec,
+    DependentTokenCache,
     GetConsentsResponse,
     GetIdentitiesResponse,
     IdentityMap,
     IDTokenDecoder,
+    JWKCache,
     NativeAppAuthClient,
     OAuthAuthorizationCodeResponse,
     OAuthClientCredentialsResponse,
     OAuthDependentTokenResponse,
     OAuthRefreshTokenResponse,
     OAuthTokenResponse,
+    SQLiteIdentityCache,
+    TokenIntrospectionCache,
 )
 from .services.compute import (
     ComputeAPIError,
@@ -68,6 +72,7 @@ from .services.gcs import (
     EndpointDocument,
     GCSAPIError,
     GCSClient,
+    GCSInventory,
     GCSRoleDocument,
     GlobusConnectServerConnector,
     GoogleCloudStorageCollectionPolicies,
@@ -120,8 +125,14 @@ from .services.transfer import (
     DeleteData,
     IterableTransferResponse,
     TransferAPIError,
+    TransferChecksumCalculator,
     TransferClient,
     TransferData,
+    TransferEndpointIndex,
+    TransferListingCache,
+    TransferSubmissionIDPool,
+    TransferSyncPlanner,
+    TransferTaskMonitor,
 )
 
 __version__ = "x.y.z"
@@ -163,6 +174,7 @@ __all__ = (
     "AuthLoginClient",
     "ConfidentialAppAuthClient",
     "DependentScopeSpec",
+    "DependentTokenCache",
     "GetConsentsResponse",
     "GetIdentitiesResponse",
     "IdentityMap",
@@ -173,6 +185,9 @@ __all__ = (
     "OAuthRefreshTokenResponse",
     "OAuthTokenResponse",
     "IDTokenDecoder",
+    "JWKCache",
+    "SQLiteIdentityCache",
+    "TokenIntrospectionCache",
     "ComputeAPIError",
     "ComputeClientV2",
     "ComputeClientV3",
@@ -192,6 +207,7 @@ __all__ = (
     "EndpointDocument",
     "GCSAPIError",
     "GCSClient",
+    "GCSInventory",
     "GCSRoleDocument",
     "GlobusConnectServerConnector",
     "GoogleCloudStorageCollectionPolicies",
@@ -235,8 +251,14 @@ __all__ = (
     "DeleteData",
     "IterableTransferResponse",
     "TransferAPIError",
+    "TransferChecksumCalculator",
     "TransferClient",
     "TransferData",
+    "TransferEndpointIndex",
+    "TransferListingCache",
+    "TransferSubmissionIDPool",
+    "TransferSyncPlanner",
+    "TransferTaskMonitor",
     "MISSING",
     "MissingType",
     "__version__",
@@ -0,0 +1,250 @@
+"""
+A compact, column-oriented list of uniform dicts.
+
+This is used to store the items of very large task documents (e.g. ``TransferData``)
+with far less memory than a list of dicts would require.
+"""
+
+from __future__ import annotations
+
+import array
+import typing as t
+
+from globus_sdk._missing import MISSING
+
+# tri-state encoding for boolean columns
+_FLAG_MISSING, _FLAG_FALSE, _FLAG_TRUE = 0, 1, 2
+_FLAG_DECODE = {_FLAG_MISSING: MISSING, _FLAG_FALSE: False, _FLAG_TRUE: True}
+
+
+class _StringColumn:
+    """
+    Strings packed end-to-end as UTF-8 in a single buffer, with an array of end
+    offsets. This avoids the ~50 byte overhead of a ``str`` object per value.
+    """
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+        self.ends = array.array("Q")
+
+    def append(self, value: str) -> None:
+        self.buf += value.encode("utf-8")
+        self.ends.append(len(self.buf))
+
+    def __getitem__(self, index: int) -> str:
+        start = self.ends[index - 1] if index else 0
+        return self.buf[start : self.ends[index]].decode("utf-8")
+
+
+class _ReadOnlyRow(dict[str, t.Any]):
+    """
+    A dict built while iterating over a :class:`CompactDictList`. It is not stored,
+    so changes to it would be lost; instead, they raise a ``TypeError``.
+    """
+
+    def _read_only(self, *args: t.Any, **kwargs: t.Any) -> t.NoReturn:
+        raise TypeError(
+            "items produced by iterating over compact items are read-only; "
+            "access an item by index to modify it"
+        )
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+class CompactDictList(t.MutableSequence[t.Dict[str, t.Any]]):
+    """
+    A mutable sequence of dicts which all have the same keys, stored in columns.
+
+    Each dict is described by a schema of fields:
+
+    - ``constants`` have the same value in every dict, and are stored once
+    - ``string_fields`` are required strings, packed into a shared buffer
+    - ``flag_fields`` are ``True``, ``False``, or ``MISSING``, stored as one byte
+    - ``sparse_fields`` are strings or ``MISSING`` which are usually ``MISSING``;
+      values which are present are interned, so repeated values are stored once
+
+    Appended dicts which do not match the schema (e.g. with extra keys) are stored
+    as-is. Dicts are built when they are accessed. A dict accessed by index is kept,
+    so that modifying it in-place behaves as it would for a list of dicts. Dicts
+    produced by iteration are built on the fly and discarded, keeping memory use
+    low while encoding, so they are read-only.
+
+    Insertion or deletion anywhere other than the end of the list rebuilds the
+    columns, and is therefore ``O(n)``.
+    """
+
+    def __init__(
+        self,
+        iterable: t.Iterable[dict[str, t.Any]] = (),
+        *,
+        constants: dict[str, t.Any],
+        string_fields: t.Sequence[str],
+        flag_fields: t.Sequence[str] = (),
+        sparse_fields: t.Sequence[str] = (),
+    ) -> None:
+        self._constants = constants
+        self._string_fields = tuple(string_fields)
+        self._flag_fields = tuple(flag_fields)
+        self._sparse_fields = tuple(sparse_fields)
+        # the key order of produced dicts
+        self._field_order = (
+            *constants,
+            *self._string_fields,
+            *self._flag_fields,
+            *self._sparse_fields,
+        )
+        self._field_set = frozenset(self._field_order)
+        self._clear()
+        self.extend(iterable)
+
+    def _clear(self) -> None:
+        self._len = 0
+        self._strings = {f: _StringColumn() for f in self._string_fields}
+        self._flags = {f: bytearray() for f in self._flag_fields}
+        self._sparse: dict[str, dict[int, str]] = {f: {} for f in self._sparse_fields}
+        self._interned: dict[str, str] = {}
+        # rows held as plain dicts, either because they do not fit the schema or
+        # because they were accessed by index
+        self._dicts: dict[int, dict[str, t.Any]] = {}
+
+    def _packable(self, item: t.Any) -> bool:
+        if not isinstance(item, dict) or item.keys() != self._field_set:
+            return False
+        return (
+            all(item[k] == v for k, v in self._constants.items())
+            and all(isinstance(item[f], str) for f in self._string_fields)
+            and all(
+                item[f] is MISSING or isinstance(item[f], bool)
+                for f in self._flag_fields
+            )
+            and all(
+                item[f] is MISSING or isinstance(item[f], str)
+                for f in self._sparse_fields
+            )
+        )
+
+    def _build(
+        self, index: int, row_type: type[dict[str, t.Any]] = dict
+    ) -> dict[str, t.Any]:
+        if index in self._dicts:
+            return self._dicts[index]
+        return row_type(
+            [
+                *self._constants.items(),
+                *((f, self._strings[f][index]) for f in self._string_fields),
+                *((f, _FLAG_DECODE[self._flags[f][index]]) for f in self._flag_fields),
+                *(
+                    (f, self._sparse[f].get(index, MISSING))
+                    for f in self._sparse_fields
+                ),
+            ]
+        )
+
+    def _normalize_index(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("list index out of range")
+        return index
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> t.Iterator[dict[str, t.Any]]:
+        for index in range(self._len):
+            yield self._build(index, _ReadOnlyRow)
+
+    @t.overload
+    def __getitem__(self, index: int) -> dict[str, t.Any]: ...
+
+    @t.overload
+    def __getitem__(self, index: slice) -> list[dict[str, t.Any]]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> dict[str, t.Any] | list[dict[str, t.Any]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._len))]
+        index = self._normalize_index(index)
+        if index not in self._dicts:
+            self._dicts[index] = self._build(index)
+        return self._dicts[index]
+
+    @t.overload
+    def __setitem__(self, index: int, value: dict[str, t.Any]) -> None: ...
+
+    @t.overload
+    def __setitem__(
+        self, index: slice, value: t.Iterable[dict[str, t.Any]]
+    ) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: t.Any) -> None:
+        if isinstance(index, slice):
+            self._rebuild(lambda rows: rows.__setitem__(index, value))
+            return
+        index = self._normalize_index(index)
+        if (
+            index not in self._dicts
+            and self._packable(value)
+            and all(self._strings[f][index] == value[f] for f in self._string_fields)
+        ):
+            # only the cheap columns differ, so update them in place
+            self._pack_row(index, value)
+        else:
+            self._dicts[index] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        if isinstance(index, int):
+            index = self._normalize_index(index)
+        self._rebuild(lambda rows: rows.__delitem__(index))
+
+    def insert(self, index: int, value: dict[str, t.Any]) -> None:
+        if index >= self._len:
+            self.append(value)
+        else:
+            self._rebuild(lambda rows: rows.insert(index, value))
+
+    def append(self, value: dict[str, t.Any]) -> None:
+        index = self._len
+        if self._packable(value):
+            for f in self._string_fields:
+                self._strings[f].append(value[f])
+            for f in self._flag_fields:
+                self._flags[f].append(_FLAG_MISSING)
+            self._pack_row(index, value)
+        else:
+            # keep the columns aligned with placeholder values
+            for f in self._string_fields:
+                self._strings[f].append("")
+            for f in self._flag_fields:
+                self._flags[f].append(_FLAG_MISSING)
+            self._dicts[index] = value
+        self._len += 1
+
+    def _pack_row(self, index: int, value: dict[str, t.Any]) -> None:
+        """Store the flag and sparse fields of a row whose strings are stored."""
+        for f in self._flag_fields:
+            v = value[f]
+            self._flags[f][index] = (
+                _FLAG_MISSING if v is MISSING else _FLAG_TRUE if v else _FLAG_FALSE
+            )
+        for f in self._sparse_fields:
+            if value[f] is MISSING:
+                self._sparse[f].pop(index, None)
+            else:
+                self._sparse[f][index] = self._interned.setdefault(value[f], value[f])
+
+    def _rebuild(self, mutate: t.Callable[[list[dict[str, t.Any]]], None]) -> None:
+        rows = [self._build(i) for i in range(self._len)]
+        mutate(rows)
+        self._clear()
+        self.extend(rows)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, CompactDictList)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{self._len} items>)"
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import threading
+import time
+import typing as t
+
+
+class RateLimiter:
+    """
+    Space out events so that at most ``rate`` occur per second, across all threads
+    which share the limiter.
+
+    :param rate: The maximum number of events per second
+    :param clock: A monotonic clock, for testing
+    """
+
+    def __init__(
+        self, rate: float, *, clock: t.Callable[[], float] = time.monotonic
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("RateLimiter rate must be positive")
+        self.interval = 1 / rate
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next: float | None = None
+
+    def wait(self) -> None:
+        """Block until the next event is allowed."""
+        with self._lock:
+            now = self._clock()
+            at = now if self._next is None else max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            time.sleep(at - now)
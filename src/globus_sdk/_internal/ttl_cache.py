@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import threading
+import time
+import typing as t
+
+K = t.TypeVar("K", bound=t.Hashable)
+V = t.TypeVar("V")
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStats:
+    """
+    A snapshot of the counters kept by a cache.
+
+    :param hits: The number of lookups which found a live entry
+    :param misses: The number of lookups which found no entry, or an expired one
+    :param evictions: The number of entries dropped to stay within the size limit
+    :param expirations: The number of entries dropped because their TTL elapsed
+    :param invalidations: The number of entries dropped by explicit invalidation
+    :param size: The number of entries currently held
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The ratio of hits to total lookups, or ``0.0`` if there were none."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(t.Generic[K, V]):
+    """
+    A thread-safe mapping with least-recently-used eviction and per-entry
+    expiration.
+
+    :param ttl: The default lifetime of an entry, in seconds
+    :param maxsize: The maximum number of entries to hold, or ``None`` for no limit
+    :param clock: A monotonic clock, used to compute expiration
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        maxsize: int | None = None,
+        clock: t.Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("TTLCache maxsize must be at least 1")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._lock = threading.Lock()
+        # entries are (expires_at, value), in least-recently-used order
+        self._data: collections.OrderedDict[K, tuple[float, V]] = (
+            collections.OrderedDict()
+        )
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            entry = self._data.get(t.cast(K, key))
+            return entry is not None and entry[0] > self._clock()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Get the value for a key, if it is present and not expired.
+        A successful lookup marks the entry as recently used.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            if entry[0] <= self._clock():
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: K, value: V, *, ttl: float | None = None) -> None:
+        """
+        Store a value, evicting the least recently used entries if needed.
+
+        :param key: The key to store
+        :param value: The value to store
+        :param ttl: A lifetime for this entry, overriding the default
+        """
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self._evictions += 1
+
+    def expires_in(self, key: K) -> float | None:
+        """
+        Get the remaining lifetime of an entry in seconds, or ``None`` if absent.
+        Does not count as a lookup.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            return max(entry[0] - self._clock(), 0.0)
+
+    def pop(self, key: K) -> V | None:
+        """Remove an entry, returning its value if it was present."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return None
+            self._invalidations += 1
+            return entry[1]
+
+    def invalidate_where(self, predicate: t.Callable[[K], bool]) -> int:
+        """
+        Remove all entries whose keys match a predicate.
+
+        :param predicate: A callable which returns ``True`` for keys to remove
+        :returns: The number of entries removed
+        """
+        with self._lock:
+            doomed = [key for key in self._data if predicate(key)]
+            for key in doomed:
+                del self._data[key]
+            self._invalidations += len(doomed)
+            return len(doomed)
+
+    def purge_expired(self) -> int:
+        """
+        Remove all expired entries.
+
+        :returns: The number of entries removed
+        """
+        now = self._clock()
+        with self._lock:
+            doomed = [key for key, (exp, _) in self._data.items() if exp <= now]
+            for key in doomed:
+                del self._data[key]
+            self._expirations += len(doomed)
+            return len(doomed)
+
+    def clear(self) -> None:
+        """Remove all entries. Counters are preserved."""
+        with self._lock:
+            self._invalidations += len(self._data)
+            self._data.clear()
+
+    def keys(self) -> list[K]:
+        """A list of all keys currently held, including expired ones."""
+        with self._lock:
+            return list(self._data)
+
+    def stats(self) -> CacheStats:
+        """Get a snapshot of the counters for this cache."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+                size=len(self._data),
+            )
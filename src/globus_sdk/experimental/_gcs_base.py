@@ -0,0 +1,189 @@
+"""
+Connection and authentication handling shared by the HTTPS helpers for Globus Connect
+Server collections.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import types
+import urllib.parse
+
+import globus_sdk
+import globus_sdk.transport
+from globus_sdk._internal.type_definitions import Closable
+from globus_sdk.experimental.gcs_collection_client import GCSCollectionClient
+from globus_sdk.transport.default_retry_checks import DEFAULT_RETRY_CHECKS
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+log = logging.getLogger(__name__)
+
+
+class _GCSHTTPSBase:
+    """
+    Manages the connection and authentication state for HTTPS access to a single
+    collection: the collection ID is detected from the server's login redirect, the
+    required scopes are determined from the collection's document in Transfer, and a
+    client is built on first use.
+    """
+
+    def __init__(
+        self,
+        app: globus_sdk.GlobusApp,
+        *,
+        gcs_client: GCSCollectionClient | None = None,
+        transfer_client: globus_sdk.TransferClient | None = None,
+        transport: globus_sdk.transport.RequestsTransport | None = None,
+    ) -> None:
+        self.app = app
+        self._resources_to_close: list[Closable] = []
+
+        if transport is not None:
+            self.transport = transport
+        else:
+            self.transport = globus_sdk.transport.RequestsTransport()
+            self._resources_to_close.append(self.transport)
+
+        # a RetryConfig is needed when using the transport directly
+        self._retry_config = globus_sdk.transport.RetryConfig()
+        self._retry_config.checks.register_many_checks(DEFAULT_RETRY_CHECKS)
+
+        self.gcs_client = gcs_client
+
+        # set the transfer_client if provided
+        self.transfer_client = transfer_client
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close all resources which are owned by this object.
+        """
+        for resource in self._resources_to_close:
+            log.debug(
+                f"closing resource of type {type(resource).__name__} "
+                f"for {type(self).__name__}"
+            )
+            resource.close()
+
+    def _get_client(self, file_uri: str) -> GCSCollectionClient:
+        # dynamically build a client if needed
+        if self.gcs_client is None:
+            self.gcs_client = self._get_client_from_uri(file_uri)
+            self._resources_to_close.append(self.gcs_client)
+        return self.gcs_client
+
+    def _get_client_from_uri(self, file_uri: str) -> GCSCollectionClient:
+        collection_id = self._sniff_collection_id(file_uri)
+        collection_address = _get_collection_address(file_uri)
+
+        client = self._gcs_client_constructor(
+            collection_client_id=collection_id,
+            collection_address=collection_address,
+        )
+        self.app.add_scope_requirements(
+            {client.scopes.resource_server: self._determine_required_scopes(client)}
+        )
+        return client
+
+    def _gcs_client_constructor(
+        self, *, collection_client_id: str, collection_address: str
+    ) -> GCSCollectionClient:
+        return GCSCollectionClient(
+            collection_client_id,
+            collection_address,
+            app=self.app,
+            transport=self.transport,
+        )
+
+    def _determine_required_scopes(
+        self, client: GCSCollectionClient
+    ) -> list[globus_sdk.Scope]:
+        return _required_scopes(
+            client, _uses_data_access(self._get_transfer_client(), client.collection_id)
+        )
+
+    def _get_transfer_client(self) -> globus_sdk.TransferClient:
+        if self.transfer_client is None:
+            self.transfer_client = globus_sdk.TransferClient(
+                app=self.app, transport=self.transport
+            )
+            self._resources_to_close.append(self.transfer_client)
+        return self.transfer_client
+
+    def _sniff_collection_id(self, file_uri: str) -> str:
+        response = self.transport.request(
+            "GET",
+            file_uri,
+            caller_info=globus_sdk.transport.RequestCallerInfo(
+                retry_config=self._retry_config
+            ),
+            allow_redirects=False,
+        )
+        if "Location" not in response.headers:
+            msg = (
+                f"Attempting to detect the collection ID for the file at '{file_uri}' "
+                "failed. Did not receive a redirect with Location header on "
+                "unauthenticated call."
+            )
+            raise RuntimeError(msg)
+
+        location_header = response.headers["Location"]
+        parsed_location = urllib.parse.urlparse(location_header)
+        parsed_location_qs = urllib.parse.parse_qs(parsed_location.query)
+
+        if "client_id" not in parsed_location_qs:
+            msg = (
+                f"Attempting to detect the collection ID for the file at '{file_uri}' "
+                "failed. Location header did not encode a 'client_id'."
+            )
+            raise RuntimeError(msg)
+
+        client_ids = parsed_location_qs["client_id"]
+        if len(client_ids) != 1:
+            msg = (
+                f"Attempting to detect the collection ID for the file at '{file_uri}' "
+                "failed. Multiple 'client_id' params were present."
+            )
+            raise RuntimeError(msg)
+
+        return client_ids[0]
+
+
+def _get_collection_address(file_uri: str) -> str:
+    parsed = urllib.parse.urlparse(file_uri)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _uses_data_access(
+    transfer_client: globus_sdk.TransferClient, collection_id: str
+) -> bool:
+    doc = transfer_client.get_endpoint(collection_id)
+    if doc["entity_type"] != "GCSv5_mapped_collection":
+        return False
+    if doc["high_assurance"]:
+        return False
+    return True
+
+
+def _required_scopes(
+    client: GCSCollectionClient, uses_data_access: bool
+) -> list[globus_sdk.Scope]:
+    required_scopes: list[globus_sdk.Scope] = [client.scopes.https]
+    if uses_data_access:
+        required_scopes.append(client.scopes.data_access)
+    return required_scopes
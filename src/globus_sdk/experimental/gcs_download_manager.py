@@ -0,0 +1,343 @@
+"""
+The GCSDownloadManager provides HTTPS file downloads across many Globus Connect Server
+collections.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import typing as t
+
+import globus_sdk
+import globus_sdk.transport
+from globus_sdk._internal.ttl_cache import CacheStats, TTLCache
+
+from ._gcs_base import (
+    _GCSHTTPSBase,
+    _get_collection_address,
+    _required_scopes,
+    _uses_data_access,
+)
+from .gcs_downloader import DownloadResult, GCSDownloader
+
+log = logging.getLogger(__name__)
+
+_CACHE_FILE_VERSION = 1
+
+
+@dataclasses.dataclass(frozen=True)
+class _CollectionInfo:
+    collection_id: str
+    uses_data_access: bool
+
+
+class GCSDownloadManager(_GCSHTTPSBase):
+    """
+    An object which routes HTTPS downloads to the Globus Connect Server collections
+    which serve them, keeping a :class:`GCSDownloader
+    <globus_sdk.experimental.gcs_downloader.GCSDownloader>` for each collection.
+
+    Before the first download from a collection, its ID is detected from the
+    server's login redirect, and its document in Globus Transfer is read to
+    determine which scopes are required. A manager remembers these results for
+    each collection address for ``cache_ttl`` seconds. If ``cache_path`` is given,
+    they are also saved to that file, so that later runs using the same file can
+    skip detection. The file is not locked, so if several processes save to it at
+    once, some of their entries may be lost and detected again later.
+
+    All collections share the manager's transport and Transfer client. Managers
+    may be used as context managers, in which case they automatically call their
+    ``close()`` method on exit.
+
+    :param app: The :class:`GlobusApp` used to authenticate calls to the servers.
+    :param transfer_client: A client used when detecting collection information.
+        Typically omitted. When not provided, one will be constructed on demand.
+    :param transport: A transport used for all requests. When omitted, the manager
+        creates and owns one.
+    :param cache_path: A path to a JSON file in which collection information is
+        saved. The file is created if needed.
+    :param cache_ttl: The number of seconds for which collection information is
+        trusted. [Default: one day]
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                with GCSDownloadManager(
+                    app, cache_path="~/.cache/gcs-collections.json"
+                ) as manager:
+                    results = manager.download_files(
+                        (url, f"/data/{url.rsplit('/', 1)[-1]}") for url in urls
+                    )
+    """
+
+    def __init__(
+        self,
+        app: globus_sdk.GlobusApp,
+        *,
+        transfer_client: globus_sdk.TransferClient | None = None,
+        transport: globus_sdk.transport.RequestsTransport | None = None,
+        cache_path: str | os.PathLike[str] | None = None,
+        cache_ttl: float = 86400,
+    ) -> None:
+        if cache_ttl <= 0:
+            raise globus_sdk.GlobusSDKUsageError(
+                "GCSDownloadManager cache_ttl must be positive"
+            )
+        super().__init__(app, transfer_client=transfer_client, transport=transport)
+        self.cache_path = (
+            os.path.expanduser(os.fspath(cache_path)) if cache_path else None
+        )
+        self.cache_ttl = cache_ttl
+
+        self._collections: TTLCache[str, _CollectionInfo] = TTLCache(ttl=cache_ttl)
+        self._downloaders: dict[str, GCSDownloader] = {}
+        self._lock = threading.Lock()
+        # one lock per collection address, so that concurrent downloads from a new
+        # collection only detect its information once
+        self._address_locks: dict[str, threading.Lock] = {}
+        self._load_cache()
+
+    def cache_stats(self) -> CacheStats:
+        """Get a snapshot of the counters of the in-memory collection cache."""
+        return self._collections.stats()
+
+    def get_downloader(self, file_uri: str) -> GCSDownloader:
+        """
+        Get the downloader for the collection which serves a file URI, creating it if
+        needed.
+
+        :param file_uri: The full URI of a file on a collection, or the address of
+            the collection
+        """
+        address = _get_collection_address(file_uri)
+        with self._lock:
+            downloader = self._downloaders.get(address)
+            if downloader is not None:
+                return downloader
+            address_lock = self._address_locks.setdefault(address, threading.Lock())
+
+        with address_lock:
+            with self._lock:
+                downloader = self._downloaders.get(address)
+            if downloader is not None:
+                return downloader
+
+            info = self._get_collection_info(address)
+            client = self._gcs_client_constructor(
+                collection_client_id=info.collection_id, collection_address=address
+            )
+            self.app.add_scope_requirements(
+                {
+                    client.scopes.resource_server: _required_scopes(
+                        client, info.uses_data_access
+                    )
+                }
+            )
+            downloader = GCSDownloader(
+                self.app,
+                gcs_client=client,
+                transfer_client=self.transfer_client,
+                transport=self.transport,
+            )
+            with self._lock:
+                self._downloaders[address] = downloader
+                self._resources_to_close.append(client)
+            return downloader
+
+    @t.overload
+    def read_file(self, file_uri: str, *, as_text: t.Literal[True]) -> str: ...
+    @t.overload
+    def read_file(self, file_uri: str, *, as_text: t.Literal[False]) -> bytes: ...
+    @t.overload
+    def read_file(self, file_uri: str) -> str: ...
+
+    def read_file(self, file_uri: str, *, as_text: bool = True) -> str | bytes:
+        """
+        Read a file, as with :meth:`GCSDownloader.read_file
+        <globus_sdk.experimental.gcs_downloader.GCSDownloader.read_file>`, from
+        whichever collection serves it.
+
+        :param file_uri: The full URI of the file on the collection which is being
+            downloaded.
+        :param as_text: When ``True``, the file contents are decoded into a string. Set
+            to ``False`` to retrieve data as bytes.
+        """
+        downloader = self.get_downloader(file_uri)
+        if as_text:
+            return downloader.read_file(file_uri, as_text=True)
+        return downloader.read_file(file_uri, as_text=False)
+
+    def download_to(
+        self,
+        file_uri: str,
+        destination: str | os.PathLike[str] | t.IO[bytes],
+        **kwargs: t.Any,
+    ) -> DownloadResult:
+        """
+        Download a file, as with :meth:`GCSDownloader.download_to
+        <globus_sdk.experimental.gcs_downloader.GCSDownloader.download_to>`, from
+        whichever collection serves it. Keyword arguments are passed through.
+
+        :param file_uri: The full URI of the file on the collection which is being
+            downloaded.
+        :param destination: A path, or a writable binary file object
+        """
+        return self.get_downloader(file_uri).download_to(
+            file_uri, destination, **kwargs
+        )
+
+    def download_files(
+        self,
+        downloads: t.Iterable[tuple[str, str | os.PathLike[str]]],
+        *,
+        max_workers: int = 8,
+        **kwargs: t.Any,
+    ) -> list[DownloadResult]:
+        """
+        Download many files, from any number of collections, concurrently.
+
+        Files are downloaded with :meth:`GCSDownloader.download_to
+        <globus_sdk.experimental.gcs_downloader.GCSDownloader.download_to>`, to which
+        keyword arguments are passed through. A file which fails to download does
+        not stop the others; its error is recorded in its result.
+
+        :param downloads: Pairs of a file URI and the path to which it is downloaded
+        :param max_workers: The maximum number of concurrent downloads.
+            [Default: ``8``]
+        :returns: A result for each download, in the order given
+        """
+        if max_workers < 1:
+            raise globus_sdk.GlobusSDKUsageError(
+                "download_files max_workers has a minimum of 1"
+            )
+
+        def _download_one(
+            file_uri: str, path: str | os.PathLike[str]
+        ) -> DownloadResult:
+            try:
+                return self.download_to(file_uri, path, **kwargs)
+            except (globus_sdk.GlobusError, OSError, RuntimeError) as err:
+                log.debug(f"download of {file_uri} failed: {err}")
+                return DownloadResult(0, os.fspath(path), error=err)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_download_one, file_uri, path)
+                for file_uri, path in downloads
+            ]
+            return [future.result() for future in futures]
+
+    def forget(self, file_uri: str) -> None:
+        """
+        Discard the cached information and downloader for the collection which
+        serves a file URI, for instance after the collection has been reconfigured.
+        The downloader's client is closed. Its information is detected again on the
+        next download.
+
+        :param file_uri: The full URI of a file on a collection, or the address of
+            the collection
+        """
+        address = _get_collection_address(file_uri)
+        with self._lock:
+            downloader = self._downloaders.pop(address, None)
+            client = downloader.gcs_client if downloader is not None else None
+            if client is not None:
+                self._resources_to_close.remove(client)
+        if client is not None:
+            client.close()
+        self._collections.pop(address)
+        self._save_cache(address, None)
+
+    def _get_collection_info(self, address: str) -> _CollectionInfo:
+        info = self._collections.get(address)
+        if info is not None:
+            return info
+
+        # sniffing the root of the collection does not depend on any file
+        collection_id = self._sniff_collection_id(f"{address}/")
+        with self._lock:
+            transfer_client = self._get_transfer_client()
+        info = _CollectionInfo(
+            collection_id, _uses_data_access(transfer_client, collection_id)
+        )
+        log.debug(f"detected collection {collection_id} at {address}")
+        self._collections.set(address, info)
+        self._save_cache(address, info)
+        return info
+
+    def _load_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        now = time.time()
+        for address, entry in self._read_cache_file().items():
+            remaining = min(entry["expires_at"] - now, self.cache_ttl)
+            if remaining > 0:
+                self._collections.set(
+                    address,
+                    _CollectionInfo(entry["collection_id"], entry["uses_data_access"]),
+                    ttl=remaining,
+                )
+
+    def _read_cache_file(self) -> dict[str, dict[str, t.Any]]:
+        assert self.cache_path is not None
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            log.warning(
+                f"ignoring unreadable collection cache {self.cache_path}: {err}"
+            )
+            return {}
+        if not isinstance(saved, dict) or saved.get("version") != _CACHE_FILE_VERSION:
+            return {}
+        return dict(saved.get("collections", {}))
+
+    def _save_cache(self, address: str, info: _CollectionInfo | None) -> None:
+        """
+        Update one entry of the cache file. The file is re-read first, so that
+        entries saved since it was loaded are usually kept. Only threads of this
+        manager are serialized; the file is replaced atomically, so readers never
+        see a partial file, but concurrent writers in other processes may drop
+        each other's entries.
+        """
+        if self.cache_path is None:
+            return
+        with self._lock:
+            now = time.time()
+            collections = {
+                key: entry
+                for key, entry in self._read_cache_file().items()
+                if entry.get("expires_at", 0) > now
+            }
+            if info is None:
+                collections.pop(address, None)
+            else:
+                collections[address] = {
+                    **dataclasses.asdict(info),
+                    "expires_at": now + self.cache_ttl,
+                }
+            cache_dir = os.path.dirname(os.path.abspath(self.cache_path))
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+                with open(fd, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"version": _CACHE_FILE_VERSION, "collections": collections},
+                        f,
+                    )
+                os.replace(tmp_path, self.cache_path)
+            except OSError as err:
+                # the cache is an optimization, so failing to write it is not fatal
+                log.warning(f"failed to save collection cache {self.cache_path}: {err}")
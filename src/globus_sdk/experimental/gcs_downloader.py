@@ -4,27 +4,81 @@ The GCSDownloader provides HTTPS file download capabilities for Globus Connect S
 
 from __future__ import annotations
 
+import concurrent.futures
+import dataclasses
+import hashlib
+import json
 import logging
-import sys
-import types
+import os
+import re
+import threading
+import time
 import typing as t
-import urllib.parse
+import uuid
+
+import requests
 
 import globus_sdk
-import globus_sdk.transport
-from globus_sdk._internal.type_definitions import Closable
 from globus_sdk.experimental.gcs_collection_client import GCSCollectionClient
-from globus_sdk.transport.default_retry_checks import DEFAULT_RETRY_CHECKS
 
-if sys.version_info >= (3, 11):
-    from typing import Self
-else:
-    from typing_extensions import Self
+from ._gcs_base import _GCSHTTPSBase
 
 log = logging.getLogger(__name__)
 
+#: The default number of bytes read from the network at a time when downloading
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+#: The default size of each part of a parallel download
+DEFAULT_PART_SIZE = 32 * 1024 * 1024
+_PART_STATE_VERSION = 1
+
+
+class ChecksumMismatchError(globus_sdk.GlobusError):
+    """
+    The checksum of a downloaded file did not match the expected checksum.
+
+    :ivar file_uri: The URI of the file
+    :ivar expected: The expected checksum
+    :ivar actual: The checksum of the data received
+    """
+
+    def __init__(self, file_uri: str, expected: str, actual: str) -> None:
+        super().__init__(
+            f"Checksum mismatch for '{file_uri}': expected {expected}, got {actual}"
+        )
+        self.file_uri = file_uri
+        self.expected = expected
+        self.actual = actual
+
 
-class GCSDownloader:
+@dataclasses.dataclass
+class DownloadResult:
+    """
+    The result of a call to :meth:`GCSDownloader.download_to`.
+
+    :param size: The number of bytes written
+    :param path: The path of the downloaded file, or ``None`` if the data was
+        written to a file object
+    :param checksum: The hex digest of the data, if a ``checksum_algorithm`` was
+        given
+    :param error: The error which caused the download to fail, if it failed. Only
+        set in the results of
+        :meth:`GCSDownloadManager.download_files
+        <globus_sdk.experimental.gcs_download_manager.GCSDownloadManager.download_files>`;
+        other methods raise the error instead.
+    """
+
+    size: int
+    path: str | None = None
+    checksum: str | None = None
+    error: Exception | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        """``True`` if the file was downloaded."""
+        return self.error is None
+
+
+class GCSDownloader(_GCSHTTPSBase):
     """
     An object which manages connection and authentication state to enable HTTPS
     downloads from a specific Globus Connect Server collection.
@@ -53,54 +107,6 @@ class GCSDownloader:
         inherit this transport.
     """
 
-    def __init__(
-        self,
-        app: globus_sdk.GlobusApp,
-        *,
-        gcs_client: GCSCollectionClient | None = None,
-        transfer_client: globus_sdk.TransferClient | None = None,
-        transport: globus_sdk.transport.RequestsTransport | None = None,
-    ) -> None:
-        self.app = app
-        self._resources_to_close: list[Closable] = []
-
-        if transport is not None:
-            self.transport = transport
-        else:
-            self.transport = globus_sdk.transport.RequestsTransport()
-            self._resources_to_close.append(self.transport)
-
-        # the downloader will need a RetryConfig when it uses its own transport
-        self._retry_config = globus_sdk.transport.RetryConfig()
-        self._retry_config.checks.register_many_checks(DEFAULT_RETRY_CHECKS)
-
-        self.gcs_client = gcs_client
-
-        # set the transfer_client if provided
-        self.transfer_client = transfer_client
-
-    def __enter__(self) -> Self:
-        return self
-
-    def __exit__(
-        self,
-        exc_type: type[BaseException] | None,
-        exc_val: BaseException | None,
-        exc_tb: types.TracebackType | None,
-    ) -> None:
-        self.close()
-
-    def close(self) -> None:
-        """
-        Close all resources which are owned by this downloader.
-        """
-        for resource in self._resources_to_close:
-            log.debug(
-                f"closing resource of type {type(resource).__name__} "
-                f"for {type(self).__name__}"
-            )
-            resource.close()
-
     @t.overload
     def read_file(self, file_uri: str, *, as_text: t.Literal[True]) -> str: ...
     @t.overload
@@ -122,103 +128,474 @@ class GCSDownloader:
             The file read is done naively as a GET request. This may be unsuitable for
             very large files.
         """
-        # dynamically build a client if needed
-        if self.gcs_client is None:
-            self.gcs_client = self._get_client_from_uri(file_uri)
-            self._resources_to_close.append(self.gcs_client)
-
-        response = self.gcs_client.get(file_uri)
+        response = self._get_client(file_uri).get(file_uri)
         if as_text:
             return response.text
         return response.binary_content
 
-    def _get_client_from_uri(self, file_uri: str) -> GCSCollectionClient:
-        collection_id = self._sniff_collection_id(file_uri)
-        collection_address = _get_collection_address(file_uri)
+    def download_to(
+        self,
+        file_uri: str,
+        destination: str | os.PathLike[str] | t.IO[bytes],
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        atomic: bool = True,
+        checksum_algorithm: str | None = None,
+        expected_checksum: str | None = None,
+        progress: t.Callable[[int, int | None], None] | None = None,
+    ) -> DownloadResult:
+        """
+        Given a file URI on a GCS Collection, stream the data into a file.
 
-        client = self._gcs_client_constructor(
-            collection_client_id=collection_id,
-            collection_address=collection_address,
-        )
-        self.app.add_scope_requirements(
-            {client.scopes.resource_server: self._determine_required_scopes(client)}
-        )
-        return client
-
-    def _gcs_client_constructor(
-        self, *, collection_client_id: str, collection_address: str
-    ) -> GCSCollectionClient:
-        return GCSCollectionClient(
-            collection_client_id,
-            collection_address,
-            app=self.app,
-            transport=self.transport,
-        )
+        The data is read from the network and written out ``chunk_size`` bytes at a
+        time, so memory use does not grow with the size of the file.
 
-    def _determine_required_scopes(
-        self, client: GCSCollectionClient
-    ) -> list[globus_sdk.Scope]:
-        if self.transfer_client is None:
-            self.transfer_client = globus_sdk.TransferClient(
-                app=self.app, transport=self.transport
+        When ``destination`` is a path and ``atomic`` is set, the data is written to
+        a temporary file in the same directory, which is renamed to ``destination``
+        only once the download is complete (and its checksum verified). If the
+        download fails, the temporary file is removed and any existing file at
+        ``destination`` is left as it was.
+
+        :param file_uri: The full URI of the file on the collection which is being
+            downloaded.
+        :param destination: A path, or a writable binary file object. A file object
+            is written from its current position and is not closed.
+        :param chunk_size: The number of bytes to read at a time. [Default: 1 MiB]
+        :param atomic: Write to a temporary file and rename it on completion. Only
+            used when ``destination`` is a path. [Default: ``True``]
+        :param checksum_algorithm: The name of a :mod:`hashlib` algorithm, such as
+            ``"sha256"`` or ``"md5"``. The checksum of the data is computed as it is
+            received, and returned in the result.
+        :param expected_checksum: The expected hex digest of the file. Requires
+            ``checksum_algorithm``. If the checksum of the data does not match,
+            :class:`ChecksumMismatchError` is raised, and when writing atomically,
+            ``destination`` is not created.
+        :param progress: A callback which is called after each chunk is written, with
+            the number of bytes written so far and the total size of the file, or
+            ``None`` if the server did not report the size.
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                .. code-block:: python
+
+                    with GCSDownloader(app) as downloader:
+                        result = downloader.download_to(
+                            FILE_URL,
+                            "/data/file.tar",
+                            checksum_algorithm="sha256",
+                            expected_checksum=known_sha256,
+                            progress=lambda done, total: print(f"{done}/{total}"),
+                        )
+                    print(f"downloaded {result.size} bytes")
+        """
+        if chunk_size < 1:
+            raise globus_sdk.GlobusSDKUsageError(
+                "download_to chunk_size has a minimum of 1"
             )
-            self._resources_to_close.append(self.transfer_client)
-
-        required_scopes: list[globus_sdk.Scope] = [client.scopes.https]
-        if _uses_data_access(self.transfer_client, client.collection_id):
-            required_scopes.append(client.scopes.data_access)
-        return required_scopes
-
-    def _sniff_collection_id(self, file_uri: str) -> str:
-        response = self.transport.request(
-            "GET",
-            file_uri,
-            caller_info=globus_sdk.transport.RequestCallerInfo(
-                retry_config=self._retry_config
-            ),
-            allow_redirects=False,
-        )
-        if "Location" not in response.headers:
-            msg = (
-                f"Attempting to detect the collection ID for the file at '{file_uri}' "
-                "failed. Did not receive a redirect with Location header on "
-                "unauthenticated call."
+        if expected_checksum is not None and checksum_algorithm is None:
+            raise globus_sdk.GlobusSDKUsageError(
+                "download_to expected_checksum requires a checksum_algorithm"
             )
-            raise RuntimeError(msg)
+        hasher = hashlib.new(checksum_algorithm) if checksum_algorithm else None
 
-        location_header = response.headers["Location"]
-        parsed_location = urllib.parse.urlparse(location_header)
-        parsed_location_qs = urllib.parse.parse_qs(parsed_location.query)
+        if not isinstance(destination, (str, os.PathLike)):
+            size = self._stream_into(
+                file_uri, destination, chunk_size, hasher, progress
+            )
+            return DownloadResult(
+                size, checksum=self._verify(file_uri, hasher, expected_checksum)
+            )
 
-        if "client_id" not in parsed_location_qs:
-            msg = (
-                f"Attempting to detect the collection ID for the file at '{file_uri}' "
-                "failed. Location header did not encode a 'client_id'."
+        path = os.fspath(destination)
+        if not atomic:
+            with open(path, "wb") as f:
+                size = self._stream_into(file_uri, f, chunk_size, hasher, progress)
+            return DownloadResult(
+                size, path, self._verify(file_uri, hasher, expected_checksum)
             )
-            raise RuntimeError(msg)
 
-        client_ids = parsed_location_qs["client_id"]
-        if len(client_ids) != 1:
-            msg = (
-                f"Attempting to detect the collection ID for the file at '{file_uri}' "
-                "failed. Multiple 'client_id' params were present."
+        # the temporary file is created alongside the destination, so that the
+        # rename is atomic, and with the mode of a file created with open()
+        tmp_path = os.path.join(
+            os.path.dirname(os.path.abspath(path)),
+            f".{os.path.basename(path)}.{uuid.uuid4().hex}.part",
+        )
+        fd = os.open(
+            tmp_path,
+            os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0),
+            0o666,
+        )
+        try:
+            with open(fd, "wb") as f:
+                size = self._stream_into(file_uri, f, chunk_size, hasher, progress)
+            checksum = self._verify(file_uri, hasher, expected_checksum)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return DownloadResult(size, path, checksum)
+
+    def download_parallel(
+        self,
+        file_uri: str,
+        path: str | os.PathLike[str],
+        *,
+        max_connections: int = 4,
+        part_size: int = DEFAULT_PART_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_attempts: int = 3,
+        resume: bool = True,
+        checksum_algorithm: str | None = None,
+        expected_checksum: str | None = None,
+        progress: t.Callable[[int, int | None], None] | None = None,
+    ) -> DownloadResult:
+        """
+        Given a file URI on a GCS Collection, download it to a path over several
+        concurrent connections.
+
+        The file is split into parts of ``part_size`` bytes, which are fetched with
+        HTTP Range requests, up to ``max_connections`` at a time, and written
+        directly to their positions in a preallocated temporary file. A part which
+        fails is retried on its own, up to ``max_attempts`` times. Once every part
+        is written, the temporary file is renamed to ``path``.
+
+        Progress is recorded in a state file next to the temporary file after each
+        part completes. If a download is interrupted, calling this method again
+        resumes it, fetching only the missing parts, as long as the file on the
+        collection has not changed.
+
+        If the server does not support Range requests, the file is downloaded over
+        a single connection, as with :meth:`download_to`.
+
+        :param file_uri: The full URI of the file on the collection which is being
+            downloaded.
+        :param path: The path to which the file is written
+        :param max_connections: The maximum number of concurrent requests.
+            [Default: ``4``]
+        :param part_size: The number of bytes in each part. [Default: 32 MiB]
+        :param chunk_size: The number of bytes to read at a time. [Default: 1 MiB]
+        :param max_attempts: The number of times to try fetching each part.
+            [Default: ``3``]
+        :param resume: Resume from a previous, interrupted download of the same file
+            to the same path. If ``False``, any saved progress is discarded.
+            [Default: ``True``]
+        :param checksum_algorithm: The name of a :mod:`hashlib` algorithm. The
+            checksum of the file is computed once every part has been written, and
+            returned in the result.
+        :param expected_checksum: The expected hex digest of the file, as in
+            :meth:`download_to`
+        :param progress: A callback which is called as data is written, with the
+            number of bytes written so far and the total size of the file. It may be
+            called from several threads.
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                .. code-block:: python
+
+                    with GCSDownloader(app) as downloader:
+                        downloader.download_parallel(
+                            FILE_URL, "/data/huge.tar", max_connections=8
+                        )
+        """
+        if max_connections < 1 or part_size < 1 or chunk_size < 1 or max_attempts < 1:
+            raise globus_sdk.GlobusSDKUsageError(
+                "download_parallel max_connections, part_size, chunk_size, and "
+                "max_attempts have a minimum of 1"
+            )
+        if expected_checksum is not None and checksum_algorithm is None:
+            raise globus_sdk.GlobusSDKUsageError(
+                "download_parallel expected_checksum requires a checksum_algorithm"
             )
-            raise RuntimeError(msg)
+        path = os.fspath(path)
+        client = self._get_client(file_uri)
 
-        return client_ids[0]
+        # probe with a one-byte range, to learn the size and whether ranges work
+        try:
+            probe = client.request(
+                "GET", file_uri, headers={"Range": "bytes=0-0"}, stream=True
+            )
+        except globus_sdk.GlobusAPIError as err:
+            # an empty file has no satisfiable range
+            if err.http_status != 416:
+                raise
+            size = None
+        else:
+            probe._raw_response.close()
+            size = _content_range_size(probe.headers.get("Content-Range"))
+            if probe.http_status != 206:
+                size = None
+        if not size:
+            log.debug(f"{file_uri} does not support ranges, using a single stream")
+            return self.download_to(
+                file_uri,
+                path,
+                chunk_size=chunk_size,
+                checksum_algorithm=checksum_algorithm,
+                expected_checksum=expected_checksum,
+                progress=progress,
+            )
 
+        validator = probe.headers.get("ETag") or probe.headers.get("Last-Modified")
+        state = _PartState(
+            f"{path}.part.json",
+            {
+                "file_uri": file_uri,
+                "size": size,
+                "part_size": part_size,
+                "validator": validator,
+            },
+        )
+        part_path = f"{path}.part"
+        if not (resume and os.path.exists(part_path) and state.load()):
+            state.done = set()
+        part_count = max(1, -(-size // part_size))
+        pending = [i for i in range(part_count) if i not in state.done]
+        log.debug(
+            f"downloading {file_uri} ({size} bytes) in {part_count} parts, "
+            f"{part_count - len(pending)} already complete"
+        )
 
-def _get_collection_address(file_uri: str) -> str:
-    parsed = urllib.parse.urlparse(file_uri)
-    return f"{parsed.scheme}://{parsed.netloc}"
+        written = sum(min(part_size, size - i * part_size) for i in state.done)
+        lock = threading.Lock()
+
+        def report(n: int) -> None:
+            nonlocal written
+            with lock:
+                written += n
+                if progress is not None:
+                    progress(written, size)
+
+        fd = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            _preallocate(fd, size)
+            with concurrent.futures.ThreadPoolExecutor(max_connections) as pool:
+                futures = {
+                    pool.submit(
+                        self._download_part,
+                        client,
+                        file_uri,
+                        fd,
+                        index * part_size,
+                        min(size, (index + 1) * part_size) - 1,
+                        validator=validator,
+                        chunk_size=chunk_size,
+                        max_attempts=max_attempts,
+                        report=report,
+                    ): index
+                    for index in pending
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    # on failure, stop queued parts; completed parts stay recorded
+                    try:
+                        future.result()
+                    except BaseException:
+                        for other in futures:
+                            other.cancel()
+                        raise
+                    state.done.add(futures[future])
+                    state.save()
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        checksum = None
+        if checksum_algorithm is not None:
+            try:
+                checksum = self._verify(
+                    file_uri,
+                    _hash_path(part_path, checksum_algorithm, chunk_size),
+                    expected_checksum,
+                )
+            except ChecksumMismatchError:
+                # bad data is never resumed from
+                os.unlink(part_path)
+                state.remove()
+                raise
+        os.replace(part_path, path)
+        state.remove()
+        return DownloadResult(size, path, checksum)
+
+    def _download_part(
+        self,
+        client: GCSCollectionClient,
+        file_uri: str,
+        fd: int,
+        start: int,
+        end: int,
+        *,
+        validator: str | None,
+        chunk_size: int,
+        max_attempts: int,
+        report: t.Callable[[int], None],
+    ) -> None:
+        headers = {"Range": f"bytes={start}-{end}"}
+        if validator is not None:
+            # if the file has changed, the server sends all of it instead
+            headers["If-Range"] = validator
+        for attempt in range(1, max_attempts + 1):
+            offset = start
+            try:
+                response = client.request("GET", file_uri, headers=headers, stream=True)
+                raw_response = response._raw_response
+                try:
+                    if response.http_status != 206:
+                        raise globus_sdk.GlobusError(
+                            f"Range request for '{file_uri}' was not honored; the "
+                            "file may have changed during the download"
+                        )
+                    for chunk in raw_response.iter_content(chunk_size=chunk_size):
+                        chunk = chunk[: end + 1 - offset]
+                        _pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                        report(len(chunk))
+                finally:
+                    raw_response.close()
+                if offset == end + 1:
+                    return
+                err: Exception = globus_sdk.NetworkError(
+                    f"short read of bytes {start}-{end} of '{file_uri}'",
+                    requests.ConnectionError(),
+                )
+            except requests.RequestException as request_err:
+                err = globus_sdk.exc.convert_request_exception(request_err)
+            except globus_sdk.GlobusAPIError as api_err:
+                if api_err.http_status < 500:
+                    raise
+                err = api_err
+            # data written by a failed attempt is rewritten by the next one
+            report(start - offset)
+            if attempt == max_attempts:
+                raise err
+            log.debug(f"retrying bytes {start}-{end} of '{file_uri}' after: {err}")
+            time.sleep(min(2 ** (attempt - 1), 30))
+
+    def _stream_into(
+        self,
+        file_uri: str,
+        fileobj: t.IO[bytes],
+        chunk_size: int,
+        hasher: t.Any,
+        progress: t.Callable[[int, int | None], None] | None,
+    ) -> int:
+        response = self._get_client(file_uri).request("GET", file_uri, stream=True)
+        raw_response = response._raw_response
+        content_length = raw_response.headers.get("Content-Length")
+        total = int(content_length) if content_length is not None else None
+        written = 0
+        try:
+            for chunk in raw_response.iter_content(chunk_size=chunk_size):
+                fileobj.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+                written += len(chunk)
+                if progress is not None:
+                    progress(written, total)
+        except requests.RequestException as err:
+            raise globus_sdk.exc.convert_request_exception(err) from err
+        finally:
+            raw_response.close()
+        log.debug(f"downloaded {written} bytes from {file_uri}")
+        return written
+
+    @staticmethod
+    def _verify(file_uri: str, hasher: t.Any, expected: str | None) -> str | None:
+        if hasher is None:
+            return None
+        actual = str(hasher.hexdigest())
+        if expected is not None and actual.lower() != expected.lower():
+            raise ChecksumMismatchError(file_uri, expected, actual)
+        return actual
+
+
+def _content_range_size(content_range: str | None) -> int | None:
+    """Get the total size from a header like ``Content-Range: bytes 0-0/1234``."""
+    match = re.fullmatch(r"bytes \d+-\d+/(\d+)", (content_range or "").strip())
+    return int(match.group(1)) if match else None
+
+
+def _preallocate(fd: int, size: int) -> None:
+    if size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:  # e.g. not supported by the filesystem
+            pass
+    os.ftruncate(fd, size)
+
+
+if hasattr(os, "pwrite"):
+
+    def _pwrite(fd: int, data: bytes, offset: int) -> None:
+        view = memoryview(data)
+        while view:
+            n = os.pwrite(fd, view, offset)
+            view, offset = view[n:], offset + n
+
+else:  # pragma: no cover
+    _pwrite_lock = threading.Lock()
+
+    def _pwrite(fd: int, data: bytes, offset: int) -> None:
+        with _pwrite_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+
+
+def _hash_path(path: str, algorithm: str, chunk_size: int) -> t.Any:
+    hasher = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            hasher.update(chunk)
+    return hasher
+
+
+class _PartState:
+    """
+    The parts of a parallel download which have been written, saved as JSON next to
+    the partial file. The file is replaced atomically after each part, so it never
+    records a part which was not fully written.
+    """
 
+    def __init__(self, path: str, identity: dict[str, t.Any]) -> None:
+        self.path = path
+        self.identity = identity
+        self.done: set[int] = set()
+
+    def load(self) -> bool:
+        """Load saved progress. Returns False if there is none for this download."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if saved.get("version") != _PART_STATE_VERSION or any(
+            saved.get(k) != v for k, v in self.identity.items()
+        ):
+            log.debug(f"discarding download state '{self.path}' for another download")
+            return False
+        self.done = set(saved["done"])
+        return True
+
+    def save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": _PART_STATE_VERSION,
+                    **self.identity,
+                    "done": sorted(self.done),
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
 
-def _uses_data_access(
-    transfer_client: globus_sdk.TransferClient, collection_id: str
-) -> bool:
-    doc = transfer_client.get_endpoint(collection_id)
-    if doc["entity_type"] != "GCSv5_mapped_collection":
-        return False
-    if doc["high_assurance"]:
-        return False
-    return True
+    def remove(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
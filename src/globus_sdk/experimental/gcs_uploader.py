@@ -0,0 +1,449 @@
+"""
+The GCSUploader provides HTTPS file upload capabilities for Globus Connect Server.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import functools
+import logging
+import mmap
+import os
+import time
+import typing as t
+
+import requests
+
+import globus_sdk
+import globus_sdk.transport
+from globus_sdk.experimental.gcs_collection_client import GCSCollectionClient
+from globus_sdk.transport.representation_providers import (
+    RequestsRepresentationProvider,
+)
+
+from ._gcs_base import _GCSHTTPSBase, _get_collection_address
+
+log = logging.getLogger(__name__)
+
+#: The default number of bytes read from a source and sent at a time when uploading
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# the name under which an upload transport has its encoding
+_STREAM_ENCODING = "octet-stream"
+
+#: The types of data which may be uploaded: a path to a file, or a buffer such as
+#: ``bytes``, a ``memoryview``, or an ``mmap.mmap``
+UploadSource = t.Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, mmap.mmap]
+
+
+@dataclasses.dataclass
+class UploadResult:
+    """
+    The result of uploading one file with a :class:`GCSUploader`.
+
+    :param file_uri: The URI to which the file was uploaded
+    :param size: The number of bytes in the file
+    :param attempts: The number of times the upload was attempted
+    :param error: The error which caused the upload to fail, if it failed. Only
+        :meth:`GCSUploader.upload_files` returns failed results;
+        :meth:`GCSUploader.upload_file` raises the error instead.
+    """
+
+    file_uri: str
+    size: int
+    attempts: int = 0
+    error: Exception | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        """``True`` if the file was uploaded."""
+        return self.error is None
+
+
+class _UploadBody:
+    """
+    A request body which streams its source in chunks.
+
+    Each iteration starts again from the beginning of the source, so the same
+    request may be sent again by the transport's retries. The length is known in
+    advance, so the upload is sent with a ``Content-Length`` rather than chunked.
+    """
+
+    def __init__(
+        self,
+        source: UploadSource,
+        chunk_size: int,
+        progress: t.Callable[[int, int], None] | None,
+    ) -> None:
+        if isinstance(source, (str, os.PathLike)):
+            self._path: str | None = os.fspath(source)
+            self._buffer: memoryview | None = None
+            self.size = os.stat(self._path).st_size
+        else:
+            self._path = None
+            # a view of the buffer, so that slices are not copies
+            self._buffer = memoryview(source).cast("B")
+            self.size = len(self._buffer)
+        self._chunk_size = chunk_size
+        self._progress = progress
+
+    def __len__(self) -> int:
+        return self.size
+
+    def close(self) -> None:
+        # release the view, so that the caller may close an mmap source
+        if self._buffer is not None:
+            self._buffer.release()
+
+    def __iter__(self) -> t.Iterator[bytes | memoryview]:
+        sent = 0
+        for chunk in self._chunks():
+            sent += len(chunk)
+            if self._progress is not None:
+                self._progress(sent, self.size)
+            yield chunk
+
+    def _chunks(self) -> t.Iterator[bytes | memoryview]:
+        if self._buffer is not None:
+            for start in range(0, self.size, self._chunk_size):
+                yield self._buffer[start : start + self._chunk_size]
+            return
+        assert self._path is not None
+        remaining = self.size
+        # the size is fixed when the upload starts, so that it matches the
+        # Content-Length even if the file is appended to meanwhile
+        with open(self._path, "rb") as f:
+            while remaining > 0:
+                chunk = f.read(min(self._chunk_size, remaining))
+                if not chunk:
+                    raise OSError(
+                        f"'{self._path}' was truncated while it was being uploaded"
+                    )
+                remaining -= len(chunk)
+                yield chunk
+
+
+class _StreamProvider(RequestsRepresentationProvider):
+    """Sends an :class:`_UploadBody` as it is, as ``application/octet-stream``."""
+
+    def encode(
+        self,
+        method: str,
+        url: str,
+        params: dict[str, t.Any] | None,
+        data: t.Any,
+        headers: dict[str, str],
+    ) -> requests.Request:
+        return requests.Request(
+            method,
+            url,
+            # an empty body is sent as such, not as an empty chunked stream
+            data=data if len(data) else b"",
+            params=self._prepare_params(params),
+            headers=self._prepare_headers(
+                {"Content-Type": "application/octet-stream", **headers}
+            ),
+        )
+
+
+class _UploadTransport(globus_sdk.transport.RequestsTransport):
+    """A transport which can also send an :class:`_UploadBody`."""
+
+    encoders = {
+        **globus_sdk.transport.RequestsTransport.encoders,
+        _STREAM_ENCODING: _StreamProvider(),
+    }
+
+
+class GCSUploader(_GCSHTTPSBase):
+    """
+    An object which manages connection and authentication state to enable HTTPS
+    uploads to a specific Globus Connect Server collection.
+
+    As with a :class:`~globus_sdk.experimental.gcs_downloader.GCSDownloader`, the
+    initial request determines authentication requirements dynamically, and
+    subsequent requests reuse that authentication data. A separate uploader should
+    be used for each collection.
+
+    Files are uploaded with HTTPS ``PUT`` requests, which replace any existing file
+    at the same path. Data is streamed from its source in chunks, so files of any
+    size may be uploaded without reading them into memory. Because a ``PUT`` is
+    idempotent, an upload which fails is safely retried by sending the whole file
+    again.
+
+    Uploaders may be used as context managers, in which case they automatically call
+    their ``close()`` method on exit:
+
+    >>> with GCSUploader(app) as uploader:
+    >>>     uploader.upload_file("results.csv", url)
+
+    :param app: The :class:`GlobusApp` used to authenticate calls to this server.
+    :param gcs_client: The underlying client used for upload requests. Typically
+        omitted. When not provided, one will be constructed on demand by the uploader.
+    :param transfer_client: A client used when detecting collection information.
+        Typically omitted. When not provided, one will be constructed on demand by the
+        uploader.
+    :param transport: A transport for the uploader, used for authentication
+        sniffing operations. Uploads are sent with a transport owned by the uploader,
+        which copies the SSL and timeout settings of the client's transport, or of
+        this one when the uploader builds the client.
+    """
+
+    def __init__(
+        self,
+        app: globus_sdk.GlobusApp,
+        *,
+        gcs_client: GCSCollectionClient | None = None,
+        transfer_client: globus_sdk.TransferClient | None = None,
+        transport: globus_sdk.transport.RequestsTransport | None = None,
+    ) -> None:
+        # when the uploader owns its transport, the same one is used for uploads
+        owned_transport = _UploadTransport() if transport is None else None
+        super().__init__(
+            app,
+            gcs_client=gcs_client,
+            transfer_client=transfer_client,
+            transport=owned_transport or transport,
+        )
+        if owned_transport is not None:
+            self._resources_to_close.append(owned_transport)
+        # the client used for uploads, as a pair of the client which it mirrors and
+        # the client which sends uploads with the uploader's transport
+        self._upload_client: tuple[GCSCollectionClient, GCSCollectionClient] | None = (
+            None
+        )
+        # the transport used by clients which the uploader builds, when the
+        # uploader's transport was given
+        self._upload_transport: _UploadTransport | None = None
+
+    def upload_file(
+        self,
+        source: UploadSource,
+        file_uri: str,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_attempts: int = 3,
+        progress: t.Callable[[int, int], None] | None = None,
+    ) -> UploadResult:
+        """
+        Upload a file to a URI on a GCS Collection.
+
+        The upload is retried after network errors and server errors, up to
+        ``max_attempts`` times, in addition to any retries made by the client's
+        transport.
+
+        :param source: The path of a local file, or a buffer holding the data, such
+            as ``bytes`` or an ``mmap.mmap``. Buffers are sent without being copied.
+        :param file_uri: The full URI of the file on the collection which is being
+            uploaded.
+        :param chunk_size: The number of bytes to read and send at a time.
+            [Default: 1 MiB]
+        :param max_attempts: The number of times to try the upload. [Default: ``3``]
+        :param progress: A callback which is called after each chunk is sent, with
+            the number of bytes sent so far and the size of the file. If the upload
+            is retried, the count starts again from zero.
+
+        :raises GlobusAPIError: if the server rejects the upload
+        :raises NetworkError: if the upload fails because of a network error
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                .. code-block:: python
+
+                    with GCSUploader(app) as uploader:
+                        uploader.upload_file("/data/results.csv", FILE_URL)
+        """
+        _check_arguments(
+            "upload_file", chunk_size=chunk_size, max_attempts=max_attempts
+        )
+        result = self._upload(source, file_uri, chunk_size, max_attempts, progress)
+        if result.error is not None:
+            raise result.error
+        return result
+
+    def upload_files(
+        self,
+        uploads: t.Iterable[tuple[UploadSource, str]],
+        *,
+        max_workers: int = 4,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_attempts: int = 3,
+        progress: t.Callable[[str, int, int], None] | None = None,
+    ) -> list[UploadResult]:
+        """
+        Upload many files to a GCS Collection concurrently.
+
+        Uploads share the uploader's client, and so its pool of connections. A file
+        which fails to upload does not stop the others; its error is recorded in its
+        result.
+
+        :param uploads: Pairs of a source and the URI to which it is uploaded. Each
+            source is a path or a buffer, as for :meth:`upload_file`.
+        :param max_workers: The maximum number of concurrent uploads.
+            [Default: ``4``]
+        :param chunk_size: The number of bytes to read and send at a time.
+            [Default: 1 MiB]
+        :param max_attempts: The number of times to try each upload.
+            [Default: ``3``]
+        :param progress: A callback which is called after each chunk is sent, with
+            the URI of the file, the number of bytes sent so far, and the size of the
+            file. It is called from several threads.
+        :returns: A result for each upload, in the order given
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                .. code-block:: python
+
+                    with GCSUploader(app) as uploader:
+                        results = uploader.upload_files(
+                            (path, f"{COLLECTION_URL}/results/{path.name}")
+                            for path in pathlib.Path("out").glob("*.csv")
+                        )
+                    failed = [r.file_uri for r in results if not r.succeeded]
+        """
+        _check_arguments(
+            "upload_files",
+            chunk_size=chunk_size,
+            max_attempts=max_attempts,
+            max_workers=max_workers,
+        )
+        uploads = list(uploads)
+        if not uploads:
+            return []
+        # build the client before starting, so that it is only built once
+        self._get_client(uploads[0][1])
+
+        def _upload_one(source: UploadSource, file_uri: str) -> UploadResult:
+            file_progress = (
+                functools.partial(progress, file_uri) if progress is not None else None
+            )
+            return self._upload(
+                source, file_uri, chunk_size, max_attempts, file_progress
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_upload_one, source, file_uri)
+                for source, file_uri in uploads
+            ]
+            return [future.result() for future in futures]
+
+    def _upload(
+        self,
+        source: UploadSource,
+        file_uri: str,
+        chunk_size: int,
+        max_attempts: int,
+        progress: t.Callable[[int, int], None] | None,
+    ) -> UploadResult:
+        try:
+            body = _UploadBody(source, chunk_size, progress)
+        except OSError as err:
+            return UploadResult(file_uri, 0, error=err)
+        result = UploadResult(file_uri, body.size)
+        try:
+            self._put(body, file_uri, max_attempts, result)
+        finally:
+            body.close()
+        return result
+
+    def _put(
+        self, body: _UploadBody, file_uri: str, max_attempts: int, result: UploadResult
+    ) -> None:
+        client = self._get_client(file_uri)
+        while True:
+            result.attempts += 1
+            try:
+                client.request(
+                    "PUT",
+                    file_uri,
+                    # the body is streamed, see _UploadBody
+                    data=body,  # type: ignore[arg-type]
+                    encoding=_STREAM_ENCODING,
+                )
+            except globus_sdk.NetworkError as err:
+                result.error = err
+            except globus_sdk.GlobusAPIError as err:
+                result.error = err
+                if err.http_status < 500:
+                    break
+            except OSError as err:
+                # the source could not be read; trying again will not help
+                result.error = err
+                break
+            else:
+                result.error = None
+                log.debug(f"uploaded {body.size} bytes to {file_uri}")
+                break
+            if result.attempts >= max_attempts:
+                break
+            log.debug(f"retrying upload to {file_uri} after: {result.error}")
+            time.sleep(min(2 ** (result.attempts - 1), 30))
+
+    def _get_client(self, file_uri: str) -> GCSCollectionClient:
+        # the file need not exist yet, so the collection is detected from its root
+        client = super()._get_client(_get_collection_address(file_uri) + "/")
+        if isinstance(client.transport, _UploadTransport):
+            return client
+        if self._upload_client is None or self._upload_client[0] is not client:
+            self._upload_client = (client, self._build_upload_client(client))
+        return self._upload_client[1]
+
+    def _gcs_client_constructor(
+        self, *, collection_client_id: str, collection_address: str
+    ) -> GCSCollectionClient:
+        return GCSCollectionClient(
+            collection_client_id,
+            collection_address,
+            app=self.app,
+            transport=self._get_upload_transport(),
+        )
+
+    def _build_upload_client(self, client: GCSCollectionClient) -> GCSCollectionClient:
+        """
+        Build a client which authenticates as ``client`` does, but which sends
+        requests with a transport owned by the uploader. The given client, and its
+        transport, which may be shared, are not changed.
+        """
+        transport = _UploadTransport(
+            verify_ssl=client.transport.verify_ssl,
+            http_timeout=client.transport.http_timeout,
+        )
+        self._resources_to_close.append(transport)
+        upload_client = GCSCollectionClient(
+            client.collection_id,
+            client.base_url,
+            environment=client.environment,
+            app=client._app,
+            app_scopes=client.app_scopes,
+            authorizer=client.authorizer,
+            app_name=client.app_name,
+            transport=transport,
+        )
+        # share the retry configuration, including any checks registered on it
+        upload_client.retry_config = client.retry_config
+        self._resources_to_close.append(upload_client)
+        return upload_client
+
+    def _get_upload_transport(self) -> _UploadTransport:
+        if isinstance(self.transport, _UploadTransport):
+            return self.transport
+        if self._upload_transport is None:
+            self._upload_transport = _UploadTransport(
+                verify_ssl=self.transport.verify_ssl,
+                http_timeout=self.transport.http_timeout,
+            )
+            self._resources_to_close.append(self._upload_transport)
+        return self._upload_transport
+
+
+def _check_arguments(method: str, **kwargs: int) -> None:
+    if any(value < 1 for value in kwargs.values()):
+        raise globus_sdk.GlobusSDKUsageError(
+            f"{method} {', '.join(kwargs)} have a minimum of 1"
+        )
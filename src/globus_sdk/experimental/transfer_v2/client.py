@@ -8,6 +8,7 @@ from globus_sdk import client, paging, response
 from globus_sdk.response import IterableJSONAPIResponse
 from globus_sdk.scopes import TransferScopes
 from globus_sdk.services.transfer.errors import TransferAPIError
+from globus_sdk.services.transfer.tunnel_events import run_follow_tunnel_events
 from globus_sdk.transport import RetryConfig
 
 from .data import (
@@ -233,6 +234,51 @@ class TransferClientV2(client.BaseClient):
         r = self.get(f"/v2/tunnels/{tunnel_id}/events", query_params=query_params)
         return IterableJSONAPIResponse(r)
 
+    def follow_tunnel_events(
+        self,
+        tunnel_ids: uuid.UUID | str | t.Iterable[uuid.UUID | str],
+        *,
+        include_existing: bool = False,
+        stop_codes: t.Iterable[str] = ("TUNNEL_STOPPED",),
+        timeout: float | None = None,
+        initial_interval: float = 1,
+        max_interval: float = 60,
+        backoff_factor: float = 2,
+        errors: dict[str, Exception] | None = None,
+    ) -> t.Iterator[tuple[str, dict[str, t.Any]]]:
+        """
+        Follow the events of one or more tunnels, in the style of ``tail -f``.
+
+        This behaves and takes the same parameters as
+        :meth:`TransferClient.follow_tunnel_events
+        <globus_sdk.TransferClient.follow_tunnel_events>`, polling each tunnel with
+        :meth:`get_tunnel_events`.
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                .. code-block:: python
+
+                    tc = globus_sdk.experimental.TransferClientV2(...)
+                    for tunnel_id, event in tc.follow_tunnel_events(tunnel_ids):
+                        attrs = event["attributes"]
+                        if attrs["is_error"]:
+                            print(tunnel_id, attrs["code"], attrs["details"])
+        """
+        log.debug(f"{self.__class__.__name__}.follow_tunnel_events(...)")
+        return run_follow_tunnel_events(
+            self.get_tunnel_events,
+            tunnel_ids,
+            include_existing=include_existing,
+            stop_codes=stop_codes,
+            timeout=timeout,
+            initial_interval=initial_interval,
+            max_interval=max_interval,
+            backoff_factor=backoff_factor,
+            errors=errors,
+        )
+
     # Stream access point methods
 
     def get_stream_access_point(
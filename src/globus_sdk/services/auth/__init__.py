@@ -5,13 +5,17 @@ from .client import (
     NativeAppAuthClient,
 )
 from .data import DependentScopeSpec
+from .dependent_token_cache import DependentTokenCache
 from .errors import AuthAPIError
 from .flow_managers import (
     GlobusAuthorizationCodeFlowManager,
     GlobusNativeAppFlowManager,
 )
 from .id_token_decoder import IDTokenDecoder
+from .identity_cache import SQLiteIdentityCache
 from .identity_map import IdentityMap
+from .introspection_cache import TokenIntrospectionCache
+from .jwk_cache import JWKCache
 from .response import (
     GetConsentsResponse,
     GetIdentitiesResponse,
@@ -32,8 +36,12 @@ __all__ = (
     "AuthAPIError",
     # high-level helpers
     "DependentScopeSpec",
+    "DependentTokenCache",
     "IdentityMap",
     "IDTokenDecoder",
+    "JWKCache",
+    "SQLiteIdentityCache",
+    "TokenIntrospectionCache",
     # flow managers
     "GlobusNativeAppFlowManager",
     "GlobusAuthorizationCodeFlowManager",
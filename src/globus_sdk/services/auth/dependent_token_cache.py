@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import threading
+import time
+import typing as t
+
+from globus_sdk import exc
+from globus_sdk._internal.ttl_cache import CacheStats, TTLCache
+from globus_sdk._internal.utils import sha256_string
+from globus_sdk._missing import MISSING, MissingType
+from globus_sdk.scopes import Scope, ScopeParseError, ScopeParser
+from globus_sdk.token_storage import TokenStorage, TokenStorageData
+
+if t.TYPE_CHECKING:
+    from .client import ConfidentialAppAuthClient
+
+log = logging.getLogger(__name__)
+
+_INDEX_SEPARATOR = "/"
+
+
+def _storage_index(key: str, resource_server: str) -> str:
+    # stored tokens are indexed by cache key and resource server
+    return f"{key}{_INDEX_SEPARATOR}{resource_server}"
+
+
+def _manifest(key: str, tokens: dict[str, TokenStorageData]) -> TokenStorageData:
+    # a record, indexed by the cache key alone, which lists the resource servers of
+    # an entry's stored tokens, so that they are found without reading the storage
+    return TokenStorageData(
+        resource_server=key,
+        identity_id=None,
+        scope=" ".join(sorted(tokens)),
+        access_token="",
+        refresh_token=None,
+        expires_at_seconds=min(data.expires_at_seconds for data in tokens.values()),
+        token_type=None,
+    )
+
+
+def _canonical_scope(scope: Scope) -> str:
+    # a scope string in which dependencies are sorted
+    base = ("*" if scope.optional else "") + scope.scope_string
+    if not scope.dependencies:
+        return base
+    return (
+        base + "[" + " ".join(sorted(map(_canonical_scope, scope.dependencies))) + "]"
+    )
+
+
+def _scope_key(scope: str | Scope | t.Iterable[str | Scope] | MissingType) -> str:
+    # scopes which differ only in order or spacing request the same tokens
+    if scope is MISSING:
+        return ""
+    scope_string = ScopeParser.serialize(scope, reject_empty=False)
+    try:
+        parsed = ScopeParser.parse(scope_string)
+    except ScopeParseError:
+        # an invalid scope is rejected by Globus Auth, and is not normalized
+        return scope_string
+    return " ".join(sorted(map(_canonical_scope, parsed)))
+
+
+class DependentTokenCache:
+    """
+    A cache of dependent tokens, for resource servers which exchange the tokens of
+    incoming requests with
+    :meth:`ConfidentialAppAuthClient.oauth2_get_dependent_tokens`.
+
+    Tokens are cached by a hash of the incoming token and by the requested scopes,
+    and are kept until shortly before the first of them expires. Concurrent requests
+    for the same tokens share a single exchange, and the least recently used entries
+    are evicted when the cache is full.
+
+    Dependent refresh tokens are not requested, so that the cached tokens are only
+    as long-lived as their access tokens.
+
+    A :class:`TokenStorage` may be given to keep the tokens when they are evicted
+    from memory, or to share them between processes. Tokens are stored in the
+    storage's namespace, indexed by the cache key and resource server, so the
+    namespace should be dedicated to this cache. Expired tokens are left in the
+    storage until :meth:`purge_expired` is called.
+
+    :param auth_client: The client of the resource server, which performs exchanges
+    :param maxsize: The maximum number of entries held in memory.
+        [Default: ``1000``]
+    :param expiration_margin: The number of seconds before expiration at which
+        tokens are no longer used. [Default: ``60``]
+    :param token_storage: A storage in which to keep the tokens
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                auth_client = globus_sdk.ConfidentialAppAuthClient(CLIENT_ID, SECRET)
+                dependent_tokens = globus_sdk.DependentTokenCache(auth_client)
+
+
+                def handle_request(request):
+                    tokens = dependent_tokens.get_dependent_tokens(
+                        request.bearer_token,
+                        scope=globus_sdk.TransferClient.scopes.all,
+                    )
+                    authorizer = globus_sdk.AccessTokenAuthorizer(
+                        tokens["transfer.api.globus.org"].access_token
+                    )
+                    ...
+    """
+
+    def __init__(
+        self,
+        auth_client: ConfidentialAppAuthClient,
+        *,
+        maxsize: int = 1000,
+        expiration_margin: float = 60,
+        token_storage: TokenStorage | None = None,
+    ) -> None:
+        if maxsize < 1:
+            raise exc.GlobusSDKUsageError(
+                "DependentTokenCache maxsize has a minimum of 1"
+            )
+        if expiration_margin < 0:
+            raise exc.GlobusSDKUsageError(
+                "DependentTokenCache expiration_margin must not be negative"
+            )
+        self.auth_client = auth_client
+        self.expiration_margin = expiration_margin
+        self.token_storage = token_storage
+
+        # the TTL of each entry is set from the expiration of its tokens
+        self._entries: TTLCache[str, dict[str, TokenStorageData]] = TTLCache(
+            ttl=0, maxsize=maxsize
+        )
+        # in-flight exchanges, shared by concurrent requests for the same tokens
+        self._flights: dict[
+            str, concurrent.futures.Future[dict[str, TokenStorageData]]
+        ] = {}
+        self._lock = threading.Lock()
+        # token storages are not safe for concurrent writes
+        self._storage_lock = threading.Lock()
+
+    def get_dependent_tokens(
+        self,
+        token: str,
+        *,
+        scope: str | Scope | t.Iterable[str | Scope] | MissingType = MISSING,
+    ) -> dict[str, TokenStorageData]:
+        """
+        Get the dependent tokens for an incoming token, exchanging it only if the
+        tokens are not cached.
+
+        :param token: The access token of the incoming request
+        :param scope: The scope or scopes of the dependent tokens. If omitted, all
+            available dependent tokens are returned.
+        :returns: The dependent tokens, by resource server
+        :raises AuthAPIError: If the exchange fails. Failures are not cached.
+        """
+        key = self._key(token, scope)
+        tokens = self._entries.get(key)
+        if tokens is not None:
+            return dict(tokens)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                # an exchange may have finished since the lookup above
+                tokens = self._entries.get(key)
+                if tokens is not None:
+                    return dict(tokens)
+                flight = concurrent.futures.Future()
+                self._flights[key] = flight
+        if not leader:
+            log.debug("DependentTokenCache: waiting for an exchange in flight")
+            return dict(flight.result())
+
+        try:
+            tokens = self._load(key)
+            if tokens is None:
+                tokens = self._exchange(key, token, scope)
+        except BaseException as err:
+            flight.set_exception(err)
+            raise
+        else:
+            flight.set_result(tokens)
+        finally:
+            with self._lock:
+                del self._flights[key]
+        return dict(tokens)
+
+    def invalidate(
+        self,
+        token: str,
+        *,
+        scope: str | Scope | t.Iterable[str | Scope] | MissingType = MISSING,
+    ) -> None:
+        """
+        Drop the dependent tokens for an incoming token, as when they have been
+        revoked.
+
+        :param token: The access token of the incoming request
+        :param scope: The scope or scopes with which the tokens were requested
+        """
+        key = self._key(token, scope)
+        self._entries.pop(key)
+        self._remove_stored(key)
+
+    def purge_expired(self) -> int:
+        """
+        Remove expired tokens from the token storage. This reads the whole storage,
+        so it is meant to be called now and then, rather than on every request.
+
+        :returns: The number of entries removed
+        """
+        if self.token_storage is None:
+            return 0
+        with self._storage_lock:
+            entries: dict[str, list[str]] = {}
+            manifests: dict[str, TokenStorageData] = {}
+            for (
+                index,
+                data,
+            ) in self.token_storage.get_token_data_by_resource_server().items():
+                entry_key, separator, _ = index.partition(_INDEX_SEPARATOR)
+                entries.setdefault(entry_key, []).append(index)
+                if not separator:
+                    manifests[entry_key] = data
+            # tokens without a manifest are never loaded, so they are removed too
+            expired = [
+                entry_key
+                for entry_key in entries
+                if entry_key not in manifests
+                or self._remaining({"": manifests[entry_key]}) <= 0
+            ]
+            for entry_key in expired:
+                for index in entries[entry_key]:
+                    self.token_storage.remove_token_data(index)
+        if expired:
+            log.debug(f"DependentTokenCache: removed {len(expired)} expired entries")
+        return len(expired)
+
+    def stats(self) -> CacheStats:
+        """Get a snapshot of the counters of the in-memory cache."""
+        return self._entries.stats()
+
+    def _key(
+        self,
+        token: str,
+        scope: str | Scope | t.Iterable[str | Scope] | MissingType,
+    ) -> str:
+        # the incoming token is never held, only its hash
+        return sha256_string(f"{sha256_string(token)} {_scope_key(scope)}")
+
+    def _remaining(self, tokens: dict[str, TokenStorageData]) -> float:
+        if not tokens:
+            return 0
+        expires_at = min(data.expires_at_seconds for data in tokens.values())
+        return expires_at - self.expiration_margin - time.time()
+
+    def _exchange(
+        self,
+        key: str,
+        token: str,
+        scope: str | Scope | t.Iterable[str | Scope] | MissingType,
+    ) -> dict[str, TokenStorageData]:
+        log.debug("DependentTokenCache: exchanging token for dependent tokens")
+        response = self.auth_client.oauth2_get_dependent_tokens(
+            token,
+            scope=ScopeParser.serialize(scope) if scope is not MISSING else MISSING,
+        )
+        tokens = {
+            resource_server: TokenStorageData(
+                resource_server=token_dict["resource_server"],
+                identity_id=None,
+                scope=token_dict["scope"],
+                access_token=token_dict["access_token"],
+                refresh_token=None,
+                expires_at_seconds=token_dict["expires_at_seconds"],
+                token_type=token_dict.get("token_type"),
+            )
+            for resource_server, token_dict in response.by_resource_server.items()
+        }
+        remaining = self._remaining(tokens)
+        if remaining > 0:
+            self._entries.set(key, tokens, ttl=remaining)
+            if self.token_storage is not None:
+                with self._storage_lock:
+                    self.token_storage.store_token_data_by_resource_server(
+                        {
+                            **{
+                                _storage_index(key, resource_server): data
+                                for resource_server, data in tokens.items()
+                            },
+                            key: _manifest(key, tokens),
+                        }
+                    )
+        return tokens
+
+    def _load(self, key: str) -> dict[str, TokenStorageData] | None:
+        """Load unexpired tokens for a key from the token storage into memory."""
+        if self.token_storage is None:
+            return None
+        with self._storage_lock:
+            manifest = self.token_storage.get_token_data(key)
+            if manifest is None or self._remaining({"": manifest}) <= 0:
+                return None
+            tokens: dict[str, TokenStorageData] = {}
+            for resource_server in manifest.scope.split():
+                data = self.token_storage.get_token_data(
+                    _storage_index(key, resource_server)
+                )
+                if data is None:
+                    return None
+                tokens[resource_server] = data
+        remaining = self._remaining(tokens)
+        if remaining <= 0:
+            return None
+        self._entries.set(key, tokens, ttl=remaining)
+        return tokens
+
+    def _remove_stored(self, key: str) -> None:
+        if self.token_storage is None:
+            return
+        with self._storage_lock:
+            manifest = self.token_storage.get_token_data(key)
+            if manifest is None:
+                return
+            for resource_server in manifest.scope.split():
+                self.token_storage.remove_token_data(
+                    _storage_index(key, resource_server)
+                )
+            self.token_storage.remove_token_data(key)
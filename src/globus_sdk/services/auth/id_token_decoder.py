@@ -1,19 +1,24 @@
 from __future__ import annotations
 
 import datetime
+import json
 import sys
+import time
 import typing as t
 
 import jwt
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
 
+from globus_sdk._internal.utils import sha256_string
 from globus_sdk.response import GlobusHTTPResponse
 
-from ._common import SupportsJWKMethods
+from ._common import SupportsJWKMethods, pem_decode_jwk_data
 
 if t.TYPE_CHECKING:
     from globus_sdk import AuthLoginClient, GlobusAppConfig
 
+    from .jwk_cache import JWKCache
+
     if sys.version_info >= (3, 11):
         from typing import Self
     else:
@@ -26,8 +31,10 @@ class IDTokenDecoder:
     Decoding uses a client object to fetch necessary data from Globus Auth.
 
     By default, the OIDC configuration data and JWKs will be cached in an internal dict.
-    An alternative cache can be provided on init to use an alternative storage
-    mechanism.
+    A :class:`JWKCache` can be provided on init to share them between decoders, and
+    between processes. A decoder with a ``JWKCache`` selects the signing key by the
+    token's ``kid``, refetches the keys if they have been rotated, and reuses the
+    claims of tokens it has already decoded.
 
     The ``get_jwt_audience`` and ``get_jwt_leeway`` methods supply parameters to
     decoding. Subclasses can override these methods to customize the decoder.
@@ -38,6 +45,8 @@ class IDTokenDecoder:
         or a timedelta. The default is 5 minutes.
     :param jwt_options: The ``options`` passed to the underlying JWT decode function.
         Defaults to an empty dict.
+    :param jwk_cache: A cache of the OIDC configuration and JWKs, which may be shared
+        with other decoders.
     """
 
     def __init__(
@@ -60,10 +69,12 @@ class IDTokenDecoder:
         # clock drift, and the underlying Kerberos requirement.
         jwt_leeway: float | datetime.timedelta = 300.0,
         jwt_options: dict[str, t.Any] | None = None,
+        jwk_cache: JWKCache | None = None,
     ) -> None:
         self._auth_client = auth_client
         self._openid_configuration: dict[str, t.Any] | None = None
         self._jwk: RSAPublicKey | None = None
+        self._jwk_cache = jwk_cache
 
         self.jwt_leeway: float | datetime.timedelta = jwt_leeway
         self.jwt_options: dict[str, t.Any] = (
@@ -99,11 +110,22 @@ class IDTokenDecoder:
         :param id_token: The token to decode
         """
         audience = self.get_jwt_audience()
+        if self._jwk_cache is not None and not self._jwk:
+            return self._decode_with_cache(self._jwk_cache, id_token, audience)
         openid_configuration = self.get_openid_configuration()
         jwk = self.get_jwk()
 
         signing_algos = openid_configuration["id_token_signing_alg_values_supported"]
 
+        return self._jwt_decode(id_token, jwk, signing_algos, audience)
+
+    def _jwt_decode(
+        self,
+        id_token: str,
+        jwk: RSAPublicKey,
+        signing_algos: list[str],
+        audience: str | None,
+    ) -> dict[str, t.Any]:
         return jwt.decode(
             id_token,
             key=jwk,
@@ -113,6 +135,65 @@ class IDTokenDecoder:
             leeway=self.jwt_leeway,
         )
 
+    def _decode_with_cache(
+        self, jwk_cache: JWKCache, id_token: str, audience: str | None
+    ) -> dict[str, t.Any]:
+        leeway = (
+            self.jwt_leeway.total_seconds()
+            if isinstance(self.jwt_leeway, datetime.timedelta)
+            else self.jwt_leeway
+        )
+        # a token decoded with a different audience or options must be decoded
+        # again, as it may not pass verification with these
+        memo_key = (
+            sha256_string(id_token),
+            str(audience),
+            json.dumps(
+                {"options": self.jwt_options, "leeway": leeway},
+                sort_keys=True,
+                default=str,
+            ),
+        )
+        claims = jwk_cache.get_decoded_token(self._auth_client, memo_key)
+        if claims is not None:
+            return dict(claims)
+
+        signing_algos = self.get_openid_configuration()[
+            "id_token_signing_alg_values_supported"
+        ]
+        kid = jwt.get_unverified_header(id_token).get("kid")
+
+        # if the key is unknown, or the signature does not verify, the keys may have
+        # been rotated; refetch them and try once more
+        for refresh in (False, True):
+            jwk_data = _select_jwk(
+                jwk_cache.get_jwks(self._auth_client, refresh=refresh), kid
+            )
+            if jwk_data is None:
+                if refresh:
+                    raise jwt.InvalidKeyError(f"No JWK matches the token's kid: {kid}")
+                continue
+            try:
+                claims = self._jwt_decode(
+                    id_token,
+                    pem_decode_jwk_data(jwk_data={"keys": [jwk_data]}),
+                    signing_algos,
+                    audience,
+                )
+            except jwt.InvalidSignatureError:
+                if refresh:
+                    raise
+                continue
+            break
+
+        assert claims is not None
+        if "exp" in claims:
+            ttl = float(claims["exp"]) + leeway - time.time()
+        else:
+            ttl = jwk_cache.decoded_token_ttl
+        jwk_cache.store_decoded_token(self._auth_client, memo_key, claims, ttl)
+        return dict(claims)
+
     def get_jwt_audience(self) -> str | None:
         """
         The audience for JWT verification defaults to the client's client ID.
@@ -150,6 +231,8 @@ class IDTokenDecoder:
         If a config was previously stored, return that instead.
         """
         if self._openid_configuration is None:
+            if self._jwk_cache is not None:
+                return self._jwk_cache.get_openid_configuration(self._auth_client)
             self._openid_configuration = (
                 self._auth_client.get_openid_configuration().data
             )
@@ -162,7 +245,24 @@ class IDTokenDecoder:
         If a key was previously stored, return that instead.
         """
         if not self._jwk:
+            if self._jwk_cache is not None:
+                return pem_decode_jwk_data(
+                    jwk_data=self._jwk_cache.get_jwks(self._auth_client)
+                )
             self._jwk = self._auth_client.get_jwk(
                 openid_configuration=self.get_openid_configuration(), as_pem=True
             )
         return self._jwk
+
+
+def _select_jwk(jwks: dict[str, t.Any], kid: str | None) -> dict[str, t.Any] | None:
+    """
+    Find the key with a key ID in a key set, or the first key if there is no ID.
+    """
+    keys: list[dict[str, t.Any]] = jwks.get("keys", [])
+    if kid is None:
+        return keys[0] if keys else None
+    for key in keys:
+        if key.get("kid") == kid:
+            return key
+    return None
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import json
+import pathlib
+import sqlite3
+import textwrap
+import threading
+import time
+import types
+import typing as t
+
+from globus_sdk import exc
+from globus_sdk._internal.ttl_cache import CacheStats, TTLCache
+
+from .identity_map import is_username, split_ids_and_usernames
+
+if t.TYPE_CHECKING:
+    from .client import AuthClient
+
+_SCHEMA_VERSION = "1"
+
+
+class SQLiteIdentityCache(t.MutableMapping[str, dict[str, t.Any]]):
+    """
+    A cache of Globus Auth identity records, stored on disk in a SQLite database,
+    with an in-memory least-recently-used cache in front of it.
+
+    The cache is a mapping from identity IDs and usernames to identity records, and
+    can be passed to an :class:`IdentityMap` as its ``cache``. Several processes may
+    share the same database file, so that identities looked up by one are available
+    to all of them, including across restarts.
+
+    Each record expires after ``ttl`` seconds. Names which Globus Auth reports as
+    not matching any identity are also remembered, for ``negative_ttl`` seconds, so
+    that they are not looked up again; an ``IdentityMap`` using this cache raises a
+    ``KeyError`` for them without calling Globus Auth.
+
+    Names are matched case-insensitively, as Globus Auth matches them. Entries are
+    held in memory for up to ``ttl`` seconds once read, so a change made by another
+    process (such as a deletion) may not be seen until then.
+
+    :param filepath: The path on disk to a SQLite database file. It is created if it
+        does not exist.
+    :param ttl: The number of seconds for which an identity record is kept.
+        [Default: one day]
+    :param negative_ttl: The number of seconds for which a name which matched no
+        identity is remembered. [Default: one hour]
+    :param memory_size: The maximum number of names held in memory.
+        [Default: ``10000``]
+    :param connect_params: A dictionary of parameters to pass to
+        ``sqlite3.connect()``.
+
+    :raises GlobusSDKUsageError: If the filepath is ":memory:", as such a database
+        cannot be shared. Use a ``dict`` as the cache of an ``IdentityMap`` instead.
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                cache = globus_sdk.SQLiteIdentityCache("~/.cache/identities.db")
+                idmap = globus_sdk.IdentityMap(auth_client, principal_ids, cache=cache)
+                idmap.prefetch()
+    """
+
+    def __init__(
+        self,
+        filepath: pathlib.Path | str,
+        *,
+        ttl: float = 86400,
+        negative_ttl: float = 3600,
+        memory_size: int = 10000,
+        connect_params: dict[str, t.Any] | None = None,
+    ) -> None:
+        if filepath == ":memory:":
+            raise exc.GlobusSDKUsageError(
+                "SQLiteIdentityCache cannot be used with a ':memory:' database."
+            )
+        if ttl <= 0 or negative_ttl <= 0:
+            raise exc.GlobusSDKUsageError(
+                "SQLiteIdentityCache ttl and negative_ttl must be positive"
+            )
+        if memory_size < 1:
+            raise exc.GlobusSDKUsageError(
+                "SQLiteIdentityCache memory_size has a minimum of 1"
+            )
+        self.filepath = pathlib.Path(filepath).expanduser()
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        # in memory, each lowercased name maps to a 1-tuple of its identity record,
+        # or of None for a name known not to match any identity
+        self._memory: TTLCache[str, tuple[dict[str, t.Any] | None]] = TTLCache(
+            ttl=ttl, maxsize=memory_size
+        )
+        # the connection is shared by threads, such as those of
+        # IdentityMap.prefetch, so its use is serialized
+        self._lock = threading.Lock()
+        self._connection = self._init_and_connect(connect_params)
+
+    def _init_and_connect(
+        self, connect_params: dict[str, t.Any] | None
+    ) -> sqlite3.Connection:
+        connect_params = {"check_same_thread": False, **(connect_params or {})}
+        conn: sqlite3.Connection = sqlite3.connect(self.filepath, **connect_params)
+        # WAL mode lets readers in other processes proceed during a write
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Globus Auth matches IDs and usernames case-insensitively
+        conn.executescript(textwrap.dedent("""
+            CREATE TABLE IF NOT EXISTS identities (
+                id VARCHAR NOT NULL PRIMARY KEY COLLATE NOCASE,
+                username VARCHAR NOT NULL COLLATE NOCASE,
+                identity_json VARCHAR NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS identities_by_username
+                ON identities(username COLLATE NOCASE);
+            CREATE TABLE IF NOT EXISTS missing_identities (
+                name VARCHAR NOT NULL PRIMARY KEY COLLATE NOCASE,
+                expires_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sdk_identity_cache_internal (
+                attribute VARCHAR NOT NULL PRIMARY KEY,
+                value VARCHAR NOT NULL
+            );
+            """))
+        conn.execute(
+            "INSERT OR IGNORE INTO sdk_identity_cache_internal(attribute, value) "
+            "VALUES ('schema_version', ?)",
+            (_SCHEMA_VERSION,),
+        )
+        conn.commit()
+        return conn
+
+    def __enter__(self) -> SQLiteIdentityCache:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+        """
+        self._connection.close()
+
+    def _lookup(self, name: str) -> tuple[bool, dict[str, t.Any] | None]:
+        """
+        Look up a name, first in memory and then on disk.
+
+        :returns: Whether anything is known about the name, and its record (which is
+            ``None`` if the name is known not to match any identity)
+        """
+        cached = self._memory.get(name.lower())
+        if cached is not None:
+            return True, cached[0]
+
+        now = time.time()
+        column = "username" if is_username(name) else "id"
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT identity_json, expires_at FROM identities WHERE {column}=? "
+                "AND expires_at>?",
+                (name, now),
+            ).fetchone()
+            if row is None:
+                row = self._connection.execute(
+                    "SELECT NULL, expires_at FROM missing_identities "
+                    "WHERE name=? AND expires_at>?",
+                    (name, now),
+                ).fetchone()
+        if row is None:
+            return False, None
+        record = json.loads(row[0]) if row[0] is not None else None
+        self._memory.set(name.lower(), (record,), ttl=row[1] - now)
+        return True, record
+
+    def __getitem__(self, key: str) -> dict[str, t.Any]:
+        _, record = self._lookup(key)
+        if record is None:
+            raise KeyError(key)
+        return record
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._lookup(key)[1] is not None
+
+    def __setitem__(self, key: str, value: dict[str, t.Any]) -> None:
+        self.update_identities([value])
+
+    def __delitem__(self, key: str) -> None:
+        column = "username" if is_username(key) else "id"
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT id, username FROM identities WHERE {column}=?", (key,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(key)
+            self._connection.execute("DELETE FROM identities WHERE id=?", (row[0],))
+            self._connection.commit()
+        self._memory.pop(row[0].lower())
+        self._memory.pop(row[1].lower())
+
+    def __iter__(self) -> t.Iterator[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, username FROM identities WHERE expires_at>?",
+                (time.time(),),
+            ).fetchall()
+        for identity_id, username in rows:
+            yield identity_id
+            yield username
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM identities WHERE expires_at>?", (time.time(),)
+            ).fetchone()
+        # each identity is keyed by both its ID and its username
+        return int(count) * 2
+
+    def update_identities(self, identities: t.Iterable[dict[str, t.Any]]) -> None:
+        """
+        Store identity records, keyed by both their IDs and their usernames, in a
+        single transaction.
+
+        :param identities: Identity records, as returned by
+            :meth:`AuthClient.get_identities`
+        """
+        expires_at = time.time() + self.ttl
+        rows = [(x["id"], x["username"], json.dumps(x), expires_at) for x in identities]
+        if not rows:
+            return
+        with self._lock:
+            self._connection.executemany(
+                "REPLACE INTO identities(id, username, identity_json, expires_at) "
+                "VALUES(?, ?, ?, ?)",
+                rows,
+            )
+            self._connection.executemany(
+                "DELETE FROM missing_identities WHERE name IN (?, ?)",
+                [(r[0], r[1]) for r in rows],
+            )
+            self._connection.commit()
+        for identity_id, username, identity_json, _ in rows:
+            record = json.loads(identity_json)
+            self._memory.set(identity_id.lower(), (record,))
+            self._memory.set(username.lower(), (record,))
+
+    def add_missing(self, names: t.Iterable[str]) -> None:
+        """
+        Record IDs or usernames which do not match any identity, for ``negative_ttl``
+        seconds.
+
+        :param names: The IDs and usernames which matched no identity
+        """
+        names = list(names)
+        if not names:
+            return
+        expires_at = time.time() + self.negative_ttl
+        with self._lock:
+            self._connection.executemany(
+                "REPLACE INTO missing_identities(name, expires_at) VALUES(?, ?)",
+                [(name, expires_at) for name in names],
+            )
+            self._connection.commit()
+        for name in names:
+            self._memory.set(name.lower(), (None,), ttl=self.negative_ttl)
+
+    def is_missing(self, name: str) -> bool:
+        """
+        Check whether an ID or username is known not to match any identity.
+
+        :param name: An identity ID or username
+        """
+        known, record = self._lookup(name)
+        return known and record is None
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries from the database.
+
+        :returns: The number of entries deleted
+        """
+        now = time.time()
+        with self._lock:
+            deleted = self._connection.execute(
+                "DELETE FROM identities WHERE expires_at<=?", (now,)
+            ).rowcount
+            deleted += self._connection.execute(
+                "DELETE FROM missing_identities WHERE expires_at<=?", (now,)
+            ).rowcount
+            self._connection.commit()
+        self._memory.purge_expired()
+        return int(deleted)
+
+    def stats(self) -> CacheStats:
+        """Get a snapshot of the counters of the in-memory cache."""
+        return self._memory.stats()
+
+    def get_identities(
+        self,
+        auth_client: AuthClient,
+        names: t.Iterable[str],
+        *,
+        batch_size: int = 100,
+    ) -> dict[str, dict[str, t.Any]]:
+        """
+        Get identity records for IDs and usernames, using
+        :meth:`AuthClient.get_identities` only for names which are not cached.
+
+        Names which match no identity are recorded, and are not looked up again
+        until their entries expire.
+
+        :param auth_client: The client used to look up uncached names
+        :param names: Identity IDs and usernames, which may be mixed
+        :param batch_size: The maximum number of names in each request.
+            [Default: ``100``]
+        :returns: A dict mapping each name which matched an identity to its record
+        """
+        if batch_size < 1:
+            raise exc.GlobusSDKUsageError(
+                "SQLiteIdentityCache.get_identities batch_size has a minimum of 1"
+            )
+        found: dict[str, dict[str, t.Any]] = {}
+        ids, usernames = split_ids_and_usernames(names)
+        for usernames_batch, pending in ((False, ids), (True, usernames)):
+            unknown = []
+            for name in sorted(pending):
+                known, record = self._lookup(name)
+                if record is not None:
+                    found[name] = record
+                elif not known:
+                    unknown.append(name)
+            for start in range(0, len(unknown), batch_size):
+                batch = unknown[start : start + batch_size]
+                if usernames_batch:
+                    response = auth_client.get_identities(usernames=batch)
+                else:
+                    response = auth_client.get_identities(ids=batch)
+                identities = list(response["identities"])
+                self.update_identities(identities)
+                # match case-insensitively, as Globus Auth does
+                field = "username" if usernames_batch else "id"
+                by_name = {x[field].lower(): x for x in identities}
+                missing = []
+                for name in batch:
+                    if name.lower() in by_name:
+                        found[name] = by_name[name.lower()]
+                    else:
+                        missing.append(name)
+                self.add_missing(missing)
+        return found
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import threading
 import typing as t
 import uuid
 
+from globus_sdk import exc
+
 from .client import AuthClient
 
 
@@ -31,6 +36,20 @@ def split_ids_and_usernames(
     return ids, usernames
 
 
+@t.runtime_checkable
+class _SupportsMissingIdentities(t.Protocol):
+    """
+    A cache which can store many identities at once, and can remember names which
+    matched no identity, as a :class:`SQLiteIdentityCache` can.
+    """
+
+    def update_identities(self, identities: t.Iterable[dict[str, t.Any]]) -> None: ...
+
+    def add_missing(self, names: t.Iterable[str]) -> None: ...
+
+    def is_missing(self, name: str) -> bool: ...
+
+
 class IdentityMap:
     r"""
     There's a common pattern of having a large batch of Globus Auth Identities which you
@@ -69,6 +88,11 @@ class IdentityMap:
     map, it will be immediately added. But adding many identities beforehand will
     improve performance.
 
+    Lookups fetch one batch at a time, as needed. To resolve a large number of
+    identities up front, call :py:meth:`~IdentityMap.prefetch` (or
+    :py:meth:`~IdentityMap.prefetch_async`), which fetches all of the batches
+    concurrently.
+
     The ``IdentityMap`` will cache its results so that repeated lookups of the same Identity
     will not repeat work. It will also map identities both by ID and by Username,
     regardless of how they're initially looked up.
@@ -122,6 +146,8 @@ class IdentityMap:
     :param cache:  A dict or other mapping object which will be used to cache results.
         The default is that results are cached once per IdentityMap object. If you want
         multiple IdentityMaps to share data, explicitly pass the same ``cache`` to both.
+        A :class:`SQLiteIdentityCache` shares results between processes, and also
+        remembers names which matched no identity.
 
     .. automethodlist:: globus_sdk.IdentityMap
         :include_methods: __getitem__,__delitem__
@@ -148,6 +174,8 @@ class IdentityMap:
         # a cache may be passed in via the constructor in order to make multiple
         # IdentityMap objects share a cache
         self._cache = cache if cache is not None else {}
+        # guards the unresolved sets and writes to the cache, for concurrent fetches
+        self._lock = threading.RLock()
 
     def _create_batch(self, key: str) -> set[str]:
         """
@@ -162,24 +190,90 @@ class IdentityMap:
             self.unresolved_usernames if key_is_username else self.unresolved_ids
         )
 
-        # start the batch with the key being looked up, and if it is in the unresolved
-        # list remove it
-        batch = {key}
-        if key in set_to_use:
-            set_to_use.remove(key)
+        with self._lock:
+            # start the batch with the key being looked up, and if it is in the
+            # unresolved list remove it
+            batch = {key}
+            if key in set_to_use:
+                set_to_use.remove(key)
 
-        # until we've exhausted the set or filled the batch, keep trying to add
-        while set_to_use and len(batch) < self.id_batch_size:
-            value = set_to_use.pop()
+            # until we've exhausted the set or filled the batch, keep trying to add
+            while set_to_use and len(batch) < self.id_batch_size:
+                value = set_to_use.pop()
 
-            # value may already have been looked up if the cache is shared, skip those
-            if value in self._cache:
-                continue
+                # value may already have been looked up if the cache is shared, skip
+                # those
+                if value in self._cache or self._is_known_missing(value):
+                    continue
 
-            batch.add(value)
+                batch.add(value)
 
         return batch
 
+    def _create_all_batches(self) -> list[tuple[bool, set[str]]]:
+        """
+        Remove all unresolved names from tracking and split them into batches, as
+        pairs of (whether the batch holds usernames, the batch).
+        """
+        batches: list[tuple[bool, set[str]]] = []
+        with self._lock:
+            for usernames, set_to_use in (
+                (False, self.unresolved_ids),
+                (True, self.unresolved_usernames),
+            ):
+                pending = sorted(
+                    v
+                    for v in set_to_use
+                    if v not in self._cache and not self._is_known_missing(v)
+                )
+                set_to_use.clear()
+                for start in range(0, len(pending), self.id_batch_size):
+                    batches.append(
+                        (usernames, set(pending[start : start + self.id_batch_size]))
+                    )
+        return batches
+
+    def _fetch_batch(self, usernames: bool, batch: set[str]) -> None:
+        """
+        Look up one batch, and store the results in the internal cache. If the lookup
+        fails, the batch is returned to the unresolved names, to be tried again later.
+        """
+        try:
+            if usernames:
+                response = self.auth_client.get_identities(usernames=batch)
+            else:
+                response = self.auth_client.get_identities(ids=batch)
+        except BaseException:
+            with self._lock:
+                if usernames:
+                    self.unresolved_usernames.update(batch)
+                else:
+                    self.unresolved_ids.update(batch)
+            raise
+
+        identities = list(response["identities"])
+        with self._lock:
+            if isinstance(self._cache, _SupportsMissingIdentities):
+                self._cache.update_identities(identities)
+                field = "username" if usernames else "id"
+                found = {x[field].lower() for x in identities}
+                self._cache.add_missing(
+                    name for name in batch if name.lower() not in found
+                )
+            else:
+                for x in identities:
+                    self._cache[x["id"]] = x
+                    self._cache[x["username"]] = x
+
+    def _is_known_missing(self, key: str) -> bool:
+        """
+        Check if the cache records that a name matched no identity, as a
+        :class:`SQLiteIdentityCache` can.
+        """
+        return isinstance(self._cache, _SupportsMissingIdentities) and (
+            self._cache.is_missing(key)
+        )
+
     def _fetch_batch_including(self, key: str) -> None:
         """
         Batch resolve identifiers (usernames or IDs), being sure to include the desired,
@@ -188,16 +282,86 @@ class IdentityMap:
 
         Store the results in the internal cache.
         """
-        batch = self._create_batch(key)
+        self._fetch_batch(is_username(key), self._create_batch(key))
 
-        if is_username(key):
-            response = self.auth_client.get_identities(usernames=batch)
-        else:
-            response = self.auth_client.get_identities(ids=batch)
+    def prefetch(self, *, max_workers: int = 4) -> None:
+        """
+        Look up all unresolved usernames and IDs now, fetching batches concurrently.
+
+        After a prefetch, lookups of names which were added to the map are answered
+        from the cache without any further calls to Globus Auth.
+
+        If a batch fails, the first error is raised once the other batches have
+        finished. The names in any failed batch remain unresolved, and are looked up
+        again by a later prefetch or lookup.
+
+        :param max_workers: The maximum number of concurrent requests. [Default: ``4``]
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
 
-        for x in response["identities"]:
-            self._cache[x["id"]] = x
-            self._cache[x["username"]] = x
+                .. code-block:: python
+
+                    idmap = globus_sdk.IdentityMap(ac, principal_ids)
+                    idmap.prefetch(max_workers=8)
+                    names = [idmap[i]["username"] for i in principal_ids]
+        """
+        if max_workers < 1:
+            raise exc.GlobusSDKUsageError("prefetch max_workers has a minimum of 1")
+        batches = self._create_all_batches()
+        if not batches:
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(self._fetch_batch, *b) for b in batches]
+        # all batches have finished; raise the first error, if any
+        for future in futures:
+            future.result()
+
+    async def prefetch_async(self, *, max_workers: int = 4) -> None:
+        """
+        An ``async`` equivalent of :meth:`prefetch`, for use in an event loop.
+
+        The requests are still made by the (synchronous) ``AuthClient``, in worker
+        threads, so the event loop is not blocked while they run.
+
+        :param max_workers: The maximum number of concurrent requests. [Default: ``4``]
+        """
+        if max_workers < 1:
+            raise exc.GlobusSDKUsageError(
+                "prefetch_async max_workers has a minimum of 1"
+            )
+        batches = self._create_all_batches()
+        if not batches:
+            return
+        loop = asyncio.get_running_loop()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = await asyncio.gather(
+                *(loop.run_in_executor(pool, self._fetch_batch, *b) for b in batches),
+                return_exceptions=True,
+            )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def resolve_all(
+        self, identity_ids: t.Iterable[str] | None = None, *, max_workers: int = 4
+    ) -> dict[str, dict[str, t.Any]]:
+        """
+        Add usernames and IDs to the map, prefetch all unresolved names, and return
+        the identities found.
+
+        :param identity_ids: Usernames or IDs to resolve, in addition to those
+            already added
+        :param max_workers: The maximum number of concurrent requests. [Default: ``4``]
+        :returns: A dict mapping each of ``identity_ids`` which was found to its
+            identity record. Names which do not match an identity are omitted.
+        """
+        keys = list(identity_ids or ())
+        for key in keys:
+            self.add(key)
+        self.prefetch(max_workers=max_workers)
+        return {key: self._cache[key] for key in keys if key in self._cache}
 
     def add(self, identity_id: str) -> bool:
         """
@@ -209,7 +373,7 @@ class IdentityMap:
         :param identity_id: A string Identity ID or Identity Name (a.k.a. "username") to
             add
         """
-        if identity_id in self._cache:
+        if identity_id in self._cache or self._is_known_missing(identity_id):
             return False
         if is_username(identity_id):
             if identity_id in self.unresolved_usernames:
@@ -239,6 +403,8 @@ class IdentityMap:
         ``IdentityMap`` supports dict-like lookups with ``map[key]``
         """
         if key not in self._cache:
+            if self._is_known_missing(key):
+                raise KeyError(key)
             self._fetch_batch_including(key)
         return self._cache[key]
 
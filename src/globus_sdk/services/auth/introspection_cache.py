@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import concurrent.futures
+import copy
+import dataclasses
+import logging
+import threading
+import time
+import typing as t
+
+from globus_sdk import exc
+from globus_sdk._internal.ttl_cache import TTLCache
+from globus_sdk._internal.utils import sha256_string
+from globus_sdk._missing import MISSING, MissingType
+
+if t.TYPE_CHECKING:
+    from .client import ConfidentialAppAuthClient
+
+log = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class TokenIntrospectionStats:
+    """
+    A snapshot of the counters of a :class:`TokenIntrospectionCache`.
+
+    :param lookups: The number of tokens looked up
+    :param hits: The number of lookups answered from the cache
+    :param negative_hits: The number of hits for tokens which were not active
+    :param coalesced: The number of lookups which waited for an introspection of
+        the same token by another thread, or which repeated a token given to
+        :meth:`TokenIntrospectionCache.introspect_many`
+    :param auth_calls: The number of introspections sent to Globus Auth
+    :param size: The number of tokens currently cached
+    """
+
+    lookups: int = 0
+    hits: int = 0
+    negative_hits: int = 0
+    coalesced: int = 0
+    auth_calls: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The ratio of hits to lookups, or ``0.0`` if there were none."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def auth_calls_avoided(self) -> int:
+        """The number of lookups which did not need a call to Globus Auth."""
+        return self.hits + self.coalesced
+
+
+class TokenIntrospectionCache:
+    """
+    A cache of token introspections, for resource servers which validate the tokens
+    of incoming requests with
+    :meth:`ConfidentialAppAuthClient.oauth2_token_introspect`.
+
+    Results are cached by the SHA-256 hash of the token, so tokens are never held in
+    memory by the cache. An active token's result is kept until the token expires,
+    but for at most ``max_ttl`` seconds, which bounds how long a revoked token may
+    still be accepted. Results for tokens which are not active are kept for
+    ``negative_ttl`` seconds. Concurrent lookups of the same token share a single
+    introspection, and errors are never cached.
+
+    :param auth_client: The client of the resource server, which performs
+        introspections
+    :param include: The ``include`` parameter of each introspection, such as
+        ``"identity_set"``
+    :param max_ttl: The maximum number of seconds for which an active token's result
+        is kept. [Default: ``60``]
+    :param negative_ttl: The number of seconds for which a result for a token which
+        is not active is kept. [Default: ``10``]
+    :param maxsize: The maximum number of results held. [Default: ``10000``]
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                auth_client = globus_sdk.ConfidentialAppAuthClient(CLIENT_ID, SECRET)
+                introspections = globus_sdk.TokenIntrospectionCache(
+                    auth_client, include="identity_set"
+                )
+
+
+                def handle_request(request):
+                    token_info = introspections.introspect(request.bearer_token)
+                    if not token_info["active"]:
+                        raise Unauthorized()
+                    ...
+    """
+
+    def __init__(
+        self,
+        auth_client: ConfidentialAppAuthClient,
+        *,
+        include: str | MissingType = MISSING,
+        max_ttl: float = 60,
+        negative_ttl: float = 10,
+        maxsize: int = 10000,
+    ) -> None:
+        if max_ttl <= 0 or negative_ttl <= 0:
+            raise exc.GlobusSDKUsageError(
+                "TokenIntrospectionCache max_ttl and negative_ttl must be positive"
+            )
+        if maxsize < 1:
+            raise exc.GlobusSDKUsageError(
+                "TokenIntrospectionCache maxsize has a minimum of 1"
+            )
+        self.auth_client = auth_client
+        self.include = include
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+
+        self._results: TTLCache[str, dict[str, t.Any]] = TTLCache(
+            ttl=max_ttl, maxsize=maxsize
+        )
+        # in-flight introspections, shared by concurrent lookups of the same token
+        self._flights: dict[str, concurrent.futures.Future[dict[str, t.Any]]] = {}
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._hits = 0
+        self._negative_hits = 0
+        self._coalesced = 0
+        self._auth_calls = 0
+
+    def introspect(self, token: str) -> dict[str, t.Any]:
+        """
+        Get the introspection of a token, calling Globus Auth only if it is not
+        cached.
+
+        :param token: The access token to introspect
+        :returns: The introspection data. A deep copy is returned, so it may be
+            modified.
+        :raises AuthAPIError: If the introspection fails
+        """
+        key = sha256_string(token)
+        with self._lock:
+            self._lookups += 1
+            result = self._results.get(key)
+            if result is not None:
+                self._hits += 1
+                if not result.get("active"):
+                    self._negative_hits += 1
+                return copy.deepcopy(result)
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = concurrent.futures.Future()
+                self._flights[key] = flight
+            else:
+                self._coalesced += 1
+        if not leader:
+            return copy.deepcopy(flight.result())
+
+        try:
+            result = self._introspect(key, token)
+        except BaseException as err:
+            flight.set_exception(err)
+            raise
+        else:
+            flight.set_result(result)
+        finally:
+            with self._lock:
+                del self._flights[key]
+        return copy.deepcopy(result)
+
+    def is_active(self, token: str) -> bool:
+        """
+        Check if a token is active, using the cache.
+
+        :param token: The access token to check
+        """
+        return bool(self.introspect(token).get("active"))
+
+    def introspect_many(
+        self, tokens: t.Iterable[str], *, max_workers: int = 8
+    ) -> list[dict[str, t.Any]]:
+        """
+        Introspect many tokens, concurrently calling Globus Auth for those which are
+        not cached. Repeated tokens are introspected once.
+
+        :param tokens: The access tokens to introspect
+        :param max_workers: The maximum number of concurrent introspections.
+            [Default: ``8``]
+        :returns: Copies of the introspection data of each token, in order
+        :raises AuthAPIError: If an introspection fails. The error is raised once
+            the other introspections have finished.
+        """
+        if max_workers < 1:
+            raise exc.GlobusSDKUsageError(
+                "TokenIntrospectionCache.introspect_many max_workers has a minimum "
+                "of 1"
+            )
+        tokens = list(tokens)
+        unique_tokens = dict.fromkeys(tokens)
+        # repeated tokens share the lookup of their first occurrence
+        with self._lock:
+            self._lookups += len(tokens) - len(unique_tokens)
+            self._coalesced += len(tokens) - len(unique_tokens)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                token: pool.submit(self.introspect, token) for token in unique_tokens
+            }
+        return [copy.deepcopy(futures[token].result()) for token in tokens]
+
+    def invalidate(self, token: str) -> None:
+        """
+        Drop the cached introspection of a token, as when it has been revoked.
+
+        :param token: The access token
+        """
+        self._results.pop(sha256_string(token))
+
+    def stats(self) -> TokenIntrospectionStats:
+        """Get a snapshot of the counters of the cache."""
+        with self._lock:
+            return TokenIntrospectionStats(
+                lookups=self._lookups,
+                hits=self._hits,
+                negative_hits=self._negative_hits,
+                coalesced=self._coalesced,
+                auth_calls=self._auth_calls,
+                size=len(self._results),
+            )
+
+    def _introspect(self, key: str, token: str) -> dict[str, t.Any]:
+        with self._lock:
+            self._auth_calls += 1
+        result = dict(
+            self.auth_client.oauth2_token_introspect(token, include=self.include).data
+        )
+        if result.get("active"):
+            ttl = self.max_ttl
+            if result.get("exp") is not None:
+                ttl = min(ttl, float(result["exp"]) - time.time())
+        else:
+            ttl = self.negative_ttl
+        if ttl > 0:
+            self._results.set(key, result, ttl=ttl)
+        return result
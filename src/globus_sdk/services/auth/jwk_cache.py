@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import time
+import typing as t
+
+from globus_sdk import exc
+from globus_sdk._internal.ttl_cache import CacheStats, TTLCache
+
+from ._common import SupportsJWKMethods
+
+log = logging.getLogger(__name__)
+
+_CACHE_FILE_VERSION = 1
+
+
+def _cache_key(auth_client: SupportsJWKMethods) -> str:
+    # clients for different Globus environments must not share keys
+    return str(getattr(auth_client, "base_url", ""))
+
+
+@dataclasses.dataclass
+class _CachedKeys:
+    openid_configuration: dict[str, t.Any]
+    jwks: dict[str, t.Any]
+    # a wall-clock time, as entries may be read by other processes
+    expires_at: float
+    # a monotonic time, used to limit refetching
+    fetched_at: float
+
+
+class JWKCache:
+    """
+    A cache of the OpenID configuration and JSON Web Key Set (JWKS) of Globus Auth,
+    which can be shared by many :class:`IDTokenDecoder` objects, and optionally
+    saved on disk so that it can be shared by processes.
+
+    Without a cache, each new ``IDTokenDecoder`` makes two requests to Globus Auth
+    before it can decode its first ``id_token``. With a shared cache, those requests
+    are made once per ``ttl``.
+
+    When Globus Auth rotates its signing keys, a decoder using the cache refetches
+    the key set if a token names a key ID (``kid``) which is not in the cached set,
+    or if a token's signature does not verify with the cached key. Refetches are made
+    at most once per ``min_refresh_interval`` seconds.
+
+    The cache also holds the claims of recently decoded tokens, keyed by a hash of
+    the token and by the Globus Auth environment, so that decoding the same
+    ``id_token`` again does not repeat the verification. Claims are held until the
+    token expires, and are never saved on disk.
+
+    Concurrent requests for the configuration and keys of the same environment share
+    a single fetch, which does not block requests for other environments.
+
+    :param filepath: A path to a JSON file in which to save the configuration and
+        keys. If omitted, the cache is held only in memory.
+    :param ttl: The number of seconds for which configuration and keys are kept.
+        [Default: one day]
+    :param min_refresh_interval: The minimum number of seconds between refetches of
+        the key set. [Default: ``60``]
+    :param decoded_token_ttl: The maximum number of seconds for which the claims of
+        a decoded token are kept. ``0`` disables this. [Default: ``300``]
+    :param decoded_token_maxsize: The maximum number of decoded tokens to keep.
+        [Default: ``1000``]
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                jwk_cache = globus_sdk.JWKCache("~/.cache/globus-jwks.json")
+
+                storage = globus_sdk.token_storage.JSONTokenStorage("tokens.json")
+                storage.id_token_decoder = globus_sdk.IDTokenDecoder(
+                    auth_client, jwk_cache=jwk_cache
+                )
+    """
+
+    def __init__(
+        self,
+        filepath: pathlib.Path | str | None = None,
+        *,
+        ttl: float = 86400,
+        min_refresh_interval: float = 60,
+        decoded_token_ttl: float = 300,
+        decoded_token_maxsize: int = 1000,
+    ) -> None:
+        if ttl <= 0:
+            raise exc.GlobusSDKUsageError("JWKCache ttl must be positive")
+        if min_refresh_interval < 0 or decoded_token_ttl < 0:
+            raise exc.GlobusSDKUsageError(
+                "JWKCache min_refresh_interval and decoded_token_ttl must not be "
+                "negative"
+            )
+        self.filepath = (
+            pathlib.Path(filepath).expanduser() if filepath is not None else None
+        )
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.decoded_token_ttl = decoded_token_ttl
+
+        self._lock = threading.RLock()
+        # serializes updates of the file, which are made without holding _lock, so
+        # that lookups are never blocked by file I/O
+        self._file_lock = threading.Lock()
+        self._entries: dict[str, _CachedKeys] = {}
+        # in-flight fetches, shared by concurrent requests for the same keys
+        self._flights: dict[str, concurrent.futures.Future[_CachedKeys]] = {}
+        self._decoded_tokens: TTLCache[tuple[str, ...], dict[str, t.Any]] = TTLCache(
+            ttl=decoded_token_ttl or 1, maxsize=decoded_token_maxsize
+        )
+        self._load()
+
+    def get_openid_configuration(
+        self, auth_client: SupportsJWKMethods
+    ) -> dict[str, t.Any]:
+        """
+        Get the OpenID configuration of Globus Auth, fetching it if it is not cached.
+
+        :param auth_client: The client used to fetch the configuration
+        """
+        return self._get_entry(auth_client).openid_configuration
+
+    def get_jwks(
+        self, auth_client: SupportsJWKMethods, *, refresh: bool = False
+    ) -> dict[str, t.Any]:
+        """
+        Get the key set of Globus Auth, fetching it if it is not cached.
+
+        :param auth_client: The client used to fetch the key set
+        :param refresh: Refetch the key set, as after a key rotation, unless it was
+            fetched less than ``min_refresh_interval`` seconds ago
+        """
+        return self._get_entry(auth_client, refresh=refresh).jwks
+
+    def invalidate(self, auth_client: SupportsJWKMethods | None = None) -> None:
+        """
+        Drop cached configuration and keys, both in memory and on disk, along with
+        the claims of decoded tokens.
+
+        :param auth_client: Only drop the entry used with this client
+        """
+        with self._lock:
+            if auth_client is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(_cache_key(auth_client), None)
+            self._decoded_tokens.clear()
+        self._save(None if auth_client is None else {_cache_key(auth_client): None})
+
+    def decoded_token_stats(self) -> CacheStats:
+        """Get a snapshot of the counters of the decoded token cache."""
+        return self._decoded_tokens.stats()
+
+    def get_decoded_token(
+        self, auth_client: SupportsJWKMethods, key: tuple[str, ...]
+    ) -> dict[str, t.Any] | None:
+        """
+        Get the claims of a decoded token, if they are cached.
+
+        :param auth_client: The client whose Globus Auth environment issued the token
+        :param key: The key under which the claims were stored, such as a hash of the
+            token along with the options used to verify it
+        """
+        if not self.decoded_token_ttl:
+            return None
+        return self._decoded_tokens.get((_cache_key(auth_client), *key))
+
+    def store_decoded_token(
+        self,
+        auth_client: SupportsJWKMethods,
+        key: tuple[str, ...],
+        claims: dict[str, t.Any],
+        ttl: float,
+    ) -> None:
+        """
+        Cache the claims of a decoded token, for at most ``decoded_token_ttl``
+        seconds.
+
+        :param auth_client: The client whose Globus Auth environment issued the token
+        :param key: The key under which to store the claims
+        :param claims: The verified claims of the token
+        :param ttl: The number of seconds for which the claims are valid, such as
+            until the token expires
+        """
+        ttl = min(ttl, self.decoded_token_ttl)
+        if ttl > 0:
+            self._decoded_tokens.set((_cache_key(auth_client), *key), claims, ttl=ttl)
+
+    def _get_entry(
+        self, auth_client: SupportsJWKMethods, *, refresh: bool = False
+    ) -> _CachedKeys:
+        key = _cache_key(auth_client)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.time():
+                if not refresh:
+                    return entry
+                if time.monotonic() - entry.fetched_at < self.min_refresh_interval:
+                    log.debug("JWKCache: skipping refresh, keys were just fetched")
+                    return entry
+            else:
+                entry = None
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = concurrent.futures.Future()
+                self._flights[key] = flight
+        if not leader:
+            log.debug("JWKCache: waiting for a fetch in flight")
+            return flight.result()
+
+        # the lock is not held while fetching, so that a slow fetch does not block
+        # requests for other environments
+        try:
+            entry = self._fetch(auth_client, key, entry)
+        except BaseException as err:
+            flight.set_exception(err)
+            raise
+        else:
+            flight.set_result(entry)
+        finally:
+            with self._lock:
+                del self._flights[key]
+        return entry
+
+    def _fetch(
+        self,
+        auth_client: SupportsJWKMethods,
+        key: str,
+        previous: _CachedKeys | None,
+    ) -> _CachedKeys:
+        if previous is not None:
+            # keep the configuration, which does not change when keys rotate
+            openid_configuration = previous.openid_configuration
+        else:
+            log.debug("JWKCache: fetching OpenID configuration")
+            openid_configuration = auth_client.get_openid_configuration().data
+
+        log.debug("JWKCache: fetching JWKS")
+        jwks = auth_client.get_jwk(openid_configuration, as_pem=False)
+        entry = _CachedKeys(
+            openid_configuration=openid_configuration,
+            jwks=jwks,
+            expires_at=time.time() + self.ttl,
+            fetched_at=time.monotonic(),
+        )
+        with self._lock:
+            self._entries[key] = entry
+        self._save({key: entry})
+        return entry
+
+    def _load(self) -> None:
+        if self.filepath is None:
+            return
+        now = time.time()
+        for key, saved in self._read_file().items():
+            expires_at = min(saved["expires_at"], now + self.ttl)
+            if expires_at > now:
+                self._entries[key] = _CachedKeys(
+                    openid_configuration=saved["openid_configuration"],
+                    jwks=saved["jwks"],
+                    expires_at=expires_at,
+                    # keys loaded from disk may be refreshed immediately
+                    fetched_at=time.monotonic() - self.min_refresh_interval,
+                )
+
+    def _read_file(self) -> dict[str, dict[str, t.Any]]:
+        assert self.filepath is not None
+        try:
+            with open(self.filepath, encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            log.warning(f"ignoring unreadable JWK cache {self.filepath}: {err}")
+            return {}
+        if not isinstance(saved, dict) or saved.get("version") != _CACHE_FILE_VERSION:
+            return {}
+        return dict(saved.get("entries", {}))
+
+    def _save(self, changes: dict[str, _CachedKeys | None] | None) -> None:
+        """
+        Update entries of the cache file. The file is re-read first, so that entries
+        saved by other processes are kept.
+
+        :param changes: New entries by key, with ``None`` for removed entries, or
+            ``None`` to remove all entries
+        """
+        if self.filepath is None:
+            return
+        with self._file_lock:
+            now = time.time()
+            entries: dict[str, dict[str, t.Any]] = {}
+            if changes is not None:
+                entries = {
+                    key: saved
+                    for key, saved in self._read_file().items()
+                    if saved.get("expires_at", 0) > now
+                }
+                for key, entry in changes.items():
+                    if entry is None:
+                        entries.pop(key, None)
+                    else:
+                        entries[key] = {
+                            "openid_configuration": entry.openid_configuration,
+                            "jwks": entry.jwks,
+                            "expires_at": entry.expires_at,
+                        }
+            cache_dir = self.filepath.parent
+            tmp_path = None
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+                with open(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": _CACHE_FILE_VERSION, "entries": entries}, f)
+                os.replace(tmp_path, self.filepath)
+            except OSError as err:
+                # the cache is an optimization, so failing to write it is not fatal
+                log.warning(f"failed to save JWK cache {self.filepath}: {err}")
+                if tmp_path is not None:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
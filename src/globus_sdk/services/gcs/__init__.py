@@ -28,6 +28,7 @@ from .data import (
     UserCredentialDocument,
 )
 from .errors import GCSAPIError
+from .inventory import GCSInventory
 from .response import IterableGCSResponse, UnpackingGCSResponse
 
 __all__ = (
@@ -62,4 +63,5 @@ __all__ = (
     "UserCredentialDocument",
     "GlobusConnectServerConnector",
     "ConnectorTable",
+    "GCSInventory",
 )
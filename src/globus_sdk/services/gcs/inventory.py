@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import dataclasses
+import logging
+import threading
+import time
+import typing as t
+import urllib.parse
+
+from globus_sdk import exc
+
+if t.TYPE_CHECKING:
+    from .client import GCSClient
+
+log = logging.getLogger(__name__)
+
+_SNAPSHOT_VERSION = 1
+
+InventoryKind = t.Literal["collection", "storage_gateway", "role", "user_credential"]
+
+#: The kinds of record collected from each endpoint, in the order they are listed
+INVENTORY_KINDS: tuple[InventoryKind, ...] = (
+    "collection",
+    "storage_gateway",
+    "role",
+    "user_credential",
+)
+
+
+def _list_records(
+    client: GCSClient, kind: InventoryKind, page_size: int | None
+) -> t.Iterator[dict[str, t.Any]]:
+    paginated = client.paginated
+    kwargs: dict[str, t.Any] = {} if page_size is None else {"page_size": page_size}
+    if kind == "collection":
+        return paginated.get_collection_list(**kwargs).items()
+    if kind == "storage_gateway":
+        return paginated.get_storage_gateway_list(**kwargs).items()
+    if kind == "role":
+        # all roles on the endpoint, not only those of the caller
+        return paginated.get_role_list(include="all_roles", **kwargs).items()
+    return paginated.get_user_credential_list(**kwargs).items()
+
+
+def _client_address(client: GCSClient) -> str:
+    return urllib.parse.urlparse(client.base_url).netloc
+
+
+class GCSInventoryKey(t.NamedTuple):
+    """
+    The key of a record in a :class:`GCSInventory`.
+
+    :param address: The DNS name of the endpoint
+    :param kind: ``"collection"``, ``"storage_gateway"``, ``"role"``, or
+        ``"user_credential"``
+    :param id: The ID of the record
+    """
+
+    address: str
+    kind: str
+    id: str
+
+
+@dataclasses.dataclass
+class GCSInventoryDiff:
+    """
+    The differences between two :class:`GCSInventory` snapshots, as computed by
+    :meth:`GCSInventory.diff`.
+
+    :param added: Records which are only in the newer snapshot
+    :param removed: Records which are only in the older snapshot
+    :param changed: Records which differ, as pairs of the older and newer documents
+    :param skipped: The ``(address, kind)`` pairs which were not compared, because
+        listing them failed in either snapshot
+    """
+
+    added: dict[GCSInventoryKey, dict[str, t.Any]] = dataclasses.field(
+        default_factory=dict
+    )
+    removed: dict[GCSInventoryKey, dict[str, t.Any]] = dataclasses.field(
+        default_factory=dict
+    )
+    changed: dict[GCSInventoryKey, tuple[dict[str, t.Any], dict[str, t.Any]]] = (
+        dataclasses.field(default_factory=dict)
+    )
+    skipped: set[tuple[str, str]] = dataclasses.field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def changed_fields(self, key: GCSInventoryKey) -> list[str]:
+        """
+        The names of the top-level fields which differ in a changed record.
+
+        :param key: The key of a record in ``changed``
+        """
+        old, new = self.changed[key]
+        return sorted(k for k in old.keys() | new.keys() if old.get(k) != new.get(k))
+
+
+class GCSInventory:
+    """
+    A snapshot of the configuration of many Globus Connect Server endpoints: their
+    collections, storage gateways, roles, and user credentials.
+
+    Snapshots are usually built with :meth:`collect`, which lists every endpoint
+    concurrently. Records are indexed by endpoint, by kind, and by ID, and two
+    snapshots can be compared with :meth:`diff` to find configuration drift.
+    Snapshots can be saved with :meth:`to_dict` and restored with :meth:`from_dict`,
+    for instance to compare against a snapshot from a previous run.
+
+    :param records: The documents in the snapshot, by key
+    :param errors: The errors which prevented listing some kinds of record on some
+        endpoints, by ``(address, kind)``
+    :param taken_at: When the snapshot was taken, as a Unix timestamp. Defaults to
+        the current time.
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                clients = [globus_sdk.GCSClient(address, app=app) for address in FLEET]
+                today = globus_sdk.GCSInventory.collect(clients, timeout=120)
+
+                with open("inventory.json") as f:
+                    yesterday = globus_sdk.GCSInventory.from_dict(json.load(f))
+                drift = yesterday.diff(today)
+                for key in drift.changed:
+                    print(key, drift.changed_fields(key))
+    """
+
+    def __init__(
+        self,
+        records: t.Mapping[GCSInventoryKey, dict[str, t.Any]] | None = None,
+        *,
+        errors: t.Mapping[tuple[str, str], Exception] | None = None,
+        taken_at: float | None = None,
+    ) -> None:
+        self._records: dict[GCSInventoryKey, dict[str, t.Any]] = dict(records or {})
+        self.errors: dict[tuple[str, str], Exception] = dict(errors or {})
+        self.taken_at = time.time() if taken_at is None else taken_at
+
+        self._by_address: dict[str, list[GCSInventoryKey]] = collections.defaultdict(
+            list
+        )
+        self._by_kind: dict[str, list[GCSInventoryKey]] = collections.defaultdict(list)
+        self._by_id: dict[str, list[GCSInventoryKey]] = collections.defaultdict(list)
+        for key in self._records:
+            self._by_address[key.address].append(key)
+            self._by_kind[key.kind].append(key)
+            self._by_id[key.id].append(key)
+
+    @classmethod
+    def collect(
+        cls,
+        clients: t.Iterable[GCSClient],
+        *,
+        kinds: t.Iterable[InventoryKind] = INVENTORY_KINDS,
+        max_workers: int = 8,
+        timeout: float | None = None,
+        page_size: int | None = None,
+    ) -> GCSInventory:
+        """
+        List the configuration of many endpoints concurrently, and return a snapshot.
+
+        Each endpoint is listed by one worker, which streams each listing page by
+        page. An endpoint which cannot be reached, or which takes longer than
+        ``timeout``, does not stop the others; its failure is recorded in
+        ``errors``, along with whatever records were listed before it.
+
+        :param clients: A client for each endpoint
+        :param kinds: The kinds of record to list [Default: all kinds]
+        :param max_workers: The maximum number of endpoints listed at once.
+            [Default: ``8``]
+        :param timeout: The number of seconds each endpoint may take. It is checked
+            between pages, so a single slow request may exceed it by up to the
+            transport's ``http_timeout``.
+        :param page_size: The page size to request for each listing
+        """
+        if max_workers < 1:
+            raise exc.GlobusSDKUsageError(
+                "GCSInventory.collect max_workers has a minimum of 1"
+            )
+        if timeout is not None and timeout <= 0:
+            raise exc.GlobusSDKUsageError(
+                "GCSInventory.collect timeout must be positive"
+            )
+        kinds = tuple(kinds)
+        unknown = set(kinds) - set(INVENTORY_KINDS)
+        if unknown:
+            raise exc.GlobusSDKUsageError(
+                f"GCSInventory.collect got unknown kinds: {sorted(unknown)}"
+            )
+
+        records: dict[GCSInventoryKey, dict[str, t.Any]] = {}
+        errors: dict[tuple[str, str], Exception] = {}
+        lock = threading.Lock()
+
+        def _collect_one(client: GCSClient) -> None:
+            address = _client_address(client)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for n, kind in enumerate(kinds):
+                found = {}
+                try:
+                    for doc in _list_records(client, kind, page_size):
+                        found[GCSInventoryKey(address, kind, str(doc["id"]))] = dict(
+                            doc
+                        )
+                        if deadline is not None and time.monotonic() > deadline:
+                            raise TimeoutError(
+                                f"listing {address} took over {timeout}s"
+                            )
+                except (exc.GlobusAPIError, exc.NetworkError, TimeoutError) as err:
+                    log.warning(f"inventory of {kind}s on {address} failed: {err}")
+                    with lock:
+                        errors[(address, kind)] = err
+                        records.update(found)
+                        if isinstance(err, TimeoutError):
+                            # the endpoint is out of time for the remaining kinds
+                            for other in kinds[n + 1 :]:
+                                errors[(address, other)] = err
+                    if isinstance(err, TimeoutError):
+                        return
+                    continue
+                with lock:
+                    records.update(found)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for future in [pool.submit(_collect_one, client) for client in clients]:
+                future.result()
+        log.debug(f"inventory collected {len(records)} records, {len(errors)} errors")
+        return cls(records, errors=errors)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> t.Iterator[GCSInventoryKey]:
+        return iter(self._records)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._records
+
+    def __getitem__(self, key: GCSInventoryKey) -> dict[str, t.Any]:
+        return self._records[key]
+
+    @property
+    def addresses(self) -> list[str]:
+        """The addresses of all endpoints with records or errors, sorted."""
+        return sorted(self._by_address.keys() | {a for a, _ in self.errors})
+
+    def get(self, address: str, kind: str, id_: str) -> dict[str, t.Any] | None:
+        """
+        Get a record, or ``None`` if it is not in the snapshot.
+
+        :param address: The DNS name of the endpoint
+        :param kind: The kind of record
+        :param id_: The ID of the record
+        """
+        return self._records.get(GCSInventoryKey(address, kind, id_))
+
+    def find(
+        self,
+        *,
+        address: str | None = None,
+        kind: str | None = None,
+        id_: str | None = None,
+    ) -> list[GCSInventoryKey]:
+        """
+        Find the keys of records matching every given criterion, using the indexes.
+
+        :param address: Only records from this endpoint
+        :param kind: Only records of this kind
+        :param id_: Only records with this ID, such as a collection ID
+        """
+        candidates: list[list[GCSInventoryKey]] = []
+        if address is not None:
+            candidates.append(self._by_address.get(address, []))
+        if kind is not None:
+            candidates.append(self._by_kind.get(kind, []))
+        if id_ is not None:
+            candidates.append(self._by_id.get(id_, []))
+        if not candidates:
+            return list(self._records)
+        # filter the smallest index by the others
+        smallest, *others = sorted(candidates, key=len)
+        other_sets = [set(keys) for keys in others]
+        return [key for key in smallest if all(key in s for s in other_sets)]
+
+    def diff(
+        self, other: GCSInventory, *, ignore_fields: t.Iterable[str] = ()
+    ) -> GCSInventoryDiff:
+        """
+        Compare this snapshot with a newer one.
+
+        Listings which failed in either snapshot are not compared, so that an
+        unreachable endpoint does not appear to have lost its configuration.
+
+        :param other: The newer snapshot
+        :param ignore_fields: Top-level fields to ignore when comparing records, such
+            as fields which change without any change of configuration
+        """
+        ignored = frozenset(ignore_fields)
+        result = GCSInventoryDiff(skipped=set(self.errors) | set(other.errors))
+
+        def _comparable(key: GCSInventoryKey) -> bool:
+            return (key.address, key.kind) not in result.skipped
+
+        def _strip(doc: dict[str, t.Any]) -> dict[str, t.Any]:
+            return {k: v for k, v in doc.items() if k not in ignored}
+
+        for key, old in self._records.items():
+            if not _comparable(key):
+                continue
+            new = other._records.get(key)
+            if new is None:
+                result.removed[key] = old
+            elif _strip(old) != _strip(new):
+                result.changed[key] = (old, new)
+        for key, new in other._records.items():
+            if _comparable(key) and key not in self._records:
+                result.added[key] = new
+        return result
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """
+        Convert the snapshot to a JSON-serializable dict. Errors are kept as their
+        messages.
+        """
+        return {
+            "version": _SNAPSHOT_VERSION,
+            "taken_at": self.taken_at,
+            "records": [
+                {"address": k.address, "kind": k.kind, "id": k.id, "document": doc}
+                for k, doc in self._records.items()
+            ],
+            "errors": [
+                {"address": address, "kind": kind, "message": str(err)}
+                for (address, kind), err in self.errors.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, t.Any]) -> GCSInventory:
+        """
+        Restore a snapshot converted with :meth:`to_dict`.
+
+        :param data: The converted snapshot
+        """
+        if data.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Unsupported GCSInventory snapshot version: {data.get('version')}"
+            )
+        return cls(
+            {
+                GCSInventoryKey(r["address"], r["kind"], r["id"]): r["document"]
+                for r in data["records"]
+            },
+            errors={
+                (e["address"], e["kind"]): exc.GlobusError(e["message"])
+                for e in data["errors"]
+            },
+            taken_at=data["taken_at"],
+        )
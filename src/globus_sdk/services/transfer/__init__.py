@@ -1,7 +1,13 @@
+from .checksums import TransferChecksumCalculator
 from .client import TransferClient
 from .data import CreateTunnelData, DeleteData, TransferData
+from .endpoint_index import TransferEndpointIndex
 from .errors import TransferAPIError
+from .listing_cache import TransferListingCache
 from .response import IterableTransferResponse
+from .submission_id_pool import TransferSubmissionIDPool
+from .sync_planner import TransferSyncPlanner
+from .task_monitor import TransferTaskMonitor
 
 __all__ = (
     "TransferClient",
@@ -10,4 +16,10 @@ __all__ = (
     "TransferAPIError",
     "IterableTransferResponse",
     "CreateTunnelData",
+    "TransferListingCache",
+    "TransferSyncPlanner",
+    "TransferTaskMonitor",
+    "TransferChecksumCalculator",
+    "TransferSubmissionIDPool",
+    "TransferEndpointIndex",
 )
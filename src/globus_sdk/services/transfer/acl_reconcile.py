@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import functools
+import logging
+import typing as t
+import uuid
+
+from globus_sdk import exc
+from globus_sdk._internal.rate_limit import RateLimiter
+from globus_sdk._missing import MISSING
+
+if t.TYPE_CHECKING:
+    from .client import TransferClient
+
+log = logging.getLogger(__name__)
+
+AclAction = t.Literal["create", "update", "delete", "unchanged"]
+
+# rules are matched on (principal_type, principal, path)
+_RuleKey = t.Tuple[str, str, str]
+
+
+def _rule_key(rule: t.Mapping[str, t.Any]) -> _RuleKey:
+    path = rule.get("path") or "/"
+    if not path.endswith("/"):
+        path += "/"
+    return (rule["principal_type"], rule.get("principal") or "", path)
+
+
+def _normalize_permissions(permissions: str | None) -> str:
+    return "".join(sorted(permissions or ""))
+
+
+@dataclasses.dataclass
+class AclRuleResult:
+    """
+    The outcome for one access rule in an
+    :class:`AclReconcileReport
+    <globus_sdk.services.transfer.acl_reconcile.AclReconcileReport>`.
+
+    :param action: ``"create"``, ``"update"``, ``"delete"``, or ``"unchanged"``
+    :param principal_type: The principal type of the rule
+    :param principal: The principal of the rule
+    :param path: The path of the rule
+    :param permissions: The desired permissions, or for a deleted rule, the
+        permissions it had
+    :param rule_id: The ID of the rule. For a created rule, this is the ID of the
+        new rule, once it has been created.
+    :param applied: Whether the change was made
+    :param error: The error which prevented the change, if any
+    """
+
+    action: AclAction
+    principal_type: str
+    principal: str
+    path: str
+    permissions: str
+    rule_id: str | None = None
+    applied: bool = False
+    error: Exception | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+@dataclasses.dataclass
+class AclReconcileReport:
+    """
+    The result of
+    :meth:`TransferClient.reconcile_endpoint_acl_rules
+    <globus_sdk.TransferClient.reconcile_endpoint_acl_rules>`.
+
+    :param endpoint_id: The endpoint whose rules were reconciled
+    :param dry_run: If ``True``, no changes were made and the results describe the
+        changes which would be made
+    :param results: A result for each desired and each existing rule
+    """
+
+    endpoint_id: str
+    dry_run: bool
+    results: list[AclRuleResult] = dataclasses.field(default_factory=list)
+
+    def by_action(self, action: AclAction) -> list[AclRuleResult]:
+        """The results for rules with the given action."""
+        return [r for r in self.results if r.action == action]
+
+    @property
+    def changes(self) -> list[AclRuleResult]:
+        """The results for rules which were (or would be) changed."""
+        return [r for r in self.results if r.action != "unchanged"]
+
+    @property
+    def failed(self) -> list[AclRuleResult]:
+        """The results for changes which could not be made."""
+        return [r for r in self.results if not r.succeeded]
+
+    @property
+    def succeeded(self) -> bool:
+        """``True`` if every change was made."""
+        return not self.failed
+
+
+@dataclasses.dataclass
+class _Plan:
+    """
+    The changes needed to reconcile access rules, with the request to make for
+    each change.
+    """
+
+    results: list[AclRuleResult] = dataclasses.field(default_factory=list)
+    # (result, document)
+    creates: list[tuple[AclRuleResult, dict[str, t.Any]]] = dataclasses.field(
+        default_factory=list
+    )
+    # (result, rule ID, document)
+    updates: list[tuple[AclRuleResult, str, dict[str, t.Any]]] = dataclasses.field(
+        default_factory=list
+    )
+    # (result, rule ID)
+    deletes: list[tuple[AclRuleResult, str]] = dataclasses.field(default_factory=list)
+
+    @property
+    def change_count(self) -> int:
+        return len(self.creates) + len(self.updates) + len(self.deletes)
+
+
+def _plan(
+    existing: t.Iterable[dict[str, t.Any]],
+    desired: t.Iterable[t.Mapping[str, t.Any]],
+    delete_extra: bool,
+) -> _Plan:
+    """
+    Compute the changes needed to go from the existing rules to the desired ones.
+    """
+    index: dict[_RuleKey, dict[str, t.Any]] = {}
+    duplicates: list[dict[str, t.Any]] = []
+    for rule in existing:
+        # rules without IDs (e.g. the owner's implicit rule) and rules derived from
+        # roles cannot be managed through the access rule API
+        if not rule.get("id") or rule.get("role_id"):
+            continue
+        key = _rule_key(rule)
+        if key in index:
+            duplicates.append(rule)
+        else:
+            index[key] = rule
+
+    plan = _Plan()
+    seen: set[_RuleKey] = set()
+    for want in desired:
+        key = _rule_key(want)
+        if key in seen:
+            raise exc.GlobusSDKUsageError(
+                f"Duplicate desired access rule for {key[0]} '{key[1]}' on {key[2]}"
+            )
+        seen.add(key)
+        permissions = want["permissions"]
+        result = AclRuleResult("unchanged", *key, permissions=permissions)
+        plan.results.append(result)
+        have = index.get(key)
+        if have is None:
+            result.action = "create"
+            plan.creates.append((result, {"DATA_TYPE": "access", **want}))
+            continue
+
+        rule_id = result.rule_id = have["id"]
+        update: dict[str, t.Any] = {}
+        if _normalize_permissions(have.get("permissions")) != _normalize_permissions(
+            permissions
+        ):
+            update["permissions"] = permissions
+        expiration = want.get("expiration_date", MISSING)
+        if expiration is not MISSING and expiration != have.get("expiration_date"):
+            update["expiration_date"] = expiration
+        if update:
+            result.action = "update"
+            plan.updates.append(
+                (
+                    result,
+                    rule_id,
+                    {"DATA_TYPE": "access", "permissions": permissions, **update},
+                )
+            )
+
+    if delete_extra:
+        extra = [r for k, r in index.items() if k not in seen] + duplicates
+        for rule in extra:
+            result = AclRuleResult(
+                "delete",
+                *_rule_key(rule),
+                permissions=rule.get("permissions") or "",
+                rule_id=rule["id"],
+            )
+            plan.results.append(result)
+            plan.deletes.append((result, rule["id"]))
+    return plan
+
+
+def run_acl_reconcile(
+    client: TransferClient,
+    endpoint_id: uuid.UUID | str,
+    desired_rules: t.Iterable[t.Mapping[str, t.Any]],
+    *,
+    delete_extra: bool,
+    dry_run: bool,
+    max_workers: int,
+    max_requests_per_second: float | None,
+) -> AclReconcileReport:
+    if max_workers < 1:
+        raise exc.GlobusSDKUsageError(
+            "reconcile_endpoint_acl_rules max_workers has a minimum of 1"
+        )
+    existing = client.endpoint_acl_list(endpoint_id)["DATA"]
+    plan = _plan(existing, desired_rules, delete_extra)
+    report = AclReconcileReport(str(endpoint_id), dry_run, plan.results)
+    log.debug(
+        f"ACL reconcile on {endpoint_id}: {plan.change_count} changes "
+        f"of {len(plan.results)} rules (dry_run={dry_run})"
+    )
+    if dry_run or not plan.change_count:
+        return report
+
+    limiter = (
+        RateLimiter(max_requests_per_second)
+        if max_requests_per_second is not None
+        else None
+    )
+
+    def apply(result: AclRuleResult, request: t.Callable[[], t.Any]) -> None:
+        if limiter is not None:
+            limiter.wait()
+        try:
+            res = request()
+        except (exc.GlobusAPIError, exc.NetworkError) as err:
+            log.debug(f"ACL {result.action} failed for {result.path}: {err}")
+            result.error = err
+            return
+        if result.action == "create":
+            result.rule_id = res["access_id"]
+        result.applied = True
+
+    requests: list[tuple[AclRuleResult, t.Callable[[], t.Any]]] = [
+        *(
+            (result, functools.partial(client.add_endpoint_acl_rule, endpoint_id, doc))
+            for result, doc in plan.creates
+        ),
+        *(
+            (
+                result,
+                functools.partial(
+                    client.update_endpoint_acl_rule, endpoint_id, rule_id, doc
+                ),
+            )
+            for result, rule_id, doc in plan.updates
+        ),
+        *(
+            (
+                result,
+                functools.partial(
+                    client.delete_endpoint_acl_rule, endpoint_id, rule_id
+                ),
+            )
+            for result, rule_id in plan.deletes
+        ),
+    ]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for future in [pool.submit(apply, *request) for request in requests]:
+            future.result()
+    return report
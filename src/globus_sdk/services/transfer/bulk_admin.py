@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import logging
+import time
+import typing as t
+import uuid
+
+from globus_sdk import exc
+
+if t.TYPE_CHECKING:
+    from .client import TransferClient
+
+log = logging.getLogger(__name__)
+
+AdminTaskAction = t.Literal["cancel", "pause", "resume"]
+
+
+@dataclasses.dataclass
+class AdminTaskChunk:
+    """
+    A record of one request made by
+    :meth:`TransferClient.endpoint_manager_bulk_task_action
+    <globus_sdk.TransferClient.endpoint_manager_bulk_task_action>`.
+
+    :param index: The position of this chunk, counting from 0
+    :param task_ids: The IDs of the tasks in this chunk
+    :param admin_cancel_id: For cancellation, the ID of the admin cancel job
+    :param done: Whether processing of the chunk finished. Pause and resume requests
+        are done once accepted; cancellations are done once the admin cancel job
+        reports that it is done.
+    :param processed: For cancellation, the number of tasks which the admin cancel
+        job has processed
+    :param error: The error which caused the request to fail, if it failed
+    :param poll_error: For cancellation, the error from the latest failed check of
+        the status of the admin cancel job. The cancellation itself was accepted.
+    """
+
+    index: int
+    task_ids: list[str]
+    admin_cancel_id: str | None = None
+    done: bool = False
+    processed: int | None = None
+    error: Exception | None = None
+    poll_error: Exception | None = None
+
+
+@dataclasses.dataclass
+class BulkAdminTaskResult:
+    """
+    The result of
+    :meth:`TransferClient.endpoint_manager_bulk_task_action
+    <globus_sdk.TransferClient.endpoint_manager_bulk_task_action>`.
+
+    :param action: ``"cancel"``, ``"pause"``, or ``"resume"``
+    :param chunks: A record of each request, in order
+    """
+
+    action: AdminTaskAction
+    chunks: list[AdminTaskChunk] = dataclasses.field(default_factory=list)
+
+    @property
+    def processed_task_ids(self) -> list[str]:
+        """The IDs of tasks in chunks which were fully processed."""
+        return [i for c in self.chunks if c.done for i in c.task_ids]
+
+    @property
+    def pending_task_ids(self) -> list[str]:
+        """
+        The IDs of tasks in cancellation jobs which were still running, or whose
+        status could not be checked, when polling stopped.
+        """
+        return [
+            i for c in self.chunks if not c.done and c.error is None for i in c.task_ids
+        ]
+
+    @property
+    def failed_task_ids(self) -> list[str]:
+        """The IDs of tasks in chunks whose requests failed."""
+        return [i for c in self.chunks if c.error is not None for i in c.task_ids]
+
+    @property
+    def succeeded(self) -> bool:
+        """``True`` if every chunk was fully processed."""
+        return all(c.done for c in self.chunks)
+
+
+def _submit_chunk(
+    client: TransferClient,
+    action: AdminTaskAction,
+    chunk: AdminTaskChunk,
+    message: str,
+) -> None:
+    try:
+        if action == "pause":
+            client.endpoint_manager_pause_tasks(chunk.task_ids, message)
+        elif action == "resume":
+            client.endpoint_manager_resume_tasks(chunk.task_ids)
+        else:
+            res = client.endpoint_manager_cancel_tasks(chunk.task_ids, message)
+            chunk.admin_cancel_id = str(res["id"])
+            chunk.processed = res.get("processed")
+            chunk.done = bool(res.get("done"))
+            return
+    except (exc.GlobusAPIError, exc.NetworkError) as err:
+        log.debug(f"admin {action} of chunk {chunk.index} failed: {err}")
+        chunk.error = err
+        return
+    chunk.done = True
+
+
+def _poll_chunk(client: TransferClient, chunk: AdminTaskChunk) -> bool:
+    """
+    Check the status of a chunk's cancellation, and return whether to check it again
+    if it is not done.
+    """
+    if chunk.admin_cancel_id is None:
+        # the cancellation was never submitted, so there is nothing to check
+        return False
+    try:
+        status = client.endpoint_manager_cancel_status(chunk.admin_cancel_id)
+    except (exc.GlobusAPIError, exc.NetworkError) as err:
+        log.debug(f"polling admin cancel {chunk.admin_cancel_id} failed: {err}")
+        chunk.poll_error = err
+        # the cancellation was accepted, so transient errors are retried
+        return not isinstance(err, exc.GlobusAPIError) or (
+            err.http_status == 429 or err.http_status >= 500
+        )
+    chunk.poll_error = None
+    chunk.processed = status.get("processed")
+    chunk.done = bool(status.get("done"))
+    return True
+
+
+def _wait_for_cancellations(
+    client: TransferClient,
+    pool: concurrent.futures.ThreadPoolExecutor,
+    chunks: list[AdminTaskChunk],
+    *,
+    timeout: float | None,
+    initial_interval: float,
+    max_interval: float,
+) -> None:
+    # as in task_wait, time is counted as the time spent waiting
+    interval, elapsed = initial_interval, 0.0
+    pending = [c for c in chunks if c.admin_cancel_id is not None and not c.done]
+    while pending:
+        if timeout is not None and elapsed >= timeout:
+            log.debug(f"{len(pending)} admin cancels timed out")
+            return
+        delay = interval if timeout is None else min(interval, timeout - elapsed)
+        time.sleep(delay)
+        elapsed += delay
+        interval = min(interval * 2, max_interval)
+        futures = {c.index: pool.submit(_poll_chunk, client, c) for c in pending}
+        pending = [c for c in pending if futures[c.index].result() and not c.done]
+
+
+def run_bulk_admin_action(
+    client: TransferClient,
+    action: AdminTaskAction,
+    task_ids: t.Iterable[uuid.UUID | str],
+    message: str | None,
+    *,
+    chunk_size: int,
+    max_workers: int,
+    wait: bool,
+    timeout: float | None,
+    initial_interval: float,
+    max_interval: float,
+) -> BulkAdminTaskResult:
+    if action not in ("cancel", "pause", "resume"):
+        raise exc.GlobusSDKUsageError(f"Unknown admin task action: {action!r}")
+    if action != "resume" and not message:
+        raise exc.GlobusSDKUsageError(f"A message is required to {action} tasks")
+    if chunk_size < 1 or max_workers < 1:
+        raise exc.GlobusSDKUsageError(
+            "endpoint_manager_bulk_task_action chunk_size and max_workers have a "
+            "minimum of 1"
+        )
+    if not 0 < initial_interval <= max_interval:
+        raise exc.GlobusSDKUsageError(
+            "endpoint_manager_bulk_task_action requires "
+            "0 < initial_interval <= max_interval"
+        )
+
+    # de-duplicate, preserving order
+    unique_ids = list(dict.fromkeys(str(i) for i in task_ids))
+    result = BulkAdminTaskResult(action)
+    for index, start in enumerate(range(0, len(unique_ids), chunk_size)):
+        result.chunks.append(
+            AdminTaskChunk(index, unique_ids[start : start + chunk_size])
+        )
+    log.debug(
+        f"admin {action} of {len(unique_ids)} tasks in {len(result.chunks)} chunks"
+    )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # every chunk is submitted before any cancellation is polled
+        futures = [
+            pool.submit(_submit_chunk, client, action, chunk, message or "")
+            for chunk in result.chunks
+        ]
+        for future in futures:
+            future.result()
+        if wait and action == "cancel":
+            _wait_for_cancellations(
+                client,
+                pool,
+                result.chunks,
+                timeout=timeout,
+                initial_interval=initial_interval,
+                max_interval=max_interval,
+            )
+    return result
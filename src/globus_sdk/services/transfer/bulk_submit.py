@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import concurrent.futures
+import copy
+import dataclasses
+import itertools
+import logging
+import random
+import time
+import typing as t
+
+from globus_sdk import exc
+from globus_sdk._missing import MISSING
+from globus_sdk.transport.representation_providers import RequestsJsonProvider
+
+from .data import DeleteData, TransferData
+
+if t.TYPE_CHECKING:
+    from globus_sdk import response
+
+    from .client import TransferClient
+
+log = logging.getLogger(__name__)
+
+_TaskDocument = t.Union[TransferData, DeleteData]
+
+# statuses on which a submission is retried with the same submission_id
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# the encoded size of a '"submission_id": "<uuid>", ' field, rounded up
+_SUBMISSION_ID_RESERVE = 64
+# the size of the widest separator between encoded items, ', '
+_ITEM_SEPARATOR_SIZE = 2
+# the default maximum size of each submitted task document
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+
+@dataclasses.dataclass
+class SubmissionChunk:
+    """
+    A record of one task submitted by
+    :meth:`TransferClient.bulk_submit <globus_sdk.TransferClient.bulk_submit>`.
+
+    :param index: The position of this chunk, counting from 0
+    :param item_count: The number of items in the chunk
+    :param size_bytes: The estimated size of the encoded chunk
+    :param first_path: The path of the first item, for identifying the chunk
+    :param submission_id: The submission ID used for this chunk
+    :param task_id: The ID of the resulting task, if submission succeeded
+    :param attempts: The number of submission attempts made
+    :param error: The error which caused submission to fail, if it failed
+    :param data: The document for this chunk, kept only if submission failed so
+        that it can be resubmitted
+    """
+
+    index: int
+    item_count: int
+    size_bytes: int
+    first_path: str | None = None
+    submission_id: str | None = None
+    task_id: str | None = None
+    attempts: int = 0
+    error: Exception | None = None
+    data: _TaskDocument | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.task_id is not None
+
+
+@dataclasses.dataclass
+class BulkSubmitManifest:
+    """
+    The result of
+    :meth:`TransferClient.bulk_submit <globus_sdk.TransferClient.bulk_submit>`,
+    mapping each chunk of items to its task.
+
+    :param chunks: A record for each chunk, in submission order
+    """
+
+    chunks: list[SubmissionChunk] = dataclasses.field(default_factory=list)
+
+    @property
+    def task_ids(self) -> list[str]:
+        """The IDs of all tasks which were created."""
+        return [c.task_id for c in self.chunks if c.task_id is not None]
+
+    @property
+    def failed(self) -> list[SubmissionChunk]:
+        """The chunks which could not be submitted."""
+        return [c for c in self.chunks if not c.succeeded]
+
+    @property
+    def succeeded(self) -> bool:
+        """``True`` if every chunk was submitted."""
+        return not self.failed
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Render the manifest as a JSON-serializable dict."""
+        return {
+            "chunks": [
+                {
+                    "index": c.index,
+                    "item_count": c.item_count,
+                    "size_bytes": c.size_bytes,
+                    "first_path": c.first_path,
+                    "submission_id": c.submission_id,
+                    "task_id": c.task_id,
+                    "attempts": c.attempts,
+                    "error": None if c.error is None else str(c.error),
+                }
+                for c in self.chunks
+            ]
+        }
+
+
+def _encoded_size(provider: RequestsJsonProvider, value: t.Any) -> int:
+    # measured with the same encoding as the submitted document
+    return len(provider.encode_json(value))
+
+
+def _iter_chunks(
+    template: _TaskDocument,
+    items: t.Iterable[dict[str, t.Any]],
+    *,
+    max_items: int,
+    max_bytes: int,
+) -> t.Iterator[tuple[_TaskDocument, int]]:
+    """
+    Lazily split items into copies of ``template`` with at most ``max_items`` items
+    and an encoded size of at most ``max_bytes`` (unless a single item is larger).
+    Yields each document with its estimated size.
+    """
+    provider = RequestsJsonProvider()
+    base = copy.copy(template)
+    base["DATA"] = []
+    # leave room for the submission_id which will be added to each chunk
+    base_size = _encoded_size(provider, base) + _SUBMISSION_ID_RESERVE
+
+    def new_chunk() -> _TaskDocument:
+        chunk = copy.copy(base)
+        chunk["DATA"] = []
+        return chunk
+
+    chunk, size = new_chunk(), base_size
+    for item in items:
+        item_size = _encoded_size(provider, item) + _ITEM_SEPARATOR_SIZE
+        if chunk["DATA"] and (
+            len(chunk["DATA"]) >= max_items or size + item_size > max_bytes
+        ):
+            yield chunk, size
+            chunk, size = new_chunk(), base_size
+        chunk["DATA"].append(item)
+        size += item_size
+    if chunk["DATA"]:
+        yield chunk, size
+
+
+def _submit_chunk(
+    client: TransferClient,
+    chunk: _TaskDocument,
+    record: SubmissionChunk,
+    max_attempts: int,
+) -> None:
+    """
+    Submit one chunk, retrying on network errors and transient service errors.
+
+    The submission ID is fetched on the first attempt and reused by every retry,
+    so a retry of a submission which was in fact accepted cannot create a
+    duplicate task.
+    """
+    submit = (
+        client.submit_delete
+        if chunk["DATA_TYPE"] == "delete"
+        else client.submit_transfer
+    )
+    while True:
+        record.attempts += 1
+        try:
+            res: response.GlobusHTTPResponse = submit(chunk)
+        except (exc.NetworkError, exc.GlobusAPIError) as err:
+            if chunk.get("submission_id", MISSING) is not MISSING:
+                record.submission_id = str(chunk["submission_id"])
+            retryable = isinstance(err, exc.NetworkError) or (
+                err.http_status in _RETRY_STATUSES
+            )
+            if not retryable or record.attempts >= max_attempts:
+                record.error = err
+                record.data = chunk
+                return
+            backoff = (0.5 + random.random()) * 2 ** (record.attempts - 1)
+            log.debug(
+                f"bulk_submit chunk {record.index} failed ({err}), "
+                f"retrying in {backoff:.1f}s"
+            )
+            time.sleep(backoff)
+            continue
+        record.submission_id = str(chunk["submission_id"])
+        record.task_id = res["task_id"]
+        return
+
+
+def run_bulk_submit(
+    client: TransferClient,
+    data: _TaskDocument,
+    items: t.Iterable[dict[str, t.Any]] | None,
+    *,
+    max_items: int,
+    max_bytes: int,
+    max_workers: int,
+    max_attempts: int,
+) -> BulkSubmitManifest:
+    if data.get("submission_id", MISSING) is not MISSING:
+        raise exc.GlobusSDKUsageError(
+            "bulk_submit requires a document without a submission_id, as "
+            "each chunk is given its own submission_id"
+        )
+    if max_items < 1 or max_workers < 1 or max_attempts < 1:
+        raise exc.GlobusSDKUsageError(
+            "bulk_submit max_items, max_workers, and max_attempts have a minimum of 1"
+        )
+
+    manifest = BulkSubmitManifest()
+    all_items = itertools.chain(data.get("DATA", ()), items or ())
+    chunks = _iter_chunks(data, all_items, max_items=max_items, max_bytes=max_bytes)
+
+    in_flight: set[concurrent.futures.Future[None]] = set()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # chunks are built lazily, and only max_workers are held at once
+        for index, (chunk, size) in enumerate(chunks):
+            if len(in_flight) >= max_workers:
+                done, in_flight = concurrent.futures.wait(
+                    in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    future.result()
+            first = chunk["DATA"][0]
+            record = SubmissionChunk(
+                index=index,
+                item_count=len(chunk["DATA"]),
+                size_bytes=size,
+                first_path=first.get("source_path", first.get("path")),
+            )
+            manifest.chunks.append(record)
+            in_flight.add(
+                pool.submit(_submit_chunk, client, chunk, record, max_attempts)
+            )
+        for future in concurrent.futures.as_completed(in_flight):
+            future.result()
+
+    for record in manifest.chunks:
+        if record.error is not None:
+            log.warning(f"bulk_submit chunk {record.index} failed: {record.error}")
+    return manifest
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import time
+import types
+import typing as t
+import zlib
+
+from globus_sdk import exc
+from globus_sdk._missing import MISSING
+
+from .data import TransferData
+
+log = logging.getLogger(__name__)
+
+ChecksumAlgorithm = t.Literal["MD5", "SHA1", "SHA256", "SHA512", "ADLER32"]
+
+_HASHLIB_NAMES = {"MD5": "md5", "SHA1": "sha1", "SHA256": "sha256", "SHA512": "sha512"}
+# the number of digests written to the index in each transaction
+_INDEX_BATCH_SIZE = 1000
+
+
+class _Adler32:
+    """A hashlib-like wrapper around ``zlib.adler32``."""
+
+    def __init__(self) -> None:
+        self.value = 1
+
+    def update(self, data: t.Any) -> None:
+        self.value = zlib.adler32(data, self.value)
+
+    def hexdigest(self) -> str:
+        return f"{self.value:08x}"
+
+
+def _new_hash(algorithm: str) -> t.Any:
+    if algorithm == "ADLER32":
+        return _Adler32()
+    return hashlib.new(_HASHLIB_NAMES[algorithm])
+
+
+def _hash_file(
+    path: str, algorithm: str, chunk_size: int, stat_key: tuple[int, int]
+) -> str:
+    """
+    Compute the checksum of a file. Runs in a worker process.
+
+    The file is memory-mapped where possible, and otherwise read in chunks of
+    ``chunk_size`` into a reused buffer. An error is raised if the file changes
+    while it is being read.
+    """
+    hasher = _new_hash(algorithm)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        try:
+            if size == 0:
+                raise ValueError("cannot mmap an empty file")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as mapped_view:
+                    for start in range(0, size, chunk_size):
+                        hasher.update(mapped_view[start : start + chunk_size])
+        except (ValueError, OSError):
+            hasher = _new_hash(algorithm)
+            f.seek(0)
+            buf = bytearray(chunk_size)
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                hasher.update(view[:n])
+    st = os.stat(path)
+    if (st.st_size, st.st_mtime_ns) != stat_key:
+        raise OSError(f"{path} changed while its checksum was being computed")
+    return str(hasher.hexdigest())
+
+
+@dataclasses.dataclass
+class ChecksumReport:
+    """
+    A summary of the work done by
+    :meth:`globus_sdk.TransferChecksumCalculator.fill`.
+
+    :param files_hashed: Files whose checksums were computed
+    :param files_cached: Files whose checksums were found in the index
+    :param files_skipped: Items which were skipped, because they are directories or
+        already have a checksum
+    :param bytes_hashed: The total size of ``files_hashed``
+    :param elapsed: The number of seconds taken
+    :param errors: Paths which could not be read, with the error for each
+    """
+
+    files_hashed: int = 0
+    files_cached: int = 0
+    files_skipped: int = 0
+    bytes_hashed: int = 0
+    elapsed: float = 0.0
+    errors: list[tuple[str, OSError]] = dataclasses.field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """The number of bytes hashed per second."""
+        return self.bytes_hashed / self.elapsed if self.elapsed else 0.0
+
+
+class TransferChecksumCalculator:
+    """
+    Compute checksums of local files in parallel, and fill them into the items of a
+    :class:`TransferData <globus_sdk.TransferData>` as ``external_checksum`` and
+    ``checksum_algorithm``.
+
+    Files are hashed in a pool of worker processes, reading each file through a
+    memory map, or in large chunks where a file cannot be mapped.
+
+    If ``index_path`` is given, digests are saved in a SQLite database keyed by
+    path, size, and modification time, so that unchanged files are not hashed
+    again on later runs.
+
+    :param algorithm: The checksum algorithm: ``"MD5"``, ``"SHA1"``, ``"SHA256"``,
+        ``"SHA512"``, or ``"ADLER32"``. [Default: ``"SHA256"``]
+    :param index_path: The path of a SQLite database in which to cache digests
+    :param max_workers: The number of worker processes. Defaults to the number of
+        CPUs.
+    :param use_processes: Hash in worker processes rather than threads. Threads
+        avoid the cost of starting processes, and still hash in parallel for the
+        hashlib algorithms. [Default: ``True``]
+    :param chunk_size: The number of bytes hashed at a time. [Default: 8 MiB]
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                tdata = TransferData(source_endpoint_id, dest_endpoint_id)
+                for name in os.listdir("/data/run42"):
+                    tdata.add_item(f"/data/run42/{name}", f"/archive/run42/{name}")
+
+                with TransferChecksumCalculator(index_path="checksums.db") as calc:
+                    report = calc.fill(tdata)
+                print(f"{report.throughput / 2**20:.1f} MiB/s")
+
+                tc = TransferClient(...)
+                tc.submit_transfer(tdata)
+    """
+
+    def __init__(
+        self,
+        algorithm: ChecksumAlgorithm = "SHA256",
+        *,
+        index_path: str | os.PathLike[str] | None = None,
+        max_workers: int | None = None,
+        use_processes: bool = True,
+        chunk_size: int = 8 * 1024 * 1024,
+    ) -> None:
+        if algorithm not in _HASHLIB_NAMES and algorithm != "ADLER32":
+            raise exc.GlobusSDKUsageError(
+                f"Unsupported checksum algorithm: {algorithm!r}"
+            )
+        if chunk_size < 1:
+            raise exc.GlobusSDKUsageError(
+                "TransferChecksumCalculator chunk_size has a minimum of 1"
+            )
+        self.algorithm = algorithm
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.chunk_size = chunk_size
+
+        self._index: sqlite3.Connection | None = None
+        if index_path is not None:
+            self._index = sqlite3.connect(os.fspath(index_path))
+            self._index.execute(
+                "CREATE TABLE IF NOT EXISTS checksums ("
+                "path TEXT NOT NULL, algorithm TEXT NOT NULL, size INTEGER NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL, "
+                "PRIMARY KEY (path, algorithm))"
+            )
+            self._index.commit()
+
+    def __enter__(self) -> TransferChecksumCalculator:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the index database, if there is one."""
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def _lookup(self, path: str, stat_key: tuple[int, int]) -> str | None:
+        if self._index is None:
+            return None
+        row = self._index.execute(
+            "SELECT digest FROM checksums "
+            "WHERE path = ? AND algorithm = ? AND size = ? AND mtime_ns = ?",
+            (path, self.algorithm, *stat_key),
+        ).fetchone()
+        return None if row is None else str(row[0])
+
+    def _save(self, rows: list[tuple[str, str, int, int, str]]) -> None:
+        if self._index is not None and rows:
+            with self._index:
+                self._index.executemany(
+                    "INSERT OR REPLACE INTO checksums VALUES (?, ?, ?, ?, ?)", rows
+                )
+        rows.clear()
+
+    def fill(
+        self,
+        data: TransferData,
+        *,
+        local_path: t.Callable[[str], str] | None = None,
+        overwrite: bool = False,
+    ) -> ChecksumReport:
+        """
+        Compute a checksum for each file item in ``data``, and set its
+        ``external_checksum`` and ``checksum_algorithm``.
+
+        Recursive items, directories, and items which already have an
+        ``external_checksum`` (unless ``overwrite`` is set) are skipped. Files which
+        cannot be read are recorded in the report's ``errors`` and left unchanged.
+
+        :param data: The document whose items are updated in place
+        :param local_path: A function which maps the ``source_path`` of an item to
+            the path of the file on this machine. By default, ``source_path`` is
+            used as-is.
+        :param overwrite: Replace existing checksums. [Default: ``False``]
+        """
+        report = ChecksumReport()
+        start_time = time.monotonic()
+        items = data["DATA"]
+        pending_rows: list[tuple[str, str, int, int, str]] = []
+
+        def fill_item(index: int, item: dict[str, t.Any], digest: str) -> None:
+            # replace the item, as items produced by iterating over a compact item
+            # list are read-only
+            items[index] = {
+                **item,
+                "external_checksum": digest,
+                "checksum_algorithm": self.algorithm,
+            }
+
+        executor_class = (
+            concurrent.futures.ProcessPoolExecutor
+            if self.use_processes
+            else concurrent.futures.ThreadPoolExecutor
+        )
+        in_flight: dict[
+            concurrent.futures.Future[str],
+            tuple[int, dict[str, t.Any], str, tuple[int, int]],
+        ] = {}
+
+        def collect(futures: t.Iterable[concurrent.futures.Future[str]]) -> None:
+            for future in futures:
+                index, item, path, stat_key = in_flight.pop(future)
+                try:
+                    digest = future.result()
+                except OSError as err:
+                    report.errors.append((path, err))
+                    continue
+                fill_item(index, item, digest)
+                report.files_hashed += 1
+                report.bytes_hashed += stat_key[0]
+                pending_rows.append((path, self.algorithm, *stat_key, digest))
+                if len(pending_rows) >= _INDEX_BATCH_SIZE:
+                    self._save(pending_rows)
+
+        with executor_class(max_workers=self.max_workers) as pool:
+            # iterate lazily, so that compact item lists stay compact
+            for index, item in enumerate(iter(items)):
+                if item.get("recursive") is True or (
+                    not overwrite
+                    and item.get("external_checksum", MISSING) not in (MISSING, None)
+                ):
+                    report.files_skipped += 1
+                    continue
+                path = item["source_path"]
+                if local_path is not None:
+                    path = local_path(path)
+                try:
+                    st = os.stat(path)
+                except OSError as err:
+                    report.errors.append((path, err))
+                    continue
+                if not os.path.isfile(path):
+                    report.files_skipped += 1
+                    continue
+                stat_key = (st.st_size, st.st_mtime_ns)
+
+                cached = self._lookup(path, stat_key)
+                if cached is not None:
+                    fill_item(index, item, cached)
+                    report.files_cached += 1
+                    continue
+
+                # bound the number of outstanding files
+                if len(in_flight) >= self.max_workers * 4:
+                    done, _ = concurrent.futures.wait(
+                        in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    collect(done)
+                future = pool.submit(
+                    _hash_file, path, self.algorithm, self.chunk_size, stat_key
+                )
+                in_flight[future] = (index, item, path, stat_key)
+            collect(concurrent.futures.as_completed(list(in_flight)))
+        self._save(pending_rows)
+
+        report.elapsed = time.monotonic() - start_time
+        log.debug(
+            "checksummed %d files (%d bytes) in %.2fs, %d cached, %d errors",
+            report.files_hashed,
+            report.bytes_hashed,
+            report.elapsed,
+            report.files_cached,
+            len(report.errors),
+        )
+        return report
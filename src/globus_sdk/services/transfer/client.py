@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import datetime
 import logging
+import os
+import re
 import time
 import typing as t
 import uuid
@@ -9,15 +14,32 @@ from globus_sdk import client, exc, paging, response
 from globus_sdk._internal import guards
 from globus_sdk._internal.remarshal import commajoin
 from globus_sdk._internal.type_definitions import DateLike, IntLike
+from globus_sdk._internal.utils import sha256_string
 from globus_sdk._missing import MISSING, MissingType
+from globus_sdk.authorizers import (
+    AccessTokenAuthorizer,
+    BasicAuthorizer,
+    ClientCredentialsAuthorizer,
+    GlobusAuthorizer,
+    NullAuthorizer,
+    RefreshTokenAuthorizer,
+)
 from globus_sdk.response import IterableJSONAPIResponse
 from globus_sdk.scopes import GCSCollectionScopes, Scope, TransferScopes
 from globus_sdk.transport import RetryConfig
 
+from .acl_reconcile import AclReconcileReport, run_acl_reconcile
+from .bulk_admin import AdminTaskAction, BulkAdminTaskResult, run_bulk_admin_action
+from .bulk_submit import DEFAULT_MAX_BYTES, BulkSubmitManifest, run_bulk_submit
 from .data import CreateTunnelData, DeleteData, TransferData
 from .errors import TransferAPIError
+from .listing_cache import TransferListingCache
+from .remote_find import run_find_files
 from .response import IterableTransferResponse
+from .submission_id_pool import TransferSubmissionIDPool
+from .task_export import TaskExportResult, TaskRecordKind, run_task_export
 from .transport import TRANSFER_DEFAULT_RETRY_CHECKS
+from .tunnel_events import run_follow_tunnel_events
 
 log = logging.getLogger(__name__)
 
@@ -65,10 +87,44 @@ def _format_filter(
     return _format_filter_item(x)
 
 
+def _join_dir_path(dirpath: str, name: str) -> str:
+    """
+    Join a directory path and a child directory name, producing a directory path
+    with a trailing slash, as Transfer uses for directories.
+    """
+    if not dirpath.endswith("/"):
+        dirpath += "/"
+    return f"{dirpath}{name}/"
+
+
+def _normalize_task_id(task_id: uuid.UUID | str) -> str:
+    # task IDs are UUIDs, which Transfer lists in lowercase
+    try:
+        return str(uuid.UUID(str(task_id)))
+    except ValueError:
+        return str(task_id)
+
+
 def _get_page_size(paged_result: IterableTransferResponse) -> int:
     return len(paged_result["DATA"])
 
 
+def _authorizer_identity(authorizer: GlobusAuthorizer) -> str | None:
+    """
+    Derive a value which distinguishes the user of an authorizer, or ``None`` if
+    the authorizer type is not known. Credentials are only included as hashes.
+    """
+    if isinstance(authorizer, AccessTokenAuthorizer):
+        return f"access_token:{authorizer.access_token_hash}"
+    if isinstance(authorizer, RefreshTokenAuthorizer):
+        return f"refresh_token:{sha256_string(authorizer.refresh_token)}"
+    if isinstance(authorizer, ClientCredentialsAuthorizer):
+        return f"client:{authorizer.confidential_client.client_id}"
+    if isinstance(authorizer, BasicAuthorizer):
+        return f"basic:{authorizer.username}"
+    return None
+
+
 class TransferClient(client.BaseClient):
     r"""
     Client for the
@@ -76,6 +132,14 @@ class TransferClient(client.BaseClient):
 
     .. sdk-sphinx-copy-params:: BaseClient
 
+        :param listing_cache: A cache for ``operation_ls`` and ``operation_stat``
+            results. See :class:`TransferListingCache
+            <globus_sdk.TransferListingCache>`.
+        :param listing_cache_identity: A value which distinguishes this client's user
+            in a shared ``listing_cache``, such as the user's identity ID. If
+            omitted, it is derived from the client's authorizer. It is required when
+            the client uses an ``app``.
+
     This class provides helper methods for most common resources in the
     REST API, and basic ``get``, ``put``, ``post``, and ``delete`` methods
     from the base rest client that can be used to access any REST resource.
@@ -139,6 +203,50 @@ class TransferClient(client.BaseClient):
     # because we know that the classproperty of this name will evaluate to a string
     resource_server: str
 
+    #: An optional reserve of submission IDs used by ``submit_transfer`` and
+    #: ``submit_delete``.
+    #: See :class:`TransferSubmissionIDPool <globus_sdk.TransferSubmissionIDPool>`.
+    submission_id_pool: TransferSubmissionIDPool | None = None
+
+    def __init__(
+        self,
+        *,
+        listing_cache: TransferListingCache | None = None,
+        listing_cache_identity: str | None = None,
+        **kwargs: t.Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.listing_cache = listing_cache
+        self.listing_cache_identity = listing_cache_identity
+        if listing_cache is not None:
+            # fail early if the identity cannot be determined
+            self._get_listing_cache_identity()
+
+    def _get_listing_cache_identity(self) -> str | None:
+        """
+        Get the value which distinguishes this client's user in the
+        ``listing_cache``, so that a shared cache never serves one user's listings
+        to another.
+        """
+        if self.listing_cache_identity is not None:
+            return self.listing_cache_identity
+        if self._app is not None:
+            raise exc.GlobusSDKUsageError(
+                "A TransferClient using an app requires a listing_cache_identity "
+                "to use a listing_cache."
+            )
+        if self.authorizer is None or isinstance(self.authorizer, NullAuthorizer):
+            # requests are unauthenticated, and are the same for every caller
+            return None
+        identity = _authorizer_identity(self.authorizer)
+        if identity is None:
+            raise exc.GlobusSDKUsageError(
+                "A TransferClient using a "
+                f"{type(self.authorizer).__name__} requires a "
+                "listing_cache_identity to use a listing_cache."
+            )
+        return identity
+
     def _register_standard_retry_checks(self, retry_config: RetryConfig) -> None:
         """Override the default retry checks."""
         retry_config.checks.register_many_checks(TRANSFER_DEFAULT_RETRY_CHECKS)
@@ -985,6 +1093,75 @@ class TransferClient(client.BaseClient):
         )
         return self.delete(f"/v0.10/endpoint/{endpoint_id}/access/{rule_id}")
 
+    def reconcile_endpoint_acl_rules(
+        self,
+        endpoint_id: uuid.UUID | str,
+        desired_rules: t.Iterable[t.Mapping[str, t.Any]],
+        *,
+        delete_extra: bool = False,
+        dry_run: bool = False,
+        max_workers: int = 4,
+        max_requests_per_second: float | None = 10,
+    ) -> AclReconcileReport:
+        """
+        Make the access rules of an endpoint match a desired set of rules, with as
+        few changes as possible.
+
+        The existing rules are read with a single call to
+        :meth:`endpoint_acl_list`. Rules are matched on ``principal_type``,
+        ``principal``, and ``path``. Desired rules which do not exist are created,
+        and matching rules whose ``permissions`` (or ``expiration_date``, if given)
+        differ are updated. Existing rules which are not desired are deleted only if
+        ``delete_extra`` is ``True``. Rules derived from roles are never changed.
+
+        Changes are applied concurrently. A failed change does not stop the others;
+        the error is recorded in the result for that rule.
+
+        :param endpoint_id: The endpoint whose rules are reconciled
+        :param desired_rules: ``access`` documents describing the desired rules, as
+            would be passed to :meth:`add_endpoint_acl_rule`
+        :param delete_extra: Delete existing rules which are not desired. Use
+            ``dry_run`` first to review the deletions. [Default: ``False``]
+        :param dry_run: Compute the changes but do not make them.
+            [Default: ``False``]
+        :param max_workers: The maximum number of concurrent requests.
+            [Default: ``4``]
+        :param max_requests_per_second: The maximum rate of requests, or ``None``
+            for no limit. [Default: ``10``]
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                .. code-block:: python
+
+                    tc = TransferClient(...)
+                    desired = [
+                        {
+                            "principal_type": "identity",
+                            "principal": identity_id,
+                            "path": f"/projects/{name}/",
+                            "permissions": "rw",
+                        }
+                        for name, identity_id in project_owners.items()
+                    ]
+                    report = tc.reconcile_endpoint_acl_rules(
+                        collection_id, desired, delete_extra=True, dry_run=True
+                    )
+                    for result in report.changes:
+                        print(result.action, result.principal, result.path)
+        """
+        log.debug(f"TransferClient.reconcile_endpoint_acl_rules({endpoint_id}, ...)")
+        return run_acl_reconcile(
+            self,
+            endpoint_id,
+            desired_rules,
+            delete_extra=delete_extra,
+            dry_run=dry_run,
+            max_workers=max_workers,
+            max_requests_per_second=max_requests_per_second,
+        )
+
     #
     # Bookmarks
     #
@@ -1194,11 +1371,27 @@ class TransferClient(client.BaseClient):
             **(query_params or {}),
         }
         log.debug(f"TransferClient.operation_ls({endpoint_id}, {query_params})")
-        return IterableTransferResponse(
+        cache, cache_key = self.listing_cache, None
+        if cache is not None:
+            cache_key = cache.make_key(
+                "ls",
+                endpoint_id,
+                query_params["path"],
+                {k: v for k, v in query_params.items() if k != "path"},
+                identity=self._get_listing_cache_identity(),
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                log.debug("operation_ls result served from listing_cache")
+                return t.cast(IterableTransferResponse, cached)
+        result = IterableTransferResponse(
             self.get(
                 f"/v0.10/operation/endpoint/{endpoint_id}/ls", query_params=query_params
             )
         )
+        if cache is not None and cache_key is not None:
+            cache.set(cache_key, result)
+        return result
 
     def operation_mkdir(
         self,
@@ -1242,11 +1435,14 @@ class TransferClient(client.BaseClient):
             "path": path,
             "local_user": local_user,
         }
-        return self.post(
+        result = self.post(
             f"/v0.10/operation/endpoint/{endpoint_id}/mkdir",
             data=json_body,
             query_params=query_params,
         )
+        if self.listing_cache is not None:
+            self.listing_cache.invalidate(endpoint_id, [path])
+        return result
 
     def operation_rename(
         self,
@@ -1293,11 +1489,14 @@ class TransferClient(client.BaseClient):
             "new_path": newpath,
             "local_user": local_user,
         }
-        return self.post(
+        result = self.post(
             f"/v0.10/operation/endpoint/{endpoint_id}/rename",
             data=json_body,
             query_params=query_params,
         )
+        if self.listing_cache is not None:
+            self.listing_cache.invalidate(endpoint_id, [oldpath, newpath])
+        return result
 
     def operation_stat(
         self,
@@ -1341,9 +1540,246 @@ class TransferClient(client.BaseClient):
             **(query_params or {}),
         }
         log.debug(f"TransferClient.operation_stat({endpoint_id}, {query_params})")
-        return self.get(
+        cache, cache_key = self.listing_cache, None
+        if cache is not None:
+            cache_key = cache.make_key(
+                "stat",
+                endpoint_id,
+                query_params["path"],
+                {k: v for k, v in query_params.items() if k != "path"},
+                identity=self._get_listing_cache_identity(),
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                log.debug("operation_stat result served from listing_cache")
+                return t.cast(response.GlobusHTTPResponse, cached)
+        result = self.get(
             f"/v0.10/operation/endpoint/{endpoint_id}/stat", query_params=query_params
         )
+        if cache is not None and cache_key is not None:
+            cache.set(cache_key, result)
+        return result
+
+    def walk(
+        self,
+        endpoint_id: uuid.UUID | str,
+        path: str = "/~/",
+        *,
+        max_depth: int | None = None,
+        max_workers: int = 4,
+        show_hidden: bool | MissingType = MISSING,
+        # pylint: disable=redefined-builtin
+        filter: (
+            str | TransferFilterDict | list[str | TransferFilterDict] | MissingType
+        ) = MISSING,
+        local_user: str | MissingType = MISSING,
+        follow_links: bool = False,
+        on_error: (
+            t.Callable[[str, exc.GlobusAPIError | exc.NetworkError], None] | None
+        ) = None,
+    ) -> t.Iterator[tuple[str, list[dict[str, t.Any]], list[dict[str, t.Any]]]]:
+        """
+        Walk a directory tree on a collection, in the style of :func:`os.walk`.
+
+        For each directory visited, yields a tuple of ``(dirpath, dirs, files)``.
+        ``dirpath`` is the path of the directory, always ending in ``/``.
+        ``dirs`` and ``files`` are lists of the file documents returned by
+        :meth:`operation_ls` for the subdirectories and non-directory entries of
+        ``dirpath``, respectively.
+
+        Directories are listed breadth-first, with up to ``max_workers`` listings in
+        flight at once. Results are yielded as listings complete, so the order of
+        results is not deterministic when ``max_workers > 1``. Only the directories
+        waiting to be listed are held in memory, never the whole tree.
+
+        As with :func:`os.walk`, the caller may modify ``dirs`` in-place (e.g. with
+        ``del`` or slice assignment) to prevent the walk from descending into some
+        subdirectories.
+
+        :param endpoint_id: The ID of the collection to walk
+        :param path: The path of the directory at which to start the walk
+        :param max_depth: The maximum depth of directories to descend into. ``0``
+            lists only ``path`` itself. By default, there is no limit.
+        :param max_workers: The maximum number of concurrent directory listings.
+            Minimum 1. [Default: ``4``]
+        :param show_hidden: Show hidden files (names beginning in dot), passed to
+            :meth:`operation_ls`.
+        :param filter: Only return file documents which match these filter clauses,
+            as in :meth:`operation_ls`. The filter is applied by the Transfer service
+            and only limits ``files``: directories are always listed so that the walk
+            can descend into them.
+        :param local_user: Optional value passed to identity mapping specifying which
+            local user account to map to. Only usable with Globus Connect Server v5
+            mapped collections.
+        :param follow_links: Descend into symlinks which point at directories.
+            [Default: ``False``]
+        :param on_error: A callback which is invoked with the path and the error
+            when a directory cannot be listed, because of an API error or a network
+            error. The walk continues with other directories. By default, errors are
+            logged and the directory is skipped.
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                Print every file in a tree, skipping any ``.git`` directories:
+
+                .. code-block:: python
+
+                    tc = globus_sdk.TransferClient(...)
+                    for dirpath, dirs, files in tc.walk(ep_id, "/~/project1/"):
+                        dirs[:] = [d for d in dirs if d["name"] != ".git"]
+                        for f in files:
+                            print(dirpath + f["name"], f["size"])
+        """
+        log.debug(f"TransferClient.walk({endpoint_id}, {path}, ...)")
+        if max_workers < 1:
+            raise exc.GlobusSDKUsageError(
+                "TransferClient.walk max_workers has a minimum of 1"
+            )
+
+        # the Transfer service returns an entry if it matches *any* of the filter
+        # params, so an extra 'type:dir' clause ensures we can always descend
+        if filter is not MISSING:
+            filter = [*(filter if isinstance(filter, list) else [filter]), "type:dir"]
+
+        def list_dir(dirpath: str) -> IterableTransferResponse:
+            return self.operation_ls(
+                endpoint_id,
+                path=dirpath,
+                show_hidden=show_hidden,
+                filter=filter,
+                local_user=local_user,
+            )
+
+        pending: collections.deque[tuple[str, int]] = collections.deque(
+            [(path if path.endswith("/") else f"{path}/", 0)]
+        )
+        in_flight: dict[
+            concurrent.futures.Future[IterableTransferResponse], tuple[str, int]
+        ] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            try:
+                while pending or in_flight:
+                    while pending and len(in_flight) < max_workers:
+                        dirpath, depth = pending.popleft()
+                        in_flight[pool.submit(list_dir, dirpath)] = (dirpath, depth)
+
+                    done, _ = concurrent.futures.wait(
+                        in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        dirpath, depth = in_flight.pop(future)
+                        try:
+                            listing = future.result()
+                        except (exc.GlobusAPIError, exc.NetworkError) as err:
+                            if on_error is not None:
+                                on_error(dirpath, err)
+                            else:
+                                log.warning(f"walk could not list {dirpath}: {err}")
+                            continue
+
+                        dirs: list[dict[str, t.Any]] = []
+                        files: list[dict[str, t.Any]] = []
+                        for entry in listing["DATA"]:
+                            (dirs if entry["type"] == "dir" else files).append(entry)
+                        yield dirpath, dirs, files
+
+                        # descend only after yielding, so that the caller may prune
+                        if max_depth is not None and depth >= max_depth:
+                            continue
+                        for entry in dirs:
+                            if entry.get("link_target") and not follow_links:
+                                continue
+                            pending.append(
+                                (_join_dir_path(dirpath, entry["name"]), depth + 1)
+                            )
+            finally:
+                # if the consumer stops early, don't start any queued listings
+                for future in in_flight:
+                    future.cancel()
+
+    def find_files(
+        self,
+        endpoint_id: uuid.UUID | str,
+        path: str = "/~/",
+        *,
+        patterns: str | t.Iterable[str] | None = None,
+        regex: str | re.Pattern[str] | None = None,
+        modified_before: datetime.datetime | None = None,
+        modified_after: datetime.datetime | None = None,
+        min_size: int | None = None,
+        max_size: int | None = None,
+        max_depth: int | None = None,
+        show_hidden: bool = True,
+        max_workers: int = 4,
+    ) -> t.Iterator[tuple[str, dict[str, t.Any]]]:
+        """
+        Find files in a directory tree on a collection, in the style of ``find``.
+
+        The tree is traversed with :meth:`walk`, and for each matching file, yields
+        a tuple of ``(path, file_doc)``, where ``path`` is the full path of the file
+        and ``file_doc`` is its file document from :meth:`operation_ls`. Only
+        non-directory entries are matched. As with :meth:`walk`, files are yielded
+        as listings complete, and only the directories waiting to be listed are
+        held in memory.
+
+        Where possible, the criteria are sent to the Transfer service as an
+        ``operation_ls`` filter, so that non-matching files are not returned at
+        all. Every file is also checked locally, so the results are the same
+        whether or not a criterion could be sent to the service.
+
+        :param endpoint_id: The ID of the collection to search
+        :param path: The path of the directory at which to start
+        :param patterns: One or more :mod:`fnmatch` patterns. The name of a file
+            must match at least one of them.
+        :param regex: A regular expression which must match (with
+            :func:`re.search`) the full path of a file
+        :param modified_before: Only match files last modified before this time.
+            A naive ``datetime`` is taken to be in UTC.
+        :param modified_after: Only match files last modified at or after this time.
+            A naive ``datetime`` is taken to be in UTC.
+        :param min_size: Only match files of at least this many bytes
+        :param max_size: Only match files of at most this many bytes
+        :param max_depth: The maximum depth of directories to descend into, as in
+            :meth:`walk`
+        :param show_hidden: Include hidden files (names beginning in dot).
+            [Default: ``True``]
+        :param max_workers: The maximum number of concurrent directory listings.
+            [Default: ``4``]
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                Print every ``.tmp`` file more than a week old:
+
+                .. code-block:: python
+
+                    tc = globus_sdk.TransferClient(...)
+                    week_ago = datetime.datetime.now(datetime.timezone.utc) - (
+                        datetime.timedelta(days=7)
+                    )
+                    for path, doc in tc.find_files(
+                        ep_id, "/scratch/", patterns="*.tmp", modified_before=week_ago
+                    ):
+                        print(path, doc["size"])
+        """
+        log.debug(f"TransferClient.find_files({endpoint_id}, {path}, ...)")
+        return run_find_files(
+            self,
+            endpoint_id,
+            path,
+            patterns=patterns,
+            regex=regex,
+            modified_before=modified_before,
+            modified_after=modified_after,
+            min_size=min_size,
+            max_size=max_size,
+            max_depth=max_depth,
+            show_hidden=show_hidden,
+            max_workers=max_workers,
+        )
 
     #
     # Task Submission
@@ -1379,6 +1815,11 @@ class TransferClient(client.BaseClient):
         log.debug(f"TransferClient.get_submission_id({query_params})")
         return self.get("/v0.10/submission_id", query_params=query_params)
 
+    def _next_submission_id(self) -> str:
+        if self.submission_id_pool is not None:
+            return self.submission_id_pool.take()
+        return str(self.get_submission_id()["value"])
+
     def submit_transfer(
         self, data: dict[str, t.Any] | TransferData
     ) -> response.GlobusHTTPResponse:
@@ -1390,8 +1831,8 @@ class TransferClient(client.BaseClient):
         Submit a Transfer Task.
 
         If no ``submission_id`` is included in the payload, one will be requested and
-        used automatically. The data passed to this method will be modified to include
-        the ``submission_id``.
+        used automatically, or taken from the ``submission_id_pool`` if one is set. The
+        data passed to this method will be modified to include the ``submission_id``.
 
         .. tab-set::
 
@@ -1425,7 +1866,7 @@ class TransferClient(client.BaseClient):
         log.debug("TransferClient.submit_transfer(...)")
         if "submission_id" not in data or data["submission_id"] is MISSING:
             log.debug("submit_transfer autofetching submission_id")
-            data["submission_id"] = self.get_submission_id()["value"]
+            data["submission_id"] = self._next_submission_id()
         return self.post("/v0.10/transfer", data=data)
 
     def submit_delete(
@@ -1439,8 +1880,8 @@ class TransferClient(client.BaseClient):
         Submit a Delete Task.
 
         If no ``submission_id`` is included in the payload, one will be requested and
-        used automatically. The data passed to this method will be modified to include
-        the ``submission_id``.
+        used automatically, or taken from the ``submission_id_pool`` if one is set. The
+        data passed to this method will be modified to include the ``submission_id``.
 
         .. tab-set::
 
@@ -1469,8 +1910,192 @@ class TransferClient(client.BaseClient):
         log.debug("TransferClient.submit_delete(...)")
         if "submission_id" not in data or data["submission_id"] is MISSING:
             log.debug("submit_delete autofetching submission_id")
-            data["submission_id"] = self.get_submission_id()["value"]
-        return self.post("/v0.10/delete", data=data)
+            data["submission_id"] = self._next_submission_id()
+        result = self.post("/v0.10/delete", data=data)
+        if self.listing_cache is not None:
+            # the deletion happens asynchronously, but the cached results
+            # are already known to be stale
+            self.listing_cache.invalidate(
+                data["endpoint"], [item["path"] for item in data.get("DATA", ())]
+            )
+        return result
+
+    def bulk_submit(
+        self,
+        data: TransferData | DeleteData,
+        *,
+        items: t.Iterable[dict[str, t.Any]] | None = None,
+        max_items: int = 10000,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_workers: int = 4,
+        max_attempts: int = 3,
+    ) -> BulkSubmitManifest:
+        """
+        Submit a very large Transfer or Delete as several tasks.
+
+        The items of ``data``, followed by any ``items`` given, are split into
+        chunks of at most ``max_items`` items and ``max_bytes`` of encoded JSON.
+        Each chunk is a copy of ``data`` (with the same options, label, etc.) and is
+        submitted as its own task, with its own submission ID, using up to
+        ``max_workers`` concurrent submissions.
+
+        Chunks are built lazily, so ``items`` may be a generator producing far more
+        items than would fit in memory at once.
+
+        Failed submissions are retried up to ``max_attempts`` times when the failure
+        is a network error or a transient service error. Every retry of a chunk
+        reuses that chunk's submission ID, which makes retries safe: a chunk can
+        never be submitted twice. A chunk which still fails is recorded in the
+        resulting manifest along with its document, and the other chunks are
+        still submitted.
+
+        :param data: A ``TransferData`` or ``DeleteData`` document. It must not have a
+            ``submission_id``.
+        :param items: Additional items to submit, as produced by
+            :meth:`TransferData.iter_items <globus_sdk.TransferData.iter_items>` or
+            :meth:`DeleteData.iter_items <globus_sdk.DeleteData.iter_items>`
+        :param max_items: The maximum number of items per task [Default: ``10000``]
+        :param max_bytes: The maximum size of each task document, in bytes.
+            A single item larger than this is submitted alone.
+            [Default: ``4194304``, 4MiB]
+        :param max_workers: The maximum number of concurrent submissions
+            [Default: ``4``]
+        :param max_attempts: The number of times to try submitting each chunk
+            [Default: ``3``]
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                .. code-block:: python
+
+                    tc = globus_sdk.TransferClient(...)
+                    tdata = globus_sdk.TransferData(src_id, dst_id, label="bulk")
+
+                    def gen_items():
+                        for i in range(1_000_000):
+                            yield {
+                                "DATA_TYPE": "transfer_item",
+                                "source_path": f"/src/{i}.dat",
+                                "destination_path": f"/dst/{i}.dat",
+                            }
+
+                    manifest = tc.bulk_submit(tdata, items=gen_items())
+                    for chunk in manifest.chunks:
+                        print(chunk.index, chunk.item_count, chunk.task_id)
+                    for chunk in manifest.failed:
+                        print("failed:", chunk.index, chunk.error)
+        """
+        log.debug("TransferClient.bulk_submit(...)")
+        return run_bulk_submit(
+            self,
+            data,
+            items,
+            max_items=max_items,
+            max_bytes=max_bytes,
+            max_workers=max_workers,
+            max_attempts=max_attempts,
+        )
+
+    def delete_matching(
+        self,
+        data: DeleteData,
+        path: str = "/~/",
+        *,
+        patterns: str | t.Iterable[str] | None = None,
+        regex: str | re.Pattern[str] | None = None,
+        modified_before: datetime.datetime | None = None,
+        modified_after: datetime.datetime | None = None,
+        min_size: int | None = None,
+        max_size: int | None = None,
+        max_depth: int | None = None,
+        show_hidden: bool = True,
+        max_items: int = 10000,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_workers: int = 4,
+        max_attempts: int = 3,
+    ) -> BulkSubmitManifest:
+        """
+        Delete the files in a directory tree on a collection which match the given
+        criteria.
+
+        The files are found with :meth:`find_files` on the collection of ``data``,
+        and are streamed into :meth:`bulk_submit`, which submits them as Delete
+        tasks of at most ``max_items`` items each. Matches are never all held in
+        memory at once, so this is suitable for trees with millions of files.
+
+        With no criteria, every file in the tree is deleted. Directories are not
+        deleted. To check what would be deleted, call :meth:`find_files` with the
+        same criteria.
+
+        :param data: A ``DeleteData`` document giving the collection and the options
+            for the tasks, such as ``label`` and ``ignore_missing``. Any items it
+            already has are deleted as well. It must not have a ``submission_id``.
+        :param path: The path of the directory at which to start
+        :param patterns: One or more :mod:`fnmatch` patterns, as in :meth:`find_files`
+        :param regex: A regular expression, as in :meth:`find_files`
+        :param modified_before: Only delete files last modified before this time
+        :param modified_after: Only delete files last modified at or after this time
+        :param min_size: Only delete files of at least this many bytes
+        :param max_size: Only delete files of at most this many bytes
+        :param max_depth: The maximum depth of directories to descend into, as in
+            :meth:`walk`
+        :param show_hidden: Include hidden files (names beginning in dot).
+            [Default: ``True``]
+        :param max_items: The maximum number of items per task [Default: ``10000``]
+        :param max_bytes: The maximum size of each task document, in bytes, as in
+            :meth:`bulk_submit` [Default: ``4194304``, 4MiB]
+        :param max_workers: The maximum number of concurrent directory listings, and
+            of concurrent submissions [Default: ``4``]
+        :param max_attempts: The number of times to try submitting each task, as in
+            :meth:`bulk_submit` [Default: ``3``]
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                Delete every ``.tmp`` or ``.partial`` file over 1GB in a scratch
+                area:
+
+                .. code-block:: python
+
+                    tc = globus_sdk.TransferClient(...)
+                    ddata = globus_sdk.DeleteData(ep_id, label="scratch cleanup")
+                    manifest = tc.delete_matching(
+                        ddata,
+                        "/scratch/",
+                        patterns=["*.tmp", "*.partial"],
+                        min_size=10**9,
+                    )
+                    print("tasks:", manifest.task_ids)
+        """
+        log.debug(f"TransferClient.delete_matching({data['endpoint']}, {path}, ...)")
+        matches = run_find_files(
+            self,
+            data["endpoint"],
+            path,
+            patterns=patterns,
+            regex=regex,
+            modified_before=modified_before,
+            modified_after=modified_after,
+            min_size=min_size,
+            max_size=max_size,
+            max_depth=max_depth,
+            show_hidden=show_hidden,
+            max_workers=max_workers,
+        )
+        return run_bulk_submit(
+            self,
+            data,
+            (
+                {"DATA_TYPE": "delete_item", "path": file_path}
+                for file_path, _ in matches
+            ),
+            max_items=max_items,
+            max_bytes=max_bytes,
+            max_workers=max_workers,
+            max_attempts=max_attempts,
+        )
 
     #
     # Task inspection and management
@@ -1804,6 +2429,131 @@ class TransferClient(client.BaseClient):
             time.sleep(polling_interval)
         # unreachable -- end of task_wait
 
+    def wait_for_tasks(
+        self,
+        task_ids: t.Iterable[uuid.UUID | str],
+        *,
+        timeout: float | None = None,
+        initial_interval: float = 1,
+        max_interval: float = 60,
+        backoff_factor: float = 2,
+        batch_size: int = 100,
+    ) -> t.Iterator[dict[str, t.Any]]:
+        r"""
+        Wait for many tasks to complete or fail, yielding each task document as soon
+        as the task reaches a terminal state (``SUCCEEDED`` or ``FAILED``).
+
+        Rather than polling each task individually, as
+        :meth:`task_wait` does, tasks are polled in batches using
+        :meth:`task_list` with a ``task_id`` filter. Each task is polled frequently
+        at first, and then less often the longer it runs, so that many long-running
+        tasks can be watched with few requests.
+
+        Tasks which do not reach a terminal state before ``timeout`` are not
+        yielded. As with :meth:`task_wait`, time is counted as the time spent
+        waiting between polls.
+
+        :param task_ids: The IDs of the tasks to wait on
+        :param timeout: Number of seconds to wait in total, or ``None`` to wait until
+            every task has terminated. [Default: ``None``]
+        :param initial_interval: Number of seconds to wait before polling a task for
+            the second time. [Default: ``1``]
+        :param max_interval: The maximum number of seconds between polls of any
+            task. [Default: ``60``]
+        :param backoff_factor: The factor by which the polling interval for a task
+            grows after each poll in which it has not terminated. [Default: ``2``]
+        :param batch_size: The maximum number of tasks to poll in a single request,
+            between 1 and 1000. [Default: ``100``]
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                Submit many tasks, then report on each as it finishes:
+
+                .. code-block:: python
+
+                    tc = TransferClient(...)
+                    task_ids = [tc.submit_transfer(tdata)["task_id"] for tdata in docs]
+                    done = set()
+                    for task in tc.wait_for_tasks(task_ids, timeout=3600):
+                        done.add(task["task_id"])
+                        print(f"Task({task['task_id']}) {task['status']}")
+                    if len(done) < len(task_ids):
+                        print("Some tasks did not finish within an hour")
+        """
+        log.debug(
+            f"TransferClient.wait_for_tasks(..., timeout={timeout}, "
+            f"batch_size={batch_size})"
+        )
+        if timeout is not None and timeout <= 0:
+            raise exc.GlobusSDKUsageError(
+                "TransferClient.wait_for_tasks timeout must be positive"
+            )
+        if not 0 < initial_interval <= max_interval:
+            raise exc.GlobusSDKUsageError(
+                "TransferClient.wait_for_tasks requires "
+                "0 < initial_interval <= max_interval"
+            )
+        if backoff_factor < 1:
+            raise exc.GlobusSDKUsageError(
+                "TransferClient.wait_for_tasks backoff_factor has a minimum of 1"
+            )
+        if not 1 <= batch_size <= 1000:
+            raise exc.GlobusSDKUsageError(
+                "TransferClient.wait_for_tasks batch_size must be between 1 and 1000"
+            )
+
+        # for each pending task, the (elapsed) time of its next poll and the
+        # interval which will follow that poll
+        schedule: dict[str, tuple[float, float]] = {
+            _normalize_task_id(task_id): (0, initial_interval) for task_id in task_ids
+        }
+        elapsed: float = 0
+
+        while schedule:
+            due = [task_id for task_id, (at, _) in schedule.items() if at <= elapsed]
+            for start in range(0, len(due), batch_size):
+                batch = due[start : start + batch_size]
+                found: set[str] = set()
+                listing = self.task_list(limit=len(batch), filter={"task_id": batch})
+                for task in listing["DATA"]:
+                    task_id = _normalize_task_id(task["task_id"])
+                    found.add(task_id)
+                    if task_id in schedule and task["status"] in (
+                        "SUCCEEDED",
+                        "FAILED",
+                    ):
+                        log.debug(
+                            f"wait_for_tasks: {task_id} terminated with "
+                            f"status={task['status']}"
+                        )
+                        del schedule[task_id]
+                        yield task
+                for task_id in batch:
+                    if task_id in schedule:
+                        if task_id not in found:
+                            log.debug(f"wait_for_tasks: {task_id} was not listed")
+                        interval = schedule[task_id][1]
+                        schedule[task_id] = (
+                            elapsed + interval,
+                            min(interval * backoff_factor, max_interval),
+                        )
+            if not schedule:
+                return
+
+            next_poll = min(at for at, _ in schedule.values())
+            if timeout is not None:
+                if elapsed >= timeout:
+                    log.debug(
+                        f"wait_for_tasks timed out with {len(schedule)} tasks pending"
+                    )
+                    return
+                next_poll = min(next_poll, timeout)
+            log.debug(f"wait_for_tasks waiting {next_poll - elapsed}s")
+            time.sleep(next_poll - elapsed)
+            elapsed = next_poll
+
     def task_pause_info(
         self,
         task_id: uuid.UUID | str,
@@ -1938,6 +2688,75 @@ class TransferClient(client.BaseClient):
             self.get(f"/v0.10/task/{task_id}/skipped_errors", query_params=query_params)
         )
 
+    def export_task_records(
+        self,
+        task_id: uuid.UUID | str,
+        output: str | os.PathLike[str],
+        *,
+        records: TaskRecordKind = "successful_transfers",
+        endpoint_manager: bool = False,
+        format: t.Literal["ndjson", "csv"] = "ndjson",  # pylint: disable=W0622
+        compress: bool | None = None,
+        fields: t.Sequence[str] | None = None,
+        checkpoint: str | os.PathLike[str] | None = None,
+        prefetch: int = 2,
+    ) -> TaskExportResult:
+        """
+        Write all of the successful transfers, skipped errors, or events of a task to
+        a file, as newline-delimited JSON or CSV.
+
+        Records are written one page at a time as they are fetched, so memory use
+        does not grow with the number of records. The next pages are fetched in the
+        background while the current page is written.
+
+        If a ``checkpoint`` file is given, progress is saved to it after each page.
+        If the export is interrupted, calling this method again with the same
+        arguments resumes it from the last saved page.
+
+        :param task_id: The ID of the task
+        :param output: The path of the file to write
+        :param records: Which records to export: ``"successful_transfers"``,
+            ``"skipped_errors"``, or ``"events"``. [Default: ``"successful_transfers"``]
+        :param endpoint_manager: Use the endpoint manager variant of the API, to export
+            records for a task owned by another user. [Default: ``False``]
+        :param format: ``"ndjson"`` or ``"csv"``. In CSV output, nested values are
+            encoded as JSON. [Default: ``"ndjson"``]
+        :param compress: Compress the output with gzip. Defaults to ``True`` if
+            ``output`` ends with ``.gz``.
+        :param fields: The CSV columns to write. Defaults to the fields of the first
+            record.
+        :param checkpoint: The path of a file in which to save progress
+        :param prefetch: The maximum number of pages to fetch ahead of the page being
+            written. [Default: ``2``]
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                .. code-block:: python
+
+                    tc = TransferClient(...)
+                    result = tc.export_task_records(
+                        task_id,
+                        "successful.ndjson.gz",
+                        checkpoint="successful.checkpoint",
+                    )
+                    print(f"wrote {result.records_written} records")
+        """
+        log.debug(f"TransferClient.export_task_records({task_id}, {records}, ...)")
+        return run_task_export(
+            self,
+            task_id,
+            output,
+            records=records,
+            endpoint_manager=endpoint_manager,
+            format=format,
+            compress=compress,
+            fields=fields,
+            checkpoint=checkpoint,
+            prefetch=prefetch,
+        )
+
     #
     # advanced endpoint management (requires endpoint manager role)
     #
@@ -2534,6 +3353,86 @@ class TransferClient(client.BaseClient):
             "/v0.10/endpoint_manager/admin_resume", data=data, query_params=query_params
         )
 
+    def endpoint_manager_bulk_task_action(
+        self,
+        action: AdminTaskAction,
+        task_ids: t.Iterable[uuid.UUID | str],
+        message: str | None = None,
+        *,
+        chunk_size: int = 1000,
+        max_workers: int = 4,
+        wait: bool = True,
+        timeout: float | None = None,
+        initial_interval: float = 1,
+        max_interval: float = 30,
+    ) -> BulkAdminTaskResult:
+        """
+        Cancel, pause, or resume any number of tasks as an admin.
+
+        The task IDs are split into chunks of at most ``chunk_size``, and the chunks
+        are submitted concurrently with :meth:`endpoint_manager_cancel_tasks`,
+        :meth:`endpoint_manager_pause_tasks`, or
+        :meth:`endpoint_manager_resume_tasks`. For cancellation, once every chunk has
+        been submitted, the resulting admin cancel jobs are polled with
+        :meth:`endpoint_manager_cancel_status` until they are done, with an interval
+        which starts at ``initial_interval`` and doubles up to ``max_interval``.
+
+        A failed request does not stop the others. The result records which tasks
+        were processed, which failed, and which were still being cancelled when
+        polling stopped.
+
+        :param action: ``"cancel"``, ``"pause"``, or ``"resume"``
+        :param task_ids: The IDs of the tasks
+        :param message: The message given to the owners of the tasks. Required to
+            cancel or pause tasks.
+        :param chunk_size: The maximum number of tasks in each request.
+            [Default: ``1000``]
+        :param max_workers: The maximum number of concurrent requests.
+            [Default: ``4``]
+        :param wait: Wait for cancellations to finish. [Default: ``True``]
+        :param timeout: The maximum number of seconds to wait for cancellations, or
+            ``None`` to wait until they are done. [Default: ``None``]
+        :param initial_interval: Seconds to wait before first checking the status of
+            a cancellation. [Default: ``1``]
+        :param max_interval: The maximum number of seconds between checks of the
+            status of a cancellation. [Default: ``30``]
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                Cancel every active task on an endpoint:
+
+                .. code-block:: python
+
+                    tc = TransferClient(...)
+                    task_ids = [
+                        task["task_id"]
+                        for task in tc.paginated.endpoint_manager_task_list(
+                            filter_endpoint=endpoint_id, filter_status="ACTIVE"
+                        ).items()
+                    ]
+                    result = tc.endpoint_manager_bulk_task_action(
+                        "cancel", task_ids, "Cancelled for emergency maintenance"
+                    )
+                    if not result.succeeded:
+                        print("failed:", result.failed_task_ids)
+                        print("still cancelling:", result.pending_task_ids)
+        """
+        log.debug(f"TransferClient.endpoint_manager_bulk_task_action({action}, ...)")
+        return run_bulk_admin_action(
+            self,
+            action,
+            task_ids,
+            message,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            wait=wait,
+            timeout=timeout,
+            initial_interval=initial_interval,
+            max_interval=max_interval,
+        )
+
     #
     # endpoint manager pause rule methods
     #
@@ -2965,3 +3864,82 @@ class TransferClient(client.BaseClient):
         log.debug(f"TransferClient.get_tunnel_events({tunnel_id}, {query_params})")
         r = self.get(f"/v2/tunnels/{tunnel_id}/events", query_params=query_params)
         return r
+
+    def follow_tunnel_events(
+        self,
+        tunnel_ids: uuid.UUID | str | t.Iterable[uuid.UUID | str],
+        *,
+        include_existing: bool = False,
+        stop_codes: t.Iterable[str] = ("TUNNEL_STOPPED",),
+        timeout: float | None = None,
+        initial_interval: float = 1,
+        max_interval: float = 60,
+        backoff_factor: float = 2,
+        errors: dict[str, Exception] | None = None,
+    ) -> t.Iterator[tuple[str, dict[str, t.Any]]]:
+        """
+        .. note::
+
+            Tunnels functionality is currently in Beta and may experience
+            changes that will break this interface
+
+        Follow the events of one or more tunnels, in the style of ``tail -f``.
+
+        Each tunnel's events are polled with :meth:`get_tunnel_events`, following
+        the links to any further pages of events, and each event not seen before
+        is yielded as a tuple of ``(tunnel_id, event)``, in order of event ID. All
+        tunnels are followed from a single polling loop. Each tunnel is polled every
+        ``initial_interval`` seconds while it is producing events, and less often
+        while it is quiet, up to every ``max_interval`` seconds.
+
+        A tunnel is no longer followed once it reports an event with one of the
+        ``stop_codes``. The generator ends when no tunnels are left, or when
+        ``timeout`` is reached. As with :meth:`task_wait`, time is counted as the
+        time spent waiting between polls.
+
+        Network errors and server errors are logged, and the tunnel is polled
+        again later. Other errors, such as a tunnel which is not found, are logged
+        and recorded in ``errors``, and the tunnel is no longer followed; the other
+        tunnels are still followed.
+
+        :param tunnel_ids: The ID of a tunnel, or an iterable of IDs
+        :param include_existing: Yield the events which already exist when
+            following starts. By default, only later events are yielded.
+            [Default: ``False``]
+        :param stop_codes: Event codes which mean a tunnel has ended
+            [Default: ``("TUNNEL_STOPPED",)``]
+        :param timeout: Number of seconds to follow for, or ``None`` to follow until
+            every tunnel has ended. [Default: ``None``]
+        :param initial_interval: Number of seconds between polls of a tunnel which is
+            producing events. [Default: ``1``]
+        :param max_interval: The maximum number of seconds between polls of any
+            tunnel. [Default: ``60``]
+        :param backoff_factor: The factor by which the interval for a tunnel grows
+            after each poll which finds no new events. [Default: ``2``]
+        :param errors: A dict in which to record, by tunnel ID, the error which
+            ended the following of a tunnel
+
+        .. tab-set::
+
+            .. tab-item:: Example Usage
+
+                .. code-block:: python
+
+                    tc = globus_sdk.TransferClient(...)
+                    for tunnel_id, event in tc.follow_tunnel_events(tunnel_ids):
+                        attrs = event["attributes"]
+                        if attrs["is_error"]:
+                            print(tunnel_id, attrs["code"], attrs["details"])
+        """
+        log.debug("TransferClient.follow_tunnel_events(...)")
+        return run_follow_tunnel_events(
+            self.get_tunnel_events,
+            tunnel_ids,
+            include_existing=include_existing,
+            stop_codes=stop_codes,
+            timeout=timeout,
+            initial_interval=initial_interval,
+            max_interval=max_interval,
+            backoff_factor=backoff_factor,
+            errors=errors,
+        )
@@ -5,6 +5,7 @@ import logging
 import typing as t
 import uuid
 
+from globus_sdk._internal.compact_items import CompactDictList
 from globus_sdk._internal.remarshal import stringify
 from globus_sdk._missing import MISSING, MissingType
 from globus_sdk._payload import GlobusPayload
@@ -54,6 +55,12 @@ class DeleteData(GlobusPayload):
         collections.
     :param additional_fields: additional fields to be added to the delete
         document. Mostly intended for internal use
+    :param compact_items: Store items in a compact columnar form, rather than as a
+        list of dicts. This greatly reduces memory use for documents with very many
+        items. Items are still read and written as dicts, but are built when
+        accessed, so changes to an item are kept only if the item was accessed by
+        index (e.g. ``ddata["DATA"][0]``), not by iteration.
+        [default: ``False``]
 
     **Examples**
 
@@ -88,10 +95,17 @@ class DeleteData(GlobusPayload):
         notify_on_inactive: bool | MissingType = MISSING,
         local_user: str | MissingType = MISSING,
         additional_fields: dict[str, t.Any] | None = None,
+        compact_items: bool = False,
     ) -> None:
         super().__init__()
         self["DATA_TYPE"] = "delete"
-        self["DATA"] = []
+        self["DATA"] = (
+            CompactDictList(
+                constants={"DATA_TYPE": "delete_item"}, string_fields=("path",)
+            )
+            if compact_items
+            else []
+        )
         self["endpoint"] = endpoint
         self["label"] = label
         self["submission_id"] = submission_id
@@ -144,6 +158,8 @@ class DeleteData(GlobusPayload):
         """
         An iterator of items created by ``add_item``.
 
-        Each item takes the form of a dictionary.
+        Each item takes the form of a dictionary. If the document was created with
+        ``compact_items=True``, each dictionary is built as it is produced, and is
+        read-only.
         """
         yield from iter(self["DATA"])
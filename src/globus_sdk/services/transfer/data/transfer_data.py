@@ -5,6 +5,7 @@ import logging
 import typing as t
 import uuid
 
+from globus_sdk._internal.compact_items import CompactDictList
 from globus_sdk._internal.remarshal import stringify
 from globus_sdk._missing import MISSING, MissingType
 from globus_sdk._payload import GlobusPayload
@@ -97,6 +98,12 @@ class TransferData(GlobusPayload):
         Connect Server v5 mapped collections.
     :param additional_fields: additional fields to be added to the transfer
         document. Mostly intended for internal use
+    :param compact_items: Store items in a compact columnar form, rather than as a
+        list of dicts. This greatly reduces memory use for documents with very many
+        items. Items are still read and written as dicts, but are built when
+        accessed, so changes to an item are kept only if the item was accessed by
+        index (e.g. ``tdata["DATA"][0]``), not by iteration.
+        [default: ``False``]
 
     **Sync Levels**
 
@@ -168,11 +175,21 @@ class TransferData(GlobusPayload):
         source_local_user: str | MissingType = MISSING,
         destination_local_user: str | MissingType = MISSING,
         additional_fields: dict[str, t.Any] | None = None,
+        compact_items: bool = False,
     ) -> None:
         super().__init__()
         log.debug("Creating a new TransferData object")
         self["DATA_TYPE"] = "transfer"
-        self["DATA"] = []
+        self["DATA"] = (
+            CompactDictList(
+                constants={"DATA_TYPE": "transfer_item"},
+                string_fields=("source_path", "destination_path"),
+                flag_fields=("recursive",),
+                sparse_fields=("external_checksum", "checksum_algorithm"),
+            )
+            if compact_items
+            else []
+        )
         self["source_endpoint"] = source_endpoint
         self["destination_endpoint"] = destination_endpoint
         self["label"] = label
@@ -321,6 +338,8 @@ class TransferData(GlobusPayload):
         """
         An iterator of items created by ``add_item``.
 
-        Each item takes the form of a dictionary.
+        Each item takes the form of a dictionary. If the document was created with
+        ``compact_items=True``, each dictionary is built as it is produced, and is
+        read-only.
         """
         yield from iter(self["DATA"])
@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import bisect
+import dataclasses
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import typing as t
+import uuid
+
+from globus_sdk import exc
+
+if t.TYPE_CHECKING:
+    from .client import TransferClient
+
+log = logging.getLogger(__name__)
+
+_INDEX_VERSION = 1
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# the endpoint fields which are kept in the index
+_KEPT_FIELDS = (
+    "id",
+    "display_name",
+    "canonical_name",
+    "owner_string",
+    "organization",
+    "description",
+    "keywords",
+    "entity_type",
+    "host_endpoint_id",
+)
+# fields whose tokens count as the name of an endpoint when ranking
+_NAME_FIELDS = ("display_name", "canonical_name")
+_OTHER_FIELDS = ("owner_string", "organization", "keywords", "description")
+
+
+def _tokenize(text: str | None) -> list[str]:
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _entry_name(entry: dict[str, t.Any]) -> str:
+    return str(entry.get("display_name") or entry.get("canonical_name") or "").lower()
+
+
+@dataclasses.dataclass
+class _Tokens:
+    name: frozenset[str]
+    other: frozenset[str]
+
+    @property
+    def all(self) -> frozenset[str]:
+        return self.name | self.other
+
+
+def _entry_tokens(entry: dict[str, t.Any]) -> _Tokens:
+    name: set[str] = set()
+    for field in _NAME_FIELDS:
+        name.update(_tokenize(entry.get(field)))
+    other: set[str] = set()
+    for field in _OTHER_FIELDS:
+        other.update(_tokenize(entry.get(field)))
+    for bookmark in entry.get("bookmarks", ()):
+        other.update(_tokenize(bookmark.get("name")))
+    return _Tokens(frozenset(name), frozenset(other - name))
+
+
+@dataclasses.dataclass
+class EndpointIndexRefresh:
+    """
+    The changes made to a :class:`TransferEndpointIndex
+    <globus_sdk.TransferEndpointIndex>` by one refresh.
+
+    :param added: The number of endpoints added
+    :param updated: The number of endpoints whose details changed
+    :param removed: The number of endpoints no longer found
+    :param errors: Errors from sources which could not be read. Endpoints from
+        those sources are kept as they were.
+    """
+
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    errors: list[Exception] = dataclasses.field(default_factory=list)
+
+
+class TransferEndpointIndex:
+    """
+    An in-memory index of endpoints and collections, for fast autocompletion of
+    names without calling
+    :meth:`TransferClient.endpoint_search
+    <globus_sdk.TransferClient.endpoint_search>` for every query.
+
+    The index is filled by :meth:`refresh`, which reads every page of
+    ``endpoint_search`` for each of ``search_scopes``, the guest collections on
+    each of ``host_endpoint_ids`` (via ``my_shared_endpoint_list``), and the user's
+    bookmarks. Only the details needed for searching and display are kept.
+
+    :meth:`search` matches each word of a query against the start of a word in an
+    endpoint's name, owner, organization, keywords, description, or bookmark
+    names, and ranks the matches with exact and name matches first.
+
+    If ``path`` is given, the index is saved there as JSON after each refresh, and
+    loaded from there when the index is created, so that a restarted application
+    can search immediately while it refreshes.
+
+    :param client: The client used to fetch endpoints
+    :param search_scopes: The ``filter_scope`` values for which all results of
+        ``endpoint_search`` are indexed
+        [Default: ``("my-endpoints", "shared-with-me", "recently-used")``]
+    :param host_endpoint_ids: Host endpoints whose guest collections, as listed by
+        ``my_shared_endpoint_list``, are indexed
+    :param include_bookmarks: Index the user's bookmarks. A bookmarked endpoint
+        is found by the bookmark's name, and ranks above other matches.
+        [Default: ``True``]
+    :param path: A file in which to persist the index
+    :param refresh_interval: The number of seconds between refreshes made by
+        :meth:`run` [Default: ``300``]
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                tc = globus_sdk.TransferClient(...)
+                index = globus_sdk.TransferEndpointIndex(tc, path="endpoints.json")
+                if not index.last_refreshed:
+                    index.refresh()
+                # keep the index fresh in the background
+                stop = threading.Event()
+                threading.Thread(target=index.run, args=(stop,), daemon=True).start()
+
+                for ep in index.search("tut col", limit=5):
+                    print(ep["id"], ep["display_name"])
+    """
+
+    def __init__(
+        self,
+        client: TransferClient,
+        *,
+        search_scopes: t.Iterable[str] = (
+            "my-endpoints",
+            "shared-with-me",
+            "recently-used",
+        ),
+        host_endpoint_ids: t.Iterable[uuid.UUID | str] = (),
+        include_bookmarks: bool = True,
+        path: str | os.PathLike[str] | None = None,
+        refresh_interval: float = 300,
+    ) -> None:
+        if refresh_interval <= 0:
+            raise exc.GlobusSDKUsageError(
+                "TransferEndpointIndex refresh_interval must be positive"
+            )
+        self.client = client
+        self.search_scopes = tuple(search_scopes)
+        self.host_endpoint_ids = tuple(str(i) for i in host_endpoint_ids)
+        self.include_bookmarks = include_bookmarks
+        self.path = os.fspath(path) if path is not None else None
+        self.refresh_interval = refresh_interval
+        #: The time of the last successful refresh, as a Unix timestamp, or
+        #: ``None`` if the index has never been refreshed
+        self.last_refreshed: float | None = None
+
+        self._lock = threading.Lock()
+        # endpoint documents and their tokens, keyed by endpoint ID
+        self._entries: dict[str, dict[str, t.Any]] = {}
+        self._tokens: dict[str, _Tokens] = {}
+        # an inverted index of token to endpoint IDs, with the tokens sorted for
+        # prefix lookups (sorted on the first search after any change)
+        self._postings: dict[str, set[str]] = {}
+        self._sorted_tokens: list[str] | None = []
+        # the source of each endpoint, so that a failed source keeps its entries
+        self._sources: dict[str, set[str]] = {}
+
+        if self.path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, endpoint_id: uuid.UUID | str) -> dict[str, t.Any] | None:
+        """
+        Get the indexed details of an endpoint.
+
+        :param endpoint_id: The ID of the endpoint
+        """
+        with self._lock:
+            entry = self._entries.get(str(endpoint_id))
+            return dict(entry) if entry is not None else None
+
+    def search(self, query: str, *, limit: int | None = 10) -> list[dict[str, t.Any]]:
+        """
+        Find endpoints matching a query, best matches first.
+
+        Each result is a copy of the indexed details of an endpoint. It has the
+        fields ``id``, ``display_name``, ``canonical_name``, ``owner_string``,
+        ``organization``, ``description``, ``keywords``, ``entity_type``, and
+        ``host_endpoint_id`` where known, and ``bookmarks``, a list of the user's
+        bookmarks on the endpoint.
+
+        :param query: The text to search for. Every word must match the start of
+            a word of the endpoint.
+        :param limit: The maximum number of results, or ``None`` for all matches
+            [Default: ``10``]
+        """
+        words = _tokenize(query)
+        if not words:
+            return []
+        phrase = query.strip().lower()
+        with self._lock:
+            candidates: set[str] | None = None
+            for word in words:
+                matches = self._prefix_matches(word)
+                candidates = matches if candidates is None else candidates & matches
+                if not candidates:
+                    return []
+            assert candidates is not None
+            scored = sorted(
+                (
+                    -self._score(endpoint_id, words, phrase),
+                    _entry_name(self._entries[endpoint_id]),
+                    endpoint_id,
+                )
+                for endpoint_id in candidates
+            )
+            if limit is not None:
+                scored = scored[:limit]
+            return [dict(self._entries[endpoint_id]) for _, _, endpoint_id in scored]
+
+    def _prefix_matches(self, word: str) -> set[str]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        matches: set[str] = set()
+        start = bisect.bisect_left(self._sorted_tokens, word)
+        for token in itertools.islice(self._sorted_tokens, start, None):
+            if not token.startswith(word):
+                break
+            matches |= self._postings[token]
+        return matches
+
+    def _score(self, endpoint_id: str, words: list[str], phrase: str) -> int:
+        entry = self._entries[endpoint_id]
+        tokens = self._tokens[endpoint_id]
+        name = _entry_name(entry)
+        score = 0
+        if name == phrase:
+            score += 1000
+        elif name.startswith(phrase):
+            score += 500
+        for word in words:
+            if word in tokens.name:
+                score += 20
+            elif any(token.startswith(word) for token in tokens.name):
+                score += 10
+            elif word in tokens.other:
+                score += 5
+            else:
+                score += 2
+        if entry.get("bookmarks"):
+            score += 50
+        return score
+
+    def refresh(self) -> EndpointIndexRefresh:
+        """
+        Fetch endpoints from every source and update the index with any changes.
+
+        A source which cannot be read is recorded in the result, and the
+        endpoints previously found from it are kept.
+        """
+        result = EndpointIndexRefresh()
+        fetched: dict[str, dict[str, t.Any]] = {}
+        sources: dict[str, set[str]] = {}
+        bookmarks: dict[str, list[dict[str, t.Any]]] = {}
+
+        def read(source: str, docs: t.Iterable[t.Mapping[str, t.Any]]) -> None:
+            try:
+                ids = set()
+                for doc in docs:
+                    endpoint_id = str(doc["id"])
+                    ids.add(endpoint_id)
+                    entry = fetched.setdefault(endpoint_id, {})
+                    for field in _KEPT_FIELDS:
+                        if doc.get(field) is not None:
+                            entry[field] = doc[field]
+                sources[source] = ids
+            except (exc.GlobusAPIError, exc.NetworkError) as err:
+                log.warning(f"TransferEndpointIndex could not read {source}: {err}")
+                result.errors.append(err)
+
+        def shared_endpoints(host_id: str) -> t.Iterator[t.Mapping[str, t.Any]]:
+            yield from self.client.my_shared_endpoint_list(host_id)
+
+        # paginators and generators make no requests until iterated
+        for scope in self.search_scopes:
+            read(
+                f"scope:{scope}",
+                self.client.paginated.endpoint_search(filter_scope=scope).items(),
+            )
+        for host_id in self.host_endpoint_ids:
+            read(f"host:{host_id}", shared_endpoints(host_id))
+        if self.include_bookmarks:
+            try:
+                for bookmark in self.client.bookmark_list():
+                    endpoint_id = str(bookmark["endpoint_id"])
+                    bookmarks.setdefault(endpoint_id, []).append(
+                        {"name": bookmark.get("name"), "path": bookmark.get("path")}
+                    )
+                sources["bookmarks"] = set(bookmarks)
+            except (exc.GlobusAPIError, exc.NetworkError) as err:
+                log.warning(f"TransferEndpointIndex could not read bookmarks: {err}")
+                result.errors.append(err)
+
+        with self._lock:
+            # keep the entries of sources which could not be read this time
+            for source, ids in self._sources.items():
+                if source in sources:
+                    continue
+                sources[source] = ids
+                for endpoint_id in ids:
+                    if endpoint_id in self._entries:
+                        previous = self._entries[endpoint_id]
+                        kept = fetched.setdefault(endpoint_id, {})
+                        for key, value in previous.items():
+                            kept.setdefault(key, value)
+                        if source == "bookmarks":
+                            bookmarks.setdefault(endpoint_id, previous["bookmarks"])
+            for endpoint_id in bookmarks:
+                fetched.setdefault(endpoint_id, {"id": endpoint_id})
+            for endpoint_id, entry in fetched.items():
+                entry["bookmarks"] = bookmarks.get(endpoint_id, [])
+
+            for endpoint_id in list(self._entries):
+                if endpoint_id not in fetched:
+                    self._remove(endpoint_id)
+                    result.removed += 1
+            for endpoint_id, entry in fetched.items():
+                old = self._entries.get(endpoint_id)
+                if old == entry:
+                    continue
+                if old is None:
+                    result.added += 1
+                else:
+                    self._remove(endpoint_id)
+                    result.updated += 1
+                self._add(endpoint_id, entry)
+            self._sources = sources
+            self.last_refreshed = time.time()
+
+        log.debug(
+            f"TransferEndpointIndex refreshed: {result.added} added, "
+            f"{result.updated} updated, {result.removed} removed"
+        )
+        if self.path is not None:
+            self.save()
+        return result
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """
+        Refresh every ``refresh_interval`` seconds, until ``stop`` is set.
+
+        If the index was loaded from disk, the first refresh is made only once the
+        saved index is ``refresh_interval`` seconds old.
+
+        :param stop: An event which, when set, stops refreshing. If not given,
+            refreshing continues forever.
+        """
+        while stop is None or not stop.is_set():
+            age = time.time() - (self.last_refreshed or 0)
+            delay = max(0.0, self.refresh_interval - age)
+            if delay:
+                if stop is None:
+                    time.sleep(delay)
+                elif stop.wait(delay):
+                    return
+            try:
+                self.refresh()
+            except (exc.NetworkError, exc.GlobusAPIError) as err:
+                log.warning(f"TransferEndpointIndex refresh failed: {err}")
+                # don't retry immediately
+                self.last_refreshed = time.time()
+
+    def save(self) -> None:
+        """Write the index to ``path``, replacing the file atomically."""
+        if self.path is None:
+            raise exc.GlobusSDKUsageError("TransferEndpointIndex has no path to save")
+        with self._lock:
+            document = {
+                "version": _INDEX_VERSION,
+                "last_refreshed": self.last_refreshed,
+                "endpoints": list(self._entries.values()),
+                "sources": {k: sorted(v) for k, v in self._sources.items()},
+            }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(document, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        assert self.path is not None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError as err:
+            log.warning(f"ignoring unreadable endpoint index '{self.path}': {err}")
+            return
+        if document.get("version") != _INDEX_VERSION:
+            log.debug(f"ignoring endpoint index '{self.path}' of an older version")
+            return
+        with self._lock:
+            for entry in document["endpoints"]:
+                self._add(entry["id"], entry)
+            self._sources = {k: set(v) for k, v in document["sources"].items()}
+            self.last_refreshed = document["last_refreshed"]
+
+    def _add(self, endpoint_id: str, entry: dict[str, t.Any]) -> None:
+        tokens = _entry_tokens(entry)
+        self._entries[endpoint_id] = entry
+        self._tokens[endpoint_id] = tokens
+        for token in tokens.all:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {endpoint_id}
+                self._sorted_tokens = None
+            else:
+                postings.add(endpoint_id)
+
+    def _remove(self, endpoint_id: str) -> None:
+        del self._entries[endpoint_id]
+        for token in self._tokens.pop(endpoint_id).all:
+            postings = self._postings[token]
+            postings.discard(endpoint_id)
+            if not postings:
+                del self._postings[token]
+                self._sorted_tokens = None
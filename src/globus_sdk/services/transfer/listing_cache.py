@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+import posixpath
+import typing as t
+import uuid
+
+from globus_sdk._internal.ttl_cache import CacheStats, TTLCache
+from globus_sdk._missing import MISSING
+
+log = logging.getLogger(__name__)
+
+# a cache key is (identity, operation, endpoint_id, path, other params)
+_CacheKey = t.Tuple[
+    t.Optional[str], str, str, t.Optional[str], t.Tuple[t.Tuple[str, str], ...]
+]
+
+
+def _normalize_path(path: t.Any) -> str | None:
+    """
+    Normalize a path for use in a cache key, so that ``/~/foo`` and ``/~/foo/``
+    are treated as the same path. ``MISSING`` (the default directory) maps to None.
+    """
+    if path is MISSING or path is None:
+        return None
+    normalized = str(path)
+    if len(normalized) > 1:
+        normalized = normalized.rstrip("/")
+    return normalized
+
+
+def _freeze_params(params: dict[str, t.Any]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((k, repr(v)) for k, v in params.items() if v is not MISSING))
+
+
+class TransferListingCache:
+    """
+    A cache for the results of
+    :meth:`TransferClient.operation_ls <globus_sdk.TransferClient.operation_ls>` and
+    :meth:`TransferClient.operation_stat <globus_sdk.TransferClient.operation_stat>`.
+
+    Entries expire after ``ttl`` seconds, and once ``maxsize`` entries are held the
+    least recently used entries are evicted.
+
+    A cache is attached to a client by passing it as the client's
+    ``listing_cache``. The client will then invalidate affected entries
+    whenever it calls ``operation_mkdir``, ``operation_rename``, or
+    ``submit_delete``. Changes made by other clients or by other means are only
+    observed once entries expire, so ``ttl`` should be chosen with this in mind.
+
+    The same cache may be shared by several clients. Entries are keyed by the
+    client's ``listing_cache_identity`` (e.g. the user's identity ID), so that
+    listings are not shared between users. If it is not given, it is derived from
+    the client's authorizer; clients which use an ``app`` must give one.
+
+    Cached responses are returned as-is, so callers should not modify them.
+
+    :param ttl: The lifetime of a cache entry, in seconds [Default: ``60``]
+    :param maxsize: The maximum number of entries to hold [Default: ``1024``]
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                tc = globus_sdk.TransferClient(
+                    ..., listing_cache=globus_sdk.TransferListingCache(ttl=30)
+                )
+
+                tc.operation_ls(ep_id, path="/~/project1/")  # fetched
+                tc.operation_ls(ep_id, path="/~/project1/")  # cached
+                tc.operation_mkdir(ep_id, "/~/project1/newdir/")
+                tc.operation_ls(ep_id, path="/~/project1/")  # fetched again
+
+                print(tc.listing_cache.stats())
+    """
+
+    def __init__(self, *, ttl: float = 60, maxsize: int = 1024) -> None:
+        self._cache: TTLCache[_CacheKey, t.Any] = TTLCache(ttl=ttl, maxsize=maxsize)
+
+    def make_key(
+        self,
+        operation: t.Literal["ls", "stat"],
+        endpoint_id: uuid.UUID | str,
+        path: t.Any,
+        params: dict[str, t.Any],
+        *,
+        identity: str | None = None,
+    ) -> _CacheKey:
+        """
+        Build the key for a listing or stat result.
+
+        :param operation: ``"ls"`` or ``"stat"``
+        :param endpoint_id: The collection which was listed
+        :param path: The path which was listed
+        :param params: All other parameters which affect the result, such as
+            ``filter``, ``orderby``, and ``local_user``
+        :param identity: A value distinguishing the user making the request
+        """
+        return (
+            identity,
+            operation,
+            str(endpoint_id),
+            _normalize_path(path),
+            _freeze_params(params),
+        )
+
+    def get(self, key: _CacheKey) -> t.Any:
+        """Get a cached result, or ``None``."""
+        return self._cache.get(key)
+
+    def set(self, key: _CacheKey, value: t.Any) -> None:
+        """Store a result."""
+        self._cache.set(key, value)
+
+    def invalidate(
+        self, endpoint_id: uuid.UUID | str, paths: t.Iterable[str] | None = None
+    ) -> int:
+        """
+        Remove cached results for a collection which may be affected by changes to
+        the given paths. For each path, this drops the listing of its parent
+        directory and every result for the path itself or anything beneath it.
+
+        Results for the default directory (when no path was given) are always
+        dropped, as it is not known which path they refer to.
+
+        :param endpoint_id: The collection which was changed
+        :param paths: The paths which were changed. If omitted, all results for the
+            collection are dropped.
+        :returns: The number of entries removed
+        """
+        endpoint_id = str(endpoint_id)
+        if paths is None:
+            count = self._cache.invalidate_where(lambda k: k[2] == endpoint_id)
+        else:
+            changed: set[str] = set()
+            parents: set[str] = set()
+            for path in paths:
+                normalized = _normalize_path(path)
+                if normalized is None:
+                    continue
+                changed.add(normalized)
+                parents.add(posixpath.dirname(normalized) or "/")
+
+            def _affected(key: _CacheKey) -> bool:
+                if key[2] != endpoint_id:
+                    return False
+                cached_path = key[3]
+                if cached_path is None or cached_path in changed:
+                    return True
+                if key[1] == "ls" and cached_path in parents:
+                    return True
+                # check if an ancestor of the cached path was changed
+                ancestor = cached_path
+                while True:
+                    parent = posixpath.dirname(ancestor)
+                    if not parent or parent == ancestor:
+                        return False
+                    if parent in changed:
+                        return True
+                    ancestor = parent
+
+            count = self._cache.invalidate_where(_affected)
+        log.debug(f"TransferListingCache invalidated {count} entries for {endpoint_id}")
+        return count
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Get statistics for this cache: counts of hits, misses, evictions,
+        expirations, and invalidations, along with the current size.
+        """
+        return self._cache.stats()
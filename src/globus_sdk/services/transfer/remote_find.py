@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import datetime
+import fnmatch
+import logging
+import re
+import typing as t
+import uuid
+
+from globus_sdk import exc
+from globus_sdk._missing import MISSING, MissingType
+
+if t.TYPE_CHECKING:
+    from .client import TransferClient
+
+log = logging.getLogger(__name__)
+
+# characters of fnmatch patterns which cannot be sent in a Transfer '~' filter:
+# wildcards which it may not support, and the filter syntax's own separators
+_LOCAL_ONLY_PATTERN_CHARS = re.compile(r"[?\[\],/]")
+
+
+def _to_utc(value: datetime.datetime) -> datetime.datetime:
+    # naive datetimes are taken to be in UTC, as Transfer reports times in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
+
+
+def _filter_time(value: datetime.datetime | None) -> str:
+    return "" if value is None else value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class _FileMatcher:
+    """
+    Checks file documents against the criteria of ``find_files``, and computes the
+    ``operation_ls`` filter which pre-filters listings on the server.
+    """
+
+    def __init__(
+        self,
+        patterns: str | t.Iterable[str] | None,
+        regex: str | re.Pattern[str] | None,
+        modified_before: datetime.datetime | None,
+        modified_after: datetime.datetime | None,
+        min_size: int | None,
+        max_size: int | None,
+    ) -> None:
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        self.patterns = list(patterns) if patterns is not None else None
+        if self.patterns is not None and not self.patterns:
+            raise exc.GlobusSDKUsageError("find_files patterns must not be empty")
+        self.regex = re.compile(regex) if isinstance(regex, str) else regex
+        self.modified_before = (
+            _to_utc(modified_before) if modified_before is not None else None
+        )
+        self.modified_after = (
+            _to_utc(modified_after) if modified_after is not None else None
+        )
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def server_filter(self) -> list[str | dict[str, str | list[str]]] | MissingType:
+        """
+        Build a filter which matches a superset of the files wanted. Each pattern
+        becomes one filter clause, as the Transfer service returns entries which
+        match any clause.
+        """
+        clause: dict[str, str | list[str]] = {}
+        if self.modified_before is not None or self.modified_after is not None:
+            clause["last_modified"] = [
+                _filter_time(self.modified_after),
+                _filter_time(self.modified_before),
+            ]
+        # only plain '*' globs are sent to the service, to avoid any difference in
+        # wildcard support or in parsing; other patterns are only checked locally
+        if self.patterns is not None and not any(
+            _LOCAL_ONLY_PATTERN_CHARS.search(p) for p in self.patterns
+        ):
+            return [{**clause, "name": f"~{p}"} for p in self.patterns]
+        return [clause] if clause else MISSING
+
+    def __call__(self, path: str, doc: dict[str, t.Any]) -> bool:
+        if self.patterns is not None and not any(
+            fnmatch.fnmatchcase(doc["name"], p) for p in self.patterns
+        ):
+            return False
+        if self.regex is not None and not self.regex.search(path):
+            return False
+        size = doc.get("size")
+        if self.min_size is not None and (size is None or size < self.min_size):
+            return False
+        if self.max_size is not None and (size is None or size > self.max_size):
+            return False
+        if self.modified_before is not None or self.modified_after is not None:
+            if not doc.get("last_modified"):
+                return False
+            modified = _to_utc(datetime.datetime.fromisoformat(doc["last_modified"]))
+            if self.modified_before is not None and modified >= self.modified_before:
+                return False
+            if self.modified_after is not None and modified < self.modified_after:
+                return False
+        return True
+
+
+def run_find_files(
+    client: TransferClient,
+    endpoint_id: uuid.UUID | str,
+    path: str,
+    *,
+    patterns: str | t.Iterable[str] | None,
+    regex: str | re.Pattern[str] | None,
+    modified_before: datetime.datetime | None,
+    modified_after: datetime.datetime | None,
+    min_size: int | None,
+    max_size: int | None,
+    max_depth: int | None,
+    show_hidden: bool,
+    max_workers: int,
+) -> t.Iterator[tuple[str, dict[str, t.Any]]]:
+    matcher = _FileMatcher(
+        patterns, regex, modified_before, modified_after, min_size, max_size
+    )
+    server_filter = matcher.server_filter()
+    log.debug(f"find_files({endpoint_id}, {path}) with filter {server_filter}")
+
+    # the arguments are checked above, before the first result is requested
+    def matches() -> t.Iterator[tuple[str, dict[str, t.Any]]]:
+        for dirpath, _, files in client.walk(
+            endpoint_id,
+            path,
+            max_depth=max_depth,
+            max_workers=max_workers,
+            show_hidden=show_hidden,
+            filter=server_filter,
+        ):
+            for doc in files:
+                file_path = dirpath + doc["name"]
+                if matcher(file_path, doc):
+                    yield file_path, doc
+
+    return matches()
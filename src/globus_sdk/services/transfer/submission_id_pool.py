@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+import time
+import types
+import typing as t
+
+from globus_sdk import exc
+
+if t.TYPE_CHECKING:
+    from .client import TransferClient
+
+log = logging.getLogger(__name__)
+
+# after a failed background refill, the number of seconds before trying again
+_REFILL_RETRY_DELAY = 5.0
+
+
+class TransferSubmissionIDPool:
+    """
+    A reserve of submission IDs, fetched ahead of time, so that submitting a task
+    does not first need to wait for a call to
+    :meth:`TransferClient.get_submission_id
+    <globus_sdk.TransferClient.get_submission_id>`.
+
+    A pool is attached to a client by assigning it to the client's
+    ``submission_id_pool`` attribute. ``submit_transfer`` and ``submit_delete``
+    (and so ``bulk_submit``) will then take an ID from the pool for any document
+    which does not already have a ``submission_id``.
+
+    IDs are fetched in a background thread whenever the reserve falls to
+    ``refill_threshold``, until it holds ``size`` IDs. If the reserve is empty, an
+    ID is fetched immediately instead, so a pool is never slower than fetching IDs
+    on demand.
+
+    Each ID is handed out exactly once. An ID is never returned to the reserve,
+    even if the submission which used it fails. (Retrying a submission with the
+    same document reuses its ID, which is what prevents a duplicate task.)
+
+    If a background fetch fails, refilling pauses for a few seconds and the error
+    is logged; errors are only raised by fetches made on demand.
+
+    :param client: The client used to fetch IDs
+    :param size: The number of IDs to hold in reserve [Default: ``10``]
+    :param refill_threshold: Start refilling once the reserve holds this many IDs
+        or fewer. Defaults to half of ``size``.
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                tc = globus_sdk.TransferClient(...)
+                with globus_sdk.TransferSubmissionIDPool(tc, size=20) as pool:
+                    tc.submission_id_pool = pool
+                    for tdata in documents:
+                        tc.submit_transfer(tdata)
+    """
+
+    def __init__(
+        self,
+        client: TransferClient,
+        *,
+        size: int = 10,
+        refill_threshold: int | None = None,
+    ) -> None:
+        if size < 1:
+            raise exc.GlobusSDKUsageError(
+                "TransferSubmissionIDPool size has a minimum of 1"
+            )
+        if refill_threshold is None:
+            refill_threshold = size // 2
+        if not 0 <= refill_threshold < size:
+            raise exc.GlobusSDKUsageError(
+                "TransferSubmissionIDPool requires 0 <= refill_threshold < size"
+            )
+        self.client = client
+        self.size = size
+        self.refill_threshold = refill_threshold
+
+        self._ids: collections.deque[str] = collections.deque()
+        self._lock = threading.Lock()
+        self._refill_thread: threading.Thread | None = None
+        self._retry_at = 0.0
+        self._closed = False
+        #: The number of IDs handed out
+        self.ids_issued = 0
+        #: The number of IDs fetched on demand, because the reserve was empty
+        self.reserve_misses = 0
+
+        self._schedule_refill()
+
+    def __enter__(self) -> TransferSubmissionIDPool:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """The number of IDs currently held in reserve."""
+        return len(self._ids)
+
+    def close(self) -> None:
+        """
+        Stop refilling and discard the reserve. The pool may still be used
+        afterwards, but will fetch each ID on demand.
+        """
+        with self._lock:
+            self._closed = True
+            thread = self._refill_thread
+        if thread is not None:
+            thread.join()
+        self._ids.clear()
+
+    def take(self) -> str:
+        """
+        Remove an ID from the reserve and return it, or fetch one if the reserve
+        is empty.
+        """
+        with self._lock:
+            submission_id = self._ids.popleft() if self._ids else None
+            self.ids_issued += 1
+            if submission_id is None:
+                self.reserve_misses += 1
+        self._schedule_refill()
+        if submission_id is None:
+            log.debug("submission ID pool is empty, fetching an ID on demand")
+            submission_id = str(self.client.get_submission_id()["value"])
+        return submission_id
+
+    def _schedule_refill(self) -> None:
+        with self._lock:
+            if (
+                self._closed
+                or len(self._ids) > self.refill_threshold
+                or (self._refill_thread is not None and self._refill_thread.is_alive())
+                or time.monotonic() < self._retry_at
+            ):
+                return
+            self._refill_thread = threading.Thread(target=self._refill, daemon=True)
+            self._refill_thread.start()
+
+    def _refill(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed or len(self._ids) >= self.size:
+                    return
+            try:
+                submission_id = str(self.client.get_submission_id()["value"])
+            except (exc.GlobusAPIError, exc.NetworkError) as err:
+                log.warning(f"failed to refill the submission ID pool: {err}")
+                with self._lock:
+                    self._retry_at = time.monotonic() + _REFILL_RETRY_DELAY
+                return
+            with self._lock:
+                # an ID fetched while closing is discarded, never issued
+                if not self._closed:
+                    self._ids.append(submission_id)
@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import datetime
+import logging
+import os
+import typing as t
+import uuid
+
+from globus_sdk import exc
+from globus_sdk._missing import MISSING, MissingType
+
+from .data import DeleteData, TransferData
+
+if t.TYPE_CHECKING:
+    from .client import TransferClient
+
+log = logging.getLogger(__name__)
+
+# a compact index of one directory: name -> (is_dir, size, mtime)
+_DirIndex = t.Dict[str, t.Tuple[bool, int, float]]
+
+
+def _scan_local_dir(path: str) -> _DirIndex | None:
+    """
+    Index a local directory with ``os.scandir``. Returns None if the directory does
+    not exist. Symlinks to directories are not followed.
+    """
+    index: _DirIndex = {}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        index[entry.name] = (True, 0, 0.0)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        index[entry.name] = (False, st.st_size, st.st_mtime)
+                except OSError as err:
+                    log.warning(f"sync planner could not stat {entry.path}: {err}")
+    except FileNotFoundError:
+        return None
+    return index
+
+
+def _parse_last_modified(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+
+def _ensure_trailing_slash(path: str) -> str:
+    return path if path.endswith("/") else f"{path}/"
+
+
+@dataclasses.dataclass
+class SyncPlanStats:
+    """
+    Counters describing the work done by a :class:`TransferSyncPlanner`.
+
+    :param directories_compared: Directories which were indexed on both sides
+    :param files_compared: Files found on both sides which were compared
+    :param files_to_transfer: Files which will be transferred
+    :param directories_to_transfer: Directories missing on the destination, which
+        will be transferred recursively
+    :param bytes_to_transfer: The total size of ``files_to_transfer``
+    :param paths_to_delete: Files and directories which will be deleted from the
+        destination
+    :param type_conflicts: Paths which are a file on one side and a directory on the
+        other. These are skipped.
+    :param errors: Remote directories which could not be listed, and were skipped
+    """
+
+    directories_compared: int = 0
+    files_compared: int = 0
+    files_to_transfer: int = 0
+    directories_to_transfer: int = 0
+    bytes_to_transfer: int = 0
+    paths_to_delete: int = 0
+    type_conflicts: int = 0
+    errors: list[tuple[str, exc.GlobusAPIError | exc.NetworkError]] = dataclasses.field(
+        default_factory=list
+    )
+
+
+class TransferSyncPlanner:
+    """
+    Compare a local directory tree with a tree on a remote collection, and build
+    the minimal :class:`TransferData <globus_sdk.TransferData>` (and optionally
+    :class:`DeleteData <globus_sdk.DeleteData>`) documents needed to bring the
+    remote tree up to date.
+
+    The two trees are compared directory by directory: the remote tree is walked
+    with :meth:`TransferClient.walk <globus_sdk.TransferClient.walk>`, and the
+    matching local directories are indexed with :func:`os.scandir` in a thread pool.
+    Only the directories on the frontier of the walk are indexed at any time, so
+    memory use does not grow with the size of the trees. Documents are yielded as
+    they fill up, rather than after the whole comparison.
+
+    Files are compared by size and modification time according to ``compare``:
+
+    - ``"size"``: transfer files whose sizes differ
+    - ``"mtime"``: also transfer files which are newer locally
+    - ``"checksum"``: transfer all files present on both sides whose sizes match
+      as well, and set ``sync_level="checksum"`` on the ``TransferData`` so that
+      the Transfer service compares checksums and skips identical files
+
+    Directories which do not exist on the remote side are transferred as single
+    recursive items.
+
+    :param client: The client used to list the remote collection
+    :param local_root: The local directory to compare
+    :param source_endpoint: The ID of the collection which serves ``local_root``
+        (e.g. a Globus Connect Personal collection)
+    :param destination_endpoint: The ID of the remote collection
+    :param destination_root: The path of the tree on the remote collection
+    :param source_root: The path of ``local_root`` on ``source_endpoint``.
+        Defaults to ``local_root``.
+    :param compare: How to compare files found on both sides.
+        [Default: ``"mtime"``]
+    :param delete: Produce ``DeleteData`` documents for paths which exist only on the
+        remote side. [Default: ``False``]
+    :param mtime_tolerance: Differences in modification time up to this many
+        seconds are ignored. [Default: ``1``]
+    :param max_items: The maximum number of items in each document. Full documents
+        are yielded and a new one is started. [Default: ``10000``]
+    :param max_workers: The number of concurrent remote listings, and of concurrent
+        local directory scans. [Default: ``4``]
+    :param label: A label for generated documents
+    :param additional_fields: Additional fields for generated ``TransferData``
+        documents, such as ``{"preserve_timestamp": True}``
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                tc = globus_sdk.TransferClient(...)
+                planner = globus_sdk.TransferSyncPlanner(
+                    tc,
+                    "/data/results",
+                    source_endpoint=LOCAL_GCP_ID,
+                    destination_endpoint=REMOTE_ID,
+                    destination_root="/projects/results/",
+                    delete=True,
+                )
+                for doc in planner.iter_documents():
+                    if isinstance(doc, globus_sdk.DeleteData):
+                        tc.submit_delete(doc)
+                    else:
+                        tc.submit_transfer(doc)
+                print(planner.stats)
+    """
+
+    def __init__(
+        self,
+        client: TransferClient,
+        local_root: str | os.PathLike[str],
+        *,
+        source_endpoint: uuid.UUID | str,
+        destination_endpoint: uuid.UUID | str,
+        destination_root: str,
+        source_root: str | None = None,
+        compare: t.Literal["size", "mtime", "checksum"] = "mtime",
+        delete: bool = False,
+        mtime_tolerance: float = 1,
+        max_items: int = 10000,
+        max_workers: int = 4,
+        label: str | MissingType = MISSING,
+        additional_fields: dict[str, t.Any] | None = None,
+    ) -> None:
+        if compare not in ("size", "mtime", "checksum"):
+            raise exc.GlobusSDKUsageError(f"Unrecognized compare mode: {compare}")
+        if max_items < 1:
+            raise exc.GlobusSDKUsageError("max_items has a minimum of 1")
+        self.client = client
+        self.local_root = os.fspath(local_root)
+        self.source_endpoint = source_endpoint
+        self.destination_endpoint = destination_endpoint
+        self.destination_root = _ensure_trailing_slash(destination_root)
+        self.source_root = _ensure_trailing_slash(
+            source_root
+            if source_root is not None
+            else self.local_root.replace(os.sep, "/")
+        )
+        self.compare = compare
+        self.delete = delete
+        self.mtime_tolerance = mtime_tolerance
+        self.max_items = max_items
+        self.max_workers = max_workers
+        self.label = label
+        self.additional_fields = additional_fields
+        self.stats = SyncPlanStats()
+
+        self._transfer_doc: TransferData | None = None
+        self._delete_doc: DeleteData | None = None
+
+    def _local_path(self, relpath: str) -> str:
+        return os.path.join(self.local_root, *relpath.split("/"))
+
+    def _add_transfer(self, relpath: str, *, recursive: bool) -> TransferData | None:
+        """Add an item, returning the current document if it is now full."""
+        if self._transfer_doc is None:
+            self._transfer_doc = TransferData(
+                self.source_endpoint,
+                self.destination_endpoint,
+                label=self.label,
+                sync_level="checksum" if self.compare == "checksum" else MISSING,
+                additional_fields=self.additional_fields,
+            )
+        self._transfer_doc.add_item(
+            self.source_root + relpath,
+            self.destination_root + relpath,
+            recursive=recursive or MISSING,
+        )
+        if len(self._transfer_doc["DATA"]) >= self.max_items:
+            full, self._transfer_doc = self._transfer_doc, None
+            return full
+        return None
+
+    def _add_delete(self, relpath: str) -> DeleteData | None:
+        """Add an item, returning the current document if it is now full."""
+        if self._delete_doc is None:
+            self._delete_doc = DeleteData(
+                self.destination_endpoint, label=self.label, recursive=True
+            )
+        self._delete_doc.add_item(self.destination_root + relpath)
+        if len(self._delete_doc["DATA"]) >= self.max_items:
+            full, self._delete_doc = self._delete_doc, None
+            return full
+        return None
+
+    def _file_changed(self, local: tuple[bool, int, float], remote: t.Any) -> bool:
+        _, local_size, local_mtime = local
+        if local_size != remote.get("size"):
+            return True
+        if self.compare == "checksum":
+            return True
+        if self.compare == "mtime":
+            remote_mtime = _parse_last_modified(remote.get("last_modified"))
+            if remote_mtime is None:
+                return True
+            return local_mtime - remote_mtime > self.mtime_tolerance
+        return False
+
+    def _diff_dir(
+        self,
+        reldir: str,
+        local: _DirIndex,
+        remote_dirs: list[dict[str, t.Any]],
+        remote_files: list[dict[str, t.Any]],
+    ) -> t.Iterator[TransferData | DeleteData]:
+        """
+        Compare one directory. Prunes ``remote_dirs`` in-place so that the walk only
+        descends into directories which exist on both sides.
+        """
+        self.stats.directories_compared += 1
+        seen: set[str] = set()
+        both_dirs = []
+
+        for remote in remote_dirs:
+            name = remote["name"]
+            seen.add(name)
+            local_entry = local.get(name)
+            if local_entry is None:
+                if self.delete:
+                    self.stats.paths_to_delete += 1
+                    if ddata := self._add_delete(reldir + name):
+                        yield ddata
+            elif not local_entry[0]:
+                self.stats.type_conflicts += 1
+                log.warning(f"sync planner skipping type conflict at {reldir}{name}")
+            else:
+                both_dirs.append(remote)
+        remote_dirs[:] = both_dirs
+
+        for remote in remote_files:
+            name = remote["name"]
+            seen.add(name)
+            local_entry = local.get(name)
+            if local_entry is None:
+                if self.delete:
+                    self.stats.paths_to_delete += 1
+                    if ddata := self._add_delete(reldir + name):
+                        yield ddata
+            elif local_entry[0]:
+                self.stats.type_conflicts += 1
+                log.warning(f"sync planner skipping type conflict at {reldir}{name}")
+            else:
+                self.stats.files_compared += 1
+                if self._file_changed(local_entry, remote):
+                    self.stats.files_to_transfer += 1
+                    self.stats.bytes_to_transfer += local_entry[1]
+                    if tdata := self._add_transfer(reldir + name, recursive=False):
+                        yield tdata
+
+        for name, (is_dir, size, _) in local.items():
+            if name in seen:
+                continue
+            if is_dir:
+                self.stats.directories_to_transfer += 1
+                if tdata := self._add_transfer(reldir + name + "/", recursive=True):
+                    yield tdata
+            else:
+                self.stats.files_to_transfer += 1
+                self.stats.bytes_to_transfer += size
+                if tdata := self._add_transfer(reldir + name, recursive=False):
+                    yield tdata
+
+    def iter_documents(self) -> t.Iterator[TransferData | DeleteData]:
+        """
+        Compare the trees, yielding ``TransferData`` and ``DeleteData`` documents
+        with up to ``max_items`` items each, as they are filled.
+
+        Remote directories which cannot be listed are recorded in ``stats.errors``
+        and skipped. If the remote root itself does not exist, the whole local
+        tree is transferred recursively.
+        """
+        if not os.path.isdir(self.local_root):
+            raise exc.GlobusSDKUsageError(
+                f"TransferSyncPlanner local_root is not a directory: {self.local_root}"
+            )
+        root_missing = False
+
+        def on_error(path: str, err: exc.GlobusAPIError | exc.NetworkError) -> None:
+            nonlocal root_missing
+            if (
+                path == self.destination_root
+                and isinstance(err, exc.GlobusAPIError)
+                and err.http_status == 404
+            ):
+                root_missing = True
+            else:
+                self.stats.errors.append((path, err))
+
+        root_len = len(self.destination_root)
+        scans: dict[str, concurrent.futures.Future[_DirIndex | None]] = {}
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as pool:
+
+            def prefetch(relpath: str) -> None:
+                scans[relpath] = pool.submit(_scan_local_dir, self._local_path(relpath))
+
+            prefetch("")
+            try:
+                for dirpath, dirs, files in self.client.walk(
+                    self.destination_endpoint,
+                    self.destination_root,
+                    max_workers=self.max_workers,
+                    on_error=on_error,
+                ):
+                    reldir = dirpath[root_len:]
+                    scan = scans.pop(reldir, None)
+                    local = (
+                        scan.result()
+                        if scan is not None
+                        else _scan_local_dir(self._local_path(reldir))
+                    )
+                    if local is None:
+                        # the local directory vanished during the walk; rather
+                        # than planning to delete its remote contents, skip it
+                        log.warning(f"sync planner: {reldir} is missing locally")
+                        dirs.clear()
+                        continue
+                    yield from self._diff_dir(reldir, local, dirs, files)
+                    for remote in dirs:
+                        prefetch(reldir + remote["name"] + "/")
+            finally:
+                for scan in scans.values():
+                    scan.cancel()
+
+        if root_missing:
+            self.stats.directories_to_transfer += 1
+            if full := self._add_transfer("", recursive=True):
+                yield full
+
+        # flush partial documents, deletions first
+        if self._delete_doc is not None:
+            yield self._delete_doc
+            self._delete_doc = None
+        if self._transfer_doc is not None:
+            yield self._transfer_doc
+            self._transfer_doc = None
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import csv
+import dataclasses
+import gzip
+import io
+import json
+import logging
+import os
+import queue
+import threading
+import typing as t
+import uuid
+
+from globus_sdk import exc
+
+if t.TYPE_CHECKING:
+    from .client import TransferClient
+
+log = logging.getLogger(__name__)
+
+TaskRecordKind = t.Literal["successful_transfers", "skipped_errors", "events"]
+
+# the page size used for offset-paginated event lists
+_EVENT_PAGE_SIZE = 1000
+_CHECKPOINT_VERSION = 1
+
+# a page of records, and the cursor for the page after it (None at the end)
+_Page = t.Tuple[t.List[t.Dict[str, t.Any]], t.Union[str, int, None]]
+
+
+@dataclasses.dataclass
+class TaskExportResult:
+    """
+    The result of
+    :meth:`TransferClient.export_task_records
+    <globus_sdk.TransferClient.export_task_records>`.
+
+    :param records_written: The total number of records in the output, including
+        any written before resuming
+    :param pages: The number of pages fetched by this call
+    :param resumed: Whether the export resumed from a checkpoint
+    """
+
+    records_written: int = 0
+    pages: int = 0
+    resumed: bool = False
+
+
+def _iter_pages(
+    client: TransferClient,
+    kind: TaskRecordKind,
+    task_id: str,
+    endpoint_manager: bool,
+    cursor: str | int | None,
+) -> t.Iterator[_Page]:
+    if kind == "events":
+        event_list = (
+            client.endpoint_manager_task_event_list
+            if endpoint_manager
+            else client.task_event_list
+        )
+        offset = int(cursor or 0)
+        while True:
+            page = event_list(task_id, limit=_EVENT_PAGE_SIZE, offset=offset)
+            data = page["DATA"]
+            offset += len(data)
+            done = not data or offset >= page.get("total", offset)
+            yield data, None if done else offset
+            if done:
+                return
+
+    if kind == "successful_transfers":
+        method = (
+            client.endpoint_manager_task_successful_transfers
+            if endpoint_manager
+            else client.task_successful_transfers
+        )
+    else:
+        method = (
+            client.endpoint_manager_task_skipped_errors
+            if endpoint_manager
+            else client.task_skipped_errors
+        )
+    marker = cursor
+    while True:
+        if marker is None:
+            page = method(task_id)
+        else:
+            page = method(task_id, marker=str(marker))
+        marker = page.get("next_marker")
+        yield page["DATA"], marker
+        if marker is None:
+            return
+
+
+def _prefetch(pages: t.Iterator[_Page], depth: int) -> t.Iterator[_Page]:
+    """
+    Fetch pages in a background thread, holding at most ``depth`` pages which have
+    not yet been consumed. Errors are re-raised in the consuming thread.
+    """
+    buffer: queue.Queue[tuple[_Page | None, BaseException | None]] = queue.Queue(
+        maxsize=depth
+    )
+    stop = threading.Event()
+
+    def put(value: tuple[_Page | None, BaseException | None]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+        except BaseException as err:  # pylint: disable=broad-exception-caught
+            put((None, err))
+            return
+        put((None, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            page, err = buffer.get()
+            if err is not None:
+                raise err
+            if page is None:
+                return
+            yield page
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _csv_value(value: t.Any) -> t.Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+class _Checkpoint:
+    """
+    The progress of an export, saved as JSON after each page is written. The file is
+    replaced atomically, so it always describes a consistent prefix of the output.
+    """
+
+    def __init__(self, path: str, identity: dict[str, t.Any]) -> None:
+        self.path = path
+        self.identity = identity
+        self.cursor: str | int | None = None
+        self.done = False
+        self.records_written = 0
+        self.output_size = 0
+        self.fields: list[str] | None = None
+
+    def load(self) -> bool:
+        """Load saved progress. Returns False if there is none."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return False
+        if saved.get("version") != _CHECKPOINT_VERSION or any(
+            saved.get(k) != v for k, v in self.identity.items()
+        ):
+            raise exc.GlobusSDKUsageError(
+                f"The checkpoint file '{self.path}' belongs to a different export"
+            )
+        self.cursor = saved["cursor"]
+        self.done = saved["done"]
+        self.records_written = saved["records_written"]
+        self.output_size = saved["output_size"]
+        self.fields = saved["fields"]
+        return True
+
+    def save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": _CHECKPOINT_VERSION,
+                    **self.identity,
+                    "cursor": self.cursor,
+                    "done": self.done,
+                    "records_written": self.records_written,
+                    "output_size": self.output_size,
+                    "fields": self.fields,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+
+def run_task_export(
+    client: TransferClient,
+    task_id: uuid.UUID | str,
+    output: str | os.PathLike[str],
+    *,
+    records: TaskRecordKind,
+    endpoint_manager: bool,
+    format: t.Literal["ndjson", "csv"],  # pylint: disable=redefined-builtin
+    compress: bool | None,
+    fields: t.Sequence[str] | None,
+    checkpoint: str | os.PathLike[str] | None,
+    prefetch: int,
+) -> TaskExportResult:
+    if records not in ("successful_transfers", "skipped_errors", "events"):
+        raise exc.GlobusSDKUsageError(f"Unknown task record kind: {records!r}")
+    if format not in ("ndjson", "csv"):
+        raise exc.GlobusSDKUsageError(f"Unknown export format: {format!r}")
+    if prefetch < 1:
+        raise exc.GlobusSDKUsageError("export_task_records prefetch has a minimum of 1")
+
+    output = os.fspath(output)
+    if compress is None:
+        compress = output.endswith(".gz")
+    progress = _Checkpoint(
+        os.fspath(checkpoint) if checkpoint is not None else "",
+        {
+            "task_id": str(task_id),
+            "records": records,
+            "endpoint_manager": endpoint_manager,
+            "format": format,
+            "compress": compress,
+        },
+    )
+    progress.fields = list(fields) if fields is not None else None
+
+    result = TaskExportResult()
+    if checkpoint is not None and progress.load():
+        result.resumed = True
+        result.records_written = progress.records_written
+        if progress.done:
+            log.debug(f"export of {records} for {task_id} is already complete")
+            return result
+        if os.path.getsize(output) < progress.output_size:
+            raise exc.GlobusSDKUsageError(
+                f"Cannot resume: '{output}' is shorter than its checkpoint"
+            )
+        f: t.BinaryIO = open(output, "r+b")
+        # discard anything written after the last checkpoint
+        f.truncate(progress.output_size)
+        f.seek(progress.output_size)
+    else:
+        f = open(output, "wb")
+
+    pages = _prefetch(
+        _iter_pages(client, records, str(task_id), endpoint_manager, progress.cursor),
+        prefetch,
+    )
+    with f:
+        for data, cursor in pages:
+            result.pages += 1
+            buf = io.StringIO()
+            if format == "ndjson":
+                for record in data:
+                    buf.write(json.dumps(record, separators=(",", ":")))
+                    buf.write("\n")
+            else:
+                # unless given, the columns are the fields of the first record
+                if progress.fields is None and data:
+                    progress.fields = list(data[0])
+                if progress.fields is not None:
+                    writer = csv.DictWriter(
+                        buf, progress.fields, restval="", extrasaction="ignore"
+                    )
+                    if progress.output_size == 0:
+                        writer.writeheader()
+                    for record in data:
+                        writer.writerow({k: _csv_value(v) for k, v in record.items()})
+            encoded = buf.getvalue().encode("utf-8")
+            if encoded:
+                if compress:
+                    # each page is a complete gzip member, so that the output is
+                    # valid at every checkpoint
+                    encoded = gzip.compress(encoded)
+                f.write(encoded)
+                f.flush()
+
+            result.records_written += len(data)
+            progress.records_written = result.records_written
+            progress.output_size += len(encoded)
+            progress.cursor = cursor
+            progress.done = cursor is None
+            if checkpoint is not None:
+                os.fsync(f.fileno())
+                progress.save()
+    return result
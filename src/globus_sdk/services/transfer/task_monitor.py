@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import datetime
+import logging
+import queue
+import sys
+import threading
+import time
+import typing as t
+import uuid
+
+from globus_sdk import exc
+from globus_sdk._missing import MISSING, MissingType
+
+if t.TYPE_CHECKING:
+    from .client import TransferClient
+
+log = logging.getLogger(__name__)
+
+_LIVE_STATUSES = ("ACTIVE", "INACTIVE")
+_TERMINAL_STATUSES = ("SUCCEEDED", "FAILED")
+# the maximum number of task IDs looked up in one request
+_LOOKUP_BATCH_SIZE = 100
+# the maximum number of results which task_list can page through
+_TASK_LIST_MAX_RESULTS = 1000
+
+
+class _TaskState(t.NamedTuple):
+    status: str
+    is_paused: bool
+    faults: int
+
+
+@dataclasses.dataclass(frozen=True)
+class TaskMonitorEvent:
+    """
+    The base class for events emitted by a :class:`TransferTaskMonitor`.
+
+    :param task_id: The ID of the task
+    :param task: The task document which produced the event
+    """
+
+    task_id: str
+    task: dict[str, t.Any]
+
+
+@dataclasses.dataclass(frozen=True)
+class TaskStatusChanged(TaskMonitorEvent):
+    """
+    The status of a task changed. When a task is first seen, ``old_status`` is
+    ``None``.
+
+    :param old_status: The previous status of the task
+    :param new_status: The current status of the task
+    """
+
+    old_status: str | None
+    new_status: str
+
+
+@dataclasses.dataclass(frozen=True)
+class TaskPauseChanged(TaskMonitorEvent):
+    """
+    A task was paused or resumed, for example by a pause rule.
+
+    :param is_paused: Whether or not the task is now paused
+    """
+
+    is_paused: bool
+
+
+@dataclasses.dataclass(frozen=True)
+class TaskFault(TaskMonitorEvent):
+    """
+    A new fault was recorded for a task.
+
+    :param event: The error event, as returned by the task event list
+    """
+
+    event: dict[str, t.Any]
+
+
+@dataclasses.dataclass(frozen=True)
+class TaskCompleted(TaskMonitorEvent):
+    """
+    A task reached a terminal status. The monitor stops tracking the task.
+
+    :param status: ``"SUCCEEDED"`` or ``"FAILED"``
+    """
+
+    status: str
+
+
+class TransferTaskMonitor:
+    """
+    Watch many Transfer tasks and emit an event whenever one changes.
+
+    Each call to :meth:`poll` lists all active and inactive tasks, and all tasks
+    which completed since the previous poll, and compares them against a compact
+    index of the state of each live task. The differences are emitted as events:
+
+    - :class:`TaskStatusChanged <globus_sdk.services.transfer.task_monitor.TaskStatusChanged>`
+      when a task is first seen or changes status
+    - :class:`TaskPauseChanged <globus_sdk.services.transfer.task_monitor.TaskPauseChanged>`
+      when a task is paused or resumed
+    - :class:`TaskFault <globus_sdk.services.transfer.task_monitor.TaskFault>`
+      for each new fault, read from the task event list
+    - :class:`TaskCompleted <globus_sdk.services.transfer.task_monitor.TaskCompleted>`
+      when a task succeeds or fails
+
+    Events are passed to each registered callback and put onto ``queue``, if one is
+    given. Completed tasks are dropped from the index, so memory use is bounded by
+    the number of live tasks, up to ``max_tasks``.
+
+    By default, the monitor watches the tasks of the current user. The task list of
+    a user can only be read up to its first 1000 results, so this is suited to users
+    with fewer than 1000 live tasks, or tasks completed between polls; if a listing
+    reaches that limit, a warning is logged, as tasks may be missed. With
+    ``endpoint_manager=True``, it uses the endpoint manager APIs to watch all tasks
+    on ``endpoints``, which requires an activity monitor role on those endpoints,
+    and has no such limit.
+
+    :param client: The client used to list tasks
+    :param endpoint_manager: Use the endpoint manager APIs. [Default: ``False``]
+    :param endpoints: Only watch tasks with one of these endpoints as their source or
+        destination. Required when ``endpoint_manager`` is used.
+    :param owner_ids: Only watch tasks owned by one of these identities. Only
+        supported when ``endpoint_manager`` is used.
+    :param since: Report tasks which completed after this time, even if they were
+        never seen while running. Defaults to the time the monitor is created.
+    :param fetch_faults: Read the task event list to report new faults. If
+        ``False``, no ``TaskFault`` events are emitted. Faults which tasks already
+        had when the monitor first polls are not reported. [Default: ``True``]
+    :param interval: The number of seconds between polls in :meth:`run`.
+        [Default: ``30``]
+    :param completion_overlap: The number of seconds by which the completion time
+        window of each poll overlaps the previous poll, to allow for clock skew.
+        [Default: ``60``]
+    :param max_tasks: The maximum number of live tasks to track, and of completed
+        tasks to remember. If exceeded, the oldest tasks are forgotten, and may be
+        reported again. [Default: ``100000``]
+    :param queue: A queue onto which each event is put
+
+    .. tab-set::
+
+        .. tab-item:: Example Usage
+
+            .. code-block:: python
+
+                from globus_sdk.services.transfer.task_monitor import (
+                    TaskCompleted,
+                    TaskFault,
+                )
+
+                tc = TransferClient(...)
+                monitor = TransferTaskMonitor(
+                    tc, endpoint_manager=True, endpoints=[my_endpoint_id]
+                )
+
+
+                def on_event(event):
+                    if isinstance(event, TaskFault):
+                        print(f"{event.task_id}: {event.event['description']}")
+                    elif isinstance(event, TaskCompleted):
+                        print(f"{event.task_id}: {event.status}")
+
+
+                monitor.add_callback(on_event)
+                monitor.run()
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        client: TransferClient,
+        *,
+        endpoint_manager: bool = False,
+        endpoints: t.Iterable[uuid.UUID | str] | None = None,
+        owner_ids: t.Iterable[uuid.UUID | str] | None = None,
+        since: datetime.datetime | None = None,
+        fetch_faults: bool = True,
+        interval: float = 30,
+        completion_overlap: float = 60,
+        max_tasks: int = 100_000,
+        queue: queue.Queue[TaskMonitorEvent] | None = None,
+    ) -> None:
+        self.client = client
+        self.endpoint_manager = endpoint_manager
+        self.endpoints = [str(e) for e in endpoints or ()]
+        self.owner_ids = [str(o) for o in owner_ids or ()]
+        self.fetch_faults = fetch_faults
+        self.interval = interval
+        self.completion_overlap = completion_overlap
+        self.max_tasks = max_tasks
+        self.queue = queue
+
+        if endpoint_manager and not self.endpoints:
+            raise exc.GlobusSDKUsageError(
+                "TransferTaskMonitor requires endpoints when endpoint_manager=True"
+            )
+        if self.owner_ids and not endpoint_manager:
+            raise exc.GlobusSDKUsageError(
+                "TransferTaskMonitor only supports owner_ids when "
+                "endpoint_manager=True"
+            )
+        if max_tasks < 1:
+            raise exc.GlobusSDKUsageError(
+                "TransferTaskMonitor max_tasks has a minimum of 1"
+            )
+
+        self._watermark = since or datetime.datetime.now(datetime.timezone.utc)
+        self._callbacks: list[t.Callable[[TaskMonitorEvent], None]] = []
+        # the state of each live task, in the order in which tasks were first seen
+        self._index: dict[str, _TaskState] = {}
+        # completed tasks, which overlapping completion windows may list again
+        self._completed: collections.OrderedDict[str, None] = collections.OrderedDict()
+        # the first poll records the faults of tasks without reading their events
+        self._primed = False
+
+    @property
+    def task_count(self) -> int:
+        """The number of live tasks being tracked."""
+        return len(self._index)
+
+    def add_callback(self, callback: t.Callable[[TaskMonitorEvent], None]) -> None:
+        """
+        Register a callback, which will be called with each event.
+
+        Exceptions raised by callbacks are logged, and do not stop the monitor.
+
+        :param callback: The function to call
+        """
+        self._callbacks.append(callback)
+
+    def poll(self) -> list[TaskMonitorEvent]:
+        """
+        Check for changes once, dispatch the resulting events, and return them.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        since = self._watermark - datetime.timedelta(seconds=self.completion_overlap)
+
+        tasks: dict[str, dict[str, t.Any]] = {}
+        for task in self._list_tasks(statuses=_LIVE_STATUSES):
+            tasks[task["task_id"]] = task
+        for task in self._list_tasks(completed_since=since):
+            tasks.setdefault(task["task_id"], task)
+        # look up tracked tasks which no longer appear in either listing
+        missing = [task_id for task_id in self._index if task_id not in tasks]
+        for start in range(0, len(missing), _LOOKUP_BATCH_SIZE):
+            batch = missing[start : start + _LOOKUP_BATCH_SIZE]
+            for task in self._list_tasks(task_ids=batch):
+                tasks[task["task_id"]] = task
+        for task_id in missing:
+            if task_id not in tasks:
+                log.debug(f"TransferTaskMonitor: {task_id} is no longer visible")
+                del self._index[task_id]
+
+        events: list[TaskMonitorEvent] = []
+        for task in tasks.values():
+            events.extend(self._update(task))
+        self._watermark = now
+        self._primed = True
+
+        for event in events:
+            self._dispatch(event)
+        return events
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """
+        Poll every ``interval`` seconds, until ``stop`` is set.
+
+        Network errors and API errors are logged, and polling continues.
+
+        :param stop: An event which, when set, stops the monitor. If not given, the
+            monitor runs forever.
+        """
+        while stop is None or not stop.is_set():
+            try:
+                self.poll()
+            except (exc.NetworkError, exc.GlobusAPIError) as err:
+                log.warning(f"TransferTaskMonitor poll failed: {err}")
+            if stop is None:
+                time.sleep(self.interval)
+            elif stop.wait(self.interval):
+                return
+
+    def _update(self, task: dict[str, t.Any]) -> list[TaskMonitorEvent]:
+        task_id = task["task_id"]
+        if task_id in self._completed:
+            return []
+        status = sys.intern(task["status"])
+        is_paused = bool(task.get("is_paused"))
+        faults = int(task.get("faults") or 0)
+        old = self._index.get(task_id)
+        terminal = status in _TERMINAL_STATUSES
+
+        events: list[TaskMonitorEvent] = []
+        if old is None and not terminal:
+            events.append(TaskStatusChanged(task_id, task, None, status))
+        elif old is not None and old.status != status:
+            events.append(TaskStatusChanged(task_id, task, old.status, status))
+        if is_paused != (old.is_paused if old else False):
+            events.append(TaskPauseChanged(task_id, task, is_paused))
+        new_faults = faults - (old.faults if old else 0)
+        if old is None and not self._primed:
+            # faults from before the monitor started are not reported
+            new_faults = 0
+        if self.fetch_faults and new_faults > 0:
+            events.extend(
+                TaskFault(task_id, task, event)
+                for event in self._fetch_faults(task_id, new_faults)
+            )
+
+        if terminal:
+            events.append(TaskCompleted(task_id, task, status))
+            self._index.pop(task_id, None)
+            self._completed[task_id] = None
+            if len(self._completed) > self.max_tasks:
+                self._completed.popitem(last=False)
+        else:
+            self._index[task_id] = _TaskState(status, is_paused, faults)
+            if len(self._index) > self.max_tasks:
+                evicted = next(iter(self._index))
+                log.warning(
+                    f"TransferTaskMonitor is tracking more than {self.max_tasks} "
+                    f"tasks, forgetting {evicted}"
+                )
+                del self._index[evicted]
+        return events
+
+    def _fetch_faults(self, task_id: str, count: int) -> list[dict[str, t.Any]]:
+        """
+        Get the newest ``count`` error events of a task, oldest first.
+        """
+        limit = min(count, 1000)
+        try:
+            if self.endpoint_manager:
+                res = self.client.endpoint_manager_task_event_list(
+                    task_id, limit=limit, filter_is_error=True
+                )
+            else:
+                res = self.client.task_event_list(
+                    task_id, limit=limit, query_params={"filter": "is_error:1"}
+                )
+        except exc.GlobusAPIError as err:
+            log.warning(
+                f"TransferTaskMonitor could not get events for {task_id}: {err}"
+            )
+            return []
+        # events are listed newest first
+        return list(res["DATA"])[:count][::-1]
+
+    def _list_tasks(
+        self,
+        *,
+        statuses: t.Sequence[str] | MissingType = MISSING,
+        completed_since: datetime.datetime | MissingType = MISSING,
+        task_ids: list[str] | MissingType = MISSING,
+    ) -> t.Iterator[dict[str, t.Any]]:
+        completion_time: str | MissingType = (
+            MISSING
+            if completed_since is MISSING
+            else f"{completed_since.isoformat(timespec='seconds')},"
+        )
+
+        if not self.endpoint_manager:
+            task_filter: dict[str, str | list[str]] = {}
+            if statuses is not MISSING:
+                task_filter["status"] = list(statuses)
+            if completion_time is not MISSING:
+                task_filter["completion_time"] = completion_time
+            if task_ids is not MISSING:
+                task_filter["task_id"] = task_ids
+            listed = 0
+            for task in self.client.paginated.task_list(filter=task_filter).items():
+                listed += 1
+                if not self.endpoints or (
+                    task.get("source_endpoint_id") in self.endpoints
+                    or task.get("destination_endpoint_id") in self.endpoints
+                ):
+                    yield task
+            if listed >= _TASK_LIST_MAX_RESULTS:
+                log.warning(
+                    f"TransferTaskMonitor listed {listed} tasks, the most which "
+                    "task_list can return, so some tasks may be missed; use "
+                    "endpoint_manager=True to watch more tasks"
+                )
+            return
+
+        if task_ids is not MISSING:
+            # a lookup by ID needs no other filters
+            yield from self.client.paginated.endpoint_manager_task_list(
+                filter_task_id=task_ids
+            ).items()
+            return
+        owner_ids: list[str | MissingType] = [*self.owner_ids] or [MISSING]
+        for endpoint in self.endpoints:
+            for owner_id in owner_ids:
+                yield from self.client.paginated.endpoint_manager_task_list(
+                    filter_status=statuses,
+                    filter_endpoint=endpoint,
+                    filter_owner_id=owner_id,
+                    filter_completion_time=completion_time,
+                ).items()
+
+    def _dispatch(self, event: TaskMonitorEvent) -> None:
+        if self.queue is not None:
+            self.queue.put(event)
+        for callback in self._callbacks:
+            try:
+                callback(event)
+            except Exception:
+                log.exception(f"TransferTaskMonitor callback failed on {event}")
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import time
+import typing as t
+import uuid
+
+from globus_sdk import exc, paging
+
+if t.TYPE_CHECKING:
+    from globus_sdk import response
+
+log = logging.getLogger(__name__)
+
+
+def _event_id(event: dict[str, t.Any]) -> int:
+    return int(event["id"])
+
+
+def _list_events(
+    get_events: t.Callable[..., response.GlobusHTTPResponse], tunnel_id: str
+) -> list[dict[str, t.Any]]:
+    # the listing may be split into pages, linked by 'links.next'
+    pages: paging.JSONAPIPaginator[response.GlobusHTTPResponse] = (
+        paging.JSONAPIPaginator(get_events, client_args=(tunnel_id,), client_kwargs={})
+    )
+    events: list[dict[str, t.Any]] = []
+    for page in pages:
+        events.extend(page["data"] or [])
+    return events
+
+
+def run_follow_tunnel_events(
+    get_events: t.Callable[..., response.GlobusHTTPResponse],
+    tunnel_ids: uuid.UUID | str | t.Iterable[uuid.UUID | str],
+    *,
+    include_existing: bool,
+    stop_codes: t.Iterable[str],
+    timeout: float | None,
+    initial_interval: float,
+    max_interval: float,
+    backoff_factor: float,
+    errors: dict[str, Exception] | None,
+) -> t.Iterator[tuple[str, dict[str, t.Any]]]:
+    """
+    Follow the events of several tunnels, polling each with ``get_events``.
+
+    Shared by ``TransferClient`` and ``TransferClientV2``, whose
+    ``get_tunnel_events`` methods differ only in their response types.
+    """
+    if timeout is not None and timeout <= 0:
+        raise exc.GlobusSDKUsageError("follow_tunnel_events timeout must be positive")
+    if not 0 < initial_interval <= max_interval:
+        raise exc.GlobusSDKUsageError(
+            "follow_tunnel_events requires 0 < initial_interval <= max_interval"
+        )
+    if backoff_factor < 1:
+        raise exc.GlobusSDKUsageError(
+            "follow_tunnel_events backoff_factor has a minimum of 1"
+        )
+    stop_codes = frozenset(stop_codes)
+    if isinstance(tunnel_ids, (str, uuid.UUID)):
+        tunnel_ids = [tunnel_ids]
+
+    def follow() -> t.Iterator[tuple[str, dict[str, t.Any]]]:
+        # for each followed tunnel, the ID of the last event seen (None before the
+        # first poll), and the (elapsed) time of its next poll and the interval
+        # which will follow that poll
+        last_seen: dict[str, int | None] = {}
+        schedule: dict[str, tuple[float, float]] = {}
+        for tunnel_id in tunnel_ids:
+            last_seen[str(tunnel_id)] = None
+            schedule[str(tunnel_id)] = (0, initial_interval)
+        elapsed: float = 0
+
+        while schedule:
+            due = [
+                tunnel_id for tunnel_id, (at, _) in schedule.items() if at <= elapsed
+            ]
+            for tunnel_id in due:
+                events: list[dict[str, t.Any]] | None
+                try:
+                    events = _list_events(get_events, tunnel_id)
+                except exc.NetworkError as err:
+                    log.warning(f"follow_tunnel_events: {tunnel_id} poll failed: {err}")
+                    events = None
+                except exc.GlobusAPIError as err:
+                    log.warning(f"follow_tunnel_events: {tunnel_id} poll failed: {err}")
+                    if err.http_status < 500:
+                        # the tunnel cannot be followed, but the others can
+                        if errors is not None:
+                            errors[tunnel_id] = err
+                        del schedule[tunnel_id]
+                        continue
+                    events = None
+
+                previous = last_seen[tunnel_id]
+                new_events = sorted(
+                    (
+                        e
+                        for e in (events or ())
+                        if previous is None or _event_id(e) > previous
+                    ),
+                    key=_event_id,
+                )
+                if new_events:
+                    last_seen[tunnel_id] = _event_id(new_events[-1])
+                elif previous is None and events is not None:
+                    # an empty first poll still sets the starting point
+                    last_seen[tunnel_id] = -1
+                if previous is not None or include_existing:
+                    for event in new_events:
+                        yield tunnel_id, event
+                if any(
+                    event.get("attributes", {}).get("code") in stop_codes
+                    for event in new_events
+                ):
+                    log.debug(f"follow_tunnel_events: {tunnel_id} stopped")
+                    del schedule[tunnel_id]
+                    continue
+
+                # poll often while a tunnel is active, and back off while it's quiet
+                interval = schedule[tunnel_id][1]
+                if new_events and previous is not None:
+                    interval = initial_interval
+                schedule[tunnel_id] = (
+                    elapsed + interval,
+                    min(interval * backoff_factor, max_interval),
+                )
+            if not schedule:
+                return
+
+            next_poll = min(at for at, _ in schedule.values())
+            if timeout is not None:
+                if elapsed >= timeout:
+                    log.debug(
+                        f"follow_tunnel_events timed out following {len(schedule)} "
+                        "tunnels"
+                    )
+                    return
+                next_poll = min(next_poll, timeout)
+            time.sleep(next_poll - elapsed)
+            elapsed = next_poll
+
+    return follow()
@@ -28,7 +28,8 @@ class TokenStorage(metaclass=abc.ABCMeta):
 
     :ivar globus_sdk.IDTokenDecoder | None id_token_decoder: A decoder to use
         when decoding ``id_token`` JWTs from Globus Auth. By default, a new decoder
-        is used each time decoding is performed.
+        is used each time decoding is performed. A decoder with a
+        :class:`globus_sdk.JWKCache` avoids refetching the keys of Globus Auth.
     """
 
     def __init__(self, namespace: str = "DEFAULT") -> None:
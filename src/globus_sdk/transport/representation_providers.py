@@ -1,16 +1,26 @@
 from __future__ import annotations
 
 import enum
+import json
 import typing as t
 import uuid
 
 from globus_sdk._internal import orjson_compat
+from globus_sdk._internal.compact_items import CompactDictList
 from globus_sdk._missing import MISSING, filter_missing
 
 if t.TYPE_CHECKING:
     import requests
 
 
+def _has_compact_items(data: t.Any) -> bool:
+    # compact lists are only used for the items of top-level documents
+    return isinstance(data, CompactDictList) or (
+        isinstance(data, dict)
+        and any(isinstance(v, CompactDictList) for v in data.values())
+    )
+
+
 class RequestsRepresentationProvider:
     """
     A ``RequestsRepresentationProvider`` defines transformations of data to and from
@@ -106,14 +116,14 @@ class RequestsRepresentationProvider:
         """
         Prepare the data (body) for a request.
 
-        If the body is a dict, list, or tuple, it will be recursively processed to
-        filter out MISSING and format primitives.
+        If the body is a dict, list, or tuple (or a compact list of dicts), it will be
+        recursively processed to filter out MISSING and format primitives.
 
         Otherwise, it is returned as-is.
         """
         if isinstance(data, dict):
             return filter_missing({k: self._prepare_data(v) for k, v in data.items()})
-        elif isinstance(data, (list, tuple)):
+        elif isinstance(data, (list, tuple, CompactDictList)):
             return [self._prepare_data(x) for x in data if x is not MISSING]
         else:
             return self._format_primitive(data)
@@ -155,6 +165,9 @@ class RequestsJsonProvider(RequestsRepresentationProvider):
 
     If the ``orjson`` library is installed, it will be used to provide accelerated
     encoding and decoding.
+
+    Compact lists of items, as used by ``TransferData(compact_items=True)``, are
+    encoded one item at a time, so that the items are never all expanded to dicts.
     """
 
     def encode(
@@ -170,6 +183,15 @@ class RequestsJsonProvider(RequestsRepresentationProvider):
         if data is not None:
             headers = {"Content-Type": "application/json", **headers}
 
+        if _has_compact_items(data):
+            return requests.Request(
+                method,
+                url,
+                data=self.encode_json(data),
+                params=self._prepare_params(params),
+                headers=self._prepare_headers(headers),
+            )
+
         # use `orjson` if it's available
         if orjson_compat.ORJSON_AVAILABLE:
             body = prepared = self._prepare_data(data)
@@ -195,6 +217,51 @@ class RequestsJsonProvider(RequestsRepresentationProvider):
                 headers=self._prepare_headers(headers),
             )
 
+    def encode_json(self, data: t.Any) -> bytes:
+        """
+        Encode data as the JSON body which :meth:`encode` sends for it.
+
+        :param data: the body, as a type which this provider can encode
+        """
+        body = bytearray()
+        self._write_json(data, body)
+        return bytes(body)
+
+    def _write_json(self, data: t.Any, body: bytearray) -> None:
+        if orjson_compat.ORJSON_AVAILABLE:
+            item_separator, key_separator = b",", b":"
+        else:
+            # the separators used by `requests` when given `json`
+            item_separator, key_separator = b", ", b": "
+
+        if isinstance(data, CompactDictList):
+            body += b"["
+            for index, item in enumerate(data):
+                if index:
+                    body += item_separator
+                body += self._dumps(self._prepare_data(item))
+            body += b"]"
+        elif isinstance(data, dict) and _has_compact_items(data):
+            body += b"{"
+            first = True
+            for key, value in data.items():
+                if value is MISSING:
+                    continue
+                if not first:
+                    body += item_separator
+                first = False
+                body += self._dumps(key) + key_separator
+                self._write_json(value, body)
+            body += b"}"
+        else:
+            body += self._dumps(self._prepare_data(data))
+
+    def _dumps(self, data: t.Any) -> bytes:
+        if orjson_compat.ORJSON_AVAILABLE:
+            return orjson_compat.dumps(data)
+        # as `requests` does when given `json`
+        return json.dumps(data, allow_nan=False).encode("utf-8")
+
     def decode_body(self, response: requests.Response) -> t.Any:
         if orjson_compat.ORJSON_AVAILABLE:
             return orjson_compat.loads(response.content)
@@ -0,0 +1,54 @@
+import tracemalloc
+
+import pytest
+
+from globus_sdk import TransferData
+from globus_sdk.transport.representation_providers import RequestsJsonProvider
+
+EP1 = "aa752cea-8222-5bc8-acd9-555b090c0ccb"
+EP2 = "313ce13e-b597-5858-ae13-29e46fea26e6"
+
+
+def _build(count, compact):
+    tdata = TransferData(EP1, EP2, compact_items=compact)
+    for i in range(count):
+        tdata.add_item(f"/~/source/dir{i % 100}/file{i}.dat", f"/~/dest/file{i}.dat")
+    return tdata
+
+
+def _measure(func):
+    tracemalloc.start()
+    try:
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+
+@pytest.mark.parametrize("compact", (False, True), ids=("dicts", "compact"))
+@pytest.mark.parametrize("count", (100_000, 1_000_000))
+def test_transfer_data_memory(benchmark, count, compact):
+    def run():
+        _, retained, _ = _measure(lambda: _build(count, compact))
+        return retained
+
+    retained = benchmark.pedantic(run, rounds=1, iterations=1)
+    benchmark.extra_info["retained_bytes"] = retained
+    benchmark.extra_info["bytes_per_item"] = retained / count
+
+
+@pytest.mark.parametrize("compact", (False, True), ids=("dicts", "compact"))
+@pytest.mark.parametrize("count", (100_000, 1_000_000))
+def test_transfer_data_encode_memory(benchmark, count, compact):
+    tdata = _build(count, compact)
+    provider = RequestsJsonProvider()
+
+    def run():
+        _, _, peak = _measure(
+            lambda: provider.encode("POST", "https://example.org", None, tdata, {})
+        )
+        return peak
+
+    peak = benchmark.pedantic(run, rounds=1, iterations=1)
+    benchmark.extra_info["encode_peak_bytes"] = peak
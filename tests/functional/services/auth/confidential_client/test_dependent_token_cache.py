@@ -0,0 +1,188 @@
+import json
+import threading
+import urllib.parse
+
+import pytest
+import responses
+
+import globus_sdk
+from globus_sdk.scopes import Scope
+from globus_sdk.token_storage import MemoryTokenStorage
+
+TOKEN_URL = "https://auth.globus.org/v2/oauth2/token"
+
+
+def _add_token_callback(expires_in=3600, status=200, gate=None):
+    def callback(request):
+        if gate is not None:
+            gate.wait(timeout=5)
+        if status != 200:
+            return (status, {}, json.dumps({"errors": [{"code": "BAD"}]}))
+        body = urllib.parse.parse_qs(request.body)
+        scope = body.get("scope", ["urn:globus:auth:scope:groups.api.globus.org:all"])
+        tokens = [
+            {
+                "access_token": f"dependent-{len(responses.calls)}",
+                "expires_in": expires_in,
+                "resource_server": "groups.api.globus.org",
+                "scope": scope[0],
+                "token_type": "Bearer",
+            }
+        ]
+        return (200, {}, json.dumps(tokens))
+
+    responses.add_callback("POST", TOKEN_URL, callback=callback)
+
+
+def test_dependent_token_cache_reuses_tokens(auth_client):
+    _add_token_callback()
+    cache = globus_sdk.DependentTokenCache(auth_client)
+
+    tokens = cache.get_dependent_tokens("token1", scope="scope1")
+    assert tokens["groups.api.globus.org"].access_token == "dependent-0"
+    assert cache.get_dependent_tokens("token1", scope=["scope1"]) == tokens
+    assert len(responses.calls) == 1
+
+    # a different incoming token, or different scopes, need another exchange
+    cache.get_dependent_tokens("token2", scope="scope1")
+    cache.get_dependent_tokens("token1", scope="scope1 scope2")
+    assert len(responses.calls) == 3
+    assert cache.stats().hits == 1
+
+
+def test_dependent_token_cache_normalizes_scope_keys(auth_client):
+    _add_token_callback()
+    cache = globus_sdk.DependentTokenCache(auth_client)
+
+    cache.get_dependent_tokens("token1", scope=["scope2", "scope1[dep2 *dep1]"])
+    cache.get_dependent_tokens("token1", scope="scope1[*dep1  dep2] scope2")
+    cache.get_dependent_tokens(
+        "token1",
+        scope=Scope("scope1").with_dependencies(
+            [Scope("dep2"), Scope("dep1", optional=True)]
+        ),
+    )
+    assert len(responses.calls) == 2
+    # the caller's scopes are sent as given
+    assert [
+        urllib.parse.parse_qs(call.request.body)["scope"] for call in responses.calls
+    ] == [["scope2 scope1[dep2 *dep1]"], ["scope1[dep2 *dep1]"]]
+
+
+def test_dependent_token_cache_does_not_use_expiring_tokens(auth_client):
+    _add_token_callback(expires_in=30)
+    cache = globus_sdk.DependentTokenCache(auth_client, expiration_margin=60)
+
+    cache.get_dependent_tokens("token1")
+    cache.get_dependent_tokens("token1")
+    assert len(responses.calls) == 2
+
+
+def test_dependent_token_cache_evicts_least_recently_used(auth_client):
+    _add_token_callback()
+    cache = globus_sdk.DependentTokenCache(auth_client, maxsize=2)
+
+    cache.get_dependent_tokens("token1")
+    cache.get_dependent_tokens("token2")
+    cache.get_dependent_tokens("token1")
+    cache.get_dependent_tokens("token3")
+    assert len(responses.calls) == 3
+
+    cache.get_dependent_tokens("token1")
+    assert len(responses.calls) == 3
+    cache.get_dependent_tokens("token2")
+    assert len(responses.calls) == 4
+    assert cache.stats().evictions == 2
+
+
+def test_dependent_token_cache_shares_concurrent_exchanges(auth_client):
+    gate = threading.Event()
+    _add_token_callback(gate=gate)
+    cache = globus_sdk.DependentTokenCache(auth_client)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_dependent_tokens("token1"))
+        )
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(responses.calls) == 1
+    assert len(results) == 5
+    assert all(r == results[0] for r in results)
+
+
+def test_dependent_token_cache_does_not_cache_failures(auth_client):
+    _add_token_callback(status=400)
+    cache = globus_sdk.DependentTokenCache(auth_client)
+
+    for _ in range(2):
+        with pytest.raises(globus_sdk.AuthAPIError):
+            cache.get_dependent_tokens("token1")
+    assert len(responses.calls) == 2
+
+
+def test_dependent_token_cache_backed_by_token_storage(auth_client):
+    _add_token_callback()
+    storage = MemoryTokenStorage(namespace="dependent_tokens")
+    cache = globus_sdk.DependentTokenCache(auth_client, token_storage=storage)
+    tokens = cache.get_dependent_tokens("token1", scope="scope1")
+    cache.get_dependent_tokens("token2", scope="scope1")
+
+    # the tokens are kept in the storage's namespace, which is left unchanged
+    assert storage.namespace == "dependent_tokens"
+    stored_indexes = list(storage.get_token_data_by_resource_server())
+    # each entry has a token, and a record of the resource servers of its tokens
+    assert len(stored_indexes) == 4
+    assert sum(i.endswith("/groups.api.globus.org") for i in stored_indexes) == 2
+
+    # a new cache with the same storage finds the tokens
+    other = globus_sdk.DependentTokenCache(auth_client, token_storage=storage)
+    stored = other.get_dependent_tokens("token1", scope="scope1")
+    assert stored["groups.api.globus.org"].access_token == (
+        tokens["groups.api.globus.org"].access_token
+    )
+    assert len(responses.calls) == 2
+
+    other.invalidate("token1", scope="scope1")
+    assert len(storage.get_token_data_by_resource_server()) == 2
+    cache.invalidate("token1", scope="scope1")
+    cache.get_dependent_tokens("token1", scope="scope1")
+    assert len(responses.calls) == 3
+
+
+def test_dependent_token_cache_purges_expired_stored_tokens(auth_client):
+    _add_token_callback()
+    storage = MemoryTokenStorage()
+    cache = globus_sdk.DependentTokenCache(auth_client, token_storage=storage)
+    cache.get_dependent_tokens("token1")
+    cache.get_dependent_tokens("token2")
+    stored = storage._tokens["DEFAULT"]
+    expired_key = next(i for i in stored if "/" not in i)
+    stored[expired_key]["expires_at_seconds"] = 0
+
+    # expired tokens are only removed when purged
+    assert len(stored) == 4
+    assert cache.purge_expired() == 1
+    assert len(stored) == 2
+    assert not any(i.startswith(expired_key) for i in stored)
+    assert cache.purge_expired() == 0
+
+    # and the tokens which remain are found by another cache
+    other = globus_sdk.DependentTokenCache(auth_client, token_storage=storage)
+    other.get_dependent_tokens("token1")
+    other.get_dependent_tokens("token2")
+    assert len(responses.calls) == 3
+
+
+def test_dependent_token_cache_rejects_bad_arguments(auth_client):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        globus_sdk.DependentTokenCache(auth_client, maxsize=0)
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        globus_sdk.DependentTokenCache(auth_client, expiration_margin=-1)
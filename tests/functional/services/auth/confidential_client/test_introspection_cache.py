@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+import urllib.parse
+
+import pytest
+import responses
+
+import globus_sdk
+from globus_sdk._internal.utils import sha256_string
+
+INTROSPECT_URL = "https://auth.globus.org/v2/oauth2/token/introspect"
+
+
+def _add_introspect_callback(exp_in=3600, status=200, gate=None):
+    def callback(request):
+        if gate is not None:
+            gate.wait(timeout=5)
+        if status != 200:
+            return (status, {}, json.dumps({"errors": [{"code": "BAD"}]}))
+        token = urllib.parse.parse_qs(request.body)["token"][0]
+        if token.startswith("inactive"):
+            return (200, {}, json.dumps({"active": False}))
+        data = {
+            "active": True,
+            "sub": "c8aad43e-d274-11e5-bf98-8b02896cf782",
+            "exp": int(time.time() + exp_in),
+            "identity_set": ["c8aad43e-d274-11e5-bf98-8b02896cf782"],
+        }
+        return (200, {}, json.dumps(data))
+
+    responses.add_callback("POST", INTROSPECT_URL, callback=callback)
+
+
+def test_introspection_cache_reuses_results(auth_client):
+    _add_introspect_callback()
+    cache = globus_sdk.TokenIntrospectionCache(auth_client, include="identity_set")
+
+    assert cache.introspect("token1")["active"] is True
+    assert cache.is_active("token1")
+    assert len(responses.calls) == 1
+    assert urllib.parse.parse_qs(responses.calls[0].request.body) == {
+        "token": ["token1"],
+        "include": ["identity_set"],
+    }
+
+    stats = cache.stats()
+    assert (stats.lookups, stats.hits, stats.auth_calls) == (2, 1, 1)
+    assert stats.hit_rate == 0.5
+    assert stats.auth_calls_avoided == 1
+
+
+def test_introspection_cache_results_are_copies(auth_client):
+    _add_introspect_callback()
+    cache = globus_sdk.TokenIntrospectionCache(auth_client)
+
+    cache.introspect("token1")["active"] = False
+    cache.introspect("token1")["identity_set"].append("some-other-identity")
+    cache.introspect_many(["token1"])[0]["identity_set"].clear()
+    assert cache.is_active("token1")
+    assert cache.introspect("token1")["identity_set"] == [
+        "c8aad43e-d274-11e5-bf98-8b02896cf782"
+    ]
+
+
+def test_introspection_cache_honors_token_expiration(auth_client):
+    _add_introspect_callback(exp_in=20)
+    cache = globus_sdk.TokenIntrospectionCache(auth_client, max_ttl=60)
+    cache.introspect("token1")
+
+    expires_in = cache._results.expires_in(sha256_string("token1"))
+    assert 0 < expires_in <= 20
+
+
+def test_introspection_cache_caches_inactive_tokens_briefly(auth_client):
+    _add_introspect_callback()
+    cache = globus_sdk.TokenIntrospectionCache(auth_client, negative_ttl=5)
+
+    assert not cache.is_active("inactive1")
+    assert not cache.is_active("inactive1")
+    assert len(responses.calls) == 1
+    assert cache.stats().negative_hits == 1
+
+    key = sha256_string("inactive1")
+    assert 0 < cache._results.expires_in(key) <= 5
+
+
+def test_introspection_cache_does_not_cache_errors(auth_client):
+    _add_introspect_callback(status=500)
+    cache = globus_sdk.TokenIntrospectionCache(auth_client)
+
+    for _ in range(2):
+        with pytest.raises(globus_sdk.AuthAPIError):
+            cache.introspect("token1")
+    assert len(responses.calls) == 2
+
+
+def test_introspection_cache_coalesces_concurrent_lookups(auth_client):
+    gate = threading.Event()
+    _add_introspect_callback(gate=gate)
+    cache = globus_sdk.TokenIntrospectionCache(auth_client)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.introspect("token1")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    # wait until every thread has either started or joined the introspection
+    deadline = time.monotonic() + 5
+    while cache.stats().lookups < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(responses.calls) == 1
+    assert len(results) == 5
+    stats = cache.stats()
+    assert stats.auth_calls == 1
+    assert stats.coalesced == 4
+    assert stats.auth_calls_avoided == 4
+
+
+def test_introspection_cache_introspect_many(auth_client):
+    _add_introspect_callback()
+    cache = globus_sdk.TokenIntrospectionCache(auth_client)
+    cache.introspect("token1")
+
+    results = cache.introspect_many(
+        ["token1", "token2", "inactive1", "token2"], max_workers=2
+    )
+
+    assert [r["active"] for r in results] == [True, True, False, True]
+    assert len(responses.calls) == 3
+    # the repeated token is counted as a lookup which shared an introspection
+    stats = cache.stats()
+    assert stats.lookups == 5
+    assert stats.hits == 1
+    assert stats.coalesced == 1
+    assert stats.auth_calls_avoided == 2
+
+
+def test_introspection_cache_invalidate(auth_client):
+    _add_introspect_callback()
+    cache = globus_sdk.TokenIntrospectionCache(auth_client)
+
+    cache.introspect("token1")
+    cache.invalidate("token1")
+    cache.introspect("token1")
+    assert len(responses.calls) == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"max_ttl": 0}, {"negative_ttl": 0}, {"maxsize": 0}]
+)
+def test_introspection_cache_rejects_bad_arguments(auth_client, kwargs):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        globus_sdk.TokenIntrospectionCache(auth_client, **kwargs)
@@ -0,0 +1,174 @@
+import json
+import time
+import urllib.parse
+import uuid
+
+import pytest
+import responses
+
+import globus_sdk
+
+
+def _fake_identity(value):
+    if globus_sdk.services.auth.identity_map.is_username(value):
+        return {"id": str(uuid.uuid5(uuid.NAMESPACE_DNS, value)), "username": value}
+    return {"id": value, "username": f"{value[:8]}@example.org"}
+
+
+def _requested_names(call):
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(call.request.url).query)
+    return (query.get("ids") or query["usernames"])[0].split(",")
+
+
+@pytest.fixture(autouse=True)
+def identities_api():
+    def callback(request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        values = (query.get("ids") or query["usernames"])[0].split(",")
+        found = [_fake_identity(v) for v in values if not v.startswith("missing")]
+        return (200, {}, json.dumps({"identities": found}))
+
+    responses.add_callback(
+        "GET", "https://auth.globus.org/v2/api/identities", callback=callback
+    )
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "identities.db"
+
+
+@pytest.fixture
+def cache(cache_path):
+    with globus_sdk.SQLiteIdentityCache(cache_path) as cache:
+        yield cache
+
+
+def test_identity_cache_is_keyed_by_id_and_username(cache):
+    identity = _fake_identity("user@example.org")
+    cache["user@example.org"] = identity
+
+    assert cache[identity["id"]] == identity
+    assert cache["user@example.org"] == identity
+    assert len(cache) == 2
+    assert set(cache) == {identity["id"], "user@example.org"}
+
+    del cache[identity["id"]]
+    assert "user@example.org" not in cache
+    with pytest.raises(KeyError):
+        cache["user@example.org"]
+
+
+def test_identity_cache_persists_across_instances(cache_path):
+    identity = _fake_identity("user@example.org")
+    with globus_sdk.SQLiteIdentityCache(cache_path) as cache:
+        cache.update_identities([identity])
+        cache.add_missing(["missing@example.org"])
+
+    with globus_sdk.SQLiteIdentityCache(cache_path) as cache:
+        assert cache["user@example.org"] == identity
+        assert cache.is_missing("missing@example.org")
+        assert not cache.is_missing("user@example.org")
+
+
+def test_identity_cache_entries_expire(cache_path, monkeypatch):
+    with globus_sdk.SQLiteIdentityCache(cache_path, ttl=60, negative_ttl=10) as cache:
+        cache.update_identities([_fake_identity("user@example.org")])
+        cache.add_missing(["missing@example.org"])
+
+    # a new instance reads from disk, where entries expire by the wall clock
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 30)
+    with globus_sdk.SQLiteIdentityCache(cache_path) as cache:
+        assert "user@example.org" in cache
+        assert not cache.is_missing("missing@example.org")
+        assert cache.purge_expired() == 1
+
+    monkeypatch.setattr(time, "time", lambda: now + 90)
+    with globus_sdk.SQLiteIdentityCache(cache_path) as cache:
+        assert "user@example.org" not in cache
+        assert len(cache) == 0
+        assert cache.purge_expired() == 1
+
+
+def test_identity_cache_matches_names_case_insensitively(cache_path):
+    identity = _fake_identity("User@Example.org")
+    with globus_sdk.SQLiteIdentityCache(cache_path) as cache:
+        cache.update_identities([identity])
+        cache.add_missing(["Missing@Example.org"])
+        assert cache["user@example.org"] == identity
+        assert cache[identity["id"].upper()] == identity
+
+    # as read from disk by another instance
+    with globus_sdk.SQLiteIdentityCache(cache_path) as cache:
+        assert cache["USER@EXAMPLE.ORG"] == identity
+        assert cache.is_missing("missing@example.org")
+        found = cache.get_identities(globus_sdk.AuthClient(), ["user@example.org"])
+        assert found == {"user@example.org": identity}
+    assert len(responses.calls) == 0
+
+
+def test_identity_cache_storing_an_identity_clears_missing(cache):
+    cache.add_missing(["user@example.org"])
+    assert cache.is_missing("user@example.org")
+
+    cache.update_identities([_fake_identity("user@example.org")])
+    assert not cache.is_missing("user@example.org")
+    assert "user@example.org" in cache
+
+
+def test_identity_cache_get_identities_fetches_only_misses(cache):
+    client = globus_sdk.AuthClient()
+    ids = [str(uuid.UUID(int=i)) for i in range(3)]
+    cache.update_identities([_fake_identity(ids[0])])
+
+    found = cache.get_identities(
+        client, ids + ["user@example.org", "missing@example.org"], batch_size=1
+    )
+
+    assert set(found) == {*ids, "user@example.org"}
+    assert found[ids[1]]["id"] == ids[1]
+    requested = [_requested_names(call) for call in responses.calls]
+    assert sorted(requested) == [
+        [ids[1]],
+        [ids[2]],
+        ["missing@example.org"],
+        ["user@example.org"],
+    ]
+
+    # everything is now cached, including the name which matched no identity
+    found_again = cache.get_identities(client, ids + ["missing@example.org"])
+    assert set(found_again) == set(ids)
+    assert len(responses.calls) == 4
+
+
+def test_identity_map_with_identity_cache_remembers_missing(cache):
+    client = globus_sdk.AuthClient()
+    idmap = globus_sdk.IdentityMap(
+        client, ["user@example.org", "missing@example.org"], cache=cache
+    )
+    idmap.prefetch()
+    assert len(responses.calls) == 1
+    assert cache.is_missing("missing@example.org")
+
+    # another map sharing the cache looks up neither name
+    other = globus_sdk.IdentityMap(client, cache=cache)
+    assert other.add("missing@example.org") is False
+    assert other.add("user@example.org") is False
+    with pytest.raises(KeyError):
+        other["missing@example.org"]
+    assert other["user@example.org"]["username"] == "user@example.org"
+    assert len(responses.calls) == 1
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"ttl": 0}, {"negative_ttl": -1}, {"memory_size": 0}]
+)
+def test_identity_cache_rejects_bad_arguments(cache_path, kwargs):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        globus_sdk.SQLiteIdentityCache(cache_path, **kwargs)
+
+
+def test_identity_cache_rejects_memory_database():
+    with pytest.raises(globus_sdk.GlobusSDKUsageError, match=":memory:"):
+        globus_sdk.SQLiteIdentityCache(":memory:")
@@ -1,3 +1,8 @@
+import asyncio
+import json
+import urllib.parse
+import uuid
+
 import pytest
 import responses
 
@@ -248,3 +253,83 @@ def test_identity_map_batch_limit(service_client):
     last_req = get_last_request()
     assert "usernames" not in last_req.params
     assert last_req.params == {"ids": meta2["id"]}
+
+
+def _fake_identity(value):
+    if globus_sdk.services.auth.identity_map.is_username(value):
+        return {"id": str(uuid.uuid5(uuid.NAMESPACE_DNS, value)), "username": value}
+    return {"id": value, "username": f"{value[:8]}@example.org"}
+
+
+def _add_identities_callback(fail_containing=None):
+    def callback(request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        values = (query.get("ids") or query["usernames"])[0].split(",")
+        if fail_containing in values:
+            return (400, {}, json.dumps({"errors": [{"code": "BAD"}]}))
+        found = [_fake_identity(v) for v in values if not v.startswith("missing")]
+        return (200, {}, json.dumps({"identities": found}))
+
+    responses.add_callback(
+        "GET", "https://auth.globus.org/v2/api/identities", callback=callback
+    )
+
+
+def test_identity_map_prefetch(service_client):
+    _add_identities_callback()
+    ids = [str(uuid.UUID(int=i)) for i in range(5)]
+    usernames = [f"user{i}@example.org" for i in range(3)]
+    idmap = globus_sdk.IdentityMap(service_client, ids + usernames, id_batch_size=2)
+
+    idmap.prefetch(max_workers=3)
+
+    # 3 batches of IDs and 2 of usernames
+    assert len(responses.calls) == 5
+    assert idmap.unresolved_ids == set()
+    assert idmap.unresolved_usernames == set()
+    assert idmap[ids[4]]["username"] == f"{ids[4][:8]}@example.org"
+    assert idmap["user1@example.org"]["username"] == "user1@example.org"
+    assert len(responses.calls) == 5
+
+    # nothing is left to fetch
+    idmap.prefetch()
+    assert len(responses.calls) == 5
+
+
+def test_identity_map_prefetch_failure_keeps_names_unresolved(service_client):
+    bad_id = str(uuid.UUID(int=3))
+    _add_identities_callback(fail_containing=bad_id)
+    ids = [str(uuid.UUID(int=i)) for i in range(4)]
+    idmap = globus_sdk.IdentityMap(service_client, ids, id_batch_size=2)
+
+    with pytest.raises(globus_sdk.AuthAPIError):
+        idmap.prefetch()
+
+    # the batch which failed is left to be retried; the other was stored
+    assert idmap.unresolved_ids == set(ids[2:])
+    assert idmap[ids[0]]["id"] == ids[0]
+
+
+def test_identity_map_prefetch_async(service_client):
+    _add_identities_callback()
+    ids = [str(uuid.UUID(int=i)) for i in range(5)]
+    idmap = globus_sdk.IdentityMap(service_client, ids, id_batch_size=2)
+
+    asyncio.run(idmap.prefetch_async(max_workers=2))
+
+    assert len(responses.calls) == 3
+    assert all(idmap[i]["id"] == i for i in ids)
+    assert len(responses.calls) == 3
+
+
+def test_identity_map_resolve_all(service_client):
+    _add_identities_callback()
+    idmap = globus_sdk.IdentityMap(service_client, ["user0@example.org"])
+
+    found = idmap.resolve_all(["user1@example.org", "missing@example.org"])
+
+    assert set(found) == {"user1@example.org"}
+    assert len(responses.calls) == 1
+    # names added before are resolved as well
+    assert idmap["user0@example.org"]["username"] == "user0@example.org"
+    assert len(responses.calls) == 1
@@ -0,0 +1,268 @@
+import json
+import threading
+import time
+import uuid
+from unittest import mock
+
+import jwt
+import pytest
+import responses
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+import globus_sdk
+
+CLIENT_ID = str(uuid.UUID(int=1))
+OIDC_CONFIG_URL = "https://auth.globus.org/.well-known/openid-configuration"
+JWKS_URL = "https://auth.globus.org/jwk.json"
+OIDC_CONFIG = {
+    "issuer": "https://auth.globus.org",
+    "jwks_uri": JWKS_URL,
+    "id_token_signing_alg_values_supported": ["RS512"],
+}
+
+
+def _make_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    if kid is not None:
+        jwk["kid"] = kid
+    return private_key, jwk
+
+
+# generating keys is slow, so the keys are shared by all tests
+KEY1, JWK1 = _make_key("key1")
+KEY2, JWK2 = _make_key("key2")
+UNNAMED_KEY, UNNAMED_JWK = _make_key(None)
+
+
+def _make_token(private_key, kid, **claims):
+    payload = {
+        "sub": str(uuid.UUID(int=2)),
+        "aud": CLIENT_ID,
+        "iss": "https://auth.globus.org",
+        "exp": int(time.time()) + 600,
+        **claims,
+    }
+    headers = {"kid": kid} if kid is not None else None
+    return jwt.encode(payload, private_key, algorithm="RS512", headers=headers)
+
+
+def _add_jwks(*keys):
+    responses.add("GET", JWKS_URL, json={"keys": list(keys)})
+
+
+@pytest.fixture
+def client():
+    return globus_sdk.AuthLoginClient(client_id=CLIENT_ID)
+
+
+@pytest.fixture(autouse=True)
+def oidc_config():
+    responses.add("GET", OIDC_CONFIG_URL, json=OIDC_CONFIG)
+
+
+def _requested_urls():
+    return [call.request.url for call in responses.calls]
+
+
+def test_decoders_share_a_jwk_cache(client):
+    _add_jwks(JWK1)
+    jwk_cache = globus_sdk.JWKCache()
+    token = _make_token(KEY1, "key1")
+
+    for _ in range(3):
+        decoder = globus_sdk.IDTokenDecoder(client, jwk_cache=jwk_cache)
+        assert decoder.decode(token)["sub"] == str(uuid.UUID(int=2))
+
+    assert _requested_urls() == [OIDC_CONFIG_URL, JWKS_URL]
+    # the token was verified once, and its claims were reused after that
+    stats = jwk_cache.decoded_token_stats()
+    assert (stats.hits, stats.misses) == (2, 1)
+
+
+def test_jwk_cache_is_shared_through_a_file(client, tmp_path):
+    _add_jwks(JWK1)
+    cache_path = tmp_path / "jwks.json"
+    token = _make_token(KEY1, "key1")
+
+    decoder = globus_sdk.IDTokenDecoder(
+        client, jwk_cache=globus_sdk.JWKCache(cache_path)
+    )
+    decoder.decode(token)
+    assert len(responses.calls) == 2
+
+    # as in a new process, with no memory of the decoded token
+    decoder = globus_sdk.IDTokenDecoder(
+        client, jwk_cache=globus_sdk.JWKCache(cache_path)
+    )
+    assert decoder.decode(token)["aud"] == CLIENT_ID
+    assert len(responses.calls) == 2
+
+
+def test_jwk_cache_file_entries_expire(client, tmp_path):
+    _add_jwks(JWK1)
+    cache_path = tmp_path / "jwks.json"
+    globus_sdk.JWKCache(cache_path, ttl=60).get_jwks(client)
+
+    saved = json.loads(cache_path.read_text())
+    (entry,) = saved["entries"].values()
+    entry["expires_at"] = time.time() - 1
+    cache_path.write_text(json.dumps(saved))
+
+    globus_sdk.JWKCache(cache_path).get_jwks(client)
+    assert _requested_urls() == [OIDC_CONFIG_URL, JWKS_URL] * 2
+
+
+def test_unknown_kid_refetches_rotated_keys(client):
+    _add_jwks(JWK1)
+    _add_jwks(JWK1, JWK2)
+    jwk_cache = globus_sdk.JWKCache()
+    decoder = globus_sdk.IDTokenDecoder(client, jwk_cache=jwk_cache)
+    decoder.decode(_make_token(KEY1, "key1"))
+
+    # jump past the minimum refresh interval
+    jwk_cache.min_refresh_interval = 0
+    assert decoder.decode(_make_token(KEY2, "key2"))["aud"] == CLIENT_ID
+    assert _requested_urls() == [OIDC_CONFIG_URL, JWKS_URL, JWKS_URL]
+
+
+def test_unknown_kid_refetches_at_most_once_per_interval(client):
+    _add_jwks(JWK1)
+    decoder = globus_sdk.IDTokenDecoder(client, jwk_cache=globus_sdk.JWKCache())
+    decoder.decode(_make_token(KEY1, "key1"))
+
+    for _ in range(3):
+        with pytest.raises(jwt.InvalidKeyError, match="key2"):
+            decoder.decode(_make_token(KEY2, "key2"))
+    assert _requested_urls() == [OIDC_CONFIG_URL, JWKS_URL]
+
+
+def test_bad_signature_refetches_keys(client):
+    _add_jwks(JWK1)
+    _add_jwks(UNNAMED_JWK)
+    jwk_cache = globus_sdk.JWKCache(min_refresh_interval=0)
+    decoder = globus_sdk.IDTokenDecoder(client, jwk_cache=jwk_cache)
+    jwk_cache.get_jwks(client)
+
+    # the token has no kid, so the first key is tried before a refetch
+    assert decoder.decode(_make_token(UNNAMED_KEY, None))["aud"] == CLIENT_ID
+    assert _requested_urls() == [OIDC_CONFIG_URL, JWKS_URL, JWKS_URL]
+
+    # a token which matches no key still fails after one more refetch
+    with pytest.raises(jwt.InvalidSignatureError):
+        decoder.decode(_make_token(KEY2, None))
+    assert len(responses.calls) == 4
+
+
+def test_decoded_token_memo_is_keyed_by_audience(client):
+    _add_jwks(JWK1)
+    jwk_cache = globus_sdk.JWKCache()
+    token = _make_token(KEY1, "key1")
+    globus_sdk.IDTokenDecoder(client, jwk_cache=jwk_cache).decode(token)
+
+    other_client = globus_sdk.AuthLoginClient(client_id=str(uuid.UUID(int=3)))
+    with pytest.raises(jwt.InvalidAudienceError):
+        globus_sdk.IDTokenDecoder(other_client, jwk_cache=jwk_cache).decode(token)
+
+
+def test_decoded_token_memo_is_keyed_by_environment(client):
+    _add_jwks(JWK1)
+    sandbox_config_url = (
+        "https://auth.sandbox.globuscs.info/.well-known/openid-configuration"
+    )
+    responses.add("GET", sandbox_config_url, json=OIDC_CONFIG)
+    jwk_cache = globus_sdk.JWKCache()
+    token = _make_token(KEY1, "key1")
+    globus_sdk.IDTokenDecoder(client, jwk_cache=jwk_cache).decode(token)
+
+    sandbox_client = globus_sdk.AuthLoginClient(
+        client_id=CLIENT_ID, environment="sandbox"
+    )
+    globus_sdk.IDTokenDecoder(sandbox_client, jwk_cache=jwk_cache).decode(token)
+
+    # the token was verified again, with the keys of the other environment
+    assert sandbox_config_url in _requested_urls()
+    stats = jwk_cache.decoded_token_stats()
+    assert (stats.hits, stats.misses) == (0, 2)
+
+
+def test_concurrent_requests_share_a_fetch(client):
+    started, gate = threading.Event(), threading.Event()
+
+    def jwks_callback(request):
+        started.set()
+        gate.wait(timeout=5)
+        return (200, {}, json.dumps({"keys": [JWK1]}))
+
+    responses.add_callback("GET", JWKS_URL, callback=jwks_callback)
+    sandbox_jwks_url = "https://auth.sandbox.globuscs.info/jwk.json"
+    responses.add(
+        "GET",
+        "https://auth.sandbox.globuscs.info/.well-known/openid-configuration",
+        json={**OIDC_CONFIG, "jwks_uri": sandbox_jwks_url},
+    )
+    responses.add("GET", sandbox_jwks_url, json={"keys": [JWK2]})
+    jwk_cache = globus_sdk.JWKCache()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(jwk_cache.get_jwks(client)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    assert started.wait(timeout=5)
+
+    # while one environment's fetch is slow, another's is not blocked
+    sandbox_client = globus_sdk.AuthLoginClient(
+        client_id=CLIENT_ID, environment="sandbox"
+    )
+    sandbox_results = []
+    sandbox_thread = threading.Thread(
+        target=lambda: sandbox_results.append(jwk_cache.get_jwks(sandbox_client))
+    )
+    sandbox_thread.start()
+    sandbox_thread.join(timeout=2)
+    assert sandbox_results == [{"keys": [JWK2]}]
+
+    gate.set()
+    for thread in threads:
+        thread.join()
+    assert results == [{"keys": [JWK1]}] * 5
+    assert _requested_urls().count(JWKS_URL) == 1
+
+
+def test_decoded_token_memo_ends_when_token_expires(client):
+    _add_jwks(JWK1)
+    jwk_cache = globus_sdk.JWKCache()
+    decoder = globus_sdk.IDTokenDecoder(client, jwk_cache=jwk_cache, jwt_leeway=0)
+    token = _make_token(KEY1, "key1", exp=int(time.time()) + 30)
+    decoder.decode(token)
+
+    (memo_key,) = jwk_cache._decoded_tokens.keys()
+    assert 0 < jwk_cache._decoded_tokens.expires_in(memo_key) <= 30
+
+
+def test_invalidate_drops_file_entries(client, tmp_path):
+    _add_jwks(JWK1)
+    cache_path = tmp_path / "jwks.json"
+    jwk_cache = globus_sdk.JWKCache(cache_path)
+    jwk_cache.get_jwks(client)
+
+    jwk_cache.invalidate(client)
+
+    assert json.loads(cache_path.read_text())["entries"] == {}
+    jwk_cache.get_jwks(client)
+    assert len(responses.calls) == 4
+
+
+def test_failed_file_write_is_cleaned_up(client, tmp_path, caplog):
+    _add_jwks(JWK1)
+    cache_path = tmp_path / "jwks.json"
+    jwk_cache = globus_sdk.JWKCache(cache_path)
+
+    with mock.patch("os.replace", side_effect=OSError("disk full")):
+        assert jwk_cache.get_jwks(client) == {"keys": [JWK1]}
+
+    assert "failed to save JWK cache" in caplog.text
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,157 @@
+import json
+import urllib.parse
+from unittest import mock
+
+import pytest
+import responses
+
+import globus_sdk
+from globus_sdk.services.gcs.inventory import GCSInventoryKey
+
+ROUTES = {
+    "collection": "collections",
+    "storage_gateway": "storage_gateways",
+    "role": "roles",
+    "user_credential": "user_credentials",
+}
+
+
+def _make_client(address):
+    client = globus_sdk.GCSClient(address)
+    client.retry_config.max_retries = 0
+    return client
+
+
+def _add_listing(address, kind, pages, status=200):
+    """Register a listing; each page is a list of documents."""
+
+    def callback(request):
+        if status != 200:
+            return (status, {}, json.dumps({"code": "error", "detail": "failed"}))
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        index = int(query.get("marker", ["0"])[0])
+        body = {"data": pages[index], "has_next_page": index + 1 < len(pages)}
+        if index + 1 < len(pages):
+            body["marker"] = str(index + 1)
+        return (200, {}, json.dumps(body))
+
+    responses.add_callback(
+        "GET", f"https://{address}/api/{ROUTES[kind]}", callback=callback
+    )
+
+
+def _add_endpoint(address, **overrides):
+    listings = {
+        "collection": [
+            [{"id": "c1", "display_name": "one"}],
+            [{"id": "c2", "display_name": "two"}],
+        ],
+        "storage_gateway": [[{"id": "g1", "display_name": "posix"}]],
+        "role": [[{"id": "r1", "role": "administrator", "principal": "u1"}]],
+        "user_credential": [[]],
+    }
+    listings.update(overrides)
+    for kind, pages in listings.items():
+        if isinstance(pages, int):
+            _add_listing(address, kind, [], status=pages)
+        else:
+            _add_listing(address, kind, pages)
+
+
+def test_collect_lists_every_endpoint():
+    _add_endpoint("a.example.org")
+    _add_endpoint("b.example.org", storage_gateway=500)
+
+    inventory = globus_sdk.GCSInventory.collect(
+        [_make_client("a.example.org"), _make_client("b.example.org")]
+    )
+
+    assert inventory.addresses == ["a.example.org", "b.example.org"]
+    assert inventory.get("a.example.org", "collection", "c2") == {
+        "id": "c2",
+        "display_name": "two",
+    }
+    assert sorted(inventory.find(kind="storage_gateway")) == [
+        GCSInventoryKey("a.example.org", "storage_gateway", "g1")
+    ]
+    assert sorted(k.address for k in inventory.find(id_="c1")) == [
+        "a.example.org",
+        "b.example.org",
+    ]
+    assert len(inventory.find(address="b.example.org")) == 3
+    assert list(inventory.errors) == [("b.example.org", "storage_gateway")]
+    assert isinstance(
+        inventory.errors[("b.example.org", "storage_gateway")], globus_sdk.GCSAPIError
+    )
+    role_requests = [
+        c.request for c in responses.calls if "/api/roles" in c.request.url
+    ]
+    assert all("include=all_roles" in r.url for r in role_requests)
+
+
+def test_collect_timeout_applies_per_endpoint():
+    _add_endpoint("a.example.org")
+    clock = iter(range(0, 1000, 10))
+    with mock.patch(
+        "globus_sdk.services.gcs.inventory.time.monotonic", lambda: next(clock)
+    ):
+        inventory = globus_sdk.GCSInventory.collect(
+            [_make_client("a.example.org")], timeout=15
+        )
+
+    # the deadline passed on the second page of collections, so the records read
+    # so far are kept, and the other kinds were not listed
+    assert set(inventory.errors) == {("a.example.org", kind) for kind in ROUTES}
+    assert isinstance(inventory.errors[("a.example.org", "role")], TimeoutError)
+    assert len(inventory) == 2
+    assert not any("/api/roles" in c.request.url for c in responses.calls)
+
+
+def test_diff_finds_drift():
+    old = globus_sdk.GCSInventory(
+        {
+            GCSInventoryKey("a", "collection", "c1"): {"id": "c1", "name": "x"},
+            GCSInventoryKey("a", "collection", "c2"): {"id": "c2"},
+            GCSInventoryKey("a", "role", "r1"): {"id": "r1", "role": "admin"},
+            GCSInventoryKey("b", "collection", "c3"): {"id": "c3"},
+        }
+    )
+    new = globus_sdk.GCSInventory(
+        {
+            GCSInventoryKey("a", "collection", "c1"): {"id": "c1", "name": "y"},
+            GCSInventoryKey("a", "collection", "c4"): {"id": "c4"},
+            GCSInventoryKey("a", "role", "r1"): {"id": "r1", "role": "admin"},
+        },
+        errors={("b", "collection"): globus_sdk.GlobusError("unreachable")},
+    )
+
+    drift = old.diff(new)
+
+    assert drift
+    assert list(drift.added) == [GCSInventoryKey("a", "collection", "c4")]
+    # c3 is not reported as removed, as its endpoint could not be listed
+    assert list(drift.removed) == [GCSInventoryKey("a", "collection", "c2")]
+    assert drift.changed_fields(GCSInventoryKey("a", "collection", "c1")) == ["name"]
+    assert drift.skipped == {("b", "collection")}
+    assert not old.diff(new, ignore_fields=["name"]).changed
+
+
+def test_snapshot_round_trip():
+    _add_endpoint("a.example.org", role=403)
+    inventory = globus_sdk.GCSInventory.collect([_make_client("a.example.org")])
+
+    restored = globus_sdk.GCSInventory.from_dict(
+        json.loads(json.dumps(inventory.to_dict()))
+    )
+
+    assert restored.taken_at == inventory.taken_at
+    assert sorted(restored) == sorted(inventory)
+    assert set(restored.errors) == {("a.example.org", "role")}
+    assert not inventory.diff(restored)
+
+
+def test_collect_bad_arguments():
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        globus_sdk.GCSInventory.collect([], max_workers=0)
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        globus_sdk.GCSInventory.collect([], kinds=["endpoint"])
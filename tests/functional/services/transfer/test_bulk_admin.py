@@ -0,0 +1,204 @@
+import json
+import re
+import threading
+
+import pytest
+import responses
+
+import globus_sdk
+
+BASE_URL = "https://transfer.api.globus.org/v0.10/endpoint_manager"
+
+
+class FakeAdminAPI:
+    def __init__(self, polls_until_done=0, fail_with=(), failed_polls=0):
+        self.polls_until_done = polls_until_done
+        self.fail_with = set(fail_with)
+        self.failed_polls = failed_polls
+        self.lock = threading.Lock()
+        self.requests = []
+        self.polls = {}
+        # the order of submissions and polls, as ("submit" | "poll", cancel_id)
+        self.log = []
+
+    def action(self, request):
+        body = json.loads(request.body)
+        action = request.url.rsplit("/admin_", 1)[1]
+        with self.lock:
+            self.requests.append((action, body))
+            cancel_id = f"cancel-{len(self.requests)}"
+            self.polls[cancel_id] = 0
+            self.log.append(("submit", cancel_id))
+        if self.fail_with & set(body["task_id_list"]):
+            return (400, {}, json.dumps({"code": "BadRequest", "message": "no"}))
+        if action == "cancel":
+            done = self.polls_until_done == 0
+            return (
+                200,
+                {},
+                json.dumps({"id": cancel_id, "done": done, "processed": 0}),
+            )
+        return (200, {}, json.dumps({"code": "Accepted"}))
+
+    def status(self, request):
+        cancel_id = request.url.rsplit("/", 1)[1]
+        with self.lock:
+            self.log.append(("poll", cancel_id))
+            if self.failed_polls:
+                self.failed_polls -= 1
+                return (502, {}, json.dumps({"code": "BadGateway", "message": ""}))
+            self.polls[cancel_id] += 1
+            done = self.polls[cancel_id] >= self.polls_until_done
+        return (200, {}, json.dumps({"id": cancel_id, "done": done, "processed": 1}))
+
+
+@pytest.fixture
+def fake():
+    def setup(**kwargs):
+        api = FakeAdminAPI(**kwargs)
+        for action in ("cancel", "pause", "resume"):
+            responses.add_callback(
+                responses.POST, f"{BASE_URL}/admin_{action}", callback=api.action
+            )
+        responses.add_callback(
+            responses.GET,
+            re.compile(rf"{BASE_URL}/admin_cancel/cancel-\d+"),
+            callback=api.status,
+        )
+        return api
+
+    return setup
+
+
+def _sorted_requests(api):
+    return sorted(api.requests, key=lambda r: r[1]["task_id_list"])
+
+
+def test_pause_is_chunked_and_deduplicated(client, fake):
+    api = fake()
+    task_ids = [f"task-{i}" for i in range(5)] + ["task-0", "task-3"]
+
+    result = client.endpoint_manager_bulk_task_action(
+        "pause", task_ids, "maintenance", chunk_size=2
+    )
+
+    assert result.succeeded
+    assert result.processed_task_ids == [f"task-{i}" for i in range(5)]
+    assert [c.task_ids for c in result.chunks] == [
+        ["task-0", "task-1"],
+        ["task-2", "task-3"],
+        ["task-4"],
+    ]
+    assert _sorted_requests(api) == [
+        ("pause", {"message": "maintenance", "task_id_list": ["task-0", "task-1"]}),
+        ("pause", {"message": "maintenance", "task_id_list": ["task-2", "task-3"]}),
+        ("pause", {"message": "maintenance", "task_id_list": ["task-4"]}),
+    ]
+
+
+def test_resume_does_not_require_a_message(client, fake):
+    api = fake()
+    result = client.endpoint_manager_bulk_task_action("resume", ["task-0"])
+    assert result.succeeded
+    assert api.requests == [("resume", {"task_id_list": ["task-0"]})]
+
+
+def test_cancel_polls_with_backoff(client, fake, mocksleep):
+    fake(polls_until_done=4)
+
+    result = client.endpoint_manager_bulk_task_action(
+        "cancel", ["task-0"], "stop", initial_interval=1, max_interval=4
+    )
+
+    assert result.succeeded
+    (chunk,) = result.chunks
+    assert chunk.admin_cancel_id == "cancel-1"
+    assert chunk.processed == 1
+    assert [c.args[0] for c in mocksleep.call_args_list] == [1, 2, 4, 4]
+
+
+def test_cancel_timeout_leaves_tasks_pending(client, fake, mocksleep):
+    fake(polls_until_done=100)
+
+    result = client.endpoint_manager_bulk_task_action(
+        "cancel", ["task-0", "task-1"], "stop", timeout=5, initial_interval=2
+    )
+
+    assert not result.succeeded
+    assert result.pending_task_ids == ["task-0", "task-1"]
+    assert result.failed_task_ids == []
+    assert sum(c.args[0] for c in mocksleep.call_args_list) == 5
+
+
+def test_cancel_submits_every_chunk_before_polling(client, fake, mocksleep):
+    api = fake(polls_until_done=1)
+
+    result = client.endpoint_manager_bulk_task_action(
+        "cancel", [f"task-{i}" for i in range(4)], "stop", chunk_size=1, max_workers=1
+    )
+
+    assert result.succeeded
+    assert [kind for kind, _ in api.log] == ["submit"] * 4 + ["poll"] * 4
+    # all of the cancellations were polled together
+    assert mocksleep.call_count == 1
+
+
+def test_cancel_poll_errors_are_recorded_apart_from_failures(client, fake, mocksleep):
+    api = fake(polls_until_done=1, failed_polls=1)
+
+    result = client.endpoint_manager_bulk_task_action(
+        "cancel", ["task-0"], "stop", timeout=1
+    )
+
+    (chunk,) = result.chunks
+    assert chunk.error is None
+    assert isinstance(chunk.poll_error, globus_sdk.TransferAPIError)
+    assert result.failed_task_ids == []
+    assert result.pending_task_ids == ["task-0"]
+
+    # a later successful poll clears the error
+    api.failed_polls = 1
+    result = client.endpoint_manager_bulk_task_action("cancel", ["task-0"], "stop")
+    assert result.succeeded
+    assert result.chunks[0].poll_error is None
+
+
+def test_cancel_without_waiting(client, fake, mocksleep):
+    fake(polls_until_done=1)
+
+    result = client.endpoint_manager_bulk_task_action(
+        "cancel", ["task-0"], "stop", wait=False
+    )
+
+    assert result.pending_task_ids == ["task-0"]
+    assert result.chunks[0].admin_cancel_id == "cancel-1"
+    mocksleep.assert_not_called()
+
+
+def test_failed_chunk_is_recorded(client, fake):
+    fake(fail_with=["task-2"])
+
+    result = client.endpoint_manager_bulk_task_action(
+        "pause", [f"task-{i}" for i in range(4)], "maintenance", chunk_size=2
+    )
+
+    assert not result.succeeded
+    assert result.processed_task_ids == ["task-0", "task-1"]
+    assert result.failed_task_ids == ["task-2", "task-3"]
+    assert isinstance(result.chunks[1].error, globus_sdk.TransferAPIError)
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        (("delete", ["task-0"], "x"), {}),
+        (("cancel", ["task-0"]), {}),
+        (("pause", ["task-0"], ""), {}),
+        (("resume", ["task-0"]), {"chunk_size": 0}),
+        (("resume", ["task-0"]), {"max_workers": 0}),
+        (("resume", ["task-0"]), {"initial_interval": 10, "max_interval": 5}),
+    ],
+)
+def test_bad_arguments(client, args, kwargs):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        client.endpoint_manager_bulk_task_action(*args, **kwargs)
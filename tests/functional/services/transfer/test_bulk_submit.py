@@ -0,0 +1,153 @@
+import itertools
+import json
+import threading
+import uuid
+
+import pytest
+import responses
+
+import globus_sdk
+from globus_sdk._internal import orjson_compat
+from tests.common import GO_EP1_ID, GO_EP2_ID
+
+BASE_URL = "https://transfer.api.globus.org/v0.10"
+
+
+class FakeTransferService:
+    """
+    Issues sequential submission IDs and records submitted documents.
+    Submissions listed in ``fail`` return an error the first N times.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ids = itertools.count()
+        self.submitted = {}
+        self.fail = {}
+        self.body_sizes = []
+
+    def submission_id(self, request):
+        with self.lock:
+            # the same length as a real submission ID
+            value = str(uuid.UUID(int=next(self.ids)))
+        return (200, {}, json.dumps({"value": value}))
+
+    def submit(self, request):
+        body = json.loads(request.body)
+        sid = body["submission_id"]
+        with self.lock:
+            self.body_sizes.append(len(request.body))
+            status = self.fail.get(body["DATA"][0].get("source_path"))
+            if status:
+                code, remaining = status
+                if remaining:
+                    self.fail[body["DATA"][0]["source_path"]] = (code, remaining - 1)
+                    return (code, {}, json.dumps({"code": "Err", "message": "no"}))
+            # resubmission of a known ID is idempotent
+            self.submitted.setdefault(sid, body)
+        return (202, {}, json.dumps({"code": "Accepted", "task_id": f"task-{sid}"}))
+
+
+@pytest.fixture
+def service():
+    svc = FakeTransferService()
+    responses.add_callback(
+        responses.GET, f"{BASE_URL}/submission_id", callback=svc.submission_id
+    )
+    for path in ("transfer", "delete"):
+        responses.add_callback(
+            responses.POST, f"{BASE_URL}/{path}", callback=svc.submit
+        )
+    return svc
+
+
+def _items(n):
+    for i in range(n):
+        yield {
+            "DATA_TYPE": "transfer_item",
+            "source_path": f"/src/{i}",
+            "destination_path": f"/dst/{i}",
+        }
+
+
+def test_bulk_submit_chunks_by_item_count(client, service):
+    tdata = globus_sdk.TransferData(GO_EP1_ID, GO_EP2_ID, label="bulk")
+    tdata.add_item("/src/first", "/dst/first")
+    manifest = client.bulk_submit(tdata, items=_items(24), max_items=10)
+
+    assert manifest.succeeded
+    assert [c.item_count for c in manifest.chunks] == [10, 10, 5]
+    assert [c.index for c in manifest.chunks] == [0, 1, 2]
+    assert manifest.chunks[0].first_path == "/src/first"
+
+    # every chunk used its own submission ID, and its own task
+    assert len(set(service.submitted)) == 3
+    assert sorted(manifest.task_ids) == sorted(f"task-{s}" for s in service.submitted)
+    for body in service.submitted.values():
+        assert body["label"] == "bulk"
+        assert body["source_endpoint"] == GO_EP1_ID
+    # the input document is not modified
+    assert tdata["submission_id"] is globus_sdk.MISSING
+    assert len(tdata["DATA"]) == 1
+
+
+@pytest.mark.parametrize("use_orjson", (True, False))
+def test_bulk_submit_chunks_by_size(client, service, monkeypatch, use_orjson):
+    if use_orjson and not orjson_compat.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(orjson_compat, "ORJSON_AVAILABLE", use_orjson)
+    tdata = globus_sdk.TransferData(GO_EP1_ID, GO_EP2_ID)
+    manifest = client.bulk_submit(tdata, items=_items(40), max_bytes=1000)
+    assert len(manifest.chunks) > 1
+    assert all(c.size_bytes <= 1000 for c in manifest.chunks)
+    assert sum(c.item_count for c in manifest.chunks) == 40
+    # the estimate is an upper bound on the size of the submitted bodies
+    assert len(service.body_sizes) == len(manifest.chunks)
+    assert all(size <= 1000 for size in service.body_sizes)
+
+
+def test_bulk_submit_delete(client, service):
+    ddata = globus_sdk.DeleteData(GO_EP1_ID, recursive=True)
+    for i in range(5):
+        ddata.add_item(f"/junk/{i}")
+    manifest = client.bulk_submit(ddata, max_items=2)
+    assert [c.item_count for c in manifest.chunks] == [2, 2, 1]
+    assert manifest.chunks[2].first_path == "/junk/4"
+    assert all(b["DATA_TYPE"] == "delete" for b in service.submitted.values())
+
+
+def test_bulk_submit_retries_reuse_submission_id(client, service, mocksleep):
+    service.fail["/src/10"] = (503, 2)
+    tdata = globus_sdk.TransferData(GO_EP1_ID, GO_EP2_ID)
+    manifest = client.bulk_submit(tdata, items=_items(20), max_items=10)
+
+    assert manifest.succeeded
+    retried = manifest.chunks[1]
+    assert retried.attempts == 3
+    # only two submission IDs were ever issued
+    assert next(service.ids) == 2
+    assert retried.task_id == f"task-{retried.submission_id}"
+    assert mocksleep.call_count == 2
+
+
+def test_bulk_submit_records_failures(client, service, mocksleep):
+    service.fail["/src/10"] = (400, 100)
+    tdata = globus_sdk.TransferData(GO_EP1_ID, GO_EP2_ID)
+    manifest = client.bulk_submit(tdata, items=_items(30), max_items=10)
+
+    assert not manifest.succeeded
+    (failed,) = manifest.failed
+    assert failed.index == 1
+    # client errors are not retried
+    assert failed.attempts == 1
+    assert isinstance(failed.error, globus_sdk.TransferAPIError)
+    assert failed.data["DATA"][0]["source_path"] == "/src/10"
+    assert len(manifest.task_ids) == 2
+    assert manifest.to_dict()["chunks"][1]["task_id"] is None
+    mocksleep.assert_not_called()
+
+
+def test_bulk_submit_rejects_submission_id(client, service):
+    tdata = globus_sdk.TransferData(GO_EP1_ID, GO_EP2_ID, submission_id="foo")
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        client.bulk_submit(tdata, items=_items(1))
@@ -0,0 +1,202 @@
+import json
+import threading
+import urllib.parse
+
+import pytest
+import responses
+
+import globus_sdk
+
+BASE_URL = "https://transfer.api.globus.org/v0.10"
+HOST_ID = "aa9d4d3c-1d6c-4b31-a6b1-3e5b1c9f0c44"
+
+
+def _ep(endpoint_id, display_name, **kwargs):
+    return {
+        "DATA_TYPE": "endpoint",
+        "id": endpoint_id,
+        "display_name": display_name,
+        "owner_string": "alice@example.org",
+        "non_functional": False,
+        **kwargs,
+    }
+
+
+class FakeEndpointAPI:
+    def __init__(self):
+        self.scopes = {
+            "my-endpoints": [
+                _ep("ep-1", "Tutorial Collection 1"),
+                _ep("ep-2", "Tutorial Collection 2", keywords="demo,example"),
+            ],
+            "shared-with-me": [_ep("ep-3", "Lab Archive", organization="Physics")],
+            "recently-used": [_ep("ep-1", "Tutorial Collection 1")],
+        }
+        self.shared = [_ep("ep-4", "Team Share", host_endpoint_id=HOST_ID)]
+        self.bookmarks = [{"endpoint_id": "ep-3", "name": "papers", "path": "/p/"}]
+        self.fail = set()
+        self.requests = []
+
+    def search(self, request):
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(request.url).query))
+        self.requests.append(("search", params))
+        if "search" in self.fail:
+            return (503, {}, json.dumps({"code": "Unavailable", "message": "no"}))
+        data = self.scopes[params["filter_scope"]]
+        offset, limit = int(params.get("offset", 0)), int(params["limit"])
+        page = data[offset : offset + limit]
+        return (
+            200,
+            {},
+            json.dumps(
+                {
+                    "DATA": page,
+                    "offset": offset,
+                    "limit": limit,
+                    "has_next_page": offset + limit < len(data),
+                }
+            ),
+        )
+
+    def shared_list(self, request):
+        self.requests.append(("shared", None))
+        return (200, {}, json.dumps({"DATA": self.shared}))
+
+    def bookmark_list(self, request):
+        self.requests.append(("bookmarks", None))
+        if "bookmarks" in self.fail:
+            return (503, {}, json.dumps({"code": "Unavailable", "message": "no"}))
+        return (200, {}, json.dumps({"DATA": self.bookmarks}))
+
+
+@pytest.fixture
+def api():
+    fake = FakeEndpointAPI()
+    responses.add_callback(
+        responses.GET, f"{BASE_URL}/endpoint_search", callback=fake.search
+    )
+    responses.add_callback(
+        responses.GET,
+        f"{BASE_URL}/endpoint/{HOST_ID}/my_shared_endpoint_list",
+        callback=fake.shared_list,
+    )
+    responses.add_callback(
+        responses.GET, f"{BASE_URL}/bookmark_list", callback=fake.bookmark_list
+    )
+    return fake
+
+
+@pytest.fixture
+def index(client, api):
+    index = globus_sdk.TransferEndpointIndex(client, host_endpoint_ids=[HOST_ID])
+    index.refresh()
+    return index
+
+
+def _ids(results):
+    return [r["id"] for r in results]
+
+
+def test_refresh_reads_every_source(index, api):
+    assert len(index) == 4
+    assert {kind for kind, _ in api.requests} == {"search", "shared", "bookmarks"}
+    assert index.get("ep-4")["host_endpoint_id"] == HOST_ID
+    assert index.get("ep-3")["bookmarks"] == [{"name": "papers", "path": "/p/"}]
+    # only the indexed fields are kept
+    assert "non_functional" not in index.get("ep-1")
+
+
+def test_search_matches_word_prefixes(index):
+    assert _ids(index.search("tut col")) == ["ep-1", "ep-2"]
+    assert _ids(index.search("tutorial collection 2")) == ["ep-2"]
+    assert _ids(index.search("phys")) == ["ep-3"]
+    assert _ids(index.search("demo")) == ["ep-2"]
+    assert _ids(index.search("paper")) == ["ep-3"]
+    assert index.search("tut nothing") == []
+    assert index.search("  ") == []
+    # the bookmarked endpoint first, then by name
+    assert _ids(index.search("alice", limit=2)) == ["ep-3", "ep-4"]
+
+
+def test_search_ranks_name_matches_first(client, api):
+    api.scopes["my-endpoints"].append(
+        _ep("ep-5", "Archive", description="the lab's archive")
+    )
+    index = globus_sdk.TransferEndpointIndex(client, include_bookmarks=False)
+    index.refresh()
+
+    # an exact name beats a longer name, which beats a description match
+    api.scopes["my-endpoints"].append(_ep("ep-6", "Old Data", description="archive"))
+    index.refresh()
+    assert _ids(index.search("archive")) == ["ep-5", "ep-3", "ep-6"]
+
+
+def test_refresh_is_incremental(index, api):
+    api.scopes["my-endpoints"] = [
+        _ep("ep-1", "Tutorial Collection 1"),
+        _ep("ep-7", "New Collection"),
+    ]
+    api.shared[0]["display_name"] = "Team Space"
+
+    result = index.refresh()
+
+    assert (result.added, result.updated, result.removed) == (1, 1, 1)
+    assert result.errors == []
+    assert index.get("ep-2") is None
+    assert _ids(index.search("team space")) == ["ep-4"]
+    assert index.search("share") == []
+
+
+def test_failed_source_keeps_its_entries(index, api):
+    api.fail.add("bookmarks")
+    api.bookmarks = []
+
+    result = index.refresh()
+
+    assert len(result.errors) == 1
+    assert isinstance(result.errors[0], globus_sdk.TransferAPIError)
+    assert _ids(index.search("papers")) == ["ep-3"]
+
+
+def test_index_persists_to_disk(client, api, tmp_path):
+    path = tmp_path / "endpoints.json"
+    index = globus_sdk.TransferEndpointIndex(client, path=path)
+    index.refresh()
+    api.requests.clear()
+
+    restored = globus_sdk.TransferEndpointIndex(client, path=path)
+
+    assert api.requests == []
+    assert restored.last_refreshed == index.last_refreshed
+    assert _ids(restored.search("tut")) == ["ep-1", "ep-2"]
+    assert restored.get("ep-3")["bookmarks"] == index.get("ep-3")["bookmarks"]
+
+
+def test_unreadable_index_file_is_ignored(client, tmp_path):
+    path = tmp_path / "endpoints.json"
+    path.write_text("{not json")
+    index = globus_sdk.TransferEndpointIndex(client, path=path)
+    assert len(index) == 0
+    assert index.last_refreshed is None
+
+
+def test_run_refreshes_until_stopped(client, api, monkeypatch):
+    index = globus_sdk.TransferEndpointIndex(client, refresh_interval=60)
+    stop = threading.Event()
+    refreshes = []
+
+    def refresh():
+        refreshes.append(1)
+        index.last_refreshed = 1.0
+        if len(refreshes) == 2:
+            stop.set()
+
+    monkeypatch.setattr(index, "refresh", refresh)
+    monkeypatch.setattr(stop, "wait", lambda delay: stop.is_set())
+    index.run(stop)
+    assert len(refreshes) == 2
+
+
+def test_bad_refresh_interval(client):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        globus_sdk.TransferEndpointIndex(client, refresh_interval=0)
@@ -0,0 +1,157 @@
+import csv
+import gzip
+import json
+import urllib.parse
+
+import pytest
+import responses
+
+import globus_sdk
+
+BASE_URL = "https://transfer.api.globus.org/v0.10"
+TASK_ID = "d7d9bf5d-c3f4-4a3a-a9c6-1f0d5b3c5f60"
+
+
+def _successful(n):
+    return [
+        {
+            "DATA_TYPE": "successful_transfer",
+            "source_path": f"/src/{i}",
+            "destination_path": f"/dst/{i}",
+        }
+        for i in range(n)
+    ]
+
+
+class MarkerPages:
+    """Serves a list of records as marker-paginated pages of a given size."""
+
+    def __init__(self, records, page_size, fail_at=None):
+        self.records = records
+        self.page_size = page_size
+        self.fail_at = fail_at
+        self.markers = []
+
+    def __call__(self, request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        start = int(query.get("marker", ["0"])[0])
+        self.markers.append(start)
+        if start == self.fail_at:
+            return (400, {}, json.dumps({"code": "Err", "message": "broken"}))
+        end = start + self.page_size
+        body = {
+            "DATA": self.records[start:end],
+            "next_marker": str(end) if end < len(self.records) else None,
+        }
+        return (200, {}, json.dumps(body))
+
+
+def _register(path, callback):
+    responses.add_callback(responses.GET, f"{BASE_URL}/{path}", callback=callback)
+
+
+def _read_ndjson(path, compressed=False):
+    opener = gzip.open if compressed else open
+    with opener(path, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_export_successful_transfers_ndjson(client, tmp_path):
+    records = _successful(25)
+    pages = MarkerPages(records, 10)
+    _register(f"task/{TASK_ID}/successful_transfers", pages)
+
+    out = tmp_path / "out.ndjson"
+    result = client.export_task_records(TASK_ID, out)
+    assert (result.records_written, result.pages, result.resumed) == (25, 3, False)
+    assert _read_ndjson(out) == records
+    assert pages.markers == [0, 10, 20]
+
+
+def test_export_skipped_errors_csv_gzip_endpoint_manager(client, tmp_path):
+    records = [
+        {"source_path": f"/src/{i}", "error_code": "PERMISSION", "extra": {"x": i}}
+        for i in range(5)
+    ]
+    _register(
+        f"endpoint_manager/task/{TASK_ID}/skipped_errors", MarkerPages(records, 2)
+    )
+
+    out = tmp_path / "out.csv.gz"
+    client.export_task_records(
+        TASK_ID, out, records="skipped_errors", endpoint_manager=True, format="csv"
+    )
+    # every page is its own gzip member, which readers treat as one stream
+    with gzip.open(out, "rt", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["source_path"] for r in rows] == [f"/src/{i}" for i in range(5)]
+    assert json.loads(rows[3]["extra"]) == {"x": 3}
+
+
+def test_export_events_by_offset(client, tmp_path):
+    events = [{"code": f"E{i}", "is_error": False} for i in range(3)]
+    _register(
+        f"task/{TASK_ID}/event_list",
+        lambda request: (
+            200,
+            {},
+            json.dumps({"DATA": events, "total": 3, "offset": 0, "limit": 1000}),
+        ),
+    )
+    out = tmp_path / "events.ndjson"
+    result = client.export_task_records(TASK_ID, out, records="events", fields=["code"])
+    assert result.pages == 1
+    assert _read_ndjson(out) == events
+
+
+@pytest.mark.parametrize("compress", (False, True))
+def test_export_resumes_from_checkpoint(client, tmp_path, compress):
+    records = _successful(25)
+    pages = MarkerPages(records, 10, fail_at=20)
+    _register(f"task/{TASK_ID}/successful_transfers", pages)
+    out = tmp_path / "out.ndjson"
+    checkpoint = tmp_path / "checkpoint.json"
+
+    with pytest.raises(globus_sdk.TransferAPIError):
+        client.export_task_records(
+            TASK_ID, out, checkpoint=checkpoint, compress=compress
+        )
+    saved = json.loads(checkpoint.read_text())
+    assert (saved["cursor"], saved["records_written"]) == ("20", 20)
+    # simulate a partial write after the last checkpoint
+    with open(out, "ab") as f:
+        f.write(b"garbage")
+
+    pages.fail_at = None
+    pages.markers.clear()
+    result = client.export_task_records(
+        TASK_ID, out, checkpoint=checkpoint, compress=compress
+    )
+    assert (result.records_written, result.pages, result.resumed) == (25, 1, True)
+    assert pages.markers == [20]
+    assert _read_ndjson(out, compressed=compress) == records
+
+    # a completed export is not repeated
+    result = client.export_task_records(
+        TASK_ID, out, checkpoint=checkpoint, compress=compress
+    )
+    assert (result.records_written, result.pages) == (25, 0)
+    assert pages.markers == [20]
+
+
+def test_export_rejects_mismatched_checkpoint(client, tmp_path):
+    _register(f"task/{TASK_ID}/successful_transfers", MarkerPages(_successful(1), 10))
+    checkpoint = tmp_path / "checkpoint.json"
+    client.export_task_records(TASK_ID, tmp_path / "a", checkpoint=checkpoint)
+    with pytest.raises(globus_sdk.GlobusSDKUsageError, match="different export"):
+        client.export_task_records(
+            TASK_ID, tmp_path / "a", checkpoint=checkpoint, format="csv"
+        )
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"records": "bogus"}, {"format": "xml"}, {"prefetch": 0}]
+)
+def test_export_rejects_bad_args(client, tmp_path, kwargs):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        client.export_task_records(TASK_ID, tmp_path / "out", **kwargs)
@@ -0,0 +1,187 @@
+import datetime
+import json
+import urllib.parse
+
+import pytest
+import responses
+
+import globus_sdk
+from tests.common import GO_EP1_ID
+
+BASE_URL = "https://transfer.api.globus.org/v0.10"
+LS_URL = f"{BASE_URL}/operation/endpoint/{GO_EP1_ID}/ls"
+
+# a small tree, keyed by directory path: (name, type, size, last_modified)
+TREE = {
+    "/scratch/": [
+        ("run1", "dir", 4096, "2024-01-01 00:00:00+00:00"),
+        ("keep.dat", "file", 100, "2024-01-01 00:00:00+00:00"),
+        ("old.tmp", "file", 10, "2023-01-01 00:00:00+00:00"),
+    ],
+    "/scratch/run1/": [
+        ("big.tmp", "file", 5000, "2023-06-01 12:00:00+00:00"),
+        ("new.tmp", "file", 20, "2024-06-01 00:00:00+00:00"),
+        ("log.txt", "file", 30, "2023-03-01 00:00:00+00:00"),
+    ],
+}
+
+
+def _ls_callback(request):
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+    path = query["path"][0]
+    body = {
+        "DATA_TYPE": "file_list",
+        "path": path,
+        "DATA": [
+            {
+                "DATA_TYPE": "file",
+                "name": name,
+                "type": typ,
+                "size": size,
+                "last_modified": modified,
+            }
+            for name, typ, size, modified in TREE[path]
+        ],
+    }
+    return (200, {"Content-Type": "application/json"}, json.dumps(body))
+
+
+@pytest.fixture(autouse=True)
+def _setup_ls_callback():
+    responses.add_callback(responses.GET, LS_URL, callback=_ls_callback)
+
+
+def _sent_filters():
+    return [
+        urllib.parse.parse_qs(urllib.parse.urlparse(call.request.url).query).get(
+            "filter"
+        )
+        for call in responses.calls
+        if call.request.url.startswith(LS_URL)
+    ]
+
+
+def _find(client, **kwargs):
+    return sorted(
+        path for path, _ in client.find_files(GO_EP1_ID, "/scratch/", **kwargs)
+    )
+
+
+def test_find_all_files(client):
+    assert _find(client) == [
+        "/scratch/keep.dat",
+        "/scratch/old.tmp",
+        "/scratch/run1/big.tmp",
+        "/scratch/run1/log.txt",
+        "/scratch/run1/new.tmp",
+    ]
+    assert _sent_filters() == [None, None]
+
+
+def test_find_by_pattern_uses_server_filter(client):
+    assert _find(client, patterns=["*.tmp", "*.txt"]) == [
+        "/scratch/old.tmp",
+        "/scratch/run1/big.tmp",
+        "/scratch/run1/log.txt",
+        "/scratch/run1/new.tmp",
+    ]
+    assert _sent_filters()[0] == ["name:~*.tmp", "name:~*.txt", "type:dir"]
+
+
+@pytest.mark.parametrize(
+    "patterns, expect",
+    (
+        ("[bn]*.tmp", ["/scratch/run1/big.tmp", "/scratch/run1/new.tmp"]),
+        # separators of the filter syntax must not be sent in a pattern
+        (
+            ["*.tmp", "a,name:~*"],
+            ["/scratch/old.tmp", "/scratch/run1/big.tmp", "/scratch/run1/new.tmp"],
+        ),
+        (["keep.*", "run1/*"], ["/scratch/keep.dat"]),
+    ),
+)
+def test_complex_patterns_are_only_checked_locally(client, patterns, expect):
+    assert _find(client, patterns=patterns) == expect
+    assert _sent_filters()[0] is None
+
+
+def test_find_by_age_and_size(client):
+    cutoff = datetime.datetime(2024, 1, 1)
+    assert _find(client, patterns="*.tmp", modified_before=cutoff, min_size=15) == [
+        "/scratch/run1/big.tmp"
+    ]
+    assert _sent_filters()[0] == [
+        "last_modified:,2024-01-01 00:00:00/name:~*.tmp",
+        "type:dir",
+    ]
+
+    responses.calls.reset()
+    after = datetime.datetime(2023, 6, 1, 12, tzinfo=datetime.timezone.utc)
+    assert _find(client, modified_after=after, max_size=1000) == [
+        "/scratch/keep.dat",
+        "/scratch/run1/new.tmp",
+    ]
+    assert _sent_filters()[0] == ["last_modified:2023-06-01 12:00:00,", "type:dir"]
+
+
+def test_find_by_regex(client):
+    assert _find(client, regex=r"/run\d+/.*\.t") == [
+        "/scratch/run1/big.tmp",
+        "/scratch/run1/log.txt",
+        "/scratch/run1/new.tmp",
+    ]
+
+
+def test_empty_patterns_are_rejected(client):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        client.find_files(GO_EP1_ID, patterns=[])
+
+
+@pytest.mark.parametrize("max_workers", (1, 4))
+def test_delete_matching_streams_into_chunks(client, max_workers):
+    submitted = []
+
+    def submit(request):
+        body = json.loads(request.body)
+        submitted.append(body)
+        return (200, {}, json.dumps({"task_id": f"task-{len(submitted)}"}))
+
+    responses.add(responses.GET, f"{BASE_URL}/submission_id", json={"value": "sub-id"})
+    responses.add_callback(responses.POST, f"{BASE_URL}/delete", callback=submit)
+
+    ddata = globus_sdk.DeleteData(GO_EP1_ID, label="cleanup", ignore_missing=True)
+    manifest = client.delete_matching(
+        ddata, "/scratch/", patterns="*.tmp", max_items=2, max_workers=max_workers
+    )
+
+    assert manifest.succeeded
+    assert len(manifest.chunks) == 2
+    assert sorted(item["path"] for body in submitted for item in body["DATA"]) == [
+        "/scratch/old.tmp",
+        "/scratch/run1/big.tmp",
+        "/scratch/run1/new.tmp",
+    ]
+    for body in submitted:
+        assert body["label"] == "cleanup"
+        assert body["ignore_missing"] is True
+        assert body["endpoint"] == GO_EP1_ID
+
+
+def test_delete_matching_limits_task_size(client):
+    submitted = []
+
+    def submit(request):
+        submitted.append(json.loads(request.body))
+        return (200, {}, json.dumps({"task_id": f"task-{len(submitted)}"}))
+
+    responses.add(responses.GET, f"{BASE_URL}/submission_id", json={"value": "sub-id"})
+    responses.add_callback(responses.POST, f"{BASE_URL}/delete", callback=submit)
+
+    # too small for two items, so each item is submitted alone
+    manifest = client.delete_matching(
+        globus_sdk.DeleteData(GO_EP1_ID), "/scratch/", patterns="*.tmp", max_bytes=1
+    )
+
+    assert manifest.succeeded
+    assert len(manifest.chunks) == 3
+    assert all(len(body["DATA"]) == 1 for body in submitted)
@@ -0,0 +1,222 @@
+import json
+import urllib.parse
+
+import pytest
+import responses
+
+import globus_sdk
+from globus_sdk.experimental import TransferClientV2
+
+BASE_URL = "https://transfer.api.globus.org/v2/tunnels"
+TUNNEL_A = "1c2b6a8e-0e0f-4d1f-9a32-5c1a4e0b7f01"
+TUNNEL_B = "7d4e2f1a-3b5c-4e6d-8f7a-9b0c1d2e3f40"
+
+
+def _event(event_id, code, is_error=False):
+    return {
+        "type": "TunnelEvent",
+        "id": event_id,
+        "attributes": {
+            "code": code,
+            "is_error": is_error,
+            "description": code.lower(),
+            "details": "",
+            "time": "2026-02-12T21:59:01.857473",
+        },
+    }
+
+
+class FakeTunnelEvents:
+    """
+    Serves a scripted event list for each tunnel. Each poll reveals the events in
+    the next step of the script, if any are left. Listings are split into pages of
+    ``page_size`` events.
+    """
+
+    def __init__(self, scripts, page_size=100):
+        self.scripts = scripts
+        self.page_size = page_size
+        self.events = {tunnel_id: [] for tunnel_id in scripts}
+        self.polls = {tunnel_id: 0 for tunnel_id in scripts}
+        self.fail_next = {}
+
+    def __call__(self, request):
+        url = urllib.parse.urlparse(request.url)
+        tunnel_id = url.path.split("/")[-2]
+        start = int(urllib.parse.parse_qs(url.query).get("offset", ["0"])[0])
+        status = self.fail_next.pop(tunnel_id, None)
+        if status is not None:
+            return (status, {}, json.dumps({"code": "Error", "message": "failed"}))
+        if start == 0:
+            script = self.scripts[tunnel_id]
+            poll = self.polls[tunnel_id]
+            self.polls[tunnel_id] += 1
+            if poll < len(script):
+                self.events[tunnel_id].extend(script[poll])
+        # the service does not guarantee any order
+        data = list(reversed(self.events[tunnel_id]))
+        end = start + self.page_size
+        links = None
+        if end < len(data):
+            links = {"next": f"{BASE_URL}/{tunnel_id}/events?offset={end}"}
+        body = {"data": data[start:end], "links": links, "meta": {}}
+        return (200, {}, json.dumps(body))
+
+
+@pytest.fixture
+def fake():
+    def setup(scripts, **kwargs):
+        api = FakeTunnelEvents(scripts, **kwargs)
+        for tunnel_id in scripts:
+            responses.add_callback(
+                responses.GET, f"{BASE_URL}/{tunnel_id}/events", callback=api
+            )
+        return api
+
+    return setup
+
+
+@pytest.fixture(params=["v1", "v2"])
+def any_client(request):
+    client = (
+        globus_sdk.TransferClient() if request.param == "v1" else TransferClientV2()
+    )
+    with client.retry_config.tune(max_retries=0):
+        yield client
+
+
+def _codes(results):
+    return [(tunnel_id, event["attributes"]["code"]) for tunnel_id, event in results]
+
+
+def test_follow_yields_only_new_events(any_client, fake, mocksleep):
+    fake(
+        {
+            TUNNEL_A: [
+                [_event(1, "STARTED")],
+                [_event(2, "TUNNEL_ACTIVE")],
+                [],
+                [_event(4, "TUNNEL_STOPPED"), _event(3, "TUNNEL_ERROR", True)],
+            ]
+        }
+    )
+
+    results = list(any_client.follow_tunnel_events(TUNNEL_A))
+
+    assert _codes(results) == [
+        (TUNNEL_A, "TUNNEL_ACTIVE"),
+        (TUNNEL_A, "TUNNEL_ERROR"),
+        (TUNNEL_A, "TUNNEL_STOPPED"),
+    ]
+
+
+def test_follow_including_existing_events(client, fake, mocksleep):
+    fake({TUNNEL_A: [[_event(1, "STARTED"), _event(2, "TUNNEL_STOPPED")]]})
+
+    results = list(client.follow_tunnel_events(TUNNEL_A, include_existing=True))
+
+    assert _codes(results) == [(TUNNEL_A, "STARTED"), (TUNNEL_A, "TUNNEL_STOPPED")]
+    mocksleep.assert_not_called()
+
+
+def test_polling_adapts_to_activity(client, fake, mocksleep):
+    fake(
+        {
+            TUNNEL_A: [
+                [_event(1, "STARTED")],
+                [],
+                [],
+                [_event(2, "TUNNEL_ACTIVE")],
+                [],
+                [_event(3, "TUNNEL_STOPPED")],
+            ]
+        }
+    )
+
+    list(client.follow_tunnel_events(TUNNEL_A, initial_interval=1, max_interval=3))
+
+    # back off while quiet, and reset once events arrive
+    assert [c.args[0] for c in mocksleep.call_args_list] == [1, 2, 3, 1, 2]
+
+
+def test_many_tunnels_share_one_loop(client, fake, mocksleep):
+    api = fake(
+        {
+            TUNNEL_A: [[], [_event(1, "TUNNEL_STOPPED")]],
+            TUNNEL_B: [[_event(10, "STARTED")], [], [], [_event(11, "TUNNEL_STOPPED")]],
+        }
+    )
+
+    results = list(client.follow_tunnel_events([TUNNEL_A, TUNNEL_B]))
+
+    assert sorted(_codes(results)) == [
+        (TUNNEL_A, "TUNNEL_STOPPED"),
+        (TUNNEL_B, "TUNNEL_STOPPED"),
+    ]
+    # tunnel A stopped following after its second poll
+    assert api.polls == {TUNNEL_A: 2, TUNNEL_B: 4}
+
+
+def test_timeout(client, fake, mocksleep):
+    fake({TUNNEL_A: [[_event(1, "STARTED")]]})
+
+    assert list(client.follow_tunnel_events(TUNNEL_A, timeout=10)) == []
+    assert sum(c.args[0] for c in mocksleep.call_args_list) == 10
+
+
+def test_server_errors_are_retried(client, fake, mocksleep):
+    api = fake({TUNNEL_A: [[_event(1, "STARTED")], [_event(2, "TUNNEL_STOPPED")]]})
+    events = client.follow_tunnel_events(TUNNEL_A)
+    api.fail_next[TUNNEL_A] = 503
+
+    assert _codes(events) == [(TUNNEL_A, "TUNNEL_STOPPED")]
+    assert api.polls[TUNNEL_A] == 2
+
+
+def test_events_are_read_from_every_page(any_client, fake, mocksleep):
+    fake(
+        {
+            TUNNEL_A: [
+                [_event(1, "STARTED")],
+                [_event(i, "TUNNEL_ACTIVE") for i in range(2, 7)]
+                + [_event(7, "TUNNEL_STOPPED")],
+            ]
+        },
+        page_size=2,
+    )
+
+    results = list(any_client.follow_tunnel_events(TUNNEL_A))
+
+    assert [event["id"] for _, event in results] == [2, 3, 4, 5, 6, 7]
+
+
+def test_client_errors_end_only_their_tunnel(any_client, fake, mocksleep):
+    api = fake(
+        {
+            TUNNEL_A: [[_event(1, "STARTED")]],
+            TUNNEL_B: [[_event(10, "STARTED")], [_event(11, "TUNNEL_STOPPED")]],
+        }
+    )
+    api.fail_next[TUNNEL_A] = 404
+    errors = {}
+
+    results = list(any_client.follow_tunnel_events([TUNNEL_A, TUNNEL_B], errors=errors))
+
+    assert _codes(results) == [(TUNNEL_B, "TUNNEL_STOPPED")]
+    assert list(errors) == [TUNNEL_A]
+    assert errors[TUNNEL_A].http_status == 404
+    assert api.polls == {TUNNEL_A: 0, TUNNEL_B: 2}
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"timeout": 0},
+        {"initial_interval": 0},
+        {"initial_interval": 10, "max_interval": 5},
+        {"backoff_factor": 0.5},
+    ],
+)
+def test_bad_arguments(client, kwargs):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        client.follow_tunnel_events(TUNNEL_A, **kwargs)
@@ -0,0 +1,167 @@
+import pytest
+import responses
+
+import globus_sdk
+from globus_sdk.testing import RegisteredResponse, load_response
+from tests.common import GO_EP1_ID, GO_EP2_ID
+
+BASE = f"/v0.10/operation/endpoint/{GO_EP1_ID}"
+
+
+@pytest.fixture
+def cache(client):
+    cache = globus_sdk.TransferListingCache(ttl=60, maxsize=10)
+    client.listing_cache = cache
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def _setup_responses():
+    for path in ("ls", "stat"):
+        load_response(
+            RegisteredResponse(
+                service="transfer",
+                path=f"{BASE}/{path}",
+                json={"DATA": [{"name": "foo", "type": "dir"}]},
+            )
+        )
+    for path in ("mkdir", "rename"):
+        load_response(
+            RegisteredResponse(
+                service="transfer",
+                method="POST",
+                path=f"{BASE}/{path}",
+                json={"code": "Success"},
+            )
+        )
+    load_response(
+        RegisteredResponse(
+            service="transfer",
+            path="/v0.10/submission_id",
+            json={"value": "abc"},
+        )
+    )
+    load_response(
+        RegisteredResponse(
+            service="transfer",
+            method="POST",
+            path="/v0.10/delete",
+            json={"task_id": "abc"},
+        )
+    )
+
+
+def test_no_cache_by_default(client):
+    client.operation_ls(GO_EP1_ID, path="/~/")
+    client.operation_ls(GO_EP1_ID, path="/~/")
+    assert len(responses.calls) == 2
+
+
+def test_ls_and_stat_are_cached(client, cache):
+    first = client.operation_ls(GO_EP1_ID, path="/~/")
+    # trailing slash differences do not matter
+    assert client.operation_ls(GO_EP1_ID, path="/~") is first
+    client.operation_stat(GO_EP1_ID, "/~/foo")
+    client.operation_stat(GO_EP1_ID, "/~/foo")
+    assert len(responses.calls) == 2
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (2, 2, 2)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"filter": "name:~*.txt"},
+        {"orderby": "name"},
+        {"local_user": "someone"},
+        {"show_hidden": False},
+        {"limit": 10},
+    ],
+)
+def test_ls_params_are_part_of_key(client, cache, kwargs):
+    client.operation_ls(GO_EP1_ID, path="/~/")
+    client.operation_ls(GO_EP1_ID, path="/~/", **kwargs)
+    assert len(responses.calls) == 2
+
+
+def test_identity_is_part_of_key(client, cache):
+    other = globus_sdk.TransferClient(
+        listing_cache=cache, listing_cache_identity="someone-else"
+    )
+    client.operation_ls(GO_EP1_ID, path="/~/")
+    other.operation_ls(GO_EP1_ID, path="/~/")
+    assert len(responses.calls) == 2
+
+
+def test_identity_is_derived_from_authorizer():
+    cache = globus_sdk.TransferListingCache()
+    clients = [
+        globus_sdk.TransferClient(
+            authorizer=globus_sdk.AccessTokenAuthorizer(token), listing_cache=cache
+        )
+        for token in ("token1", "token2", "token1")
+    ]
+    for tc in clients:
+        tc.operation_ls(GO_EP1_ID, path="/~/")
+    # only the clients with the same token share listings
+    assert len(responses.calls) == 2
+
+
+def test_identity_is_required_when_it_cannot_be_derived():
+    class CustomAuthorizer(globus_sdk.authorizers.StaticGlobusAuthorizer):
+        def __init__(self):
+            self.header_val = "Bearer custom"
+
+    cache = globus_sdk.TransferListingCache()
+    with pytest.raises(globus_sdk.GlobusSDKUsageError, match="CustomAuthorizer"):
+        globus_sdk.TransferClient(authorizer=CustomAuthorizer(), listing_cache=cache)
+    globus_sdk.TransferClient(
+        authorizer=CustomAuthorizer(),
+        listing_cache=cache,
+        listing_cache_identity="someone",
+    )
+
+
+def test_mkdir_invalidates_parent(client, cache):
+    client.operation_ls(GO_EP1_ID, path="/~/")
+    client.operation_ls(GO_EP1_ID, path="/~/other/")
+    client.operation_mkdir(GO_EP1_ID, "/~/newdir/")
+    assert cache.stats().size == 1
+    client.operation_ls(GO_EP1_ID, path="/~/")
+    assert len(responses.calls) == 4
+
+
+def test_rename_invalidates_both_sides_and_subtree(client, cache):
+    client.operation_ls(GO_EP1_ID, path="/~/a/")
+    client.operation_ls(GO_EP1_ID, path="/~/a/sub/")
+    client.operation_stat(GO_EP1_ID, "/~/b/x")
+    client.operation_ls(GO_EP1_ID, path="/~/c/")
+    client.operation_rename(GO_EP1_ID, "/~/a/sub", "/~/b/x")
+    # only the listing of /~/c/ survives
+    assert cache.stats().size == 1
+    assert cache.stats().invalidations == 3
+
+
+def test_submit_delete_invalidates(client, cache):
+    load_response(
+        RegisteredResponse(
+            service="transfer",
+            path=f"/v0.10/operation/endpoint/{GO_EP2_ID}/ls",
+            json={"DATA": []},
+        )
+    )
+    client.operation_ls(GO_EP1_ID, path="/~/")
+    client.operation_ls(GO_EP1_ID, path="/~/foo/bar/")
+    client.operation_ls(GO_EP2_ID, path="/~/")
+    ddata = globus_sdk.DeleteData(GO_EP1_ID, recursive=True)
+    ddata.add_item("/~/foo")
+    client.submit_delete(ddata)
+    # only the listing on the other endpoint survives
+    assert cache.stats().size == 1
+
+
+def test_default_path_is_always_invalidated(client, cache):
+    client.operation_ls(GO_EP1_ID)
+    client.operation_mkdir(GO_EP1_ID, "/anywhere/else/")
+    assert cache.stats().size == 0
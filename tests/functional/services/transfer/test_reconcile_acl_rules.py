@@ -0,0 +1,168 @@
+import itertools
+import json
+import re
+import threading
+
+import pytest
+import responses
+
+import globus_sdk
+from tests.common import GO_EP1_ID
+
+BASE_URL = f"https://transfer.api.globus.org/v0.10/endpoint/{GO_EP1_ID}"
+ALICE = "ae341a98-d274-11e5-b888-dbae3a8ba545"
+BOB = "c8aad43e-d274-11e5-bf98-8b02896cf782"
+
+
+def _rule(rule_id, principal, path, permissions, principal_type="identity"):
+    return {
+        "DATA_TYPE": "access",
+        "id": rule_id,
+        "principal_type": principal_type,
+        "principal": principal,
+        "path": path,
+        "permissions": permissions,
+        "role_id": None,
+    }
+
+
+class FakeAccessAPI:
+    def __init__(self, rules, fail_paths=()):
+        self.rules = {r["id"]: r for r in rules if r["id"]}
+        self.listing = rules
+        self.fail_paths = fail_paths
+        self.ids = itertools.count(100)
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def access_list(self, request):
+        return (200, {}, json.dumps({"DATA": self.listing}))
+
+    def modify(self, request):
+        rule_id = request.url.rsplit("/access", 1)[1].lstrip("/")
+        body = json.loads(request.body) if request.body else None
+        path = (body or self.rules.get(rule_id, {})).get("path")
+        with self.lock:
+            self.calls.append((request.method, rule_id, body))
+        if path in self.fail_paths:
+            return (409, {}, json.dumps({"code": "Exists", "message": "conflict"}))
+        if request.method == "POST":
+            return (201, {}, json.dumps({"access_id": str(next(self.ids))}))
+        return (200, {}, json.dumps({"code": "Done"}))
+
+
+@pytest.fixture
+def fake():
+    def setup(rules, **kwargs):
+        api = FakeAccessAPI(rules, **kwargs)
+        responses.add_callback(
+            responses.GET, f"{BASE_URL}/access_list", callback=api.access_list
+        )
+        for method in (responses.POST, responses.PUT, responses.DELETE):
+            responses.add_callback(
+                method, re.compile(rf"{BASE_URL}/access(/.*)?$"), callback=api.modify
+            )
+        return api
+
+    return setup
+
+
+EXISTING = [
+    # the owner's implicit rule, which cannot be managed
+    _rule(None, ALICE, "/", "rw"),
+    _rule("1", ALICE, "/shared/", "r"),
+    _rule("2", BOB, "/shared/", "rw"),
+    _rule("3", "", "/public/", "r", principal_type="anonymous"),
+    _rule("4", BOB, "/old/", "r"),
+    {**_rule("5", BOB, "/role/", "rw"), "role_id": "some-role"},
+]
+DESIRED = [
+    # permissions changed
+    {
+        "principal_type": "identity",
+        "principal": ALICE,
+        "path": "/shared/",
+        "permissions": "rw",
+    },  # noqa: E501
+    # unchanged, ignoring the order of permissions and the trailing slash
+    {
+        "principal_type": "identity",
+        "principal": BOB,
+        "path": "/shared",
+        "permissions": "wr",
+    },  # noqa: E501
+    {"principal_type": "anonymous", "path": "/public/", "permissions": "r"},
+    # new
+    {
+        "principal_type": "identity",
+        "principal": BOB,
+        "path": "/new/",
+        "permissions": "r",
+    },  # noqa: E501
+]
+
+
+def _actions(report):
+    return sorted((r.action, r.principal, r.path) for r in report.results)
+
+
+def test_reconcile_dry_run(client, fake):
+    api = fake(EXISTING)
+    report = client.reconcile_endpoint_acl_rules(
+        GO_EP1_ID, DESIRED, delete_extra=True, dry_run=True
+    )
+    assert report.dry_run
+    assert _actions(report) == [
+        ("create", BOB, "/new/"),
+        ("delete", BOB, "/old/"),
+        ("unchanged", "", "/public/"),
+        ("unchanged", BOB, "/shared/"),
+        ("update", ALICE, "/shared/"),
+    ]
+    assert not any(r.applied for r in report.results)
+    assert api.calls == []
+
+
+def test_reconcile_applies_minimal_changes(client, fake, mocksleep):
+    api = fake(EXISTING)
+    report = client.reconcile_endpoint_acl_rules(GO_EP1_ID, DESIRED, delete_extra=True)
+
+    assert report.succeeded
+    assert sorted((m, i) for m, i, _ in api.calls) == [
+        ("DELETE", "4"),
+        ("POST", ""),
+        ("PUT", "1"),
+    ]
+    (created,) = report.by_action("create")
+    assert created.applied and created.rule_id == "100"
+    put_body = next(b for m, _, b in api.calls if m == "PUT")
+    assert put_body == {"DATA_TYPE": "access", "permissions": "rw"}
+    post_body = next(b for m, _, b in api.calls if m == "POST")
+    assert post_body["DATA_TYPE"] == "access" and post_body["path"] == "/new/"
+
+
+def test_reconcile_keeps_extra_rules_by_default(client, fake):
+    api = fake(EXISTING)
+    report = client.reconcile_endpoint_acl_rules(
+        GO_EP1_ID, DESIRED, max_requests_per_second=None
+    )
+    assert report.by_action("delete") == []
+    assert "DELETE" not in [m for m, _, _ in api.calls]
+
+
+def test_reconcile_records_failures(client, fake):
+    fake(EXISTING, fail_paths=("/new/",))
+    report = client.reconcile_endpoint_acl_rules(
+        GO_EP1_ID, DESIRED, delete_extra=True, max_requests_per_second=None
+    )
+    (failed,) = report.failed
+    assert failed.action == "create"
+    assert isinstance(failed.error, globus_sdk.TransferAPIError)
+    assert not failed.applied
+    assert len([r for r in report.changes if r.applied]) == 2
+
+
+def test_reconcile_rejects_duplicate_desired_rules(client, fake):
+    fake(EXISTING)
+    with pytest.raises(globus_sdk.GlobusSDKUsageError, match="Duplicate"):
+        client.reconcile_endpoint_acl_rules(GO_EP1_ID, [DESIRED[0], DESIRED[0]])
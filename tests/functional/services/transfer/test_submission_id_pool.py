@@ -0,0 +1,119 @@
+import itertools
+import json
+import threading
+
+import pytest
+import responses
+
+import globus_sdk
+from tests.common import GO_EP1_ID, GO_EP2_ID
+
+SUBMISSION_ID_URL = "https://transfer.api.globus.org/v0.10/submission_id"
+
+
+class FakeSubmissionIDs:
+    def __init__(self):
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.fail = False
+        self.issued = []
+
+    def __call__(self, request):
+        if self.fail:
+            return (503, {}, json.dumps({"code": "Unavailable", "message": "no"}))
+        with self.lock:
+            value = f"sub-{next(self.counter)}"
+            self.issued.append(value)
+        return (200, {}, json.dumps({"value": value}))
+
+
+@pytest.fixture
+def fake_ids():
+    fake = FakeSubmissionIDs()
+    responses.add_callback(responses.GET, SUBMISSION_ID_URL, callback=fake)
+    responses.add(
+        responses.POST,
+        "https://transfer.api.globus.org/v0.10/transfer",
+        json={"task_id": "task-1"},
+    )
+    return fake
+
+
+def _wait_for_refill(pool):
+    if pool._refill_thread is not None:
+        pool._refill_thread.join()
+
+
+def test_pool_prefetches_in_background(client, fake_ids):
+    with globus_sdk.TransferSubmissionIDPool(client, size=4) as pool:
+        _wait_for_refill(pool)
+        assert len(pool) == 4
+        assert fake_ids.issued == ["sub-0", "sub-1", "sub-2", "sub-3"]
+
+        assert [pool.take() for _ in range(2)] == ["sub-0", "sub-1"]
+        # the reserve is at the threshold, so a refill has started
+        _wait_for_refill(pool)
+        assert len(pool) == 4
+        assert pool.reserve_misses == 0
+        assert pool.ids_issued == 2
+
+
+def test_submit_transfer_uses_pool(client, fake_ids):
+    pool = globus_sdk.TransferSubmissionIDPool(client, size=2)
+    _wait_for_refill(pool)
+    client.submission_id_pool = pool
+
+    tdata = globus_sdk.TransferData(GO_EP1_ID, GO_EP2_ID)
+    tdata.add_item("/a", "/b")
+    client.submit_transfer(tdata)
+    pool.close()
+
+    assert tdata["submission_id"] == "sub-0"
+    (post,) = [c for c in responses.calls if c.request.method == "POST"]
+    assert json.loads(post.request.body)["submission_id"] == "sub-0"
+    assert pool.ids_issued == 1
+    assert pool.reserve_misses == 0
+
+
+def test_ids_are_never_reissued(client, fake_ids):
+    with globus_sdk.TransferSubmissionIDPool(
+        client, size=3, refill_threshold=2
+    ) as pool:
+        taken = [pool.take() for _ in range(20)]
+    assert len(set(taken)) == 20
+
+
+def test_empty_pool_fetches_on_demand(client, fake_ids):
+    pool = globus_sdk.TransferSubmissionIDPool(client, size=2)
+    pool.close()
+    assert len(pool) == 0
+
+    assert pool.take() == f"sub-{len(fake_ids.issued) - 1}"
+    assert pool.reserve_misses == 1
+    assert len(pool) == 0
+
+
+def test_refill_failure_pauses_refilling(client, fake_ids):
+    fake_ids.fail = True
+    pool = globus_sdk.TransferSubmissionIDPool(client, size=2)
+    _wait_for_refill(pool)
+    assert len(pool) == 0
+    thread = pool._refill_thread
+
+    # on-demand fetches raise, and do not restart refilling immediately
+    with pytest.raises(globus_sdk.TransferAPIError):
+        pool.take()
+    assert pool._refill_thread is thread
+
+    fake_ids.fail = False
+    assert pool.take().startswith("sub-")
+    pool.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"size": 0}, {"size": 2, "refill_threshold": 2}, {"refill_threshold": -1}],
+)
+def test_bad_arguments(client, kwargs):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        globus_sdk.TransferSubmissionIDPool(client, **kwargs)
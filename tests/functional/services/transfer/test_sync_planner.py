@@ -0,0 +1,175 @@
+import json
+import os
+import urllib.parse
+
+import pytest
+import responses
+
+import globus_sdk
+from tests.common import GO_EP1_ID, GO_EP2_ID
+
+LS_URL = f"https://transfer.api.globus.org/v0.10/operation/endpoint/{GO_EP2_ID}/ls"
+OLD = "2000-01-01 00:00:00+00:00"
+NEW = "2100-01-01 00:00:00+00:00"
+
+# the remote tree, keyed by directory path: (name, type, size, last_modified)
+REMOTE_TREE = {
+    "/remote/": [
+        ("same.txt", "file", 5, NEW),
+        ("resized.txt", "file", 1, NEW),
+        ("stale.txt", "file", 5, OLD),
+        ("remote_only.txt", "file", 3, NEW),
+        ("sub", "dir", 0, NEW),
+        ("remote_only_dir", "dir", 0, NEW),
+        ("conflict", "file", 5, NEW),
+    ],
+    "/remote/sub/": [("nested.txt", "file", 5, NEW)],
+    "/remote/remote_only_dir/": [("x", "file", 1, NEW)],
+}
+
+
+def _ls_callback(request):
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+    path = query["path"][0]
+    if path not in REMOTE_TREE:
+        return (
+            404,
+            {"Content-Type": "application/json"},
+            json.dumps({"code": "ClientError.NotFound", "message": "no such dir"}),
+        )
+    data = [
+        {"name": name, "type": typ, "size": size, "last_modified": mtime}
+        for name, typ, size, mtime in REMOTE_TREE[path]
+    ]
+    return (200, {"Content-Type": "application/json"}, json.dumps({"DATA": data}))
+
+
+@pytest.fixture(autouse=True)
+def _setup_ls_callback():
+    responses.add_callback(responses.GET, LS_URL, callback=_ls_callback)
+
+
+@pytest.fixture
+def local_tree(tmp_path):
+    def write(relpath, content):
+        path = tmp_path / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        os.utime(path, (0, 1_000_000_000))
+
+    write("same.txt", "12345")
+    write("resized.txt", "12345")
+    write("stale.txt", "12345")
+    write("local_only.txt", "1")
+    write("sub/nested.txt", "12345")
+    write("local_only_dir/y", "1")
+    write("conflict/z", "1")
+    return tmp_path
+
+
+def _paths(docs, typ):
+    return sorted(
+        item.get("destination_path", item.get("path"))
+        for doc in docs
+        if isinstance(doc, typ)
+        for item in doc["DATA"]
+    )
+
+
+def _make_planner(client, local_tree, **kwargs):
+    return globus_sdk.TransferSyncPlanner(
+        client,
+        local_tree,
+        source_endpoint=GO_EP1_ID,
+        destination_endpoint=GO_EP2_ID,
+        destination_root="/remote",
+        source_root="/~/local/",
+        **kwargs,
+    )
+
+
+def test_sync_plan_by_mtime(client, local_tree):
+    # make "stale.txt" newer locally than on the remote side
+    os.utime(local_tree / "stale.txt", (0, 2_000_000_000))
+    planner = _make_planner(client, local_tree)
+    docs = list(planner.iter_documents())
+
+    assert _paths(docs, globus_sdk.TransferData) == [
+        "/remote/local_only.txt",
+        "/remote/local_only_dir/",
+        "/remote/resized.txt",
+        "/remote/stale.txt",
+    ]
+    assert _paths(docs, globus_sdk.DeleteData) == []
+    # the remote-only directory is never listed
+    assert "/remote/remote_only_dir/" not in [
+        urllib.parse.parse_qs(urllib.parse.urlparse(c.request.url).query)["path"][0]
+        for c in responses.calls
+    ]
+
+    (tdata,) = docs
+    item = next(i for i in tdata["DATA"] if i["source_path"].endswith("_dir/"))
+    assert item["source_path"] == "/~/local/local_only_dir/"
+    assert item["recursive"] is True
+
+    assert planner.stats.files_compared == 4
+    assert planner.stats.files_to_transfer == 3
+    assert planner.stats.directories_to_transfer == 1
+    assert planner.stats.bytes_to_transfer == 11
+    assert planner.stats.type_conflicts == 1
+
+
+def test_sync_plan_by_size_with_delete(client, local_tree):
+    planner = _make_planner(client, local_tree, compare="size", delete=True)
+    docs = list(planner.iter_documents())
+    # deletes are flushed before transfers
+    assert isinstance(docs[0], globus_sdk.DeleteData)
+    assert docs[0]["recursive"] is True
+    assert _paths(docs, globus_sdk.DeleteData) == [
+        "/remote/remote_only.txt",
+        "/remote/remote_only_dir",
+    ]
+    assert _paths(docs, globus_sdk.TransferData) == [
+        "/remote/local_only.txt",
+        "/remote/local_only_dir/",
+        "/remote/resized.txt",
+    ]
+
+
+def test_sync_plan_checksum_mode(client, local_tree):
+    planner = _make_planner(client, local_tree, compare="checksum")
+    docs = list(planner.iter_documents())
+    (tdata,) = docs
+    assert tdata["sync_level"] == 3
+    assert "/remote/same.txt" in _paths(docs, globus_sdk.TransferData)
+    assert "/remote/sub/nested.txt" in _paths(docs, globus_sdk.TransferData)
+
+
+def test_sync_plan_chunks_documents(client, local_tree):
+    planner = _make_planner(client, local_tree, compare="checksum", max_items=2)
+    docs = list(planner.iter_documents())
+    assert all(len(doc["DATA"]) <= 2 for doc in docs)
+    assert len(_paths(docs, globus_sdk.TransferData)) == 6
+
+
+def test_sync_plan_missing_remote_root(client, local_tree):
+    planner = globus_sdk.TransferSyncPlanner(
+        client,
+        local_tree,
+        source_endpoint=GO_EP1_ID,
+        destination_endpoint=GO_EP2_ID,
+        destination_root="/nowhere/",
+        source_root="/~/local/",
+        delete=True,
+    )
+    (tdata,) = list(planner.iter_documents())
+    assert tdata["DATA"][0]["source_path"] == "/~/local/"
+    assert tdata["DATA"][0]["destination_path"] == "/nowhere/"
+    assert tdata["DATA"][0]["recursive"] is True
+    assert planner.stats.errors == []
+
+
+def test_sync_plan_requires_local_root(client, tmp_path):
+    planner = _make_planner(client, tmp_path / "nonexistent")
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        list(planner.iter_documents())
@@ -0,0 +1,291 @@
+import datetime
+import json
+import queue
+import re
+import urllib.parse
+
+import pytest
+import responses
+
+import globus_sdk
+from globus_sdk.services.transfer.task_monitor import (
+    TaskCompleted,
+    TaskFault,
+    TaskPauseChanged,
+    TaskStatusChanged,
+)
+from tests.common import GO_EP1_ID, GO_EP2_ID
+
+BASE_URL = "https://transfer.api.globus.org/v0.10"
+
+
+class FakeTasks:
+    """
+    Serves task_list (user and endpoint manager) and task event lists from a
+    mutable dict of tasks.
+    """
+
+    def __init__(self):
+        self.tasks = {}
+        self.events = {}
+        self.queries = []
+        self.event_queries = []
+
+    def add(self, task_id, status="ACTIVE", **kwargs):
+        self.tasks[task_id] = {
+            "task_id": task_id,
+            "status": status,
+            "is_paused": False,
+            "faults": 0,
+            "completion_time": None,
+            "source_endpoint_id": GO_EP1_ID,
+            "destination_endpoint_id": GO_EP2_ID,
+            **kwargs,
+        }
+
+    def complete(self, task_id, status="SUCCEEDED"):
+        self.tasks[task_id]["status"] = status
+        self.tasks[task_id]["completion_time"] = datetime.datetime.now(
+            datetime.timezone.utc
+        ).isoformat(timespec="seconds")
+
+    def _matches(self, task, filters):
+        for key, value in filters.items():
+            if key == "completion_time":
+                if task["completion_time"] is None:
+                    return False
+                start = value.split(",")[0]
+                if task["completion_time"] < start:
+                    return False
+            elif key == "endpoint":
+                if value not in (
+                    task["source_endpoint_id"],
+                    task["destination_endpoint_id"],
+                ):
+                    return False
+            elif task[key] not in value.split(","):
+                return False
+        return True
+
+    def task_list(self, request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        if "filter" in query:
+            filters = dict(
+                clause.split(":", 1) for clause in query["filter"][0].split("/")
+            )
+        else:
+            filters = {
+                k.removeprefix("filter_"): v[0]
+                for k, v in query.items()
+                if k.startswith("filter_")
+            }
+        self.queries.append(filters)
+        data = [t for t in self.tasks.values() if self._matches(t, filters)]
+        limit = int(query.get("limit", ["10"])[0])
+        offset = int(query.get("offset", ["0"])[0])
+        body = {
+            "DATA": data[offset : offset + limit],
+            "total": len(data),
+            "limit": limit,
+            "offset": offset,
+            "has_next_page": offset + limit < len(data),
+        }
+        return (200, {}, json.dumps(body))
+
+    def event_list(self, request):
+        task_id = request.url.split("/task/")[1].split("/")[0]
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        self.event_queries.append(query)
+        data = self.events.get(task_id, [])
+        if query.get("filter") == ["is_error:1"] or query.get("filter_is_error") == [
+            "1"
+        ]:
+            data = [e for e in data if e["is_error"]]
+        data = data[: int(query.get("limit", ["10"])[0])]
+        return (200, {}, json.dumps({"DATA": data}))
+
+
+@pytest.fixture
+def fake():
+    fake = FakeTasks()
+    for path in ("task_list", "endpoint_manager/task_list"):
+        responses.add_callback(
+            responses.GET, f"{BASE_URL}/{path}", callback=fake.task_list
+        )
+    responses.add_callback(
+        responses.GET,
+        re.compile(rf"{BASE_URL}/(endpoint_manager/)?task/[^/]+/event_list"),
+        callback=fake.event_list,
+    )
+    return fake
+
+
+def _summary(events):
+    return [(type(e).__name__, e.task_id) for e in events]
+
+
+def test_monitor_reports_changes(client, fake):
+    monitor = globus_sdk.TransferTaskMonitor(client)
+    seen = []
+    monitor.add_callback(seen.append)
+
+    fake.add("a")
+    fake.add("b", status="INACTIVE")
+    events = monitor.poll()
+    assert _summary(events) == [
+        ("TaskStatusChanged", "a"),
+        ("TaskStatusChanged", "b"),
+    ]
+    assert events[1].old_status is None
+    assert monitor.task_count == 2
+
+    # nothing changed
+    assert monitor.poll() == []
+
+    fake.tasks["a"]["faults"] = 2
+    fake.events["a"] = [
+        {"code": "NEWER", "is_error": True},
+        {"code": "PROGRESS", "is_error": False},
+        {"code": "OLDER", "is_error": True},
+        {"code": "OLDEST", "is_error": True},
+    ]
+    fake.tasks["b"]["status"] = "ACTIVE"
+    fake.tasks["b"]["is_paused"] = True
+    events = monitor.poll()
+    assert _summary(events) == [
+        ("TaskFault", "a"),
+        ("TaskFault", "a"),
+        ("TaskStatusChanged", "b"),
+        ("TaskPauseChanged", "b"),
+    ]
+    assert [e.event["code"] for e in events if isinstance(e, TaskFault)] == [
+        "OLDER",
+        "NEWER",
+    ]
+    status_change = events[2]
+    assert isinstance(status_change, TaskStatusChanged)
+    assert (status_change.old_status, status_change.new_status) == (
+        "INACTIVE",
+        "ACTIVE",
+    )
+    assert isinstance(events[3], TaskPauseChanged) and events[3].is_paused
+
+    fake.complete("a", "FAILED")
+    events = monitor.poll()
+    assert _summary(events) == [
+        ("TaskStatusChanged", "a"),
+        ("TaskCompleted", "a"),
+    ]
+    assert events[1].status == "FAILED"
+    assert monitor.task_count == 1
+    # the completed task is listed again due to the overlap, but not re-reported
+    assert monitor.poll() == []
+
+    # callbacks received every event
+    assert len(seen) == 8
+
+
+def test_monitor_filters_fault_events_on_the_server(client, fake):
+    monitor = globus_sdk.TransferTaskMonitor(client)
+    fake.add("a", faults=1)
+    fake.events["a"] = [{"code": "OLD", "is_error": True}]
+    # faults from before the first poll are not read
+    assert _summary(monitor.poll()) == [("TaskStatusChanged", "a")]
+    assert fake.event_queries == []
+
+    fake.tasks["a"]["faults"] = 3
+    fake.events["a"] = [
+        {"code": "NEWER", "is_error": True},
+        *({"code": "PROGRESS", "is_error": False} for _ in range(50)),
+        {"code": "NEW", "is_error": True},
+        {"code": "OLD", "is_error": True},
+    ]
+    events = monitor.poll()
+    assert [e.event["code"] for e in events] == ["NEW", "NEWER"]
+    (query,) = fake.event_queries
+    assert query["filter"] == ["is_error:1"]
+    assert query["limit"] == ["2"]
+
+
+def test_monitor_reports_tasks_completed_between_polls(client, fake):
+    results = queue.Queue()
+    monitor = globus_sdk.TransferTaskMonitor(client, queue=results)
+    monitor.poll()
+
+    fake.add("quick")
+    fake.complete("quick")
+    (event,) = monitor.poll()
+    assert isinstance(event, TaskCompleted)
+    assert results.get_nowait() is event
+
+
+def test_monitor_looks_up_tasks_missing_from_listings(client, fake):
+    monitor = globus_sdk.TransferTaskMonitor(client)
+    fake.add("a")
+    monitor.poll()
+
+    # complete the task without a completion time, so that it only appears in a
+    # lookup by ID
+    fake.tasks["a"]["status"] = "SUCCEEDED"
+    events = monitor.poll()
+    assert _summary(events) == [
+        ("TaskStatusChanged", "a"),
+        ("TaskCompleted", "a"),
+    ]
+    assert fake.queries[-1] == {"task_id": "a"}
+
+
+def test_monitor_endpoint_manager(client, fake):
+    monitor = globus_sdk.TransferTaskMonitor(
+        client, endpoint_manager=True, endpoints=[GO_EP2_ID], fetch_faults=False
+    )
+    fake.add("a", faults=3)
+    fake.add("elsewhere", destination_endpoint_id="other")
+    events = monitor.poll()
+    assert _summary(events) == [("TaskStatusChanged", "a")]
+    assert all(q["endpoint"] == GO_EP2_ID for q in fake.queries)
+
+
+def test_monitor_callback_errors_are_logged(client, fake, caplog):
+    monitor = globus_sdk.TransferTaskMonitor(client)
+
+    def bad_callback(event):
+        raise ValueError("oops")
+
+    monitor.add_callback(bad_callback)
+    fake.add("a")
+    assert len(monitor.poll()) == 1
+    assert "callback failed" in caplog.text
+
+
+def test_monitor_warns_when_task_list_is_truncated(client, fake, caplog):
+    monitor = globus_sdk.TransferTaskMonitor(client)
+    for n in range(1005):
+        fake.add(f"task-{n}")
+
+    events = monitor.poll()
+
+    # task_list cannot return more than 1000 results
+    assert len(events) == 1000
+    assert "some tasks may be missed" in caplog.text
+
+
+def test_monitor_bounds_tracked_tasks(client, fake):
+    monitor = globus_sdk.TransferTaskMonitor(client, max_tasks=2)
+    for task_id in "abc":
+        fake.add(task_id)
+    monitor.poll()
+    assert monitor.task_count == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"endpoint_manager": True},
+        {"owner_ids": ["foo"]},
+        {"max_tasks": 0},
+    ],
+)
+def test_monitor_rejects_bad_args(client, kwargs):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        globus_sdk.TransferTaskMonitor(client, **kwargs)
@@ -0,0 +1,109 @@
+import json
+import urllib.parse
+import uuid
+
+import pytest
+import responses
+
+import globus_sdk
+
+TASK_LIST_URL = "https://transfer.api.globus.org/v0.10/task_list"
+
+
+class FakeTasks:
+    """
+    Each task completes after being polled a given number of times.
+    """
+
+    def __init__(self, polls_until_done):
+        self.remaining = dict(polls_until_done)
+        self.requests = []
+
+    def callback(self, request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        task_ids = query["filter"][0].removeprefix("task_id:").split(",")
+        self.requests.append(task_ids)
+        data = []
+        for task_id in task_ids:
+            if task_id not in self.remaining:
+                continue
+            self.remaining[task_id] -= 1
+            status = "ACTIVE" if self.remaining[task_id] > 0 else "SUCCEEDED"
+            if task_id == "fails" and status == "SUCCEEDED":
+                status = "FAILED"
+            # as Transfer does, list IDs in lowercase
+            data.append({"task_id": task_id.lower(), "status": status})
+        return (200, {}, json.dumps({"DATA": data, "total": len(data)}))
+
+
+@pytest.fixture
+def tasks():
+    def setup(polls_until_done):
+        fake = FakeTasks(polls_until_done)
+        responses.add_callback(responses.GET, TASK_LIST_URL, callback=fake.callback)
+        return fake
+
+    return setup
+
+
+def test_wait_for_tasks_yields_tasks_as_they_finish(client, tasks, mocksleep):
+    fake = tasks({"a": 3, "b": 1, "fails": 2})
+    results = list(client.wait_for_tasks(["a", "b", "fails"]))
+
+    assert [(t["task_id"], t["status"]) for t in results] == [
+        ("b", "SUCCEEDED"),
+        ("fails", "FAILED"),
+        ("a", "SUCCEEDED"),
+    ]
+    # all tasks are polled together, and finished tasks are dropped
+    assert fake.requests == [["a", "b", "fails"], ["a", "fails"], ["a"]]
+    # the interval grows with each poll
+    assert [c.args[0] for c in mocksleep.call_args_list] == [1, 2]
+
+
+def test_wait_for_tasks_batches_requests(client, tasks, mocksleep):
+    task_ids = [f"task{i}" for i in range(5)]
+    fake = tasks({task_id: 1 for task_id in task_ids})
+    results = list(client.wait_for_tasks(task_ids, batch_size=2))
+    assert len(results) == 5
+    assert [len(r) for r in fake.requests] == [2, 2, 1]
+    mocksleep.assert_not_called()
+
+
+def test_wait_for_tasks_normalizes_task_ids(client, tasks, mocksleep):
+    id1, id2 = str(uuid.UUID(int=1)), str(uuid.UUID(int=2))
+    fake = tasks({id1: 1, id2: 2})
+    results = list(client.wait_for_tasks([uuid.UUID(id1), id2.upper(), id1]))
+    assert [r["task_id"] for r in results] == [id1, id2]
+    assert fake.requests == [[id1, id2], [id2]]
+
+
+def test_wait_for_tasks_backoff_is_capped(client, tasks, mocksleep):
+    tasks({"a": 6})
+    (result,) = client.wait_for_tasks(["a"], backoff_factor=3, max_interval=10)
+    assert result["task_id"] == "a"
+    assert [c.args[0] for c in mocksleep.call_args_list] == [1, 3, 9, 10, 10]
+
+
+def test_wait_for_tasks_timeout(client, tasks, mocksleep):
+    fake = tasks({"a": 1, "b": 100})
+    results = list(client.wait_for_tasks(["a", "b"], timeout=5))
+    assert [r["task_id"] for r in results] == ["a"]
+    # polls at 0, 1, 3, and a final wait until the timeout
+    assert len(fake.requests) == 3
+    assert [c.args[0] for c in mocksleep.call_args_list] == [1, 2, 2]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"timeout": 0},
+        {"initial_interval": 0},
+        {"initial_interval": 10, "max_interval": 5},
+        {"backoff_factor": 0.5},
+        {"batch_size": 1001},
+    ],
+)
+def test_wait_for_tasks_rejects_bad_args(client, kwargs):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        list(client.wait_for_tasks(["a"], **kwargs))
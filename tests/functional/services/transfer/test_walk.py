@@ -0,0 +1,162 @@
+import json
+import urllib.parse
+
+import pytest
+import requests
+import responses
+
+import globus_sdk
+from tests.common import GO_EP1_ID
+
+LS_URL = f"https://transfer.api.globus.org/v0.10/operation/endpoint/{GO_EP1_ID}/ls"
+
+# a small tree, keyed by directory path
+TREE = {
+    "/~/": [("a", "dir"), ("b", "dir"), ("top.txt", "file")],
+    "/~/a/": [("c", "dir"), ("a1.txt", "file"), ("a2.txt", "file")],
+    "/~/a/c/": [("deep.txt", "file")],
+    "/~/b/": [],
+}
+
+
+def _mk_item(name, typ, link_target=None):
+    return {
+        "DATA_TYPE": "file",
+        "name": name,
+        "type": typ,
+        "size": 4096 if typ == "dir" else 10,
+        "link_target": link_target,
+    }
+
+
+def _ls_callback(request):
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+    path = query["path"][0]
+    if path not in TREE:
+        return (
+            404,
+            {"Content-Type": "application/json"},
+            json.dumps({"code": "ClientError.NotFound", "message": "nope"}),
+        )
+    body = {
+        "DATA_TYPE": "file_list",
+        "path": path,
+        "DATA": [_mk_item(*entry) for entry in TREE[path]],
+    }
+    return (200, {"Content-Type": "application/json"}, json.dumps(body))
+
+
+@pytest.fixture(autouse=True)
+def _setup_ls_callback():
+    responses.add_callback(responses.GET, LS_URL, callback=_ls_callback)
+
+
+def _listed_paths():
+    return [
+        urllib.parse.parse_qs(urllib.parse.urlparse(call.request.url).query)["path"][0]
+        for call in responses.calls
+    ]
+
+
+@pytest.mark.parametrize("max_workers", (1, 4))
+def test_walk_visits_whole_tree(client, max_workers):
+    results = {
+        dirpath: ([d["name"] for d in dirs], [f["name"] for f in files])
+        for dirpath, dirs, files in client.walk(
+            GO_EP1_ID, "/~/", max_workers=max_workers
+        )
+    }
+    assert results == {
+        "/~/": (["a", "b"], ["top.txt"]),
+        "/~/a/": (["c"], ["a1.txt", "a2.txt"]),
+        "/~/a/c/": ([], ["deep.txt"]),
+        "/~/b/": ([], []),
+    }
+
+
+def test_walk_single_worker_is_breadth_first(client):
+    paths = [dirpath for dirpath, _, _ in client.walk(GO_EP1_ID, "/~", max_workers=1)]
+    assert paths == ["/~/", "/~/a/", "/~/b/", "/~/a/c/"]
+
+
+def test_walk_max_depth(client):
+    paths = {dirpath for dirpath, _, _ in client.walk(GO_EP1_ID, max_depth=1)}
+    assert paths == {"/~/", "/~/a/", "/~/b/"}
+
+
+def test_walk_prune_in_place(client):
+    paths = []
+    for dirpath, dirs, _ in client.walk(GO_EP1_ID, max_workers=1):
+        paths.append(dirpath)
+        dirs[:] = [d for d in dirs if d["name"] != "a"]
+    assert paths == ["/~/", "/~/b/"]
+    assert "/~/a/" not in _listed_paths()
+
+
+def test_walk_does_not_follow_links_by_default(client):
+    TREE["/~/"].append(("link", "dir", "/elsewhere/"))
+    try:
+        paths = {dirpath for dirpath, _, _ in client.walk(GO_EP1_ID)}
+        assert "/~/link/" not in paths
+
+        # with follow_links, the link is listed (and fails, as it is not in TREE)
+        errors = []
+        for _ in client.walk(
+            GO_EP1_ID, follow_links=True, on_error=lambda p, e: errors.append(p)
+        ):
+            pass
+        assert errors == ["/~/link/"]
+    finally:
+        TREE["/~/"].remove(("link", "dir", "/elsewhere/"))
+
+
+def test_walk_errors_do_not_abort(client):
+    TREE["/~/"].append(("missing", "dir"))
+    try:
+        errors = []
+        paths = {
+            dirpath
+            for dirpath, _, _ in client.walk(
+                GO_EP1_ID, on_error=lambda p, e: errors.append((p, e.http_status))
+            )
+        }
+    finally:
+        TREE["/~/"].remove(("missing", "dir"))
+    assert errors == [("/~/missing/", 404)]
+    assert paths == {"/~/", "/~/a/", "/~/b/", "/~/a/c/"}
+
+
+def test_walk_network_errors_do_not_abort(client):
+    def callback(request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        if query["path"][0] == "/~/a/":
+            raise requests.ConnectionError("connection reset")
+        return _ls_callback(request)
+
+    responses.remove(responses.GET, LS_URL)
+    responses.add_callback(responses.GET, LS_URL, callback=callback)
+
+    errors = []
+    paths = {
+        dirpath
+        for dirpath, _, _ in client.walk(
+            GO_EP1_ID, on_error=lambda p, e: errors.append((p, e))
+        )
+    }
+    assert [p for p, _ in errors] == ["/~/a/"]
+    assert isinstance(errors[0][1], globus_sdk.NetworkError)
+    assert paths == {"/~/", "/~/b/"}
+
+
+def test_walk_filter_keeps_directories(client):
+    list(client.walk(GO_EP1_ID, max_depth=0, filter="name:~*.txt", show_hidden=False))
+    query = urllib.parse.parse_qs(
+        urllib.parse.urlparse(responses.calls[-1].request.url).query
+    )
+    assert query["filter"] == ["name:~*.txt", "type:dir"]
+    assert query["show_hidden"] == ["0"]
+
+
+def test_walk_rejects_bad_max_workers(client):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        list(client.walk(GO_EP1_ID, max_workers=0))
@@ -0,0 +1,189 @@
+import json
+import time
+import uuid
+from unittest import mock
+
+import pytest
+import responses
+
+import globus_sdk
+from globus_sdk.experimental.gcs_download_manager import GCSDownloadManager
+
+HOSTS = {
+    "https://a.example.com": str(uuid.UUID(int=1)),
+    "https://b.example.com": str(uuid.UUID(int=2)),
+}
+
+
+@pytest.fixture
+def app():
+    app = mock.Mock()
+    app.get_authorizer.return_value = globus_sdk.NullAuthorizer()
+    app.get_client_retry_checks.return_value = []
+    return app
+
+
+@pytest.fixture
+def transfer_client():
+    transfer_client = mock.Mock()
+    transfer_client.get_endpoint.return_value = {
+        "entity_type": "GCSv5_mapped_collection",
+        "high_assurance": False,
+    }
+    return transfer_client
+
+
+@pytest.fixture(autouse=True)
+def _collections():
+    for address, client_id in HOSTS.items():
+        responses.add(
+            "GET",
+            f"{address}/",
+            status=302,
+            headers={
+                "Location": f"https://auth.globus.org/authorize?client_id={client_id}"
+            },
+        )
+        for i in range(3):
+            responses.add(
+                "GET",
+                f"{address}/data/{i}.txt",
+                body=f"{address} file {i}".encode(),
+            )
+
+
+def _sniff_count():
+    return sum(1 for call in responses.calls if call.request.url.endswith(".com/"))
+
+
+def test_download_files_across_collections(app, transfer_client, tmp_path):
+    downloads = [
+        (f"{address}/data/{i}.txt", tmp_path / f"{n}-{i}.txt")
+        for n, address in enumerate(HOSTS)
+        for i in range(3)
+    ]
+    with GCSDownloadManager(app, transfer_client=transfer_client) as manager:
+        results = manager.download_files(downloads, max_workers=6)
+
+        assert all(r.succeeded for r in results)
+        for (file_uri, path), result in zip(downloads, results):
+            assert result.path == str(path)
+            assert path.read_text() == file_uri.replace("/data/", " file ")[:-4]
+        # each collection is detected once
+        assert _sniff_count() == 2
+        assert transfer_client.get_endpoint.call_count == 2
+        assert manager.get_downloader(downloads[0][0]) is manager.get_downloader(
+            "https://a.example.com"
+        )
+        assert (
+            manager.get_downloader(downloads[0][0]).gcs_client.collection_id
+            == HOSTS["https://a.example.com"]
+        )
+
+    required = {
+        str(s)
+        for call in app.add_scope_requirements.call_args_list
+        for scopes in call.args[0].values()
+        for s in scopes
+    }
+    assert any("data_access" in s for s in required)
+
+
+def test_download_files_records_errors(app, transfer_client, tmp_path):
+    responses.add(
+        "GET",
+        "https://a.example.com/data/missing.txt",
+        status=404,
+        json={"code": "NotFound"},
+    )
+    with GCSDownloadManager(app, transfer_client=transfer_client) as manager:
+        results = manager.download_files(
+            [
+                ("https://a.example.com/data/missing.txt", tmp_path / "missing"),
+                ("https://a.example.com/data/0.txt", tmp_path / "0"),
+            ]
+        )
+
+    assert isinstance(results[0].error, globus_sdk.GlobusAPIError)
+    assert results[1].succeeded
+    assert not (tmp_path / "missing").exists()
+
+
+def test_disk_cache_is_shared(app, transfer_client, tmp_path):
+    cache_path = tmp_path / "cache" / "collections.json"
+    with GCSDownloadManager(
+        app, transfer_client=transfer_client, cache_path=cache_path
+    ) as manager:
+        assert manager.read_file("https://a.example.com/data/0.txt").endswith("0")
+    saved = json.loads(cache_path.read_text())["collections"]
+    assert saved["https://a.example.com"]["collection_id"] == str(uuid.UUID(int=1))
+    assert saved["https://a.example.com"]["uses_data_access"] is True
+
+    other_transfer_client = mock.Mock()
+    other_transfer_client.get_endpoint.return_value = {
+        "entity_type": "GCSv5_guest_collection",
+        "high_assurance": False,
+    }
+    with GCSDownloadManager(
+        app, transfer_client=other_transfer_client, cache_path=cache_path
+    ) as manager:
+        manager.read_file("https://a.example.com/data/1.txt")
+        manager.read_file("https://b.example.com/data/1.txt")
+        assert manager.cache_stats().hits == 1
+
+    # only collection 'b' was detected by the second manager
+    assert _sniff_count() == 2
+    assert other_transfer_client.get_endpoint.call_count == 1
+    saved = json.loads(cache_path.read_text())["collections"]
+    assert set(saved) == set(HOSTS)
+
+
+def test_disk_cache_entries_expire(app, transfer_client, tmp_path):
+    cache_path = tmp_path / "collections.json"
+    cache_path.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "collections": {
+                    "https://a.example.com": {
+                        "collection_id": "stale",
+                        "uses_data_access": False,
+                        "expires_at": time.time() - 1,
+                    }
+                },
+            }
+        )
+    )
+    with GCSDownloadManager(
+        app, transfer_client=transfer_client, cache_path=cache_path
+    ) as manager:
+        downloader = manager.get_downloader("https://a.example.com/data/0.txt")
+
+    assert downloader.gcs_client.collection_id == str(uuid.UUID(int=1))
+    assert _sniff_count() == 1
+
+
+def test_forget(app, transfer_client, tmp_path):
+    cache_path = tmp_path / "collections.json"
+    with GCSDownloadManager(
+        app, transfer_client=transfer_client, cache_path=cache_path
+    ) as manager:
+        first = manager.get_downloader("https://a.example.com/data/0.txt")
+        with mock.patch.object(first.gcs_client, "close") as close:
+            manager.forget("https://a.example.com/data/0.txt")
+        close.assert_called_once()
+        assert first.gcs_client not in manager._resources_to_close
+        assert json.loads(cache_path.read_text())["collections"] == {}
+        assert manager.get_downloader("https://a.example.com") is not first
+
+    assert _sniff_count() == 2
+
+
+def test_unreadable_cache_is_ignored(app, transfer_client, tmp_path):
+    cache_path = tmp_path / "collections.json"
+    cache_path.write_text("not json")
+    with GCSDownloadManager(
+        app, transfer_client=transfer_client, cache_path=cache_path
+    ) as manager:
+        manager.read_file("https://a.example.com/data/0.txt")
+    assert "https://a.example.com" in json.loads(cache_path.read_text())["collections"]
@@ -1,3 +1,7 @@
+import hashlib
+import io
+import json
+import os
 import uuid
 from unittest import mock
 
@@ -5,7 +9,8 @@ import pytest
 import responses
 
 import globus_sdk
-from globus_sdk.experimental.gcs_downloader import GCSDownloader
+from globus_sdk.experimental.gcs_collection_client import GCSCollectionClient
+from globus_sdk.experimental.gcs_downloader import ChecksumMismatchError, GCSDownloader
 
 
 def test_collection_id_sniffing():
@@ -49,3 +54,267 @@ def test_required_scope_detection(entity_type, high_assurance):
         assert {str(s) for s in result} == {str(scopes.https), str(scopes.data_access)}
     else:
         assert {str(s) for s in result} == {str(scopes.https)}
+
+
+FILE_URL = "https://some-base-url.example.com/data/big.dat"
+FILE_DATA = bytes(range(256)) * 1000
+
+
+@pytest.fixture
+def streaming_downloader():
+    gcs_client = GCSCollectionClient(
+        str(uuid.UUID(int=5)), "https://some-base-url.example.com"
+    )
+    return GCSDownloader(mock.Mock(), gcs_client=gcs_client)
+
+
+def _add_file(body=FILE_DATA, **kwargs):
+    responses.add(
+        method="GET",
+        url=FILE_URL,
+        body=body,
+        auto_calculate_content_length=True,
+        **kwargs,
+    )
+
+
+def test_download_to_path_streams_in_chunks(streaming_downloader, tmp_path):
+    _add_file()
+    dest = tmp_path / "big.dat"
+    progress = []
+
+    result = streaming_downloader.download_to(
+        FILE_URL,
+        dest,
+        chunk_size=4096,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert dest.read_bytes() == FILE_DATA
+    assert result.size == len(FILE_DATA)
+    assert result.path == str(dest)
+    assert result.checksum is None
+    assert len(progress) == -(-len(FILE_DATA) // 4096)
+    assert progress[-1] == (len(FILE_DATA), len(FILE_DATA))
+    # the temporary file was renamed into place
+    assert os.listdir(tmp_path) == ["big.dat"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="file modes are POSIX only")
+@pytest.mark.parametrize("atomic", (True, False))
+def test_download_to_path_uses_the_default_file_mode(
+    streaming_downloader, tmp_path, atomic
+):
+    _add_file()
+    dest = tmp_path / "big.dat"
+    old_umask = os.umask(0o027)
+    try:
+        streaming_downloader.download_to(FILE_URL, dest, atomic=atomic)
+    finally:
+        os.umask(old_umask)
+
+    # as for a file created with open(), not the owner-only mode of a temp file
+    assert dest.stat().st_mode & 0o777 == 0o640
+
+
+def test_download_to_file_object(streaming_downloader):
+    _add_file()
+    buf = io.BytesIO(b"header:")
+    buf.seek(0, io.SEEK_END)
+
+    result = streaming_downloader.download_to(
+        FILE_URL, buf, checksum_algorithm="sha256"
+    )
+
+    assert buf.getvalue() == b"header:" + FILE_DATA
+    assert result.path is None
+    assert result.checksum == hashlib.sha256(FILE_DATA).hexdigest()
+
+
+@pytest.mark.parametrize("atomic", (True, False))
+def test_download_to_verifies_checksum(streaming_downloader, tmp_path, atomic):
+    _add_file()
+    dest = tmp_path / "big.dat"
+    dest.write_bytes(b"previous contents")
+    expected = hashlib.md5(FILE_DATA).hexdigest()
+
+    with pytest.raises(ChecksumMismatchError) as excinfo:
+        streaming_downloader.download_to(
+            FILE_URL,
+            dest,
+            atomic=atomic,
+            checksum_algorithm="md5",
+            expected_checksum="0" * 32,
+        )
+
+    assert excinfo.value.actual == expected
+    if atomic:
+        # the existing file is untouched, and no temporary file is left behind
+        assert dest.read_bytes() == b"previous contents"
+        assert os.listdir(tmp_path) == ["big.dat"]
+
+    responses.calls.reset()
+    result = streaming_downloader.download_to(
+        FILE_URL,
+        dest,
+        atomic=atomic,
+        checksum_algorithm="md5",
+        expected_checksum=expected.upper(),
+    )
+    assert result.checksum == expected
+    assert dest.read_bytes() == FILE_DATA
+
+
+def test_download_to_error_leaves_no_partial_file(streaming_downloader, tmp_path):
+    _add_file(body=json.dumps({"code": "NotFound"}), status=404)
+    dest = tmp_path / "big.dat"
+
+    with pytest.raises(globus_sdk.GlobusAPIError):
+        streaming_downloader.download_to(FILE_URL, dest)
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_download_to_bad_arguments(streaming_downloader, tmp_path):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        streaming_downloader.download_to(FILE_URL, tmp_path / "x", chunk_size=0)
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        streaming_downloader.download_to(
+            FILE_URL, tmp_path / "x", expected_checksum="abc"
+        )
+
+
+def _add_ranged_file(body=FILE_DATA, etag='"v1"', fail=None):
+    """
+    Serve a file which honors Range requests. ``fail`` may map a range header to a
+    list of responses to send, in turn, before the range is served correctly.
+    """
+    requested_ranges = []
+
+    def callback(request):
+        range_header = request.headers.get("Range")
+        requested_ranges.append(range_header)
+        if fail and fail.get(range_header):
+            return fail[range_header].pop(0)
+        if range_header is None:
+            return (200, {}, body)
+        start, end = (int(x) for x in range_header[len("bytes=") :].split("-"))
+        end = min(end, len(body) - 1)
+        headers = {"Content-Range": f"bytes {start}-{end}/{len(body)}", "ETag": etag}
+        return (206, headers, body[start : end + 1])
+
+    responses.add_callback("GET", FILE_URL, callback=callback)
+    return requested_ranges
+
+
+def test_download_parallel_fetches_ranges(streaming_downloader, tmp_path):
+    requested_ranges = _add_ranged_file()
+    dest = tmp_path / "big.dat"
+    seen = []
+
+    result = streaming_downloader.download_parallel(
+        FILE_URL,
+        dest,
+        part_size=100_000,
+        checksum_algorithm="sha256",
+        progress=lambda written, total: seen.append((written, total)),
+    )
+
+    assert dest.read_bytes() == FILE_DATA
+    assert result.size == len(FILE_DATA)
+    assert result.checksum == hashlib.sha256(FILE_DATA).hexdigest()
+    assert sorted(requested_ranges[1:]) == [
+        "bytes=0-99999",
+        "bytes=100000-199999",
+        "bytes=200000-255999",
+    ]
+    assert seen[-1] == (len(FILE_DATA), len(FILE_DATA))
+    # only the finished file remains
+    assert os.listdir(tmp_path) == ["big.dat"]
+
+
+def test_download_parallel_retries_a_failed_range(
+    streaming_downloader, tmp_path, mocksleep
+):
+    # the first attempt at the second part is cut short
+    short = (206, {"Content-Range": "bytes 100000-199999/256000"}, b"x" * 10)
+    requested_ranges = _add_ranged_file(fail={"bytes=100000-199999": [short]})
+    dest = tmp_path / "big.dat"
+
+    streaming_downloader.download_parallel(FILE_URL, dest, part_size=100_000)
+
+    assert dest.read_bytes() == FILE_DATA
+    assert requested_ranges.count("bytes=100000-199999") == 2
+    assert requested_ranges.count("bytes=0-99999") == 1
+
+
+def test_download_parallel_resumes(streaming_downloader, tmp_path, mocksleep):
+    not_found = (404, {}, json.dumps({"code": "NotFound"}))
+    _add_ranged_file(fail={"bytes=200000-255999": [not_found]})
+    dest = tmp_path / "big.dat"
+
+    with pytest.raises(globus_sdk.GlobusAPIError):
+        streaming_downloader.download_parallel(
+            FILE_URL, dest, part_size=100_000, max_connections=1
+        )
+    assert not dest.exists()
+    state = json.loads((tmp_path / "big.dat.part.json").read_text())
+    assert state["done"] == [0, 1]
+
+    responses.reset()
+    requested_ranges = _add_ranged_file()
+    streaming_downloader.download_parallel(FILE_URL, dest, part_size=100_000)
+
+    assert dest.read_bytes() == FILE_DATA
+    assert requested_ranges == ["bytes=0-0", "bytes=200000-255999"]
+    assert os.listdir(tmp_path) == ["big.dat"]
+
+
+def test_download_parallel_restarts_when_the_file_changes(
+    streaming_downloader, tmp_path
+):
+    not_found = (404, {}, json.dumps({"code": "NotFound"}))
+    _add_ranged_file(fail={"bytes=200000-255999": [not_found]})
+    dest = tmp_path / "big.dat"
+    with pytest.raises(globus_sdk.GlobusAPIError):
+        streaming_downloader.download_parallel(
+            FILE_URL, dest, part_size=100_000, max_connections=1
+        )
+
+    responses.reset()
+    new_data = FILE_DATA[::-1]
+    requested_ranges = _add_ranged_file(body=new_data, etag='"v2"')
+    streaming_downloader.download_parallel(FILE_URL, dest, part_size=100_000)
+
+    assert dest.read_bytes() == new_data
+    assert len(requested_ranges) == 4
+
+
+def test_download_parallel_falls_back_without_range_support(
+    streaming_downloader, tmp_path
+):
+    _add_file()
+    dest = tmp_path / "big.dat"
+
+    result = streaming_downloader.download_parallel(FILE_URL, dest, part_size=1000)
+
+    assert dest.read_bytes() == FILE_DATA
+    assert result.size == len(FILE_DATA)
+    assert len(responses.calls) == 2
+
+
+def test_download_parallel_checksum_mismatch_discards_data(
+    streaming_downloader, tmp_path
+):
+    _add_ranged_file()
+    dest = tmp_path / "big.dat"
+
+    with pytest.raises(ChecksumMismatchError):
+        streaming_downloader.download_parallel(
+            FILE_URL,
+            dest,
+            part_size=100_000,
+            checksum_algorithm="md5",
+            expected_checksum="0" * 32,
+        )
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,213 @@
+import json
+import mmap
+import uuid
+from unittest import mock
+
+import pytest
+import responses
+
+import globus_sdk
+from globus_sdk.experimental.gcs_collection_client import GCSCollectionClient
+from globus_sdk.experimental.gcs_uploader import GCSUploader
+
+BASE_URL = "https://some-base-url.example.com"
+FILE_DATA = bytes(range(256)) * 100
+
+
+def _make_uploader(**client_kwargs):
+    gcs_client = GCSCollectionClient(str(uuid.UUID(int=5)), BASE_URL, **client_kwargs)
+    return GCSUploader(mock.Mock(), gcs_client=gcs_client)
+
+
+@pytest.fixture
+def uploader():
+    return _make_uploader()
+
+
+def _add_upload(url, statuses=(200,)):
+    """
+    Accept PUTs to a URL, recording the body of each one. ``statuses`` gives the
+    status of each response in turn; the last is repeated.
+    """
+    received = []
+
+    def callback(request):
+        received.append(b"".join(bytes(chunk) for chunk in request.body or ()))
+        status = statuses[min(len(received), len(statuses)) - 1]
+        body = {} if status == 200 else {"code": "Error", "message": "nope"}
+        return (status, {}, json.dumps(body))
+
+    responses.add_callback("PUT", url, callback=callback)
+    return received
+
+
+def test_upload_file_streams_from_path(uploader, tmp_path):
+    url = f"{BASE_URL}/data/upload.dat"
+    received = _add_upload(url)
+    source = tmp_path / "upload.dat"
+    source.write_bytes(FILE_DATA)
+    seen = []
+
+    result = uploader.upload_file(
+        source,
+        url,
+        chunk_size=10_000,
+        progress=lambda sent, total: seen.append((sent, total)),
+    )
+
+    assert result.succeeded
+    assert result.size == len(FILE_DATA)
+    assert result.attempts == 1
+    assert received == [FILE_DATA]
+    sent_headers = responses.calls[0].request.headers
+    assert sent_headers["Content-Length"] == str(len(FILE_DATA))
+    assert sent_headers["Content-Type"] == "application/octet-stream"
+    assert [sent for sent, _ in seen] == [10_000, 20_000, len(FILE_DATA)]
+
+
+def test_upload_does_not_change_the_client_transport(uploader):
+    url = f"{BASE_URL}/data/upload.dat"
+    received = _add_upload(url)
+    transport = uploader.gcs_client.transport
+    encodings = dict(transport.representation_providers)
+
+    uploader.upload_file(FILE_DATA, url)
+    uploader.upload_file(FILE_DATA, url)
+
+    assert received == [FILE_DATA, FILE_DATA]
+    # the transport may be shared with other clients
+    assert transport.representation_providers == encodings
+
+
+def test_upload_authenticates_as_the_given_client():
+    url = f"{BASE_URL}/data/upload.dat"
+    received = _add_upload(url)
+    uploader = _make_uploader(
+        authorizer=globus_sdk.AccessTokenAuthorizer("some-token"),
+        transport=globus_sdk.transport.RequestsTransport(http_timeout=5),
+    )
+
+    uploader.upload_file(FILE_DATA, url)
+
+    assert received == [FILE_DATA]
+    assert responses.calls[0].request.headers["Authorization"] == "Bearer some-token"
+    # the uploader's transport copies the settings of the client's transport
+    upload_transport = uploader._get_client(url).transport
+    assert upload_transport is not uploader.gcs_client.transport
+    assert upload_transport.http_timeout == 5
+
+    with mock.patch.object(upload_transport, "close") as close:
+        uploader.close()
+    close.assert_called_once()
+
+
+def test_upload_file_from_mmap(uploader, tmp_path):
+    url = f"{BASE_URL}/data/upload.dat"
+    received = _add_upload(url)
+    source = tmp_path / "upload.dat"
+    source.write_bytes(FILE_DATA)
+
+    with open(source, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            uploader.upload_file(buffer, url)
+
+    assert received == [FILE_DATA]
+
+
+def test_upload_file_empty(uploader):
+    url = f"{BASE_URL}/data/empty.dat"
+    received = _add_upload(url)
+
+    uploader.upload_file(b"", url)
+
+    assert received == [b""]
+    assert responses.calls[0].request.headers["Content-Length"] == "0"
+
+
+def test_transport_retries_resend_the_whole_file(uploader, mocksleep):
+    url = f"{BASE_URL}/data/upload.dat"
+    received = _add_upload(url, statuses=(500, 200))
+
+    result = uploader.upload_file(FILE_DATA, url, chunk_size=1000)
+
+    assert result.succeeded
+    assert received == [FILE_DATA, FILE_DATA]
+
+
+def test_upload_file_retries_server_errors(mocksleep):
+    uploader = _make_uploader(
+        retry_config=globus_sdk.transport.RetryConfig(max_retries=0)
+    )
+    url = f"{BASE_URL}/data/upload.dat"
+    received = _add_upload(url, statuses=(503, 200))
+
+    result = uploader.upload_file(FILE_DATA, url)
+
+    assert result.attempts == 2
+    assert received == [FILE_DATA, FILE_DATA]
+
+
+def test_upload_file_raises_client_errors_without_retrying(uploader):
+    url = f"{BASE_URL}/data/upload.dat"
+    received = _add_upload(url, statuses=(403,))
+
+    with pytest.raises(globus_sdk.GlobusAPIError) as excinfo:
+        uploader.upload_file(FILE_DATA, url)
+
+    assert excinfo.value.http_status == 403
+    assert len(received) == 1
+
+
+def test_upload_files_concurrently(uploader, tmp_path):
+    uploads = []
+    received = {}
+    for i in range(6):
+        url = f"{BASE_URL}/data/{i}.dat"
+        received[url] = _add_upload(url, statuses=(403,) if i == 2 else (200,))
+        uploads.append((FILE_DATA[i:], url))
+    uploads.append((tmp_path / "missing.dat", f"{BASE_URL}/data/missing.dat"))
+    seen_uris = set()
+
+    results = uploader.upload_files(
+        uploads,
+        max_workers=3,
+        progress=lambda uri, sent, total: seen_uris.add(uri),
+    )
+
+    assert [r.file_uri for r in results] == [url for _, url in uploads]
+    assert [r.succeeded for r in results] == [
+        True,
+        True,
+        False,
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert results[2].error.http_status == 403
+    assert isinstance(results[-1].error, FileNotFoundError)
+    for i, (_, url) in enumerate(uploads[:-1]):
+        assert received[url] == [FILE_DATA[i:]]
+    assert len(seen_uris) == 6
+
+
+def test_collection_is_detected_from_the_root(tmp_path):
+    uploader = GCSUploader(mock.Mock())
+    gcs_client = GCSCollectionClient(str(uuid.UUID(int=5)), BASE_URL)
+    url = f"{BASE_URL}/data/new/upload.dat"
+    _add_upload(url)
+
+    with mock.patch.object(
+        uploader, "_get_client_from_uri", return_value=gcs_client
+    ) as get_client:
+        uploader.upload_file(b"data", url)
+        uploader.upload_file(b"data", url)
+
+    get_client.assert_called_once_with(f"{BASE_URL}/")
+
+
+def test_bad_arguments(uploader):
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        uploader.upload_file(b"data", f"{BASE_URL}/x", chunk_size=0)
+    with pytest.raises(globus_sdk.GlobusSDKUsageError):
+        uploader.upload_files([], max_workers=0)
@@ -1,9 +1,12 @@
 import datetime
+import json
 
 import pytest
 
 from globus_sdk import MISSING, DeleteData, TransferData
+from globus_sdk._internal import orjson_compat
 from globus_sdk.services.transfer.client import _format_filter
+from globus_sdk.transport.representation_providers import RequestsJsonProvider
 from tests.common import GO_EP1_ID, GO_EP2_ID
 
 
@@ -314,3 +317,78 @@ def test_transfer_data_stringifies_deadline(deadline_str):
 
     tdata = TransferData(GO_EP1_ID, GO_EP2_ID, deadline=deadline_dt)
     assert tdata["deadline"] == deadline_str
+
+
+def _fill_transfer_data(tdata):
+    tdata.add_item("source/abc.txt", "dest/abc.txt")
+    tdata.add_item("source/def/", "dest/def/", recursive=True)
+    tdata.add_item(
+        "source/ghi.txt",
+        "dest/ghi.txt",
+        recursive=False,
+        external_checksum="d41d8cd98f00b204e9800998ecf8427e",
+        checksum_algorithm="MD5",
+    )
+    tdata.add_item("source/jkl.txt", "dest/jkl.txt", additional_fields={"foo": 1})
+
+
+def test_transfer_compact_items_match_list_items():
+    plain = TransferData(GO_EP1_ID, GO_EP2_ID)
+    compact = TransferData(GO_EP1_ID, GO_EP2_ID, compact_items=True)
+    _fill_transfer_data(plain)
+    _fill_transfer_data(compact)
+
+    assert compact["DATA"] == plain["DATA"]
+    assert list(compact.iter_items()) == list(plain.iter_items())
+    assert compact["DATA"][1]["recursive"] is True
+    assert compact["DATA"][0]["recursive"] is MISSING
+    assert compact["DATA"][-1]["foo"] == 1
+
+    provider = RequestsJsonProvider()
+    assert provider._prepare_data(compact) == provider._prepare_data(plain)
+
+
+@pytest.mark.parametrize("use_orjson", (True, False))
+def test_transfer_compact_items_encode_as_list_items(monkeypatch, use_orjson):
+    if use_orjson and not orjson_compat.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(orjson_compat, "ORJSON_AVAILABLE", use_orjson)
+    plain = TransferData(GO_EP1_ID, GO_EP2_ID, label=MISSING)
+    compact = TransferData(GO_EP1_ID, GO_EP2_ID, label=MISSING, compact_items=True)
+    _fill_transfer_data(plain)
+    _fill_transfer_data(compact)
+
+    provider = RequestsJsonProvider()
+    url = "https://transfer.api.globus.org/v0.10/transfer"
+    plain_body = provider.encode("POST", url, None, plain, {}).prepare().body
+    compact_request = provider.encode("POST", url, None, compact, {}).prepare()
+    # the compact items are encoded exactly as the plain items are sent
+    assert compact_request.body == plain_body
+    assert compact_request.headers["Content-Type"] == "application/json"
+    assert json.loads(compact_request.body)["DATA"][-1]["foo"] == 1
+    assert provider.encode_json(plain) == plain_body
+
+
+def test_transfer_compact_items_modified_by_index():
+    tdata = TransferData(GO_EP1_ID, GO_EP2_ID, compact_items=True)
+    _fill_transfer_data(tdata)
+    tdata["DATA"][0]["external_checksum"] = "abc"
+    del tdata["DATA"][1]
+    assert [x["source_path"] for x in tdata.iter_items()] == [
+        "source/abc.txt",
+        "source/ghi.txt",
+        "source/jkl.txt",
+    ]
+    assert tdata["DATA"][0]["external_checksum"] == "abc"
+
+
+def test_delete_compact_items_match_list_items():
+    plain = DeleteData(GO_EP1_ID)
+    compact = DeleteData(GO_EP1_ID, compact_items=True)
+    for ddata in (plain, compact):
+        ddata.add_item("abc/")
+        ddata.add_item("def/", additional_fields={"foo": "bar"})
+
+    assert compact["DATA"] == plain["DATA"]
+    provider = RequestsJsonProvider()
+    assert provider._prepare_data(compact) == provider._prepare_data(plain)
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import zlib
+
+import pytest
+
+from globus_sdk import (
+    MISSING,
+    GlobusSDKUsageError,
+    TransferChecksumCalculator,
+    TransferData,
+)
+from globus_sdk.services.transfer import checksums
+from tests.common import GO_EP1_ID, GO_EP2_ID
+
+
+@pytest.fixture
+def files(tmp_path):
+    contents = {
+        "a.txt": b"hello world",
+        "empty": b"",
+        "big.bin": os.urandom(300_000),
+    }
+    for name, content in contents.items():
+        (tmp_path / name).write_bytes(content)
+    (tmp_path / "subdir").mkdir()
+    return tmp_path, contents
+
+
+def _tdata(root, names, **kwargs):
+    tdata = TransferData(GO_EP1_ID, GO_EP2_ID, **kwargs)
+    for name in names:
+        tdata.add_item(str(root / name), f"/dst/{name}")
+    return tdata
+
+
+@pytest.mark.parametrize("use_processes", (False, True))
+@pytest.mark.parametrize("compact", (False, True))
+def test_fill_checksums(files, use_processes, compact):
+    root, contents = files
+    tdata = _tdata(root, [*contents, "subdir"], compact_items=compact)
+    tdata.add_item(str(root / "subdir"), "/dst/subdir2", recursive=True)
+
+    calc = TransferChecksumCalculator(
+        max_workers=2, use_processes=use_processes, chunk_size=4096
+    )
+    report = calc.fill(tdata)
+
+    assert (report.files_hashed, report.files_skipped, report.files_cached) == (
+        3,
+        2,
+        0,
+    )
+    assert report.bytes_hashed == sum(len(c) for c in contents.values())
+    assert report.throughput > 0
+    for item, content in zip(tdata.iter_items(), contents.values()):
+        assert item["external_checksum"] == hashlib.sha256(content).hexdigest()
+        assert item["checksum_algorithm"] == "SHA256"
+    assert tdata["DATA"][3]["external_checksum"] is MISSING
+    if compact:
+        # filled items remain in compact storage
+        assert tdata["DATA"]._dicts.keys() == {3}
+
+
+@pytest.mark.parametrize(
+    "algorithm, expect",
+    [
+        ("MD5", lambda b: hashlib.md5(b).hexdigest()),
+        ("SHA512", lambda b: hashlib.sha512(b).hexdigest()),
+        ("ADLER32", lambda b: f"{zlib.adler32(b):08x}"),
+    ],
+)
+def test_fill_checksums_algorithms(files, algorithm, expect):
+    root, contents = files
+    tdata = _tdata(root, contents)
+    TransferChecksumCalculator(algorithm, use_processes=False, chunk_size=1000).fill(
+        tdata
+    )
+    assert [i["external_checksum"] for i in tdata.iter_items()] == [
+        expect(c) for c in contents.values()
+    ]
+
+
+def test_buffered_reads_match_mmap(files, monkeypatch):
+    root, contents = files
+    key = lambda p: (os.stat(p).st_size, os.stat(p).st_mtime_ns)  # noqa: E731
+    path = str(root / "big.bin")
+    mapped = checksums._hash_file(path, "SHA1", 65536, key(path))
+
+    def fail_mmap(*args, **kwargs):
+        raise OSError("no mmap here")
+
+    monkeypatch.setattr(checksums.mmap, "mmap", fail_mmap)
+    assert checksums._hash_file(path, "SHA1", 65536, key(path)) == mapped
+    assert mapped == hashlib.sha1(contents["big.bin"]).hexdigest()
+
+
+def test_checksum_index_reuses_unchanged_files(files, tmp_path_factory):
+    root, contents = files
+    index_path = tmp_path_factory.mktemp("index") / "checksums.db"
+
+    with TransferChecksumCalculator(index_path=index_path, use_processes=False) as c:
+        assert c.fill(_tdata(root, contents)).files_hashed == 3
+
+    (root / "a.txt").write_bytes(b"changed")
+    tdata = _tdata(root, contents)
+    with TransferChecksumCalculator(index_path=index_path, use_processes=False) as c:
+        report = c.fill(tdata)
+    assert (report.files_hashed, report.files_cached) == (1, 2)
+    assert (
+        tdata["DATA"][0]["external_checksum"] == hashlib.sha256(b"changed").hexdigest()
+    )
+
+
+def test_fill_checksums_skips_existing_and_reports_errors(files):
+    root, contents = files
+    tdata = TransferData(GO_EP1_ID, GO_EP2_ID)
+    tdata.add_item(str(root / "a.txt"), "/dst/a", external_checksum="abc")
+    tdata.add_item("/remote/a.txt", "/dst/b")
+    calc = TransferChecksumCalculator(use_processes=False)
+
+    report = calc.fill(tdata)
+    assert report.files_skipped == 1
+    ((path, err),) = report.errors
+    assert path == "/remote/a.txt" and isinstance(err, FileNotFoundError)
+    assert tdata["DATA"][0]["external_checksum"] == "abc"
+
+    # with a path mapping and overwrite
+    report = calc.fill(
+        tdata,
+        local_path=lambda p: str(root / os.path.basename(p)),
+        overwrite=True,
+    )
+    assert report.files_hashed == 2
+    assert tdata["DATA"][0]["external_checksum"] != "abc"
+
+
+def test_rejects_unknown_algorithm():
+    with pytest.raises(GlobusSDKUsageError):
+        TransferChecksumCalculator("CRC64")
@@ -0,0 +1,81 @@
+import pytest
+
+from globus_sdk import MISSING
+from globus_sdk._internal.compact_items import CompactDictList
+
+
+def _row(src, *, flag=MISSING, note=MISSING):
+    return {"TYPE": "row", "src": src, "flag": flag, "note": note}
+
+
+def _make(rows=()):
+    return CompactDictList(
+        rows,
+        constants={"TYPE": "row"},
+        string_fields=("src",),
+        flag_fields=("flag",),
+        sparse_fields=("note",),
+    )
+
+
+def test_roundtrip_preserves_values_and_key_order():
+    rows = [
+        _row("a"),
+        _row("β/ü", flag=True),
+        _row("c", flag=False, note="x"),
+        {"TYPE": "other", "src": "d"},
+    ]
+    items = _make(rows)
+    assert len(items) == 4
+    assert items == rows
+    assert [list(x) for x in items] == [list(x) for x in rows]
+    assert items[1]["flag"] is True
+    assert items[2]["flag"] is False
+    assert items[0]["flag"] is MISSING
+
+
+def test_index_access_is_stable_and_iteration_is_read_only():
+    items = _make([_row("a")])
+    items[0]["note"] = "changed"
+    assert items[0] is items[0]
+    assert items[0]["note"] == "changed"
+
+    items.append(_row("b"))
+    first, second = items
+    # a row accessed by index is kept, so it may still be changed
+    first["note"] = "kept"
+    assert items[0]["note"] == "kept"
+    # but other rows are built for the iteration, and changes would be lost
+    with pytest.raises(TypeError, match="read-only"):
+        second["note"] = "lost"
+    with pytest.raises(TypeError, match="read-only"):
+        second.update(note="lost")
+    assert items[1]["note"] is MISSING
+    assert second == _row("b")
+    assert dict(second) == _row("b")
+
+
+def test_mutation_in_the_middle():
+    items = _make(_row(c) for c in "abc")
+    items.insert(1, _row("z", note="n"))
+    assert [x["src"] for x in items] == ["a", "z", "b", "c"]
+    del items[0]
+    items[-1] = _row("y")
+    assert items == [_row("z", note="n"), _row("b"), _row("y")]
+    items[0:2] = [_row("q")]
+    assert [x["src"] for x in items] == ["q", "y"]
+    with pytest.raises(IndexError):
+        items[2]
+
+
+def test_repeated_sparse_values_are_interned():
+    items = _make(_row(str(i), note="".join(["sha", "256"])) for i in range(3))
+    assert items[0]["note"] is items[2]["note"]
+
+
+def test_setitem_with_same_strings_stays_packed():
+    items = _make([_row("a"), _row("b", note="x")])
+    items[0] = _row("a", flag=True, note="y")
+    items[1] = _row("b")
+    assert items._dicts == {}
+    assert list(items) == [_row("a", flag=True, note="y"), _row("b")]
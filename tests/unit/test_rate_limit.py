@@ -0,0 +1,26 @@
+from unittest import mock
+
+import pytest
+
+from globus_sdk._internal.rate_limit import RateLimiter
+
+
+def test_rate_limiter_spaces_events():
+    now = [0.0]
+    limiter = RateLimiter(4, clock=lambda: now[0])
+    with mock.patch("time.sleep") as sleep:
+        limiter.wait()
+        limiter.wait()
+        limiter.wait()
+        assert [c.args[0] for c in sleep.call_args_list] == [0.25, 0.5]
+
+        # once time has passed, no wait is needed
+        now[0] = 10.0
+        sleep.reset_mock()
+        limiter.wait()
+        sleep.assert_not_called()
+
+
+def test_rate_limiter_rejects_bad_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
@@ -0,0 +1,75 @@
+import pytest
+
+from globus_sdk._internal.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_get_and_set(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert "a" in cache
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+
+
+def test_entries_expire(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=100)
+    assert cache.expires_in("a") == 10
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats().expirations == 1
+
+
+def test_purge_expired(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=100)
+    clock.now = 50
+    assert cache.purge_expired() == 1
+    assert cache.keys() == ["b"]
+
+
+def test_lru_eviction(clock):
+    cache = TTLCache(ttl=10, maxsize=2, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # touch "a" so that "b" is the least recently used
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.keys() == ["a", "c"]
+    assert cache.stats().evictions == 1
+
+
+def test_invalidation(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    for i in range(5):
+        cache.set(i, i)
+    assert cache.invalidate_where(lambda k: k % 2 == 0) == 3
+    assert cache.pop(1) == 1
+    assert cache.pop(1) is None
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats().invalidations == 5
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        TTLCache(ttl=1, maxsize=0)